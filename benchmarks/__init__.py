@@ -0,0 +1,7 @@
+"""
+Benchmarks do interpretador Portugol.
+
+Cada módulo pode ser executado diretamente, por exemplo:
+
+    python -m benchmarks.inicializacao
+"""
@@ -0,0 +1,87 @@
+"""
+Mede a montagem de uma cadeia longa com `texto = texto + parte` em um laço.
+
+O programa Portugol acrescenta uma parte de `--parte` caracteres por
+iteração de um `enquanto` até chegar a `--megabytes` (10 por padrão) e
+depois compara o texto, o que obriga a montagem da `Corda` de
+`portugol.cadeias`. Para cada backend são medidos o tempo e o pico de
+memória; com `--sem-cordas`, a mesma carga é medida com as cordas
+desligadas, em que cada '+' copia o texto inteiro (use tamanhos pequenos:
+o custo é quadrático).
+
+    python -m benchmarks.cadeias [--megabytes N] [--parte N] [--backends ...] [--sem-cordas]
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+from portugol import cadeias
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKENDS, criar_interpretador
+from portugol.parser import analisar
+
+
+def programa(megabytes: float, parte: int) -> str:
+    repeticoes = max(1, round(megabytes * 2 ** 20 / parte))
+    literal = ("abcdefghij" * (parte // 10 + 1))[:parte]
+    return f"""
+    programa {{
+        cadeia texto = "";
+        inteiro i = 0;
+        enquanto (i < {repeticoes}) {{
+            texto = texto + "{literal}";
+            i = i + 1;
+        }}
+        escreva(texto == "");
+    }}
+    """
+
+
+def executar(programa_ast, backend: str):
+    saida = io.StringIO()
+    criar_interpretador(backend, es=EntradaSaida(saida=saida)).interpretar(programa_ast)
+    if saida.getvalue() != "False\n":
+        raise RuntimeError(f"Saída inesperada do backend {backend}: {saida.getvalue()!r}")
+
+
+def medir(codigo: str, backend: str):
+    programa_ast = analisar(codigo)
+    inicio = time.perf_counter()
+    executar(programa_ast, backend)
+    tempo = time.perf_counter() - inicio
+    # O tracemalloc deixa a execução mais lenta: a memória é medida em outra execução
+    tracemalloc.start()
+    executar(programa_ast, backend)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return tempo, pico
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--megabytes", type=float, default=10)
+    argumentos.add_argument("--parte", type=int, default=100, help="caracteres acrescentados por iteração")
+    argumentos.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    argumentos.add_argument("--sem-cordas", action="store_true", help="mede também com as cordas desligadas")
+    args = argumentos.parse_args()
+
+    codigo = programa(args.megabytes, args.parte)
+    variantes = [("cordas", cadeias.LIMITE_CORDA)]
+    if args.sem_cordas:
+        variantes.append(("sem cordas", float("inf")))
+    print(f"{args.megabytes:g} MiB em partes de {args.parte} caracteres")
+    print(f"{'backend':<10}{'variante':<12}{'tempo':>12}{'pico de memória':>20}")
+    for backend in args.backends:
+        for nome, limite in variantes:
+            anterior, cadeias.LIMITE_CORDA = cadeias.LIMITE_CORDA, limite
+            try:
+                tempo, pico = medir(codigo, backend)
+            finally:
+                cadeias.LIMITE_CORDA = anterior
+            print(f"{backend:<10}{nome:<12}{tempo:>10.2f} s{pico / 2 ** 20:>16.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Cargas de trabalho representativas usadas pelos benchmarks.
+
+Cada carga é um programa Portugol gerado a partir de um tamanho, junto com a
+entrada que ele consome. `escala` multiplica os tamanhos padrão: valores
+menores que 1 deixam as medições rápidas (por exemplo, nos testes).
+"""
+
+import math
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Carga(NamedTuple):
+    nome: str
+    codigo: str
+    entrada: str = ""
+
+
+def fibonacci(n: int) -> Carga:
+    codigo = f"""
+    programa {{
+        funcao inteiro fibonacci(inteiro n) {{
+            se (n <= 1) {{
+                retorne n;
+            }}
+            retorne fibonacci(n - 1) + fibonacci(n - 2);
+        }}
+        escreva(fibonacci({n}));
+    }}
+    """
+    return Carga("fibonacci", codigo)
+
+
+def lacos_aninhados(n: int) -> Carga:
+    codigo = f"""
+    programa {{
+        inteiro soma = 0;
+        para (inteiro i = 0; i < {n}; i = i + 1) {{
+            para (inteiro j = 0; j < {n}; j = j + 1) {{
+                soma = soma + (i * j) % 7;
+            }}
+        }}
+        escreva(soma);
+    }}
+    """
+    return Carga("lacos_aninhados", codigo)
+
+
+def escreva_cadeias(n: int) -> Carga:
+    codigo = f"""
+    programa {{
+        cadeia linha = "";
+        para (inteiro i = 0; i < {n}; i = i + 1) {{
+            linha = "item " + i;
+            escreva(linha, ": ", i * 2, " de ", {n});
+        }}
+    }}
+    """
+    return Carga("escreva_cadeias", codigo)
+
+
+def leia_intensivo(n: int) -> Carga:
+    codigo = f"""
+    programa {{
+        inteiro valor;
+        inteiro total = 0;
+        para (inteiro i = 0; i < {n}; i = i + 1) {{
+            leia(valor);
+            total = total + valor;
+        }}
+        escreva(total);
+    }}
+    """
+    return Carga("leia_intensivo", codigo, "".join(f"{i % 1000}\n" for i in range(n)))
+
+
+def crivo(n: int) -> Carga:
+    """Crivo de Eratóstenes: leitura e escrita de elementos de um vetor."""
+    codigo = f"""
+    programa {{
+        inteiro composto[{n} + 1];
+        inteiro primos = 0;
+        para (inteiro i = 2; i <= {n}; i = i + 1) {{
+            se (composto[i] == 0) {{
+                primos = primos + 1;
+                para (inteiro j = i * i; j <= {n}; j = j + i) {{
+                    composto[j] = 1;
+                }}
+            }}
+        }}
+        escreva(primos);
+    }}
+    """
+    return Carga("crivo", codigo)
+
+
+def fonte_grande(linhas: int) -> Carga:
+    """Programa longo e pouco repetitivo: o custo é dominado pela análise sintática."""
+    partes = ["programa {"]
+    for i in range(linhas // 4):
+        partes.append(f"    funcao inteiro f{i}(inteiro a, inteiro b) {{")
+        partes.append(f"        se (a > b) {{ retorne a * {i % 10 + 1} - b; }} senao {{ retorne b + {i}; }}")
+        partes.append("    }")
+        partes.append(f"    inteiro v{i} = f{i}({i}, {i % 7});")
+    partes.append("    escreva(\"fim\");")
+    partes.append("}")
+    return Carga("fonte_grande", "\n".join(partes) + "\n")
+
+
+PHI = (1 + 5 ** 0.5) / 2
+
+# nome -> (gerador, tamanho padrão)
+CARGAS: Dict[str, Tuple[Callable[[int], Carga], int]] = {
+    "fibonacci": (fibonacci, 22),
+    "lacos_aninhados": (lacos_aninhados, 300),
+    "escreva_cadeias": (escreva_cadeias, 50_000),
+    "leia_intensivo": (leia_intensivo, 50_000),
+    "fonte_grande": (fonte_grande, 8_000),
+    "crivo": (crivo, 100_000),
+}
+
+
+def gerar_cargas(nomes: Optional[List[str]] = None, escala: float = 1.0) -> List[Carga]:
+    cargas = []
+    for nome in nomes or CARGAS:
+        gerador, tamanho = CARGAS[nome]
+        if gerador is fibonacci:
+            # O custo de fibonacci cresce exponencialmente: a escala atua sobre o número de chamadas
+            tamanho = max(1, tamanho + round(math.log(escala) / math.log(PHI)))
+        else:
+            tamanho = max(1, round(tamanho * escala))
+        cargas.append(gerador(tamanho))
+    return cargas
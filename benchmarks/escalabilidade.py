@@ -0,0 +1,226 @@
+"""
+Mede como cada etapa cresce com o tamanho dos programas de `benchmarks.gerador`.
+
+Para cada formato, programas de tamanhos crescentes (`--pontos` tamanhos que
+dobram a partir do tamanho inicial do formato, multiplicado por `--escala`)
+passam pelas etapas de `benchmarks.regressao`: análise sintática
+(`Lark.parse`), construção da AST (`PortugolTransformer`) e execução. Em cada
+etapa, o expoente `k` de `tempo ~ tamanho ** k` (e o do pico de memória) é
+estimado por mínimos quadrados em escala log-log: `k` perto de 1 é
+crescimento linear, e acima de `LIMITE_SUPERLINEAR` a etapa é apontada como
+superlinear. Uma etapa que falha (como `RecursionError` em expressões muito
+aninhadas) aparece no lugar das medições, e os tamanhos maiores do formato
+não são medidos.
+
+`--grafico` grava um SVG com o tempo e o pico de memória de cada etapa
+contra o tamanho, em escala log-log, uma linha de painéis por formato;
+`--saida` grava as medições em JSON.
+
+    python -m benchmarks.escalabilidade [FORMATO ...] [--pontos N] [--escala X] [--grafico ARQUIVO.svg]
+"""
+
+import argparse
+import json
+import math
+from typing import Dict, List, Optional
+
+from benchmarks.gerador import FORMATOS, gerar
+from benchmarks.regressao import ETAPAS, ErroEtapa, medir_carga
+from portugol.execucao import BACKEND_PADRAO, BACKENDS
+
+# Primeiro tamanho medido de cada formato, com `--escala 1`
+TAMANHOS_INICIAIS = {
+    "expressoes_profundas": 8,
+    "muitas_funcoes": 25,
+    "blocos_aninhados": 8,
+    "linear": 250,
+    "lacos_longos": 1_000,
+    "misto": 100,
+}
+
+# Expoente a partir do qual o crescimento é apontado como superlinear
+LIMITE_SUPERLINEAR = 1.3
+
+# Medições menores são dominadas por ruído e ficam fora do ajuste
+TEMPO_MINIMO = 0.0005
+MEMORIA_MINIMA = 16 * 1024
+
+MEDIDAS = (("tempo", "tempo (ms)", 1000, TEMPO_MINIMO),
+           ("memoria_pico", "pico de memória (KiB)", 1 / 1024, MEMORIA_MINIMA))
+
+CORES = {"parse": "#1f77b4", "transformacao": "#ff7f0e", "execucao": "#2ca02c"}
+LARGURA_PAINEL, ALTURA_PAINEL = 380, 230
+
+
+def tamanhos(formato: str, pontos: int, escala: float = 1.0) -> List[int]:
+    inicial = max(1, round(TAMANHOS_INICIAIS[formato] * escala))
+    return [inicial * 2 ** i for i in range(pontos)]
+
+
+def medir_formato(formato: str, tamanhos_medidos: List[int], backend: str = BACKEND_PADRAO,
+                  repeticoes: int = 3, semente: int = 0, posicoes: bool = False) -> List[dict]:
+    pontos = []
+    for tamanho in tamanhos_medidos:
+        carga = gerar(formato, tamanho, semente)
+        ponto = {"tamanho": tamanho, "bytes": len(carga.codigo.encode("utf-8"))}
+        pontos.append(ponto)
+        try:
+            ponto.update(medir_carga(carga, backend, repeticoes, posicoes))
+        except ErroEtapa as e:
+            ponto["erro"] = {"etapa": e.etapa, "tipo": type(e.causa).__name__}
+            break
+    return pontos
+
+
+def expoente(pontos: List[dict], medida: str, etapa: str, minimo: float = 0.0) -> Optional[float]:
+    """Inclinação da reta de mínimos quadrados de log(medida) contra log(tamanho)."""
+    coordenadas = [(math.log(ponto["tamanho"]), math.log(ponto[medida][etapa]))
+                   for ponto in pontos if "erro" not in ponto and ponto[medida][etapa] > max(minimo, 0)]
+    if len(coordenadas) < 2:
+        return None
+    media_x = sum(x for x, _ in coordenadas) / len(coordenadas)
+    media_y = sum(y for _, y in coordenadas) / len(coordenadas)
+    variancia = sum((x - media_x) ** 2 for x, _ in coordenadas)
+    if variancia == 0:
+        return None
+    return sum((x - media_x) * (y - media_y) for x, y in coordenadas) / variancia
+
+
+def expoentes(resultados: dict) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+    """formato -> medida -> etapa -> expoente (None se não há medições suficientes)."""
+    return {formato: {medida: {etapa: expoente(pontos, medida, etapa, minimo) for etapa in ETAPAS}
+                      for medida, _, _, minimo in MEDIDAS}
+            for formato, pontos in resultados["formatos"].items()}
+
+
+def medir(formatos: List[str], pontos: int = 5, escala: float = 1.0, backend: str = BACKEND_PADRAO,
+          repeticoes: int = 3, semente: int = 0, posicoes: bool = False) -> dict:
+    resultados = {
+        "ambiente": {"backend": backend, "repeticoes": repeticoes, "semente": semente,
+                     "escala": escala, "posicoes": posicoes},
+        "formatos": {formato: medir_formato(formato, tamanhos(formato, pontos, escala), backend,
+                                            repeticoes, semente, posicoes)
+                     for formato in formatos},
+    }
+    resultados["expoentes"] = expoentes(resultados)
+    return resultados
+
+
+def formatar(resultados: dict) -> str:
+    cabecalho = "".join(f" {etapa + ' (ms)':>18}" for etapa in ETAPAS)
+    linhas = [f"{'formato':<22} {'tamanho':>8} {'bytes':>10}{cabecalho}"]
+    for formato, pontos in resultados["formatos"].items():
+        for ponto in pontos:
+            inicio = f"{formato:<22} {ponto['tamanho']:>8} {ponto['bytes']:>10}"
+            if "erro" in ponto:
+                linhas.append(f"{inicio} {ponto['erro']['tipo']} em {ponto['erro']['etapa']}")
+                continue
+            linhas.append(inicio + "".join(f" {ponto['tempo'][etapa] * 1000:>18.2f}" for etapa in ETAPAS))
+
+    linhas.append("")
+    linhas.append(f"expoentes (medida ~ tamanho ** k; acima de {LIMITE_SUPERLINEAR} é superlinear):")
+    for formato, medidas in resultados["expoentes"].items():
+        for medida, etapas in medidas.items():
+            descricoes = []
+            for etapa, valor in etapas.items():
+                if valor is None:
+                    descricoes.append(f"{etapa} -")
+                else:
+                    alerta = " (superlinear)" if valor > LIMITE_SUPERLINEAR else ""
+                    descricoes.append(f"{etapa} {valor:.2f}{alerta}")
+            linhas.append(f"  {formato:<22} {medida:<13} " + ", ".join(descricoes))
+    return "\n".join(linhas)
+
+
+def grafico_svg(resultados: dict) -> str:
+    """Painéis log-log do tempo e do pico de memória de cada etapa contra o tamanho."""
+    formatos = list(resultados["formatos"])
+    largura, altura = 2 * LARGURA_PAINEL, 30 + len(formatos) * ALTURA_PAINEL
+    partes = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{largura}" height="{altura}" '
+              'font-family="sans-serif" font-size="11">',
+              f'<rect width="{largura}" height="{altura}" fill="white"/>']
+    for i, etapa in enumerate(ETAPAS):
+        x = 60 + i * 150
+        partes.append(f'<rect x="{x}" y="10" width="12" height="12" fill="{CORES[etapa]}"/>'
+                      f'<text x="{x + 18}" y="20">{etapa}</text>')
+
+    for linha, formato in enumerate(formatos):
+        pontos = [ponto for ponto in resultados["formatos"][formato] if "erro" not in ponto]
+        erro = next((ponto for ponto in resultados["formatos"][formato] if "erro" in ponto), None)
+        for coluna, (medida, rotulo, fator, _) in enumerate(MEDIDAS):
+            x0, y0 = coluna * LARGURA_PAINEL + 70, 30 + linha * ALTURA_PAINEL + 25
+            w, h = LARGURA_PAINEL - 95, ALTURA_PAINEL - 70
+            partes.append(f'<text x="{x0}" y="{y0 - 8}" font-weight="bold">{formato}: {rotulo}</text>')
+            partes.append(f'<rect x="{x0}" y="{y0}" width="{w}" height="{h}" fill="none" stroke="#888"/>')
+            if erro:
+                partes.append(f'<text x="{x0 + 6}" y="{y0 + 14}" fill="#c00">{erro["erro"]["tipo"]} em '
+                              f'{erro["erro"]["etapa"]} no tamanho {erro["tamanho"]}</text>')
+            series = {etapa: [(ponto["tamanho"], ponto[medida][etapa] * fator)
+                              for ponto in pontos if ponto[medida][etapa] > 0] for etapa in ETAPAS}
+            xs = [x for serie in series.values() for x, _ in serie]
+            ys = [y for serie in series.values() for _, y in serie]
+            if not xs:
+                continue
+            lx = _limites(xs)
+            ly = _limites(ys)
+
+            def px(valor):
+                return x0 + w * (math.log(valor) - lx[0]) / (lx[1] - lx[0])
+
+            def py(valor):
+                return y0 + h - h * (math.log(valor) - ly[0]) / (ly[1] - ly[0])
+
+            partes.append(f'<text x="{x0}" y="{y0 + h + 14}">{min(xs)}</text>'
+                          f'<text x="{x0 + w}" y="{y0 + h + 14}" text-anchor="end">{max(xs)}</text>'
+                          f'<text x="{x0 + w / 2}" y="{y0 + h + 28}" text-anchor="middle">tamanho</text>'
+                          f'<text x="{x0 - 4}" y="{y0 + h}" text-anchor="end">{min(ys):.3g}</text>'
+                          f'<text x="{x0 - 4}" y="{y0 + 10}" text-anchor="end">{max(ys):.3g}</text>')
+            for etapa, serie in series.items():
+                if not serie:
+                    continue
+                coordenadas = " ".join(f"{px(x):.1f},{py(y):.1f}" for x, y in serie)
+                partes.append(f'<polyline points="{coordenadas}" fill="none" stroke="{CORES[etapa]}" stroke-width="2"/>')
+                partes.extend(f'<circle cx="{px(x):.1f}" cy="{py(y):.1f}" r="3" fill="{CORES[etapa]}"/>'
+                              for x, y in serie)
+    partes.append("</svg>")
+    return "\n".join(partes) + "\n"
+
+
+def _limites(valores):
+    minimo, maximo = math.log(min(valores)), math.log(max(valores))
+    if maximo - minimo < 1e-9:
+        minimo, maximo = minimo - 0.5, maximo + 0.5
+    return minimo, maximo
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("formatos", nargs="*", metavar="FORMATO",
+                            help=f"formatos a medir (padrão: todos; opções: {', '.join(FORMATOS)})")
+    argumentos.add_argument("--pontos", type=int, default=5, help="tamanhos medidos por formato")
+    argumentos.add_argument("--escala", type=float, default=1.0, help="multiplica os tamanhos iniciais")
+    argumentos.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO)
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    argumentos.add_argument("--semente", type=int, default=0)
+    argumentos.add_argument("--posicoes", action="store_true", help="guarda linha e coluna nos nós")
+    argumentos.add_argument("--saida", metavar="ARQUIVO", help="grava as medições em JSON")
+    argumentos.add_argument("--grafico", metavar="ARQUIVO", help="grava os gráficos em SVG")
+    args = argumentos.parse_args()
+    desconhecidos = [formato for formato in args.formatos if formato not in FORMATOS]
+    if desconhecidos:
+        argumentos.error(f"formatos desconhecidos: {', '.join(desconhecidos)}")
+
+    resultados = medir(args.formatos or list(FORMATOS), args.pontos, args.escala, args.backend,
+                       args.repeticoes, args.semente, args.posicoes)
+    print(formatar(resultados))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+    if args.grafico:
+        with open(args.grafico, "w", encoding="utf-8") as f:
+            f.write(grafico_svg(resultados))
+        print(f"\ngráficos gravados em {args.grafico}")
+
+
+if __name__ == "__main__":
+    main()
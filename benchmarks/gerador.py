@@ -0,0 +1,412 @@
+"""
+Gerador de programas Portugol sintéticos para testes de escala e de estresse.
+
+Os programas seguem as construções de `portugol/grammar.lark`: cada método de
+`GeradorProgramas` com nome de regra (`comando_se`, `expressao_primaria`,
+`declaracao_funcao`...) produz o texto de uma derivação dessa regra. Além de
+sintaticamente corretos, os programas são válidos para a verificação de tipos
+e executam sem erros: as variáveis são declaradas antes do uso, os índices
+ficam dentro dos limites, os divisores nunca são zero e todo laço termina.
+Cada programa termina escrevendo as variáveis globais, o que permite comparar
+a saída entre backends.
+
+O formato escolhe a forma do programa e o tamanho, a grandeza que cresce:
+
+- `expressoes_profundas`: uma expressão com `tamanho` níveis de aninhamento;
+- `muitas_funcoes`: `tamanho` funções, todas chamadas;
+- `blocos_aninhados`: `tamanho` comandos `se`, `enquanto`, `para` e blocos, um dentro do outro;
+- `linear`: `tamanho` comandos sem desvios;
+- `lacos_longos`: laços que executam `tamanho` voltas no total;
+- `misto`: `tamanho` comandos sorteados entre todas as construções da gramática.
+
+A mesma semente gera sempre o mesmo programa.
+
+    python -m benchmarks.gerador misto 200 --semente 7 > programa.ptg
+"""
+
+import argparse
+import random
+import sys
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Set
+
+from benchmarks.cargas import Carga
+
+# Variáveis globais de cada tipo, declaradas no começo de todo programa
+GLOBAIS_INTEIRAS = 6
+TAMANHO_VETOR = 16
+LINHAS_MATRIZ, COLUNAS_MATRIZ = 3, 4
+
+# Valores inteiros são reduzidos com este módulo a cada atribuição, para não crescerem sem limite
+MODULO = 1_000
+
+# Recuo máximo: programas muito aninhados teriam linhas quadráticas no tamanho
+RECUO_MAXIMO = 16
+
+OPERADORES_RELACIONAIS = ("==", "!=", "<", "<=", ">", ">=")
+
+
+class GeradorProgramas:
+    """Monta um programa linha a linha; cada instância gera um só programa."""
+
+    def __init__(self, semente: int = 0):
+        self.aleatorio = random.Random(semente)
+        self.linhas: List[str] = []
+        self.entrada: List[str] = []
+        self.nivel = 0
+        self.nomes = 0
+        # Funções já declaradas: nome -> número de parâmetros
+        self.funcoes: Dict[str, int] = {}
+        # Variáveis inteiras visíveis no ponto atual do programa
+        self.inteiras: List[str] = [f"g{i}" for i in range(GLOBAIS_INTEIRAS)]
+        # Contadores de laço: podem ser lidos, mas nunca atribuídos, para que todo laço termine
+        self.contadores: Set[str] = set()
+        # Chamadas de função nas expressões; desligadas dentro das funções, para as chamadas não se encadearem
+        self.chamadas = True
+
+    # Texto
+
+    def emitir(self, linha: str):
+        self.linhas.append("    " * min(self.nivel, RECUO_MAXIMO) + linha)
+
+    @contextmanager
+    def bloco(self, cabecalho: str, *locais: str):
+        """`cabecalho {` ... `}`, com as variáveis `locais` visíveis só dentro do bloco."""
+        self.emitir(f"{cabecalho} {{" if cabecalho else "{")
+        self.nivel += 1
+        visiveis = list(self.inteiras)
+        self.inteiras.extend(locais)
+        try:
+            yield
+        finally:
+            self.inteiras = visiveis
+            self.nivel -= 1
+            self.emitir("}")
+
+    def alvo(self) -> str:
+        """Variável inteira que pode receber uma atribuição ou um `leia`."""
+        return self.aleatorio.choice([nome for nome in self.inteiras if nome not in self.contadores])
+
+    def novo_nome(self, prefixo: str) -> str:
+        self.nomes += 1
+        return f"{prefixo}{self.nomes}"
+
+    def programa(self, corpo: Callable[[], None]) -> str:
+        with self.bloco("programa"):
+            self.declaracoes_globais()
+            corpo()
+            self.escreva_resultado()
+        return "\n".join(self.linhas) + "\n"
+
+    # Declarações
+
+    def declaracoes_globais(self):
+        sorteio = self.aleatorio.randrange
+        for nome in self.inteiras:
+            self.emitir(f"inteiro {nome} = {sorteio(1, 100)};")
+        self.emitir(f"real r0 = {sorteio(1, 100)}.{sorteio(10)};")
+        self.emitir('cadeia c0 = "inicio";')
+        self.emitir("caractere k0 = 'a';")
+        elementos = ", ".join(str(sorteio(100)) for _ in range(TAMANHO_VETOR))
+        self.emitir(f"inteiro v[{TAMANHO_VETOR}] = {{{elementos}}};")
+        self.emitir(f"inteiro m[{LINHAS_MATRIZ}][{COLUNAS_MATRIZ}];")
+
+    def declaracao_variavel(self) -> str:
+        nome = self.novo_nome("x")
+        self.emitir(f"inteiro {nome} = {self.expressao_inteira(2)};")
+        self.inteiras.append(nome)
+        return nome
+
+    def declaracao_funcao(self):
+        """Função de dois parâmetros que chama no máximo uma função sem chamadas."""
+        nome = f"f{len(self.funcoes)}"
+        folhas = [funcao for funcao in self.funcoes if int(funcao[1:]) % 16 == 0]
+        externas = self.inteiras
+        self.inteiras, self.chamadas = [], False
+        with self.bloco(f"funcao inteiro {nome}(inteiro a, inteiro b)", "a", "b"):
+            local = self.declaracao_variavel()
+            if folhas and len(self.funcoes) % 16:
+                chamada = self.aleatorio.choice(folhas)
+                self.emitir(f"{local} = ({local} + {chamada}(a % {MODULO}, {self.expressao_primaria()})) % {MODULO};")
+            with self.bloco(f"se ({self.condicao()})"):
+                self.emitir(f"retorne ({self.expressao_inteira(2)}) % {MODULO};")
+            self.emitir(f"retorne ({local} + b) % {MODULO};")
+        self.inteiras, self.chamadas = externas, True
+        self.funcoes[nome] = 2
+
+    def funcao_vetor(self):
+        """Função com um parâmetro vetor (`inteiro w[]`), chamada logo depois de declarada."""
+        nome = self.novo_nome("soma")
+        externas = self.inteiras
+        self.inteiras = []
+        with self.bloco(f"funcao inteiro {nome}(inteiro w[], inteiro n)", "n"):
+            self.emitir("inteiro total = 0;")
+            with self.bloco("para (inteiro j = 0; j < n; j = j + 1)", "j"):
+                self.emitir(f"total = (total + w[j]) % {MODULO};")
+            self.emitir("retorne total;")
+        self.inteiras = externas
+        self.emitir(f"g0 = (g0 + {nome}(v, {TAMANHO_VETOR})) % {MODULO};")
+
+    # Comandos
+
+    def comando(self):
+        """Um comando sorteado entre as alternativas da regra `comando`."""
+        escolha = self.aleatorio.random()
+        if escolha < 0.3:
+            self.comando_atribuicao()
+        elif escolha < 0.45:
+            self.atribuicao_indice()
+        elif escolha < 0.55:
+            self.comando_escreva()
+        elif escolha < 0.6:
+            self.comando_leia()
+        elif escolha < 0.7:
+            self.declaracao_variavel()
+        elif escolha < 0.8:
+            self.comando_se(lambda: self.comando_atribuicao())
+        elif escolha < 0.87:
+            self.comando_enquanto(self.aleatorio.randrange(1, 4), self.comando_atribuicao)
+        elif escolha < 0.94:
+            self.comando_para(self.aleatorio.randrange(1, 4), self.comando_atribuicao)
+        else:
+            with self.bloco(""):
+                self.comando_atribuicao()
+
+    def comando_atribuicao(self):
+        alvo = self.alvo()
+        self.emitir(f"{alvo} = ({self.expressao_inteira(3)}) % {MODULO};")
+
+    def atribuicao_indice(self):
+        if self.aleatorio.random() < 0.5:
+            self.emitir(f"v[{self.indice(TAMANHO_VETOR)}] = ({self.expressao_inteira(2)}) % {MODULO};")
+        else:
+            self.emitir(f"m[{self.indice(LINHAS_MATRIZ)}][{self.indice(COLUNAS_MATRIZ)}] = "
+                        f"{self.expressao_primaria()} + 1;")
+
+    def comando_escreva(self):
+        escolha = self.aleatorio.random()
+        if escolha < 0.3:
+            # Concatenação de cadeia com número e com caractere
+            self.emitir(f'c0 = "v" + {self.expressao_primaria()} + k0;')
+            self.emitir("escreva(c0);")
+        elif escolha < 0.5:
+            self.emitir(f"r0 = r0 / ({self.expressao_primaria()} % 10 + 1.5);")
+            self.emitir('escreva("r0 = ", r0 > 1);')
+        else:
+            self.emitir(f'escreva("{self.aleatorio.choice(self.inteiras)} ", {self.expressao_inteira(2)});')
+
+    def comando_leia(self):
+        alvo = self.alvo()
+        self.entrada.append(str(self.aleatorio.randrange(MODULO)))
+        self.emitir(f"leia({alvo});")
+
+    def comando_se(self, corpo: Callable[[], None], senao: bool = None):
+        if senao is None:
+            senao = self.aleatorio.random() < 0.5
+        with self.bloco(f"se ({self.condicao()})"):
+            corpo()
+        if senao:
+            # O 'senao' continua o comando: a linha do '}' é reaproveitada
+            self.linhas[-1] += " senao {"
+            self.nivel += 1
+            self.comando_atribuicao()
+            self.nivel -= 1
+            self.emitir("}")
+
+    def comando_enquanto(self, voltas: int, corpo: Callable[[], None]):
+        contador = self.novo_nome("w")
+        self.contadores.add(contador)
+        self.emitir(f"inteiro {contador} = 0;")
+        with self.bloco(f"enquanto ({contador} < {voltas})", contador):
+            corpo()
+            self.emitir(f"{contador} = {contador} + 1;")
+
+    def comando_para(self, voltas: int, corpo: Callable[[], None]):
+        contador = self.novo_nome("i")
+        self.contadores.add(contador)
+        with self.bloco(f"para (inteiro {contador} = 0; {contador} < {voltas}; {contador} = {contador} + 1)",
+                        contador):
+            corpo()
+
+    def escreva_resultado(self):
+        globais = ", \" \", ".join(f"g{i}" for i in range(GLOBAIS_INTEIRAS))
+        self.emitir(f'escreva({globais}, " ", v[0], " ", m[1][2], " ", c0, " ", k0);')
+
+    # Expressões
+
+    def expressao_inteira(self, profundidade: int) -> str:
+        """Expressão inteira: `expressao_aditiva` e `expressao_multiplicativa` até `profundidade` níveis."""
+        if profundidade <= 0 or self.aleatorio.random() < 0.25:
+            return self.expressao_unaria()
+        escolha = self.aleatorio.random()
+        esquerda = self.expressao_inteira(profundidade - 1)
+        if escolha < 0.5:
+            operador = self.aleatorio.choice("+-")
+            return f"{esquerda} {operador} {self.expressao_inteira(profundidade - 1)}"
+        if escolha < 0.75:
+            return f"({esquerda}) * {self.aleatorio.randrange(1, 10)}"
+        return f"({esquerda}) % {self.aleatorio.randrange(1, 50)}"
+
+    def expressao_unaria(self) -> str:
+        if self.aleatorio.random() < 0.1:
+            return f"-{self.expressao_primaria()}"
+        return self.expressao_primaria()
+
+    def expressao_primaria(self) -> str:
+        escolha = self.aleatorio.random()
+        if escolha < 0.3:
+            return str(self.aleatorio.randrange(100))
+        if escolha < 0.75 or not (self.funcoes and self.chamadas or escolha < 0.9):
+            return self.aleatorio.choice(self.inteiras)
+        if escolha < 0.9:
+            return f"v[{self.indice(TAMANHO_VETOR)}]"
+        funcao = self.aleatorio.choice(list(self.funcoes))
+        return f"{funcao}({self.aleatorio.choice(self.inteiras)}, {self.aleatorio.randrange(10)})"
+
+    def indice(self, tamanho: int) -> str:
+        # O '%' do Python nunca é negativo com divisor positivo
+        return f"{self.aleatorio.choice(self.inteiras)} % {tamanho}"
+
+    def condicao(self) -> str:
+        """Expressão lógica: `expressao_relacional` combinadas com `e`, `ou` e `!`."""
+        comparacao = (f"{self.expressao_inteira(1)} {self.aleatorio.choice(OPERADORES_RELACIONAIS)} "
+                      f"{self.expressao_primaria()}")
+        escolha = self.aleatorio.random()
+        if escolha < 0.2:
+            return f"!({comparacao})"
+        if escolha < 0.4:
+            outra = f"{self.expressao_primaria()} {self.aleatorio.choice(OPERADORES_RELACIONAIS)} {self.expressao_primaria()}"
+            return f"{comparacao} {self.aleatorio.choice(('e', 'ou'))} {outra}"
+        return comparacao
+
+
+# Formatos
+
+def expressoes_profundas(gerador: GeradorProgramas, tamanho: int):
+    aleatorio = gerador.aleatorio
+    expressao = gerador.expressao_primaria()
+    for nivel in range(tamanho):
+        operando = gerador.expressao_primaria()
+        escolha = aleatorio.random()
+        if nivel % 8 == 7:
+            # Mantém os valores intermediários pequenos
+            expressao = f"({expressao}) % {MODULO}"
+        elif escolha < 0.4:
+            expressao = f"({expressao} {aleatorio.choice('+-')} {operando})"
+        elif escolha < 0.7:
+            expressao = f"({operando} {aleatorio.choice('+-')} {expressao})"
+        elif escolha < 0.85:
+            expressao = f"-({expressao})"
+        else:
+            expressao = f"({expressao}) * {aleatorio.randrange(1, 4)}"
+    gerador.emitir(f"g0 = ({expressao}) % {MODULO};")
+
+
+def muitas_funcoes(gerador: GeradorProgramas, tamanho: int):
+    for _ in range(tamanho):
+        gerador.declaracao_funcao()
+    for funcao in gerador.funcoes:
+        gerador.emitir(f"g1 = (g1 + {funcao}(g2, g3)) % {MODULO};")
+
+
+def blocos_aninhados(gerador: GeradorProgramas, tamanho: int):
+    abertos = 0
+    for _ in range(tamanho):
+        escolha = gerador.aleatorio.random()
+        if escolha < 0.25:
+            # Condição sempre verdadeira: todos os níveis executam
+            gerador.emitir(f"se ({gerador.aleatorio.choice(gerador.inteiras)} > -1) {{")
+        elif escolha < 0.5:
+            contador = gerador.novo_nome("w")
+            gerador.contadores.add(contador)
+            gerador.emitir(f"inteiro {contador} = 0;")
+            gerador.emitir(f"enquanto ({contador} < 1) {{")
+            gerador.emitir(f"    {contador} = {contador} + 1;")
+        elif escolha < 0.75:
+            contador = gerador.novo_nome("i")
+            gerador.contadores.add(contador)
+            gerador.emitir(f"para (inteiro {contador} = 0; {contador} < 1; {contador} = {contador} + 1) {{")
+        else:
+            gerador.emitir("{")
+        gerador.nivel += 1
+        abertos += 1
+        gerador.declaracao_variavel()
+        gerador.comando_atribuicao()
+    for _ in range(abertos):
+        gerador.nivel -= 1
+        gerador.emitir("}")
+
+
+def linear(gerador: GeradorProgramas, tamanho: int):
+    for _ in range(tamanho):
+        escolha = gerador.aleatorio.random()
+        if escolha < 0.6:
+            gerador.comando_atribuicao()
+        elif escolha < 0.8:
+            gerador.atribuicao_indice()
+        elif escolha < 0.9:
+            gerador.declaracao_variavel()
+        else:
+            gerador.comando_escreva()
+
+
+def lacos_longos(gerador: GeradorProgramas, tamanho: int):
+    gerador.declaracao_funcao()
+    externas = max(1, int(tamanho ** 0.5))
+    internas = max(1, tamanho // externas)
+
+    def corpo():
+        gerador.comando_atribuicao()
+        gerador.atribuicao_indice()
+        gerador.comando_se(gerador.comando_atribuicao, senao=True)
+
+    def laco_interno():
+        gerador.comando_enquanto(internas, corpo)
+
+    gerador.comando_para(externas, laco_interno)
+
+
+def misto(gerador: GeradorProgramas, tamanho: int):
+    funcoes = max(1, tamanho // 20)
+    for _ in range(funcoes):
+        gerador.declaracao_funcao()
+    gerador.funcao_vetor()
+    for _ in range(tamanho):
+        gerador.comando()
+
+
+FORMATOS: Dict[str, Callable[[GeradorProgramas, int], None]] = {
+    "expressoes_profundas": expressoes_profundas,
+    "muitas_funcoes": muitas_funcoes,
+    "blocos_aninhados": blocos_aninhados,
+    "linear": linear,
+    "lacos_longos": lacos_longos,
+    "misto": misto,
+}
+
+
+def gerar(formato: str, tamanho: int, semente: int = 0) -> Carga:
+    """Gera o programa do `formato` com o `tamanho` pedido, junto com a entrada que ele lê."""
+    gerador = GeradorProgramas(semente)
+    codigo = gerador.programa(lambda: FORMATOS[formato](gerador, tamanho))
+    entrada = "".join(valor + "\n" for valor in gerador.entrada)
+    return Carga(f"{formato}_{tamanho}", codigo, entrada)
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("formato", choices=FORMATOS)
+    argumentos.add_argument("tamanho", type=int)
+    argumentos.add_argument("--semente", type=int, default=0)
+    argumentos.add_argument("--entrada", metavar="ARQUIVO", help="grava a entrada lida pelo programa")
+    args = argumentos.parse_args()
+
+    carga = gerar(args.formato, args.tamanho, args.semente)
+    sys.stdout.write(carga.codigo)
+    if args.entrada:
+        with open(args.entrada, "w", encoding="utf-8") as f:
+            f.write(carga.entrada)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Mede a latência de cada edição com a reanálise incremental, para vários tamanhos de arquivo.
+
+Para cada tamanho, um programa gerado por `benchmarks.cargas.fonte_grande` é
+aberto em um `Documento` e recebe edições em funções escolhidas ao acaso
+(três dígitos digitados ao fim de um literal e depois apagados, um caractere
+por edição, como em um editor). A latência por edição deve ficar praticamente
+constante, enquanto a análise completa, medida para comparação, cresce com
+o arquivo.
+
+    python -m benchmarks.incremental [--linhas 1000 10000 50000] [--trechos N]
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+
+from benchmarks.cargas import fonte_grande
+from portugol.incremental import Documento, Edicao
+from portugol.parser import analisar
+
+
+DIGITADOS = 3
+
+
+def medir_edicoes(documento: Documento, funcoes: int, trechos: int, semente: int = 0):
+    aleatorio = random.Random(semente)
+    tempos = []
+    for _ in range(trechos):
+        i = aleatorio.randrange(funcoes)
+        # O literal de 'retorne b + i' da função f<i>
+        alvo = f"retorne b + {i};"
+        posicao = documento.codigo.find(alvo) + len(alvo) - 1
+        # Digita três caracteres e os apaga com backspace, um por edição
+        digitadas = [Edicao(posicao + k, posicao + k, "7") for k in range(DIGITADOS)]
+        apagadas = [Edicao(posicao + k, posicao + k + 1, "") for k in reversed(range(DIGITADOS))]
+        for edicao in digitadas + apagadas:
+            inicio = time.perf_counter()
+            documento.editar(edicao)
+            tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--linhas", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    argumentos.add_argument("--trechos", type=int, default=100, help="funções editadas por tamanho")
+    argumentos.add_argument("--posicoes", action="store_true", help="mantém linha e coluna em cada nó")
+    args = argumentos.parse_args()
+
+    print(f"{'linhas':>8} {'análise completa':>18} {'edição (mediana)':>18} {'edição (p95)':>14}")
+    for linhas in args.linhas:
+        codigo = fonte_grande(linhas).codigo
+        # Como em benchmarks.memoria_ast: sem a coleta de ciclos a análise de arquivos grandes não fica quadrática
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            analisar(codigo, posicoes=args.posicoes)
+            completa = time.perf_counter() - inicio
+            documento = Documento(codigo, args.posicoes)
+        finally:
+            gc.enable()
+        tempos = sorted(medir_edicoes(documento, linhas // 4, args.trechos))
+        p95 = tempos[int(len(tempos) * 0.95)]
+        print(f"{linhas:>8} {completa * 1000:15.1f} ms {statistics.median(tempos) * 1000:15.3f} ms "
+              f"{p95 * 1000:11.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
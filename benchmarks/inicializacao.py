@@ -0,0 +1,86 @@
+"""
+Mede o tempo de inicialização do `main.py` com o cache do parser frio e quente.
+
+Cada medição executa `main.py` com `--programa` (padrão `exemplos/olaMundo.ptg`)
+em um processo novo. Na medição fria o diretório de cache é apagado antes de
+cada execução; na quente o cache já existe, e a AST do programa vem do cache
+de programas (`.ptgc`) sem usar o Lark. A medição com `--no-cache` usa só as
+tabelas do parser em cache. Também mede, dentro do processo, a construção das
+tabelas LALR contra o carregamento delas do disco.
+
+    python -m benchmarks.inicializacao [--repeticoes N] [--programa ARQUIVO]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAMA = os.path.join(RAIZ, "exemplos", "olaMundo.ptg")
+
+
+def medir_processo(ambiente, repeticoes, programa=PROGRAMA, opcoes=(), limpar=None):
+    tempos = []
+    for _ in range(repeticoes):
+        if limpar:
+            shutil.rmtree(limpar, ignore_errors=True)
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(RAIZ, "main.py"), *opcoes, programa],
+                       env=ambiente, cwd=RAIZ, check=True, stdout=subprocess.DEVNULL)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def medir_construcao(repeticoes):
+    sys.path.insert(0, RAIZ)
+    from portugol.parser import construir_parser
+
+    sem_cache, com_cache = [], []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        construir_parser(usar_cache=False)
+        sem_cache.append(time.perf_counter() - inicio)
+    construir_parser()
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        construir_parser()
+        com_cache.append(time.perf_counter() - inicio)
+    return sem_cache, com_cache
+
+
+def _resumo(nome, tempos):
+    return f"{nome:<38} mediana {statistics.median(tempos) * 1000:8.1f} ms   mínimo {min(tempos) * 1000:8.1f} ms"
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--repeticoes", type=int, default=10)
+    argumentos.add_argument("--programa", default=PROGRAMA)
+    args = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache = os.path.join(diretorio, "cache")
+        ambiente = dict(os.environ, PORTUGOL_CACHE_DIR=cache)
+        os.environ["PORTUGOL_CACHE_DIR"] = cache
+
+        programa = os.path.abspath(args.programa)
+        frio = medir_processo(ambiente, args.repeticoes, programa, limpar=cache)
+        quente = medir_processo(ambiente, args.repeticoes, programa)
+        sem_programas = medir_processo(ambiente, args.repeticoes, programa, opcoes=["--no-cache"])
+        sem_cache, com_cache = medir_construcao(args.repeticoes)
+
+    print(_resumo("main.py, cache frio", frio))
+    print(_resumo("main.py, cache quente", quente))
+    print(_resumo("main.py, cache quente, --no-cache", sem_programas))
+    print(_resumo("construção das tabelas LALR", sem_cache))
+    print(_resumo("carregamento das tabelas do cache", com_cache))
+    print(f"ganho na inicialização: {statistics.median(frio) / statistics.median(quente):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
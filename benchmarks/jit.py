@@ -0,0 +1,67 @@
+"""
+Compara o interpretador de árvore com a execução em camadas do backend `jit`.
+
+As cargas de `benchmarks.cargas` que repetem muito o mesmo código (funções
+recursivas, laços aninhados, o crivo) são executadas pelos dois backends,
+que devem produzir a mesma saída. Para o `jit` são mostrados também as
+compilações e desotimizações de cada carga; `--limite` muda os limites de
+chamadas e de voltas a partir dos quais uma função ou um laço é compilado.
+
+    python -m benchmarks.jit [--cargas NOME ...] [--escala X] [--limite N] [--repeticoes N]
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+from benchmarks.cargas import CARGAS, gerar_cargas
+from portugol.es import EntradaSaida
+from portugol.interpretador import Interpretador
+from portugol.jit import LIMITE_CHAMADAS, InterpretadorJIT
+from portugol.parser import analisar
+
+CARGAS_PADRAO = ["fibonacci", "lacos_aninhados", "crivo"]
+
+
+def medir(criar, carga, repeticoes: int):
+    tempos, saidas = [], set()
+    interpretador = None
+    for _ in range(repeticoes):
+        # Cada execução começa do zero: os contadores e o código compilado não passam de uma para outra
+        programa = analisar(carga.codigo, posicoes=False)
+        saida = io.StringIO()
+        interpretador = criar(EntradaSaida(entrada=io.StringIO(carga.entrada), saida=saida))
+        inicio = time.perf_counter()
+        interpretador.interpretar(programa)
+        tempos.append(time.perf_counter() - inicio)
+        saidas.add(saida.getvalue())
+    return statistics.median(tempos), saidas, interpretador
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--cargas", nargs="+", choices=list(CARGAS), default=CARGAS_PADRAO)
+    argumentos.add_argument("--escala", type=float, default=1.0)
+    argumentos.add_argument("--limite", type=int, default=LIMITE_CHAMADAS,
+                            help="chamadas e voltas antes de compilar uma função ou um laço")
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    args = argumentos.parse_args()
+
+    print(f"{'carga':<18} {'arvore':>10} {'jit':>10} {'aceleração':>11}  eventos")
+    for carga in gerar_cargas(args.cargas, args.escala):
+        arvore, saidas_arvore, _ = medir(lambda es: Interpretador(es=es), carga, args.repeticoes)
+        jit, saidas_jit, interpretador = medir(
+            lambda es: InterpretadorJIT(es=es, limite_chamadas=args.limite, limite_voltas=args.limite),
+            carga, args.repeticoes)
+        if saidas_arvore != saidas_jit:
+            raise RuntimeError(f"{carga.nome}: o backend jit mudou a saída do programa.")
+        eventos = interpretador.eventos
+        compilacoes = sum(evento.tipo == "compilacao" for evento in eventos)
+        desotimizacoes = sum(evento.tipo == "desotimizacao" for evento in eventos)
+        print(f"{carga.nome:<18} {arvore * 1000:8.1f}ms {jit * 1000:8.1f}ms {arvore / jit:10.2f}x  "
+              f"{compilacoes} compilações, {desotimizacoes} desotimizações")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Mede os laços `para` de contagem do interpretador de árvore.
+
+O programa é a `exemplos/tabuada.ptg` ampliada: dois laços `para` aninhados
+calculam a tabuada de `--numeros` números até `--multiplicadores` e, com
+`--escreva`, escrevem cada linha como o exemplo. O mesmo programa é
+executado com o contador nativo (`Interpretador.executar_laco_contado`) e
+pelo caminho genérico, que avalia a condição e executa o incremento a cada
+volta.
+
+    python -m benchmarks.lacos [--numeros N] [--multiplicadores N] [--escreva] [--repeticoes N]
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+from portugol.es import EntradaSaida
+from portugol.interpretador import Interpretador
+from portugol.parser import analisar
+
+
+class InterpretadorGenerico(Interpretador):
+    lacos_contados = False
+
+
+def tabuada(numeros: int, multiplicadores: int, escreva: bool) -> str:
+    linha = 'escreva(numero, " X ", contador, " = ", resultado);' if escreva else ""
+    return f"""
+    programa {{
+        inteiro resultado;
+        inteiro soma = 0;
+        para (inteiro numero = 1; numero <= {numeros}; numero = numero + 1) {{
+            para (inteiro contador = 1; contador <= {multiplicadores}; contador = contador + 1) {{
+                resultado = numero * contador;
+                soma = soma + resultado;
+                {linha}
+            }}
+        }}
+        escreva(soma);
+    }}
+    """
+
+
+def medir(classe, programa, repeticoes: int):
+    tempos, saidas = [], set()
+    for _ in range(repeticoes):
+        saida = io.StringIO()
+        interpretador = classe(es=EntradaSaida(saida=saida))
+        inicio = time.perf_counter()
+        interpretador.interpretar(programa)
+        tempos.append(time.perf_counter() - inicio)
+        saidas.add(saida.getvalue())
+    return statistics.median(tempos), saidas
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--numeros", type=int, default=2_000)
+    argumentos.add_argument("--multiplicadores", type=int, default=100)
+    argumentos.add_argument("--escreva", action="store_true", help="escreve cada linha da tabuada")
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    args = argumentos.parse_args()
+
+    programa = analisar(tabuada(args.numeros, args.multiplicadores, args.escreva))
+    contado, saidas_contado = medir(Interpretador, programa, args.repeticoes)
+    generico, saidas_generico = medir(InterpretadorGenerico, programa, args.repeticoes)
+    if saidas_contado != saidas_generico:
+        raise RuntimeError("O laço de contagem mudou a saída do programa.")
+
+    voltas = args.numeros * args.multiplicadores
+    print(f"voltas do laço interno:  {voltas:>10}")
+    print(f"caminho genérico:        {generico * 1000:10.1f} ms ({generico / voltas * 1e6:.2f} µs por volta)")
+    print(f"contador nativo:         {contado * 1000:10.1f} ms ({contado / voltas * 1e6:.2f} µs por volta)")
+    print(f"aceleração:              {generico / contado:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
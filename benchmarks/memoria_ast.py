@@ -0,0 +1,80 @@
+"""
+Mede a memória e o tempo de construção da AST de um programa gerado grande.
+
+O programa (por padrão com 100 mil linhas, gerado por
+`benchmarks.cargas.fonte_grande`) é analisado uma vez pelo Lark; em seguida
+são medidos o tempo de `PortugolTransformer.transform`, a memória ocupada
+pela AST resultante e o pico de memória durante a transformação, além da
+memória dos ambientes criados ao executar o programa.
+
+    python -m benchmarks.memoria_ast [--linhas N] [--repeticoes N]
+"""
+
+import argparse
+import gc
+import io
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.cargas import fonte_grande
+from portugol.es import EntradaSaida
+from portugol.interpretador import Interpretador
+from portugol.parser import obter_parser
+from portugol.transformer import PortugolTransformer
+
+
+def medir_construcao(arvore, posicoes: bool, repeticoes: int):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        PortugolTransformer(posicoes).transform(arvore)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    programa = PortugolTransformer(posicoes).transform(arvore)
+    ocupada, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return programa, statistics.median(tempos), ocupada - antes, pico - antes
+
+
+def medir_execucao(programa):
+    interpretador = Interpretador(es=EntradaSaida(saida=io.StringIO()))
+    tracemalloc.start()
+    interpretador.interpretar(programa)
+    ocupada = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ocupada
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--linhas", type=int, default=100_000)
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    argumentos.add_argument("--posicoes", action="store_true", help="guarda linha e coluna em cada nó")
+    args = argumentos.parse_args()
+
+    codigo = fonte_grande(args.linhas).codigo
+    # A árvore do Lark tem milhões de objetos: sem a coleta de ciclos a análise não fica quadrática
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        arvore = obter_parser(posicoes=args.posicoes).parse(codigo)
+        analise = time.perf_counter() - inicio
+        programa, construcao, ocupada, pico = medir_construcao(arvore, args.posicoes, args.repeticoes)
+        del arvore
+        ambientes = medir_execucao(programa)
+    finally:
+        gc.enable()
+
+    print(f"linhas:                   {codigo.count(chr(10)):>10}")
+    print(f"análise (Lark):           {analise * 1000:10.1f} ms")
+    print(f"construção da AST:        {construcao * 1000:10.1f} ms")
+    print(f"memória da AST:           {ocupada / 2 ** 20:10.1f} MiB")
+    print(f"pico durante a construção:{pico / 2 ** 20:10.1f} MiB")
+    print(f"memória após a execução:  {ambientes / 2 ** 20:10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compara a análise em duas passagens com a passagem única em programas grandes.
+
+Para cada tamanho em `--megabytes`, um programa gerado por
+`benchmarks.cargas.fonte_grande` é gravado em um arquivo temporário e
+analisado de duas formas, sem posições:
+
+- duas passagens: `f.read()`, a árvore do Lark e `PortugolTransformer.transform`;
+- passagem única: `ler_codigo` (arquivo mapeado na memória) e o parser com o
+  `ConstrutorAST` como `transformer=`, que constrói a AST durante a análise.
+
+O tempo (mediana de `--repeticoes`) e o pico de memória alocada pelo Python
+(`tracemalloc`, em uma execução separada) incluem a leitura do arquivo.
+
+    python -m benchmarks.passagem_unica [--megabytes MB ...] [--repeticoes N]
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.cargas import fonte_grande
+from portugol.parser import ler_codigo, obter_parser
+from portugol.transformer import PortugolTransformer
+
+
+def duas_passagens(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        codigo = f.read()
+    arvore = obter_parser(posicoes=False).parse(codigo)
+    return PortugolTransformer(False).transform(arvore)
+
+
+def passagem_unica(caminho):
+    return obter_parser(posicoes=False, passagem_unica=True).parse(ler_codigo(caminho))
+
+
+def gerar_arquivo(diretorio, megabytes):
+    # fonte_grande gera blocos de 4 linhas de tamanho quase constante
+    amostra = len(fonte_grande(4_000).codigo.encode("utf-8")) / 4_000
+    codigo = fonte_grande(max(4, round(megabytes * 2 ** 20 / amostra))).codigo
+    caminho = os.path.join(diretorio, f"programa_{megabytes:g}mb.ptg")
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(codigo)
+    return caminho
+
+
+def medir(analise, caminho, repeticoes):
+    tempos = []
+    # A árvore do Lark tem milhões de objetos: sem a coleta de ciclos a análise não fica quadrática
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            programa = analise(caminho)
+            tempos.append(time.perf_counter() - inicio)
+            del programa
+        tracemalloc.start()
+        programa = analise(caminho)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    return statistics.median(tempos), pico, len(programa.declaracoes.declaracoes)
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--megabytes", type=float, nargs="+", default=[1, 2])
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    args = argumentos.parse_args()
+
+    # As tabelas dos dois parsers são carregadas antes das medições
+    obter_parser(posicoes=False)
+    obter_parser(posicoes=False, passagem_unica=True)
+
+    print(f"{'tamanho':>10} {'análise':<16} {'tempo':>12} {'pico de memória':>18}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for megabytes in args.megabytes:
+            caminho = gerar_arquivo(diretorio, megabytes)
+            tamanho = f"{os.path.getsize(caminho) / 2 ** 20:.1f} MiB"
+            resultados = {}
+            for nome, analise in (("duas passagens", duas_passagens), ("passagem única", passagem_unica)):
+                resultados[nome] = medir(analise, caminho, args.repeticoes)
+                tempo, pico, _ = resultados[nome]
+                print(f"{tamanho:>10} {nome:<16} {tempo * 1000:9.1f} ms {pico / 2 ** 20:14.1f} MiB")
+            (tempo2, pico2, itens2), (tempo1, pico1, itens1) = resultados.values()
+            if itens1 != itens2:
+                raise RuntimeError("As duas análises produziram programas diferentes.")
+            print(f"{tamanho:>10} {'ganho':<16} {tempo2 / tempo1:11.2f}x {pico2 / pico1:16.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Mede parser, transformador e interpretador nas cargas de `benchmarks.cargas`.
+
+Para cada carga são medidas separadamente as três etapas: a análise sintática
+(`Lark.parse`), a construção da AST (`PortugolTransformer.transform`) e a
+execução (`interpretar` do backend escolhido). O tempo de cada etapa é a
+mediana das repetições; o pico de memória de cada etapa é medido em uma
+execução à parte com `tracemalloc`, que deixaria os tempos mais lentos.
+
+Os resultados podem ser gravados em JSON e comparados com uma linha de base
+gravada antes: o programa termina com código 1 se alguma medição piorar mais
+do que o limite relativo (10% por padrão).
+
+    python -m benchmarks.regressao --saida base.json
+    python -m benchmarks.regressao --comparar base.json [--limite 0.2]
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from benchmarks.cargas import CARGAS, Carga, gerar_cargas
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKEND_PADRAO, BACKENDS, criar_interpretador
+from portugol.parser import obter_parser
+from portugol.transformer import PortugolTransformer
+
+ETAPAS = ("parse", "transformacao", "execucao")
+
+# Piora relativa tolerada antes de acusar uma regressão
+LIMITE_PADRAO = 0.10
+
+# Medições abaixo deste valor variam demais para serem comparadas
+TEMPO_MINIMO_COMPARADO = 0.005
+MEMORIA_MINIMA_COMPARADA = 64 * 1024
+
+
+class ErroEtapa(Exception):
+    """Uma etapa falhou (ex.: `RecursionError` em um programa muito aninhado)."""
+
+    def __init__(self, etapa: str, causa: BaseException):
+        super().__init__(f"{etapa}: {type(causa).__name__}: {causa}")
+        self.etapa = etapa
+        self.causa = causa
+
+
+def executar_etapas(carga: Carga, backend: str, posicoes: bool, medicao) -> Dict[str, float]:
+    """Executa as três etapas, devolvendo `medicao(etapa, funcao)` de cada uma."""
+    parser = obter_parser(posicoes=posicoes)
+    resultados = {}
+    arvore = None
+    programa = None
+
+    def parse():
+        nonlocal arvore
+        arvore = parser.parse(carga.codigo)
+
+    def transformacao():
+        nonlocal programa
+        programa = PortugolTransformer(posicoes).transform(arvore)
+
+    def execucao():
+        es = EntradaSaida(entrada=io.StringIO(carga.entrada), saida=io.StringIO())
+        criar_interpretador(backend, es=es).interpretar(programa)
+
+    for etapa, funcao in zip(ETAPAS, (parse, transformacao, execucao)):
+        try:
+            resultados[etapa] = medicao(etapa, funcao)
+        except Exception as e:
+            raise ErroEtapa(etapa, e) from e
+    return resultados
+
+
+def _cronometrar(etapa, funcao) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def _pico_memoria(etapa, funcao) -> int:
+    tracemalloc.reset_peak()
+    antes = tracemalloc.get_traced_memory()[0]
+    funcao()
+    return tracemalloc.get_traced_memory()[1] - antes
+
+
+def medir_carga(carga: Carga, backend: str = BACKEND_PADRAO, repeticoes: int = 3,
+                posicoes: bool = False) -> Dict[str, Dict[str, float]]:
+    tempos: Dict[str, List[float]] = {etapa: [] for etapa in ETAPAS}
+    for _ in range(repeticoes):
+        for etapa, tempo in executar_etapas(carga, backend, posicoes, _cronometrar).items():
+            tempos[etapa].append(tempo)
+
+    tracemalloc.start()
+    try:
+        memoria = executar_etapas(carga, backend, posicoes, _pico_memoria)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "tempo": {etapa: statistics.median(valores) for etapa, valores in tempos.items()},
+        "memoria_pico": memoria,
+    }
+
+
+def medir(cargas: List[Carga], backend: str = BACKEND_PADRAO, repeticoes: int = 3,
+          posicoes: bool = False, escala: float = 1.0) -> dict:
+    return {
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "backend": backend,
+            "repeticoes": repeticoes,
+            "escala": escala,
+            "posicoes": posicoes,
+        },
+        "cargas": {carga.nome: medir_carga(carga, backend, repeticoes, posicoes) for carga in cargas},
+    }
+
+
+def comparar(atual: dict, base: dict, limite: float = LIMITE_PADRAO) -> List[str]:
+    """Lista as medições de `atual` que pioraram mais que `limite` em relação a `base`."""
+    regressoes = []
+    for nome, medicoes in atual["cargas"].items():
+        anteriores = base["cargas"].get(nome)
+        if anteriores is None:
+            continue
+        for tipo, minimo, unidade in (("tempo", TEMPO_MINIMO_COMPARADO, "s"),
+                                      ("memoria_pico", MEMORIA_MINIMA_COMPARADA, "B")):
+            for etapa, valor in medicoes[tipo].items():
+                anterior = anteriores[tipo].get(etapa)
+                if anterior is None or max(valor, anterior) < minimo:
+                    continue
+                if valor > anterior * (1 + limite):
+                    piora = (valor / anterior - 1) * 100 if anterior else float("inf")
+                    regressoes.append(f"{nome}/{etapa} ({tipo}): {anterior:.6g} {unidade} -> "
+                                      f"{valor:.6g} {unidade} (+{piora:.1f}%)")
+    return regressoes
+
+
+def formatar(resultados: dict, base: Optional[dict] = None) -> str:
+    linhas = [f"{'carga':<18} {'etapa':<14} {'tempo (ms)':>12} {'pico (KiB)':>12} {'base (ms)':>12}"]
+    for nome, medicoes in resultados["cargas"].items():
+        anteriores = (base or {}).get("cargas", {}).get(nome)
+        for etapa in ETAPAS:
+            tempo = medicoes["tempo"][etapa] * 1000
+            memoria = medicoes["memoria_pico"][etapa] / 1024
+            anterior = f"{anteriores['tempo'][etapa] * 1000:12.1f}" if anteriores else f"{'-':>12}"
+            linhas.append(f"{nome:<18} {etapa:<14} {tempo:12.1f} {memoria:12.1f} {anterior}")
+    return "\n".join(linhas)
+
+
+def main(argv: Optional[List[str]] = None):
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("cargas", nargs="*", metavar="CARGA",
+                            help=f"cargas a medir (padrão: todas; opções: {', '.join(CARGAS)})")
+    argumentos.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO)
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    argumentos.add_argument("--escala", type=float, default=1.0,
+                            help="multiplica o tamanho das cargas (padrão: %(default)s)")
+    argumentos.add_argument("--posicoes", action="store_true",
+                            help="mede a análise guardando linha e coluna nos nós")
+    argumentos.add_argument("--saida", metavar="ARQUIVO", help="grava os resultados em JSON")
+    argumentos.add_argument("--comparar", metavar="ARQUIVO", help="JSON de uma execução anterior (linha de base)")
+    argumentos.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                            help="piora relativa tolerada em relação à base (padrão: %(default)s)")
+    args = argumentos.parse_args(argv)
+    desconhecidas = [nome for nome in args.cargas if nome not in CARGAS]
+    if desconhecidas:
+        argumentos.error(f"cargas desconhecidas: {', '.join(desconhecidas)}")
+
+    resultados = medir(gerar_cargas(args.cargas, args.escala), args.backend,
+                       args.repeticoes, args.posicoes, args.escala)
+
+    base = None
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            base = json.load(f)
+    print(formatar(resultados, base))
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+    if base is not None:
+        regressoes = comparar(resultados, base, args.limite)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressões acima de {args.limite:.0%}:")
+            for regressao in regressoes:
+                print(f"  {regressao}")
+            return 1
+        print(f"\nnenhuma regressão acima de {args.limite:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Mede a latência de cada trecho executado em uma `Sessao` interativa.
+
+Uma sessão recebe `--trechos` trechos curtos, como os digitados em um REPL:
+declarações de variáveis e de funções, atribuições, laços pequenos, chamadas
+e expressões sobre o que já foi definido. A latência por trecho (mediana e
+p95) deve ficar abaixo de 1 ms e não depender de quantos trechos vieram
+antes. Para comparação, a alternativa sem sessão analisa e executa de novo,
+a cada linha, o programa com todos os trechos anteriores (medida em uma
+amostra dos trechos, já que cresce com a sessão).
+
+    python -m benchmarks.sessao [--trechos N]
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+from portugol.es import EntradaSaida
+from portugol.interpretador import Interpretador
+from portugol.parser import analisar
+from portugol.sessao import Sessao
+
+
+def trechos(quantidade: int):
+    """Trechos de uma sessão: 'expressao' indica os que só avaliam uma expressão."""
+    gerados = [("inteiro total = 0;", False)]
+    for i in range(quantidade // 5):
+        gerados += [
+            (f"funcao inteiro f{i}(inteiro x) {{ retorne x * {i % 7 + 1} + total % 3; }}", False),
+            (f"inteiro v{i} = f{i}({i});", False),
+            (f"total = total + v{i}", False),
+            (f"para (inteiro j = 0; j < 5; j = j + 1) {{ total = total + j; }}", False),
+            (f"total % 1000 + f{i}(2)", True),
+        ]
+    return gerados
+
+
+def percentil(tempos, fracao):
+    return sorted(tempos)[min(len(tempos) - 1, int(len(tempos) * fracao))]
+
+
+def medir_sessao(lista):
+    sessao = Sessao()
+    tempos = []
+    for trecho, _ in lista:
+        inicio = time.perf_counter()
+        resultado = sessao.executar(trecho)
+        tempos.append(time.perf_counter() - inicio)
+        if resultado.erro is not None:
+            raise RuntimeError(f"{trecho}: {resultado.erro}")
+    return tempos
+
+
+def medir_sem_sessao(lista, amostras: int):
+    """Tempo de analisar e executar o programa com os trechos até cada ponto amostrado."""
+    tempos = []
+    passo = max(1, len(lista) // amostras)
+    for fim in range(passo, len(lista) + 1, passo):
+        # As expressões viram escreva, que é o que o programa inteiro poderia fazer com elas
+        corpo = "\n".join(f"escreva({t});" if expressao else (t if t.endswith(("}", ";")) else t + ";")
+                          for t, expressao in lista[:fim])
+        inicio = time.perf_counter()
+        Interpretador(es=EntradaSaida(saida=io.StringIO())).interpretar(
+            analisar("programa {\n" + corpo + "\n}", posicoes=False))
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--trechos", type=int, default=5_000)
+    argumentos.add_argument("--amostras", type=int, default=5,
+                            help="pontos da sessão medidos na alternativa sem sessão")
+    args = argumentos.parse_args()
+
+    lista = trechos(args.trechos)
+    # O parser é carregado antes das medições, como em um REPL já aberto
+    Sessao().executar("0")
+    tempos = medir_sessao(lista)
+    metade = len(tempos) // 2
+    print(f"{len(lista)} trechos em uma sessão")
+    print(f"  por trecho: mediana {statistics.median(tempos) * 1000:.3f} ms, "
+          f"p95 {percentil(tempos, 0.95) * 1000:.3f} ms")
+    print(f"  primeira metade: mediana {statistics.median(tempos[:metade]) * 1000:.3f} ms; "
+          f"segunda metade: {statistics.median(tempos[metade:]) * 1000:.3f} ms")
+    sem_sessao = medir_sem_sessao(lista, args.amostras)
+    print(f"programa inteiro de novo a cada linha: {sem_sessao[0] * 1000:.1f} ms no início, "
+          f"{sem_sessao[-1] * 1000:.1f} ms no fim")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Mede a memória e as operações em bloco dos vetores de `portugol/vetores.py`.
+
+Para um vetor `inteiro` de N elementos (1 milhão por padrão) são medidos a
+memória ocupada, comparada com a de uma lista Python com os mesmos valores,
+e o tempo de criar o vetor zerado, de inicializá-lo a partir de um literal e
+de copiar outro vetor para ele, cada operação em bloco comparada com o mesmo
+trabalho feito elemento a elemento.
+
+    python -m benchmarks.vetores [--tamanho N] [--repeticoes N]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from portugol.vetores import criar_vetor
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def memoria(funcao) -> int:
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcao()
+    ocupada = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del resultado
+    return ocupada
+
+
+def medir(tamanho: int, repeticoes: int):
+    valores = [i * 7 % 1000 for i in range(tamanho)]
+    origem = criar_vetor("w", "inteiro", [tamanho], valores)
+    destino = criar_vetor("v", "inteiro", [tamanho])
+
+    def zerar_elemento_a_elemento():
+        vetor = criar_vetor("v", "inteiro", [tamanho])
+        for i in range(tamanho):
+            vetor.atribuir1(i, 0)
+
+    def inicializar_elemento_a_elemento():
+        vetor = criar_vetor("v", "inteiro", [tamanho])
+        for i, valor in enumerate(valores):
+            vetor.atribuir1(i, valor)
+
+    def copiar_elemento_a_elemento():
+        for i in range(tamanho):
+            destino.atribuir1(i, origem.obter1(i))
+
+    return {
+        "memória do vetor": memoria(lambda: criar_vetor("v", "inteiro", [tamanho], valores)),
+        "memória da lista": memoria(lambda: [i * 7 % 1000 + 1000 for i in range(tamanho)]),
+        "tempos": [
+            ("criação zerada", cronometrar(lambda: criar_vetor("v", "inteiro", [tamanho]), repeticoes),
+             cronometrar(zerar_elemento_a_elemento, repeticoes)),
+            ("inicialização com literal", cronometrar(lambda: criar_vetor("v", "inteiro", [tamanho], valores), repeticoes),
+             cronometrar(inicializar_elemento_a_elemento, repeticoes)),
+            ("cópia v = w", cronometrar(lambda: destino.copiar(origem), repeticoes),
+             cronometrar(copiar_elemento_a_elemento, repeticoes)),
+        ],
+    }
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argumentos.add_argument("--tamanho", type=int, default=1_000_000)
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    args = argumentos.parse_args()
+
+    resultados = medir(args.tamanho, args.repeticoes)
+    vetor, lista = resultados["memória do vetor"], resultados["memória da lista"]
+    print(f"elementos:                 {args.tamanho:>10}")
+    print(f"memória do vetor:          {vetor / 2 ** 20:10.1f} MiB ({vetor / args.tamanho:.1f} bytes por elemento)")
+    print(f"memória de uma lista:      {lista / 2 ** 20:10.1f} MiB ({lista / args.tamanho:.1f} bytes por elemento)")
+    print()
+    print(f"{'operação':<28}{'em bloco':>12}{'elemento a elemento':>22}{'razão':>9}")
+    for nome, bloco, elementos in resultados["tempos"]:
+        print(f"{nome:<28}{bloco * 1000:>9.1f} ms{elementos * 1000:>19.1f} ms{elementos / bloco:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
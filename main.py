@@ -1,33 +1,156 @@
+import argparse
 import sys
-from lark import Lark
-from portugol.transformer import PortugolTransformer
-from portugol.interpretador import Interpretador, ErroExecucao
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKENDS, BACKEND_PADRAO, criar_interpretador
+from portugol.parser import analisar, ler_codigo
 
 def main():
-    if len(sys.argv) != 2:
-        print("Uso: python3 main.py <arquivo_portugol>")
-        sys.exit(1)
+    argumentos = argparse.ArgumentParser(description="Interpretador Portugol")
+    argumentos.add_argument("arquivo_portugol", nargs="?")
+    argumentos.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO,
+                            help="estratégia de execução (padrão: %(default)s)")
+    argumentos.add_argument("--desmontar", action="store_true",
+                            help="mostra o bytecode do programa em vez de executá-lo")
+    argumentos.add_argument("--transpile", action="store_true",
+                            help="transpila o programa para Python e o executa (o mesmo que --backend=python)")
+    argumentos.add_argument("--emit-python", action="store_true",
+                            help="mostra o código Python gerado em vez de executá-lo")
+    argumentos.add_argument("--otimizar", action="store_true",
+                            help="aplica os passos de otimização da AST antes de executar")
+    argumentos.add_argument("--estatisticas-otimizacao", action="store_true",
+                            help="otimiza e mostra, na saída de erro, o que cada passo alterou")
+    argumentos.add_argument("--memoizar", action="store_true",
+                            help="guarda os resultados das funções puras (backends arvore, closures, slots e jit)")
+    argumentos.add_argument("--tamanho-cache", type=int, default=None, metavar="N",
+                            help="número máximo de resultados guardados pela memoização")
+    argumentos.add_argument("--estatisticas-memoizacao", action="store_true",
+                            help="memoiza e mostra, na saída de erro, os acertos e faltas do cache")
+    argumentos.add_argument("--limite-pilha", type=int, default=None, metavar="N",
+                            help="máximo de chamadas aninhadas no backend vm")
+    argumentos.add_argument("--limite-jit", type=int, default=None, metavar="N",
+                            help="chamadas de uma função ou voltas de um laço antes de compilá-lo no backend jit")
+    argumentos.add_argument("--eventos-jit", action="store_true",
+                            help="mostra, na saída de erro, as compilações e desotimizações do backend jit")
+    argumentos.add_argument("--limite-buffer", type=int, default=None, metavar="N",
+                            help="caracteres de saída acumulados antes de gravar (0 grava a cada escreva)")
+    argumentos.add_argument("--leitura-por-token", action="store_true",
+                            help="cada leia consome uma palavra da entrada em vez de uma linha")
+    argumentos.add_argument("--verificar-tipos", action="store_true",
+                            help="verifica os tipos antes de executar e usa operações especializadas pelos tipos")
+    argumentos.add_argument("--profile", action="store_true",
+                            help="executa com medições e mostra, na saída de erro, as linhas e funções mais custosas")
+    argumentos.add_argument("--profile-pilhas", default="perfil.folded", metavar="ARQUIVO",
+                            help="arquivo das pilhas colapsadas gravado por --profile (padrão: %(default)s)")
+    argumentos.add_argument("--no-cache", action="store_true",
+                            help="analisa o programa sem ler nem gravar o cache de programas (.ptgc)")
+    argumentos.add_argument("--cache-dir", default=None, metavar="DIRETORIO",
+                            help="diretório do cache de programas (padrão: programas/ no cache do parser)")
+    argumentos.add_argument("--podar-cache", default=None, metavar="TAMANHO",
+                            help="remove os programas usados há mais tempo até o cache caber em TAMANHO "
+                                 "(ex.: 50M) e termina")
+    argumentos.add_argument("--interativo", action="store_true",
+                            help="abre o modo interativo, que executa cada trecho digitado (portugol.sessao)")
+    args = argumentos.parse_args()
+
+    if args.podar_cache is not None:
+        podar_cache(argumentos, args)
+        return
+    if args.interativo:
+        from portugol.sessao import repl
+        sys.exit(repl())
+    if args.arquivo_portugol is None:
+        argumentos.error("informe o arquivo_portugol ou --interativo")
 
-    arquivo_portugol = sys.argv[1]
+    arquivo_portugol = args.arquivo_portugol
+    backend = "python" if args.transpile else args.backend
 
     try:
-        with open("portugol/grammar.lark", "r", encoding="utf-8") as f:
-            grammar = f.read()
-        
-        parser = Lark(grammar, start="programa", parser="lalr")
+        codigo = ler_codigo(arquivo_portugol)
+
+        # as posições no código só são guardadas quando o perfil precisa delas
+        posicoes = args.profile or args.verificar_tipos
+        otimizar = args.otimizar or args.estatisticas_otimizacao
+        # As estatísticas de otimização só existem quando os passos executam
+        cache = None
+        if not (args.no_cache or args.estatisticas_otimizacao):
+            from portugol.cache_programas import CacheProgramas
+            cache = CacheProgramas(args.cache_dir)
+            chave = cache.chave(codigo, posicoes, otimizar)
+        ast = cache.carregar(chave) if cache else None
+
+        if ast is None:
+            # O parser é construído uma vez e suas tabelas ficam em cache no disco
+            ast = analisar(codigo, posicoes=posicoes)
+
+            if otimizar:
+                from portugol.otimizador import GerenciadorPassos
+                gerenciador = GerenciadorPassos()
+                ast = gerenciador.otimizar(ast)
+                if args.estatisticas_otimizacao:
+                    print(gerenciador.relatorio(), file=sys.stderr)
+
+            if cache:
+                cache.guardar(chave, ast)
+
+        if args.verificar_tipos:
+            from portugol.tipos import verificar_tipos
+            erros = verificar_tipos(ast)
+            for erro in erros:
+                print(f"Erro de tipo: {erro}")
+            if erros:
+                sys.exit(1)
 
-        with open(arquivo_portugol, "r", encoding="utf-8") as f:
-            codigo = f.read()
+        if args.desmontar:
+            from portugol.bytecode import CompiladorBytecode, desmontar
+            print(desmontar(CompiladorBytecode().compilar_programa(ast)))
+            return
 
-        tree = parser.parse(codigo)
-        # print("Parse Tree:\n", tree.pretty())
+        if args.emit_python:
+            from portugol.transpilador import transpilar
+            print(transpilar(ast), end="")
+            return
 
-        # Aplicar o transformer para converter a parse tree em AST
-        ast = PortugolTransformer().transform(tree)
+        opcoes = {"es": EntradaSaida(limite_buffer=args.limite_buffer, por_token=args.leitura_por_token)}
+        if args.memoizar or args.estatisticas_memoizacao or args.tamanho_cache is not None:
+            from portugol.memoizacao import BACKENDS_COM_MEMOIZACAO, TAMANHO_CACHE_PADRAO, Memoizacao
+            if backend not in BACKENDS_COM_MEMOIZACAO:
+                argumentos.error(f"a memoização não está disponível no backend '{backend}'")
+            opcoes["memoizacao"] = Memoizacao(args.tamanho_cache or TAMANHO_CACHE_PADRAO)
 
-        interpretador = Interpretador()
+        if args.limite_pilha is not None:
+            if backend != "vm":
+                argumentos.error("--limite-pilha só se aplica ao backend 'vm'")
+            opcoes["limite_pilha"] = args.limite_pilha
+
+        if args.limite_jit is not None or args.eventos_jit:
+            if backend != "jit":
+                argumentos.error("--limite-jit e --eventos-jit só se aplicam ao backend 'jit'")
+            if args.limite_jit is not None:
+                opcoes["limite_chamadas"] = opcoes["limite_voltas"] = args.limite_jit
+
+        if args.profile:
+            from portugol.perfil import InterpretadorPerfilado
+            if backend != "arvore":
+                argumentos.error("--profile só está disponível no backend 'arvore'")
+            interpretador = InterpretadorPerfilado(**opcoes)
+        else:
+            interpretador = criar_interpretador(backend, **opcoes)
         interpretador.interpretar(ast)
+        if args.profile:
+            with open(args.profile_pilhas, "w", encoding="utf-8") as f:
+                f.write(interpretador.perfil.pilhas_colapsadas())
+            print(interpretador.perfil.relatorio(codigo), file=sys.stderr)
+            print(f"pilhas colapsadas gravadas em {args.profile_pilhas}", file=sys.stderr)
+        if args.estatisticas_memoizacao:
+            print(interpretador.memoizacao.relatorio(), file=sys.stderr)
+        if args.eventos_jit:
+            print(interpretador.relatorio(), file=sys.stderr)
 
+    except RecursionError:
+        # Os backends que usam a pilha do Python suportam poucas centenas de chamadas aninhadas
+        print(f"Erro: recursão profunda demais para o backend '{backend}'. "
+              "Use --backend=vm, que guarda as chamadas em uma pilha própria.")
+        sys.exit(1)
     except FileNotFoundError:
         print(f"Erro: Arquivo \'{arquivo_portugol}\' não encontrado.")
         sys.exit(1)
@@ -35,7 +158,15 @@ def main():
         print(f"Erro: {e}")
         sys.exit(1)
 
+def podar_cache(argumentos, args):
+    from portugol.cache_programas import CacheProgramas, interpretar_tamanho
+    try:
+        tamanho_maximo = interpretar_tamanho(args.podar_cache)
+    except ValueError as e:
+        argumentos.error(str(e))
+    resultado = CacheProgramas(args.cache_dir).podar(tamanho_maximo)
+    print(f"{resultado.removidos} programas removidos ({resultado.bytes_removidos} bytes); "
+          f"{resultado.restantes} no cache ({resultado.bytes_restantes} bytes).")
+
 if __name__ == "__main__":
     main()
-
-
@@ -0,0 +1,238 @@
+"""
+Análises auxiliares sobre a AST, compartilhadas pelos backends e passes.
+
+Inclui a detecção de laços `para` de contagem, isto é, laços no formato
+`para (i = a; i < b; i = i + c)` em que o corpo não altera `i` nem o limite:
+esses laços podem ser executados com um contador inteiro nativo (`range`).
+"""
+
+import math
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from .ast import (
+    ASTNode, DeclaracaoVariavel, DeclaracaoFuncao, Parametro,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoLeia, ComandoPara, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .operadores import OPERADORES_BINARIOS, somar, subtrair
+
+
+# Nomes dos atributos de cada classe de nó (os __slots__ da hierarquia, da base para a classe)
+_NOMES_CAMPOS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _nomes_campos(classe: type) -> Tuple[str, ...]:
+    nomes = _NOMES_CAMPOS.get(classe)
+    if nomes is None:
+        nomes = tuple(nome for base in reversed(classe.__mro__)
+                      for nome in base.__dict__.get("__slots__", ()))
+        _NOMES_CAMPOS[classe] = nomes
+    return nomes
+
+
+def campos(no) -> Iterator[Tuple[str, Any]]:
+    """Itera pelos pares (atributo, valor) de um nó da AST."""
+    for nome in _nomes_campos(type(no)):
+        yield nome, getattr(no, nome, None)
+
+
+def filhos(no) -> Iterator[Any]:
+    """Itera pelos nós filhos diretos de um nó da AST."""
+    for _, valor in campos(no):
+        if isinstance(valor, (ASTNode, Parametro)):
+            yield valor
+        elif isinstance(valor, list):
+            for item in valor:
+                if isinstance(item, (ASTNode, Parametro)):
+                    yield item
+
+
+def percorrer(no) -> Iterator[Any]:
+    """Itera pelo nó e por todos os seus descendentes, em pré-ordem."""
+    pendentes = [no]
+    while pendentes:
+        atual = pendentes.pop()
+        yield atual
+        pendentes.extend(reversed(list(filhos(atual))))
+
+
+def nomes_atribuidos(no) -> Set[str]:
+    """Nomes declarados, atribuídos (inteiros ou por elemento) ou lidos com `leia` na subárvore."""
+    nomes = set()
+    for atual in percorrer(no):
+        if isinstance(atual, (ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoLeia,
+                              DeclaracaoVariavel, Parametro)):
+            nomes.add(atual.identificador)
+        elif isinstance(atual, DeclaracaoFuncao):
+            nomes.add(atual.nome)
+    return nomes
+
+
+def nomes_lidos(no) -> Set[str]:
+    return {atual.nome for atual in percorrer(no)
+            if isinstance(atual, (ExpressaoIdentificador, ExpressaoIndice, ChamadaFuncao))}
+
+
+def contem_chamada(no) -> bool:
+    return any(isinstance(atual, ChamadaFuncao) for atual in percorrer(no))
+
+
+def nomes_atribuidos_em_funcoes(programa) -> Set[str]:
+    """Nomes externos que alguma função pode alterar quando é chamada."""
+    nomes = set()
+    for atual in percorrer(programa):
+        if isinstance(atual, DeclaracaoFuncao):
+            locais = {param.identificador for param in atual.parametros}
+            atribuidos = set()
+            for no in percorrer(atual.corpo):
+                if isinstance(no, DeclaracaoVariavel):
+                    locais.add(no.identificador)
+                elif isinstance(no, DeclaracaoFuncao):
+                    locais.add(no.nome)
+                elif isinstance(no, (ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoLeia)):
+                    atribuidos.add(no.identificador)
+            nomes |= atribuidos - locais
+    return nomes
+
+
+def pode_ser_vetor(expressao) -> bool:
+    """Falso quando a expressão certamente não produz um vetor nem um literal `{...}`."""
+    if isinstance(expressao, ExpressaoBinaria):
+        # 'e'/'ou' devolvem um dos operandos
+        return expressao.operador in ('e', 'ou')
+    return not isinstance(expressao, (ExpressaoLiteral, ExpressaoIndice, ExpressaoUnaria))
+
+
+def valor_constante(expressao: ExpressaoVetor) -> Optional[list]:
+    """Os valores (listas aninhadas) de um literal `{...}` só com constantes, ou None."""
+    valores = []
+    for elemento in expressao.elementos:
+        if isinstance(elemento, ExpressaoLiteral):
+            valores.append(elemento.valor)
+        elif isinstance(elemento, ExpressaoVetor):
+            interno = valor_constante(elemento)
+            if interno is None:
+                return None
+            valores.append(interno)
+        else:
+            return None
+    return valores
+
+
+def _expressao_simples(expressao) -> bool:
+    # Literais, variáveis e operadores, sem chamadas de função
+    return all(isinstance(no, (ExpressaoLiteral, ExpressaoIdentificador, ExpressaoBinaria,
+                               ExpressaoLogica, ExpressaoUnaria))
+               for no in percorrer(expressao))
+
+
+class LacoContado:
+    """Forma reconhecida de um laço `para` de contagem."""
+
+    def __init__(self, variavel: str, declarada: bool, inicio, limite, operador: str, passo: int):
+        self.variavel = variavel
+        # Verdadeiro quando a variável é declarada pelo próprio laço
+        self.declarada = declarada
+        self.inicio = inicio
+        self.limite = limite
+        self.operador = operador
+        # Incremento com sinal: positivo para '<'/'<=', negativo para '>'/'>='
+        self.passo = passo
+
+
+def detectar_laco_contado(comando: ComandoPara, atribuidos_por_funcoes: Set[str]) -> Optional[LacoContado]:
+    """Reconhece `para (i = a; i OP b; i = i +/- c)` com `c` inteiro positivo.
+
+    O corpo não pode alterar `i` nem as variáveis usadas em `b`, e, se chamar
+    funções, nenhuma função do programa pode alterá-las.
+    """
+    inicializacao = comando.inicializacao
+    if isinstance(inicializacao, DeclaracaoVariavel):
+        if not inicializacao.inicializador:
+            return None
+        variavel, inicio, declarada = inicializacao.identificador, inicializacao.inicializador, True
+    elif isinstance(inicializacao, ComandoAtribuicao):
+        variavel, inicio, declarada = inicializacao.identificador, inicializacao.expressao, False
+    else:
+        return None
+
+    condicao = comando.condicao
+    if not (isinstance(condicao, ExpressaoBinaria) and condicao.operador in ('<', '<=', '>', '>=')
+            and isinstance(condicao.esquerda, ExpressaoIdentificador) and condicao.esquerda.nome == variavel):
+        return None
+    limite = condicao.direita
+
+    incremento = comando.incremento
+    if not (isinstance(incremento, ComandoAtribuicao) and incremento.identificador == variavel):
+        return None
+    expressao = incremento.expressao
+    if not (isinstance(expressao, ExpressaoBinaria) and expressao.operador in ('+', '-')
+            and isinstance(expressao.esquerda, ExpressaoIdentificador) and expressao.esquerda.nome == variavel
+            and isinstance(expressao.direita, ExpressaoLiteral)
+            and type(expressao.direita.valor) is int and expressao.direita.valor > 0):
+        return None
+    passo = expressao.direita.valor
+    crescente = condicao.operador in ('<', '<=')
+    if crescente != (expressao.operador == '+'):
+        return None
+
+    if not _expressao_simples(limite):
+        return None
+    invariantes = nomes_lidos(limite) | {variavel}
+    if invariantes & nomes_atribuidos(comando.comando):
+        return None
+    if contem_chamada(comando.comando):
+        # A variável declarada pelo laço só é visível para funções declaradas no corpo
+        externas = invariantes - {variavel} if declarada else invariantes
+        if externas & atribuidos_por_funcoes:
+            return None
+
+    return LacoContado(variavel, declarada, inicio, limite, condicao.operador,
+                       passo if crescente else -passo)
+
+
+class Contagem:
+    """Valores assumidos pela variável de um `LacoContado` em tempo de execução.
+
+    Quando o início é inteiro e o limite é um número finito, os valores vêm de
+    um `range`. Caso contrário, a sequência é gerada com a mesma semântica do
+    laço genérico (comparação e incremento dos operadores Portugol). Depois
+    que os valores se esgotam, `final` guarda o valor que a variável teria ao
+    sair do laço genérico.
+    """
+
+    def __init__(self, inicio: Any, limite: Any, operador: str, passo: int):
+        self.final = inicio
+        parada = _parada_range(inicio, limite, operador)
+        if parada is None:
+            self.valores = self._gerar(inicio, limite, operador, passo)
+            return
+        self.valores = range(inicio, parada, passo)
+        if self.valores:
+            self.final = self.valores[-1] + passo
+
+    def _gerar(self, valor, limite, operador, passo):
+        comparar = OPERADORES_BINARIOS[operador]
+        incrementar = somar if passo > 0 else subtrair
+        while comparar(valor, limite):
+            yield valor
+            valor = incrementar(valor, abs(passo))
+            self.final = valor
+        self.final = valor
+
+
+def _parada_range(inicio: Any, limite: Any, operador: str) -> Optional[int]:
+    if type(inicio) is not int:
+        return None
+    if type(limite) is int:
+        return {'<': limite, '<=': limite + 1, '>': limite, '>=': limite - 1}[operador]
+    if type(limite) is float and math.isfinite(limite):
+        if operador == '<':
+            return math.ceil(limite)
+        if operador == '<=':
+            return math.floor(limite) + 1
+        if operador == '>':
+            return math.floor(limite)
+        return math.ceil(limite) - 1
+    return None
@@ -0,0 +1,185 @@
+"""
+Execução assíncrona de programas Portugol, para muitas sessões em um só processo.
+
+O `InterpretadorAssincrono` executa o programa na máquina virtual de
+`portugol.vm`, cujo laço é um gerador sem recursão Python, e o conduz de
+dentro de uma corrotina. Um `leia` espera (`await`) a próxima linha de uma
+`EntradaAssincrona` em vez de bloquear uma thread. A cada
+`passos_por_pausa` passos (voltas de laço e chamadas de função, contadas
+pela própria máquina virtual), a execução cede o laço de eventos com
+`asyncio.sleep(0)`. Assim, um só laço de eventos conduz milhares de
+sessões, e um programa em laço infinito não impede o avanço dos outros.
+
+    entrada = FilaEntrada()
+    interpretador = InterpretadorAssincrono(entrada, es=EntradaSaida(saida=saida),
+                                            limite_passos=10_000_000, limite_tempo=2.0)
+    tarefa = asyncio.create_task(interpretador.interpretar_assincrono(programa))
+    entrada.enviar("42\\n")
+    resumo = await tarefa
+
+`limite_passos` e `limite_tempo` interrompem uma sessão que passa deles,
+com um `ErroLimiteExecucao` escrito na saída como os demais erros de
+execução. O tempo contado é só o de execução da própria sessão: não inclui
+a espera por entrada nem o tempo em que outras sessões executam. Os limites
+são conferidos nas pausas e nas leituras, então o tempo pode passar do
+limite em até uma cota de passos.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional
+
+from .ast import Programa
+from .bytecode import CompiladorBytecode
+from .interpretador import ErroExecucao
+from .vm import LIMITE_PILHA_PADRAO, InterpretadorVM, MaquinaVirtual
+
+# Passos entre duas pausas: cada pausa custa uma volta no laço de eventos
+PASSOS_POR_PAUSA_PADRAO = 10_000
+
+
+class ErroLimiteExecucao(ErroExecucao):
+    """A sessão passou do limite de passos ou de tempo de execução."""
+
+
+class ResumoExecucao(NamedTuple):
+    # Voltas de laço e chamadas de função executadas
+    passos: int
+    # Segundos de execução da sessão, sem a espera por entrada
+    tempo: float
+    # Erro que encerrou o programa (já escrito na saída), ou None
+    erro: Optional[ErroExecucao]
+
+
+class EntradaAssincrona(ABC):
+    """Fonte das linhas (ou palavras) lidas por `leia`."""
+
+    @abstractmethod
+    async def ler(self) -> Optional[str]:
+        """Próxima linha sem o fim de linha, ou None no fim da entrada."""
+
+
+class FilaEntrada(EntradaAssincrona):
+    """
+    Entrada alimentada aos poucos, por exemplo pelas mensagens de um cliente.
+
+    `enviar` aceita qualquer trecho de texto: só as linhas completas (ou, com
+    `por_token`, as palavras completas) ficam disponíveis para `leia`, e
+    `fechar` entrega o resto e marca o fim da entrada.
+    """
+
+    def __init__(self, texto: str = "", por_token: bool = False):
+        self.por_token = por_token
+        self._itens: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self._resto = ""
+        self._fechada = False
+        if texto:
+            self.enviar(texto)
+
+    def enviar(self, texto: str):
+        if self._fechada:
+            raise ValueError("A entrada já foi fechada.")
+        for item in self._dividir(self._resto + texto):
+            self._itens.put_nowait(item)
+
+    def fechar(self):
+        if not self._fechada:
+            resto, self._resto = self._resto, ""
+            for item in (resto.split() if self.por_token else [resto] if resto else []):
+                self._itens.put_nowait(item)
+            self._itens.put_nowait(None)
+            self._fechada = True
+
+    async def ler(self) -> Optional[str]:
+        item = await self._itens.get()
+        if item is None:
+            # O fim da entrada vale para todas as leituras seguintes
+            self._itens.put_nowait(None)
+        return item
+
+    def _dividir(self, texto: str) -> List[str]:
+        if self.por_token:
+            if texto and not texto[-1].isspace():
+                palavras = texto.split()
+                self._resto = palavras.pop()
+                return palavras
+            self._resto = ""
+            return texto.split()
+        linhas = texto.split("\n")
+        self._resto = linhas.pop()
+        return [linha[:-1] if linha.endswith("\r") else linha for linha in linhas]
+
+
+class InterpretadorAssincrono(InterpretadorVM):
+    """Executa um programa na máquina virtual de dentro de uma corrotina."""
+
+    def __init__(self, entrada: EntradaAssincrona, passos_por_pausa: int = PASSOS_POR_PAUSA_PADRAO,
+                 limite_passos: Optional[int] = None, limite_tempo: Optional[float] = None,
+                 limite_pilha: int = LIMITE_PILHA_PADRAO, **opcoes):
+        if passos_por_pausa < 1:
+            raise ValueError("passos_por_pausa deve ser positivo.")
+        super().__init__(limite_pilha=limite_pilha, **opcoes)
+        self.entrada = entrada
+        self.passos_por_pausa = passos_por_pausa
+        self.limite_passos = limite_passos
+        self.limite_tempo = limite_tempo
+        self.passos = 0
+        self.tempo = 0.0
+
+    def interpretar(self, programa: Programa):
+        raise TypeError("Use 'await interpretar_assincrono(programa)'.")
+
+    async def interpretar_assincrono(self, programa: Programa) -> ResumoExecucao:
+        erro = None
+        try:
+            codigo = CompiladorBytecode().compilar_programa(programa)
+            await self._conduzir(MaquinaVirtual(self, self.limite_pilha), codigo)
+        except ErroExecucao as e:
+            erro = e
+            self.es.escrever(f"Erro de execução: {e}\n")
+        finally:
+            self.es.descarregar()
+        return ResumoExecucao(self.passos, self.tempo, erro)
+
+    async def _conduzir(self, maquina: MaquinaVirtual, codigo):
+        cota = self._cota()
+        execucao = maquina.execucao(codigo, self.ambiente_global, cota)
+        envio = None
+        try:
+            while True:
+                inicio = time.perf_counter()
+                try:
+                    pedido = execucao.send(envio)
+                except StopIteration as fim:
+                    self.passos += cota - fim.value
+                    return
+                finally:
+                    self.tempo += time.perf_counter() - inicio
+                if pedido:
+                    # leia: `pedido` é o que resta da cota
+                    self.passos += cota - pedido
+                    cota = pedido
+                    self._conferir_limites()
+                    # O que já foi escrito (ex.: uma pergunta) precisa aparecer antes da espera
+                    self.es.descarregar()
+                    envio = self.converter_entrada(await self.entrada.ler())
+                else:
+                    self.passos += cota
+                    self._conferir_limites()
+                    await asyncio.sleep(0)
+                    cota = envio = self._cota()
+        finally:
+            execucao.close()
+
+    def _cota(self) -> int:
+        if self.limite_passos is None:
+            return self.passos_por_pausa
+        # Uma pausa logo depois do último passo permitido detecta o excesso
+        return min(self.passos_por_pausa, self.limite_passos - self.passos + 1)
+
+    def _conferir_limites(self):
+        if self.limite_passos is not None and self.passos > self.limite_passos:
+            raise ErroLimiteExecucao(f"Limite de passos excedido: mais de {self.limite_passos} passos.")
+        if self.limite_tempo is not None and self.tempo > self.limite_tempo:
+            raise ErroLimiteExecucao(f"Limite de tempo excedido: mais de {self.limite_tempo:g} s de execução.")
@@ -1,84 +1,165 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 
+# Os nós usam __slots__: sem um __dict__ por instância, ocupam menos memória
+# e o acesso aos atributos é mais rápido. Os campos opcionais abaixo são
+# iniciados em cada __init__.
+
+# Posição (linha e coluna, a partir de 1) do nó no código-fonte, quando ele veio do parser
 class ASTNode(ABC):
-    pass
+    __slots__ = ("linha", "coluna")
 
 
+# Tipo inferido pela verificação de tipos (portugol.tipos), quando conhecido
 class Expressao(ASTNode):
-    pass
+    __slots__ = ("tipo_estatico",)
 
 
 class Comando(ASTNode):
-    pass
+    __slots__ = ()
 
 
 class Declaracao(ASTNode):
-    pass
+    __slots__ = ()
 
 
 class Programa(ASTNode):
+    __slots__ = ("declaracoes",)
+
     def __init__(self, declaracoes: List[Declaracao]):
+        self.linha = self.coluna = None
         self.declaracoes = declaracoes
 
 class Tipo:
+    __slots__ = ("nome",)
+
     def __init__(self, nome: str):
         self.nome = nome
-    
+
     def __str__(self):
         return self.nome
 
 class ExpressaoLiteral(Expressao):
+    __slots__ = ("valor",)
+
     def __init__(self, valor: Any):
+        self.linha = self.coluna = self.tipo_estatico = None
         self.valor = valor
 
 
 class ExpressaoIdentificador(Expressao):
+    __slots__ = ("nome",)
+
     def __init__(self, nome: str):
+        self.linha = self.coluna = self.tipo_estatico = None
         self.nome = nome
 
 
+# 'operacao': implementação escolhida pela verificação de tipos; None usa o caminho genérico
 class ExpressaoBinaria(Expressao):
+    __slots__ = ("esquerda", "operador", "direita", "operacao")
+
+    def __init__(self, esquerda: Expressao, operador: str, direita: Expressao):
+        self.linha = self.coluna = self.tipo_estatico = None
+        self.esquerda = esquerda
+        self.operador = operador
+        self.direita = direita
+        self.operacao: Optional[Callable[[Any, Any], Any]] = None
+
+
+# 'e'/'ou' com curto-circuito: o operando direito só é avaliado se necessário
+class ExpressaoLogica(Expressao):
+    __slots__ = ("esquerda", "operador", "direita")
+
     def __init__(self, esquerda: Expressao, operador: str, direita: Expressao):
+        self.linha = self.coluna = self.tipo_estatico = None
         self.esquerda = esquerda
         self.operador = operador
         self.direita = direita
 
 
 class ExpressaoUnaria(Expressao):
+    __slots__ = ("operador", "expressao", "operacao")
+
     def __init__(self, operador: str, expressao: Expressao):
+        self.linha = self.coluna = self.tipo_estatico = None
         self.operador = operador
         self.expressao = expressao
+        self.operacao: Optional[Callable[[Any], Any]] = None
+
+
+# Elemento de um vetor ou matriz: 'v[i]', 'm[i][j]'
+class ExpressaoIndice(Expressao):
+    __slots__ = ("nome", "indices")
+
+    def __init__(self, nome: str, indices: List[Expressao]):
+        self.linha = self.coluna = self.tipo_estatico = None
+        self.nome = nome
+        self.indices = indices
+
+
+# Literal '{1, 2, 3}' (aninhado para matrizes), usado para inicializar ou atribuir vetores
+class ExpressaoVetor(Expressao):
+    __slots__ = ("elementos",)
+
+    def __init__(self, elementos: List[Expressao]):
+        self.linha = self.coluna = self.tipo_estatico = None
+        self.elementos = elementos
 
 
 class ChamadaFuncao(Expressao):
+    __slots__ = ("nome", "argumentos")
+
     def __init__(self, nome: str, argumentos: List[Expressao]):
+        self.linha = self.coluna = self.tipo_estatico = None
         self.nome = nome
         self.argumentos = argumentos
 
 
 class ComandoAtribuicao(Comando):
+    __slots__ = ("identificador", "expressao")
+
     def __init__(self, identificador: str, expressao: Expressao):
+        self.linha = self.coluna = None
+        self.identificador = identificador
+        self.expressao = expressao
+
+
+class ComandoAtribuicaoIndice(Comando):
+    __slots__ = ("identificador", "indices", "expressao")
+
+    def __init__(self, identificador: str, indices: List[Expressao], expressao: Expressao):
+        self.linha = self.coluna = None
         self.identificador = identificador
+        self.indices = indices
         self.expressao = expressao
 
 
 class ComandoSe(Comando):
+    __slots__ = ("condicao", "comando_entao", "comando_senao")
+
     def __init__(self, condicao: Expressao, comando_entao: Comando, comando_senao: Optional[Comando] = None):
+        self.linha = self.coluna = None
         self.condicao = condicao
         self.comando_entao = comando_entao
         self.comando_senao = comando_senao
 
 
 class ComandoEnquanto(Comando):
+    __slots__ = ("condicao", "comando")
+
     def __init__(self, condicao: Expressao, comando: Comando):
+        self.linha = self.coluna = None
         self.condicao = condicao
         self.comando = comando
 
 
 class ComandoPara(Comando):
+    __slots__ = ("inicializacao", "condicao", "incremento", "comando")
+
     def __init__(self, inicializacao: ComandoAtribuicao, condicao: Expressao, incremento: str, comando: Comando):
+        self.linha = self.coluna = None
         self.inicializacao = inicializacao
         self.condicao = condicao
         self.incremento = incremento
@@ -86,42 +167,66 @@ class ComandoPara(Comando):
 
 
 class ComandoEscreva(Comando):
+    __slots__ = ("expressoes",)
+
     def __init__(self, expressoes: List[Expressao]):
+        self.linha = self.coluna = None
         self.expressoes = expressoes
 
 
 class ComandoLeia(Comando):
+    __slots__ = ("identificador",)
+
     def __init__(self, identificador: str):
+        self.linha = self.coluna = None
         self.identificador = identificador
 
 
 class ComandoRetorne(Comando):
+    __slots__ = ("expressao",)
+
     def __init__(self, expressao: Optional[Expressao] = None):
+        self.linha = self.coluna = None
         self.expressao = expressao
 
 
 class Bloco(Comando):
+    __slots__ = ("declaracoes",)
+
     def __init__(self, declaracoes: List[Union[Declaracao, Comando]]):
+        self.linha = self.coluna = None
         self.declaracoes = declaracoes
 
 
+# 'dimensoes': expressões com o tamanho de cada dimensão de um vetor ou matriz; None para variáveis simples
 class DeclaracaoVariavel(Declaracao):
-    def __init__(self, tipo: Tipo, identificador: str, inicializador: Optional[Expressao] = None):
+    __slots__ = ("tipo", "identificador", "inicializador", "dimensoes")
+
+    def __init__(self, tipo: Tipo, identificador: str, inicializador: Optional[Expressao] = None,
+                 dimensoes: Optional[List[Expressao]] = None):
+        self.linha = self.coluna = None
         self.tipo = tipo
         self.identificador = identificador
         self.inicializador = inicializador
+        self.dimensoes = dimensoes
 
 
+# 'dimensoes': número de pares '[]' do parâmetro ('inteiro v[]' tem 1); 0 para valores simples
 class Parametro:
-    def __init__(self, tipo: Tipo, identificador: str):
+    __slots__ = ("tipo", "identificador", "dimensoes")
+
+    def __init__(self, tipo: Tipo, identificador: str, dimensoes: int = 0):
         self.tipo = tipo
         self.identificador = identificador
+        self.dimensoes = dimensoes
 
 
 class DeclaracaoFuncao(Declaracao):
+    __slots__ = ("tipo", "nome", "parametros", "corpo")
+
     def __init__(self, tipo: Tipo, nome: str, parametros: List[Parametro], corpo: Bloco):
+        self.linha = self.coluna = None
         self.tipo = tipo
         self.nome = nome
         self.parametros = parametros
         self.corpo = corpo
-
@@ -0,0 +1,356 @@
+"""
+Compilador de AST Portugol para bytecode de pilha.
+
+Cada função (e o programa principal) vira um `Codigo`: uma sequência linear
+de instruções `(opcode, argumento)` guardada em um `array`, acompanhada de
+uma tabela de constantes e de uma tabela de nomes. Os desvios de `se`,
+`enquanto` e `para` usam endereços absolutos dentro da própria sequência.
+"""
+
+from array import array
+from typing import Any, Dict, List, Tuple
+
+from .ast import (
+    Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .analise import pode_ser_vetor, valor_constante
+from .interpretador import ErroExecucao
+from .operadores import OPERADORES_BINARIOS, OPERADORES_UNARIOS
+
+# Opcodes
+LOAD_CONST = 0       # empilha constantes[arg]
+LOAD_NAME = 1        # empilha o valor da variável nomes[arg]
+STORE_NAME = 2       # desempilha e atribui à variável existente nomes[arg]
+DEFINE_NAME = 3      # desempilha e define nomes[arg] no escopo atual
+POP = 4              # descarta o topo da pilha
+BINARY_OP = 5        # aplica OPERACOES_BINARIAS[arg] aos dois valores do topo
+UNARY_OP = 6         # aplica OPERACOES_UNARIAS[arg] ao topo
+JUMP = 7             # desvia para arg
+JUMP_IF_FALSE = 8    # desempilha e desvia para arg se o valor for falso
+ENTER_SCOPE = 9      # cria um escopo filho do atual
+EXIT_SCOPE = 10      # volta ao escopo pai
+PRINT = 11           # desempilha arg valores e os escreve em uma linha
+READ = 12            # lê um valor da entrada e atribui a nomes[arg]
+MAKE_FUNCTION = 13   # empilha uma função com o código constantes[arg] e o escopo atual
+LOAD_FUNCTION = 14   # empilha a função (nome, aridade) = constantes[arg], validando a chamada
+CALL = 15            # chama a função abaixo dos arg argumentos do topo
+RETURN = 16          # desempilha o valor de retorno e volta ao chamador
+HALT = 17            # encerra o programa
+JUMP_IF_FALSE_OR_POP = 18  # desvia para arg mantendo o topo se ele for falso; senão o descarta
+JUMP_IF_TRUE_OR_POP = 19   # desvia para arg mantendo o topo se ele for verdadeiro; senão o descarta
+LOAD_INDEX = 20      # com (nome, n) = constantes[arg]: troca o vetor e os n índices do topo pelo elemento
+STORE_INDEX = 21     # com (nome, n) = constantes[arg]: atribui o topo ao elemento do vetor e índices abaixo dele
+NEW_ARRAY = 22       # com (nome, tipo, n, inicializado) = constantes[arg]: cria um vetor com os n tamanhos do topo
+BUILD_LIST = 23      # troca os arg valores do topo por uma lista (literal {...})
+STORE_ARRAY_NAME = 24  # como STORE_NAME, mas um vetor ou literal é copiado para o vetor que a variável guarda
+JUMP_BACK = 25       # desvia para arg no fim de um laço; conta um passo da máquina virtual
+
+NOMES_OPCODES = [
+    "LOAD_CONST", "LOAD_NAME", "STORE_NAME", "DEFINE_NAME", "POP",
+    "BINARY_OP", "UNARY_OP", "JUMP", "JUMP_IF_FALSE", "ENTER_SCOPE",
+    "EXIT_SCOPE", "PRINT", "READ", "MAKE_FUNCTION", "LOAD_FUNCTION",
+    "CALL", "RETURN", "HALT", "JUMP_IF_FALSE_OR_POP", "JUMP_IF_TRUE_OR_POP",
+    "LOAD_INDEX", "STORE_INDEX", "NEW_ARRAY", "BUILD_LIST", "STORE_ARRAY_NAME",
+    "JUMP_BACK",
+]
+
+SIMBOLOS_BINARIOS = tuple(OPERADORES_BINARIOS)
+OPERACOES_BINARIAS = tuple(OPERADORES_BINARIOS.values())
+SIMBOLOS_UNARIOS = tuple(OPERADORES_UNARIOS)
+OPERACOES_UNARIAS = tuple(OPERADORES_UNARIOS.values())
+
+
+class Codigo:
+    """Bytecode de uma função ou do programa principal."""
+
+    def __init__(self, nome: str, parametros: List[str]):
+        self.nome = nome
+        self.parametros = parametros
+        self.instrucoes = array('i')
+        self.constantes: List[Any] = []
+        self.nomes: List[str] = []
+        # (tipo, valor) -> posição em `constantes`; o tipo não deixa confundir 1, 1.0 e verdadeiro
+        self.indices_constantes: Dict[Tuple[type, Any], int] = {}
+        self.indices_nomes: Dict[str, int] = {}
+
+    def __repr__(self):
+        return f"<código {self.nome}>"
+
+
+class CompiladorBytecode:
+    def __init__(self):
+        self.codigo: Codigo = None
+
+    def compilar_programa(self, programa: Programa) -> Codigo:
+        self.codigo = Codigo("programa", [])
+        self.compilar(programa)
+        self.emitir(HALT)
+        return self.codigo
+
+    # Emissão
+
+    def emitir(self, opcode: int, argumento: int = 0) -> int:
+        posicao = len(self.codigo.instrucoes)
+        self.codigo.instrucoes.extend((opcode, argumento))
+        return posicao
+
+    def posicao_atual(self) -> int:
+        return len(self.codigo.instrucoes)
+
+    def corrigir_desvio(self, posicao: int, destino: int):
+        self.codigo.instrucoes[posicao + 1] = destino
+
+    def constante(self, valor: Any) -> int:
+        indices = self.codigo.indices_constantes
+        chave = (type(valor), valor)
+        indice = indices.get(chave)
+        if indice is None:
+            constantes = self.codigo.constantes
+            indice = indices[chave] = len(constantes)
+            constantes.append(valor)
+        return indice
+
+    def nome(self, nome: str) -> int:
+        indices = self.codigo.indices_nomes
+        indice = indices.get(nome)
+        if indice is None:
+            nomes = self.codigo.nomes
+            indice = indices[nome] = len(nomes)
+            nomes.append(nome)
+        return indice
+
+    # Comandos
+
+    def compilar(self, no):
+        metodo_nome = 'compilar_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.compilar_no_desconhecido)
+        return metodo(no)
+
+    def compilar_no_desconhecido(self, no):
+        raise ErroExecucao(f"Tipo de nó AST desconhecido: {type(no).__name__}")
+
+    def compilar_Programa(self, programa: Programa):
+        self.compilar(programa.declaracoes)
+
+    def compilar_Bloco(self, bloco: Bloco):
+        # Um bloco que não declara nada teria sempre um escopo vazio: não é preciso criá-lo
+        if not _declara_nomes(bloco):
+            self.compilar_comandos(bloco.declaracoes)
+            return
+        self.emitir(ENTER_SCOPE)
+        self.compilar_comandos(bloco.declaracoes)
+        self.emitir(EXIT_SCOPE)
+
+    def compilar_comandos(self, comandos):
+        for no in comandos:
+            self.compilar(no)
+
+    def compilar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        if declaracao.dimensoes is not None:
+            for tamanho in declaracao.dimensoes:
+                self.compilar_expressao(tamanho)
+            if declaracao.inicializador:
+                self.compilar_expressao(declaracao.inicializador)
+            descricao = (declaracao.identificador, declaracao.tipo.nome, len(declaracao.dimensoes),
+                         declaracao.inicializador is not None)
+            self.emitir(NEW_ARRAY, self.constante(descricao))
+        elif declaracao.inicializador:
+            self.compilar_expressao(declaracao.inicializador)
+        else:
+            self.emitir(LOAD_CONST, self.constante(None))
+        self.emitir(DEFINE_NAME, self.nome(declaracao.identificador))
+
+    def compilar_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        parametros = [param.identificador for param in declaracao.parametros]
+        codigo_funcao = Codigo(declaracao.nome, parametros)
+
+        codigo_anterior = self.codigo
+        self.codigo = codigo_funcao
+        try:
+            # O corpo usa o próprio escopo da chamada, onde estão os parâmetros: redeclarar
+            # um parâmetro no corpo substitui o valor, o que é indistinguível de sombreá-lo
+            self.compilar_comandos(declaracao.corpo.declaracoes)
+            # Função que termina sem 'retorne' devolve None
+            self.emitir(LOAD_CONST, self.constante(None))
+            self.emitir(RETURN)
+        finally:
+            self.codigo = codigo_anterior
+
+        self.codigo.constantes.append(codigo_funcao)
+        self.emitir(MAKE_FUNCTION, len(self.codigo.constantes) - 1)
+        self.emitir(DEFINE_NAME, self.nome(declaracao.nome))
+
+    def compilar_ComandoAtribuicao(self, comando: ComandoAtribuicao):
+        self.compilar_expressao(comando.expressao)
+        store = STORE_ARRAY_NAME if pode_ser_vetor(comando.expressao) else STORE_NAME
+        self.emitir(store, self.nome(comando.identificador))
+
+    def compilar_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        self.emitir(LOAD_NAME, self.nome(comando.identificador))
+        for indice in comando.indices:
+            self.compilar_expressao(indice)
+        self.compilar_expressao(comando.expressao)
+        self.emitir(STORE_INDEX, self.constante((comando.identificador, len(comando.indices))))
+
+    def compilar_ComandoSe(self, comando: ComandoSe):
+        self.compilar_expressao(comando.condicao)
+        desvio_senao = self.emitir(JUMP_IF_FALSE)
+        self.compilar(comando.comando_entao)
+        if comando.comando_senao:
+            desvio_fim = self.emitir(JUMP)
+            self.corrigir_desvio(desvio_senao, self.posicao_atual())
+            self.compilar(comando.comando_senao)
+            self.corrigir_desvio(desvio_fim, self.posicao_atual())
+        else:
+            self.corrigir_desvio(desvio_senao, self.posicao_atual())
+
+    def compilar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        inicio = self.posicao_atual()
+        self.compilar_expressao(comando.condicao)
+        desvio_fim = self.emitir(JUMP_IF_FALSE)
+        self.compilar(comando.comando)
+        self.emitir(JUMP_BACK, inicio)
+        self.corrigir_desvio(desvio_fim, self.posicao_atual())
+
+    def compilar_ComandoPara(self, comando: ComandoPara):
+        # O laço 'para' cria seu próprio escopo, necessário só se a inicialização declarar a variável
+        escopo = isinstance(comando.inicializacao, DeclaracaoVariavel)
+        if escopo:
+            self.emitir(ENTER_SCOPE)
+        self.compilar(comando.inicializacao)
+        inicio = self.posicao_atual()
+        self.compilar_expressao(comando.condicao)
+        desvio_fim = self.emitir(JUMP_IF_FALSE)
+        self.compilar(comando.comando)
+        self.compilar(comando.incremento)
+        self.emitir(JUMP_BACK, inicio)
+        self.corrigir_desvio(desvio_fim, self.posicao_atual())
+        if escopo:
+            self.emitir(EXIT_SCOPE)
+
+    def compilar_ComandoEscreva(self, comando: ComandoEscreva):
+        for expressao in comando.expressoes:
+            self.compilar_expressao(expressao)
+        self.emitir(PRINT, len(comando.expressoes))
+
+    def compilar_ComandoLeia(self, comando: ComandoLeia):
+        self.emitir(READ, self.nome(comando.identificador))
+
+    def compilar_ComandoRetorne(self, comando: ComandoRetorne):
+        if comando.expressao:
+            self.compilar_expressao(comando.expressao)
+        else:
+            self.emitir(LOAD_CONST, self.constante(None))
+        self.emitir(RETURN)
+
+    def compilar_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        self.compilar_expressao(chamada)
+        self.emitir(POP)
+
+    # Expressões
+
+    def compilar_expressao(self, no):
+        metodo_nome = 'compilar_expressao_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.compilar_expressao_desconhecida)
+        return metodo(no)
+
+    def compilar_expressao_desconhecida(self, no):
+        raise ErroExecucao(f"Tipo de nó de expressão desconhecido: {type(no).__name__}")
+
+    def compilar_expressao_ExpressaoLiteral(self, expressao: ExpressaoLiteral):
+        self.emitir(LOAD_CONST, self.constante(expressao.valor))
+
+    def compilar_expressao_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador):
+        self.emitir(LOAD_NAME, self.nome(expressao.nome))
+
+    def compilar_expressao_ExpressaoIndice(self, expressao: ExpressaoIndice):
+        self.emitir(LOAD_NAME, self.nome(expressao.nome))
+        for indice in expressao.indices:
+            self.compilar_expressao(indice)
+        self.emitir(LOAD_INDEX, self.constante((expressao.nome, len(expressao.indices))))
+
+    def compilar_expressao_ExpressaoVetor(self, expressao: ExpressaoVetor):
+        constante = valor_constante(expressao)
+        if constante is not None:
+            # Literal só com constantes: a lista vai para a tabela de constantes (NEW_ARRAY a copia)
+            self.codigo.constantes.append(constante)
+            self.emitir(LOAD_CONST, len(self.codigo.constantes) - 1)
+            return
+        for elemento in expressao.elementos:
+            self.compilar_expressao(elemento)
+        self.emitir(BUILD_LIST, len(expressao.elementos))
+
+    def compilar_expressao_ExpressaoUnaria(self, expressao: ExpressaoUnaria):
+        if expressao.operador not in SIMBOLOS_UNARIOS:
+            raise ErroExecucao(f"Operador unário desconhecido: {expressao.operador}")
+        self.compilar_expressao(expressao.expressao)
+        self.emitir(UNARY_OP, SIMBOLOS_UNARIOS.index(expressao.operador))
+
+    def compilar_expressao_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        if expressao.operador not in SIMBOLOS_BINARIOS:
+            raise ErroExecucao(f"Operador binário desconhecido: {expressao.operador}")
+        self.compilar_expressao(expressao.esquerda)
+        self.compilar_expressao(expressao.direita)
+        self.emitir(BINARY_OP, SIMBOLOS_BINARIOS.index(expressao.operador))
+
+    def compilar_expressao_ExpressaoLogica(self, expressao: ExpressaoLogica):
+        desvios = {"e": JUMP_IF_FALSE_OR_POP, "ou": JUMP_IF_TRUE_OR_POP}
+        if expressao.operador not in desvios:
+            raise ErroExecucao(f"Operador lógico desconhecido: {expressao.operador}")
+        self.compilar_expressao(expressao.esquerda)
+        desvio_fim = self.emitir(desvios[expressao.operador])
+        self.compilar_expressao(expressao.direita)
+        self.corrigir_desvio(desvio_fim, self.posicao_atual())
+
+    def compilar_expressao_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        # A função é localizada e validada antes de os argumentos serem avaliados
+        self.emitir(LOAD_FUNCTION, self.constante((chamada.nome, len(chamada.argumentos))))
+        for argumento in chamada.argumentos:
+            self.compilar_expressao(argumento)
+        self.emitir(CALL, len(chamada.argumentos))
+
+
+def _declara_nomes(bloco: Bloco) -> bool:
+    return any(isinstance(no, (DeclaracaoVariavel, DeclaracaoFuncao)) for no in bloco.declaracoes)
+
+
+def desmontar(codigo: Codigo) -> str:
+    """Gera uma listagem legível do bytecode, incluindo as funções aninhadas."""
+    linhas = []
+    pendentes = [codigo]
+    while pendentes:
+        atual = pendentes.pop(0)
+        parametros = ", ".join(atual.parametros)
+        linhas.append(f"Código {atual.nome}({parametros}):")
+        instrucoes = atual.instrucoes
+        for posicao in range(0, len(instrucoes), 2):
+            opcode, argumento = instrucoes[posicao], instrucoes[posicao + 1]
+            nome = NOMES_OPCODES[opcode]
+            detalhe = _descrever_argumento(atual, opcode, argumento)
+            if detalhe is None:
+                linhas.append(f"  {posicao:>5}  {nome}")
+            else:
+                linhas.append(f"  {posicao:>5}  {nome:<14} {argumento:>4} {detalhe}".rstrip())
+        linhas.append("")
+        pendentes.extend(c for c in atual.constantes if isinstance(c, Codigo))
+    return "\n".join(linhas)
+
+
+def _descrever_argumento(codigo: Codigo, opcode: int, argumento: int):
+    if opcode in (LOAD_CONST, LOAD_FUNCTION, MAKE_FUNCTION, LOAD_INDEX, STORE_INDEX, NEW_ARRAY):
+        return f"({codigo.constantes[argumento]!r})"
+    if opcode in (LOAD_NAME, STORE_NAME, DEFINE_NAME, READ, STORE_ARRAY_NAME):
+        return f"({codigo.nomes[argumento]})"
+    if opcode == BINARY_OP:
+        return f"({SIMBOLOS_BINARIOS[argumento]})"
+    if opcode == UNARY_OP:
+        return f"({SIMBOLOS_UNARIOS[argumento]})"
+    if opcode in (JUMP, JUMP_BACK, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP):
+        return f"(para {argumento})"
+    if opcode in (PRINT, CALL, BUILD_LIST):
+        return ""
+    return None
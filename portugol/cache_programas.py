@@ -0,0 +1,197 @@
+"""
+Cache em disco dos programas já analisados (arquivos `.ptgc`).
+
+Executar o mesmo `.ptg` várias vezes (na integração contínua, na correção de
+trabalhos) refaz a cada vez a análise léxica, a sintática e a construção da
+AST. `CacheProgramas` guarda a AST pronta, já otimizada quando os passos de
+`portugol.otimizador` foram aplicados, em um arquivo `.ptgc`: o cabeçalho
+`MAGICO` seguido do `pickle` da AST comprimido com `zlib`. Carregar o arquivo
+não importa o Lark nem o transformer.
+
+O nome do arquivo é o hash do código-fonte, das opções da análise (posições,
+otimização) e da versão do interpretador, que é o hash da gramática e de todos
+os módulos do pacote: alterar qualquer um deles invalida as entradas antigas,
+que deixam de ser lidas e saem na próxima poda. Um arquivo ilegível é tratado
+como ausente.
+
+A poda remove os arquivos usados há mais tempo até que o diretório caiba no
+tamanho pedido; cada acerto atualiza a data de modificação do arquivo.
+
+    cache = CacheProgramas()
+    chave = cache.chave(codigo, posicoes=False, otimizar=True)
+    programa = cache.carregar(chave)
+    if programa is None:
+        programa = GerenciadorPassos().otimizar(analisar(codigo, posicoes=False))
+        cache.guardar(chave, programa)
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import zlib
+from typing import List, NamedTuple, Optional, Tuple
+
+from .ast import Programa
+from .parser import CAMINHO_GRAMATICA, diretorio_cache
+
+EXTENSAO = ".ptgc"
+
+# Identifica o formato; muda quando a estrutura do arquivo muda
+MAGICO = b"PTGC\x01"
+
+# Compressão rápida: o arquivo é lido em toda execução
+NIVEL_COMPRESSAO = 1
+
+SUFIXOS_TAMANHO = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def diretorio_padrao() -> str:
+    # Fica ao lado das tabelas do parser, mas em um diretório próprio para a poda
+    return os.path.join(diretorio_cache(), "programas")
+
+
+@functools.lru_cache(maxsize=None)
+def versao_interpretador() -> str:
+    """Hash da gramática, de todos os módulos do pacote e da versão do Python."""
+    resumo = hashlib.sha256(MAGICO)
+    resumo.update(repr(sys.version_info[:2]).encode("ascii"))
+    pacote = os.path.dirname(CAMINHO_GRAMATICA)
+    arquivos = [CAMINHO_GRAMATICA] + sorted(
+        os.path.join(pacote, nome) for nome in os.listdir(pacote) if nome.endswith(".py"))
+    for caminho in arquivos:
+        with open(caminho, "rb") as f:
+            resumo.update(os.path.basename(caminho).encode("utf-8") + b"\0" + f.read())
+    return resumo.hexdigest()
+
+
+def interpretar_tamanho(texto: str) -> int:
+    """Converte tamanhos como `500000`, `200K`, `50M` ou `1G` em bytes."""
+    numero = texto.strip().lower().removesuffix("b")
+    sufixo = numero[-1:] if numero[-1:] in SUFIXOS_TAMANHO else ""
+    try:
+        valor = float(numero[:len(numero) - len(sufixo)])
+    except ValueError:
+        raise ValueError(f"Tamanho inválido: '{texto}'.") from None
+    if valor < 0:
+        raise ValueError(f"Tamanho inválido: '{texto}'.")
+    return int(valor * SUFIXOS_TAMANHO[sufixo])
+
+
+class ResultadoPoda(NamedTuple):
+    removidos: int
+    bytes_removidos: int
+    # Arquivos e bytes que continuam no cache
+    restantes: int
+    bytes_restantes: int
+
+
+class CacheProgramas:
+    """Diretório de arquivos `.ptgc`, um por programa e opções de análise."""
+
+    def __init__(self, diretorio: Optional[str] = None):
+        self.diretorio = diretorio or diretorio_padrao()
+
+    def chave(self, codigo: str, posicoes: bool = True, otimizar: bool = False) -> str:
+        resumo = hashlib.sha256(versao_interpretador().encode("ascii"))
+        resumo.update(b"posicoes" if posicoes else b"-")
+        resumo.update(b"otimizar" if otimizar else b"-")
+        resumo.update(codigo.encode("utf-8", "surrogatepass"))
+        return resumo.hexdigest()[:32]
+
+    def caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+
+    def carregar(self, chave: str) -> Optional[Programa]:
+        """Devolve o programa guardado com `chave`, ou None se não houver um legível."""
+        caminho = self.caminho(chave)
+        try:
+            with open(caminho, "rb") as f:
+                dados = f.read()
+        except OSError:
+            return None
+        try:
+            if not dados.startswith(MAGICO):
+                raise ValueError("cabeçalho inválido")
+            programa = pickle.loads(zlib.decompress(memoryview(dados)[len(MAGICO):]))
+            if not isinstance(programa, Programa):
+                raise ValueError("conteúdo inválido")
+        except Exception:
+            # Arquivo truncado ou de outro formato: é descartado e refeito
+            self._remover(caminho)
+            return None
+        try:
+            # A data de modificação marca o último uso, usada pela poda
+            os.utime(caminho)
+        except OSError:
+            pass
+        return programa
+
+    def guardar(self, chave: str, programa: Programa) -> bool:
+        """
+        Grava o programa com `chave`. Devolve False, sem erro, quando não é
+        possível (diretório sem permissão, AST aninhada demais para o pickle).
+        """
+        try:
+            dados = pickle.dumps(programa, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError, TypeError):
+            return False
+        dados = MAGICO + zlib.compress(dados, NIVEL_COMPRESSAO)
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            # Grava em um arquivo temporário e o renomeia: execuções simultâneas
+            # nunca leem um arquivo pela metade
+            descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        except OSError:
+            return False
+        try:
+            with os.fdopen(descritor, "wb") as f:
+                f.write(dados)
+            os.replace(temporario, self.caminho(chave))
+        except OSError:
+            self._remover(temporario)
+            return False
+        return True
+
+    def arquivos(self) -> List[Tuple[str, os.stat_result]]:
+        """Os arquivos `.ptgc` do cache, do usado há menos tempo ao mais antigo."""
+        try:
+            entradas = [entrada for entrada in os.scandir(self.diretorio)
+                        if entrada.name.endswith(EXTENSAO) and entrada.is_file()]
+        except OSError:
+            return []
+        informacoes = []
+        for entrada in entradas:
+            try:
+                informacoes.append((entrada.path, entrada.stat()))
+            except OSError:
+                pass
+        informacoes.sort(key=lambda item: item[1].st_mtime, reverse=True)
+        return informacoes
+
+    def tamanho(self) -> int:
+        return sum(estado.st_size for _, estado in self.arquivos())
+
+    def podar(self, tamanho_maximo: int) -> ResultadoPoda:
+        """Remove os arquivos usados há mais tempo até o cache ocupar no máximo `tamanho_maximo` bytes."""
+        mantidos = removidos = bytes_mantidos = bytes_removidos = 0
+        cheio = False
+        for caminho, estado in self.arquivos():
+            cheio = cheio or bytes_mantidos + estado.st_size > tamanho_maximo
+            if not cheio:
+                mantidos += 1
+                bytes_mantidos += estado.st_size
+            elif self._remover(caminho):
+                removidos += 1
+                bytes_removidos += estado.st_size
+        return ResultadoPoda(removidos, bytes_removidos, mantidos, bytes_mantidos)
+
+    @staticmethod
+    def _remover(caminho: str) -> bool:
+        try:
+            os.remove(caminho)
+        except OSError:
+            return False
+        return True
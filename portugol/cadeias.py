@@ -0,0 +1,153 @@
+"""
+Cadeias montadas por concatenações sucessivas.
+
+Em `texto = texto + parte` dentro de um laço, cada `+` entre duas `str` copia
+o texto inteiro, e montar uma cadeia de N caracteres aos poucos custa O(N²).
+O operador '+' de todos os backends passa por `concatenar`, que devolve uma
+`Corda` quando o resultado chega a `LIMITE_CORDA` caracteres. A corda é
+imutável: guarda o texto anterior (outra corda ou uma `str`) e uma cauda
+curta. Acrescentar ao fim copia só a cauda, de até `LIMITE_CAUDA` caracteres,
+e cria um nó, então o custo amortizado de cada concatenação não depende do
+tamanho do texto já montado.
+
+O texto completo só é montado quando é usado de outra forma: ao escrever,
+comparar, calcular o hash (chaves da memoização), guardar em um vetor ou em
+qualquer outra operação. A montagem é um único `str.join` e o resultado
+substitui os nós anteriores. Para o programa Portugol a corda é uma cadeia
+como outra qualquer: essas operações, inclusive os erros de operações
+inválidas, são as da `str` montada. Acrescentar no início (`texto = parte +
+texto`) continua copiando o texto inteiro.
+"""
+
+from typing import Any, Union
+
+# Resultados menores continuam sendo `str`: a corda só compensa em textos longos
+LIMITE_CORDA = 1024
+# Tamanho máximo da cauda copiada a cada concatenação antes de criar um novo nó
+LIMITE_CAUDA = 256
+
+
+class Corda:
+    __slots__ = ("anterior", "cauda", "comprimento")
+
+    def __init__(self, anterior: Union["Corda", str], cauda: str, comprimento: int):
+        self.anterior = anterior
+        self.cauda = cauda
+        self.comprimento = comprimento
+
+    def anexar(self, texto: str) -> "Corda":
+        cauda = self.cauda
+        if len(cauda) + len(texto) <= LIMITE_CAUDA:
+            return Corda(self.anterior, cauda + texto, self.comprimento + len(texto))
+        return Corda(self, texto, self.comprimento + len(texto))
+
+    def __str__(self) -> str:
+        anterior = self.anterior
+        if not self.cauda and anterior.__class__ is str:
+            return anterior
+        partes = []
+        no = self
+        while no.__class__ is Corda:
+            partes.append(no.cauda)
+            no = no.anterior
+        partes.append(no)
+        partes.reverse()
+        texto = "".join(partes)
+        # O texto montado substitui os nós anteriores, que podem ser liberados
+        self.anterior, self.cauda = texto, ""
+        return texto
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __format__(self, formato: str) -> str:
+        return format(str(self), formato)
+
+    def __len__(self) -> int:
+        return self.comprimento
+
+    def __bool__(self) -> bool:
+        return self.comprimento > 0
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    # As demais operações são as da `str` montada
+
+    def __eq__(self, outro: Any) -> bool:
+        return str(self) == texto(outro)
+
+    def __ne__(self, outro: Any) -> bool:
+        return str(self) != texto(outro)
+
+    def __lt__(self, outro: Any) -> bool:
+        return str(self) < texto(outro)
+
+    def __le__(self, outro: Any) -> bool:
+        return str(self) <= texto(outro)
+
+    def __gt__(self, outro: Any) -> bool:
+        return str(self) > texto(outro)
+
+    def __ge__(self, outro: Any) -> bool:
+        return str(self) >= texto(outro)
+
+    def __add__(self, outro: Any):
+        return concatenar(self, outro)
+
+    def __radd__(self, outro: Any):
+        if outro.__class__ is str:
+            return concatenar(outro, self)
+        return outro + str(self)
+
+    def __sub__(self, outro: Any):
+        return str(self) - texto(outro)
+
+    def __rsub__(self, outro: Any):
+        return outro - str(self)
+
+    def __mul__(self, outro: Any):
+        return str(self) * texto(outro)
+
+    def __rmul__(self, outro: Any):
+        return outro * str(self)
+
+    def __truediv__(self, outro: Any):
+        return str(self) / texto(outro)
+
+    def __rtruediv__(self, outro: Any):
+        return outro / str(self)
+
+    def __mod__(self, outro: Any):
+        return str(self) % texto(outro)
+
+    def __rmod__(self, outro: Any):
+        return outro % str(self)
+
+    def __neg__(self):
+        return -str(self)
+
+    def __pos__(self):
+        return +str(self)
+
+
+def texto(valor: Any) -> Any:
+    """O valor com as cordas montadas como `str`; os demais valores não mudam."""
+    return str(valor) if valor.__class__ is Corda else valor
+
+
+def concatenar(esquerda: Union[Corda, str], direita: Any) -> Union[Corda, str]:
+    """`esquerda + direita` com uma cadeia à esquerda, convertendo números à direita."""
+    classe = direita.__class__
+    if classe is not str:
+        if classe is Corda or isinstance(direita, (int, float)):
+            direita = str(direita)
+        else:
+            # Mesmo resultado (ou erro) da concatenação entre `str`
+            return str(esquerda) + direita
+    if esquerda.__class__ is Corda:
+        return esquerda.anexar(direita)
+    comprimento = len(esquerda) + len(direita)
+    if comprimento < LIMITE_CORDA:
+        return esquerda + direita
+    return Corda(esquerda, direita, comprimento)
@@ -0,0 +1,395 @@
+"""
+Backend de execução por closures para a linguagem Portugol.
+
+Em vez de despachar cada nó com `getattr` durante a execução, a AST é
+compilada uma única vez em uma árvore de funções Python já ligadas: o
+operador de cada expressão é resolvido em tempo de compilação e os filhos
+de cada nó já estão compilados. Cada comando compilado recebe o `Ambiente`
+atual; cada expressão compilada recebe o `Ambiente` e devolve seu valor.
+"""
+
+from typing import Any, Callable, List
+
+from .ast import (
+    Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .analise import pode_ser_vetor, valor_constante
+from .interpretador import Ambiente, ErroExecucao, Funcao, Interpretador, RetornoFuncao
+from .operadores import operador_binario, operador_unario
+from .vetores import CLASSES_VETOR, COMPOSTOS, atribuir_composto, como_vetor, criar_vetor
+
+Executavel = Callable[[Ambiente], Any]
+
+
+class FuncaoCompilada(Funcao):
+    __slots__ = ("corpo", "parametros")
+
+    def __init__(self, declaracao: DeclaracaoFuncao, ambiente_definicao: Ambiente,
+                 corpo: Executavel, parametros: List[str]):
+        super().__init__(declaracao, ambiente_definicao)
+        self.corpo = corpo
+        self.parametros = parametros
+
+    def executar(self, valores) -> Any:
+        ambiente_funcao = Ambiente(self.ambiente_definicao)
+        ambiente_funcao.valores.update(zip(self.parametros, valores))
+        try:
+            self.corpo(ambiente_funcao)
+            return None
+        except RetornoFuncao as r:
+            return r.valor
+
+
+class CompiladorClosures:
+    def __init__(self, interpretador: Interpretador):
+        self.interpretador = interpretador
+
+    def compilar(self, no) -> Executavel:
+        metodo_nome = 'compilar_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.compilar_no_desconhecido)
+        return metodo(no)
+
+    def compilar_no_desconhecido(self, no):
+        raise ErroExecucao(f"Tipo de nó AST desconhecido: {type(no).__name__}")
+
+    def compilar_Programa(self, programa: Programa):
+        return self.compilar(programa.declaracoes)
+
+    def compilar_Bloco(self, bloco: Bloco):
+        comandos = tuple(self.compilar(no) for no in bloco.declaracoes)
+
+        def executar_bloco(amb):
+            amb = Ambiente(amb)
+            for comando in comandos:
+                comando(amb)
+        return executar_bloco
+
+    # Acesso a uma variável pelo nome; CompiladorSlots troca por acesso ao quadro
+
+    def leitor_nome(self, no, nome: str) -> Executavel:
+        return self.compilar_expressao_ExpressaoIdentificador(ExpressaoIdentificador(nome))
+
+    def escritor_nome(self, no, nome: str) -> Callable[[Any, Any], None]:
+        return _atribuidor(nome)
+
+    def compilar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        nome = declaracao.identificador
+        if declaracao.dimensoes is not None:
+            criar = self.compilar_criacao_vetor(declaracao)
+
+            def declarar_vetor(amb):
+                amb.valores[nome] = criar(amb)
+            return declarar_vetor
+        if declaracao.inicializador:
+            inicializador = self.compilar_expressao(declaracao.inicializador)
+
+            def declarar(amb):
+                amb.valores[nome] = inicializador(amb)
+        else:
+            def declarar(amb):
+                amb.valores[nome] = None
+        return declarar
+
+    def compilar_criacao_vetor(self, declaracao: DeclaracaoVariavel) -> Executavel:
+        nome, tipo = declaracao.identificador, declaracao.tipo.nome
+        dimensoes = tuple(self.compilar_expressao(tamanho) for tamanho in declaracao.dimensoes)
+        if not declaracao.inicializador:
+            return lambda amb: criar_vetor(nome, tipo, [dimensao(amb) for dimensao in dimensoes])
+        inicializador = self.compilar_expressao(declaracao.inicializador)
+        return lambda amb: criar_vetor(nome, tipo, [dimensao(amb) for dimensao in dimensoes], inicializador(amb))
+
+    def compilar_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        nome = declaracao.nome
+        corpo = self.compilar(declaracao.corpo)
+        parametros = [param.identificador for param in declaracao.parametros]
+
+        def declarar_funcao(amb):
+            amb.valores[nome] = FuncaoCompilada(declaracao, amb, corpo, parametros)
+        return declarar_funcao
+
+    def compilar_ComandoAtribuicao(self, comando: ComandoAtribuicao):
+        nome = comando.identificador
+        atribuir = self.escritor_nome(comando, nome)
+        expressao = self.compilar_expressao(comando.expressao)
+        if pode_ser_vetor(comando.expressao):
+            # Um vetor atribuído a uma variável que já guarda um vetor é copiado para ele
+            ler = self.leitor_nome(comando, nome)
+
+            def executar_atribuicao_vetor(amb):
+                valor = expressao(amb)
+                if valor.__class__ in COMPOSTOS:
+                    valor = atribuir_composto(ler(amb), valor, nome)
+                atribuir(amb, valor)
+            return executar_atribuicao_vetor
+
+        def executar_atribuicao(amb):
+            atribuir(amb, expressao(amb))
+        return executar_atribuicao
+
+    def compilar_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        nome = comando.identificador
+        ler = self.leitor_nome(comando, nome)
+        indices = tuple(self.compilar_expressao(indice) for indice in comando.indices)
+        expressao = self.compilar_expressao(comando.expressao)
+        if len(indices) == 1:
+            indice = indices[0]
+
+            def atribuir_elemento(amb):
+                vetor = ler(amb)
+                if vetor.__class__ not in CLASSES_VETOR:
+                    como_vetor(vetor, nome)
+                vetor.atribuir1(indice(amb), expressao(amb))
+            return atribuir_elemento
+
+        if len(indices) == 2:
+            linha, coluna = indices
+
+            def atribuir_elemento_matriz(amb):
+                vetor = ler(amb)
+                if vetor.__class__ not in CLASSES_VETOR:
+                    como_vetor(vetor, nome)
+                vetor.atribuir2(linha(amb), coluna(amb), expressao(amb))
+            return atribuir_elemento_matriz
+
+        def atribuir_elemento_geral(amb):
+            vetor = como_vetor(ler(amb), nome)
+            vetor.atribuir([indice(amb) for indice in indices], expressao(amb))
+        return atribuir_elemento_geral
+
+    def compilar_ComandoSe(self, comando: ComandoSe):
+        condicao = self.compilar_expressao(comando.condicao)
+        entao = self.compilar(comando.comando_entao)
+        if not comando.comando_senao:
+            def executar_se(amb):
+                if condicao(amb):
+                    entao(amb)
+            return executar_se
+
+        senao = self.compilar(comando.comando_senao)
+
+        def executar_se_senao(amb):
+            if condicao(amb):
+                entao(amb)
+            else:
+                senao(amb)
+        return executar_se_senao
+
+    def compilar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        condicao = self.compilar_expressao(comando.condicao)
+        corpo = self.compilar(comando.comando)
+
+        def executar_enquanto(amb):
+            while condicao(amb):
+                corpo(amb)
+        return executar_enquanto
+
+    def compilar_ComandoPara(self, comando: ComandoPara):
+        inicializacao = self.compilar(comando.inicializacao)
+        condicao = self.compilar_expressao(comando.condicao)
+        incremento = self.compilar(comando.incremento)
+        corpo = self.compilar(comando.comando)
+
+        def executar_para(amb):
+            # O laço 'para' cria seu próprio escopo
+            amb = Ambiente(amb)
+            inicializacao(amb)
+            while condicao(amb):
+                corpo(amb)
+                incremento(amb)
+        return executar_para
+
+    def compilar_ComandoEscreva(self, comando: ComandoEscreva):
+        expressoes = tuple(self.compilar_expressao(expr) for expr in comando.expressoes)
+        escrever = self.interpretador.es.escrever
+
+        def executar_escreva(amb):
+            escrever("".join([str(expressao(amb)) for expressao in expressoes]) + "\n")
+        return executar_escreva
+
+    def compilar_ComandoLeia(self, comando: ComandoLeia):
+        atribuir = self.escritor_nome(comando, comando.identificador)
+        ler_entrada = self.interpretador.ler_entrada
+
+        def executar_leia(amb):
+            atribuir(amb, ler_entrada())
+        return executar_leia
+
+    def compilar_ComandoRetorne(self, comando: ComandoRetorne):
+        if not comando.expressao:
+            def executar_retorne_vazio(amb):
+                raise RetornoFuncao(None)
+            return executar_retorne_vazio
+
+        expressao = self.compilar_expressao(comando.expressao)
+
+        def executar_retorne(amb):
+            raise RetornoFuncao(expressao(amb))
+        return executar_retorne
+
+    def compilar_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        return self.compilar_expressao(chamada)
+
+    # Expressões
+
+    def compilar_expressao(self, no) -> Executavel:
+        metodo_nome = 'compilar_expressao_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.compilar_expressao_desconhecida)
+        return metodo(no)
+
+    def compilar_expressao_desconhecida(self, no):
+        raise ErroExecucao(f"Tipo de nó de expressão desconhecido: {type(no).__name__}")
+
+    def compilar_expressao_ExpressaoLiteral(self, expressao: ExpressaoLiteral):
+        valor = expressao.valor
+        return lambda amb: valor
+
+    def compilar_expressao_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador):
+        nome = expressao.nome
+
+        def ler_variavel(amb):
+            while amb is not None:
+                valores = amb.valores
+                if nome in valores:
+                    return valores[nome]
+                amb = amb.pai
+            raise ErroExecucao(f"Variável '{nome}' não definida.")
+        return ler_variavel
+
+    def compilar_expressao_ExpressaoIndice(self, expressao: ExpressaoIndice):
+        nome = expressao.nome
+        ler = self.leitor_nome(expressao, nome)
+        indices = tuple(self.compilar_expressao(indice) for indice in expressao.indices)
+        if len(indices) == 1:
+            indice = indices[0]
+
+            def ler_elemento(amb):
+                vetor = ler(amb)
+                if vetor.__class__ not in CLASSES_VETOR:
+                    como_vetor(vetor, nome)
+                return vetor.obter1(indice(amb))
+            return ler_elemento
+
+        if len(indices) == 2:
+            linha, coluna = indices
+
+            def ler_elemento_matriz(amb):
+                vetor = ler(amb)
+                if vetor.__class__ not in CLASSES_VETOR:
+                    como_vetor(vetor, nome)
+                return vetor.obter2(linha(amb), coluna(amb))
+            return ler_elemento_matriz
+
+        return lambda amb: como_vetor(ler(amb), nome).obter([indice(amb) for indice in indices])
+
+    def compilar_expressao_ExpressaoVetor(self, expressao: ExpressaoVetor):
+        constante = valor_constante(expressao)
+        if constante is not None:
+            # Literal só com constantes: a lista é montada uma vez (criar_vetor e copiar não a alteram)
+            return lambda amb: constante
+        elementos = tuple(self.compilar_expressao(elemento) for elemento in expressao.elementos)
+        return lambda amb: [elemento(amb) for elemento in elementos]
+
+    def compilar_expressao_ExpressaoUnaria(self, expressao: ExpressaoUnaria):
+        operando = self.compilar_expressao(expressao.expressao)
+        operacao = expressao.operacao or operador_unario(expressao.operador)
+        return lambda amb: operacao(operando(amb))
+
+    def compilar_expressao_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        # A verificação de tipos pode ter escolhido uma implementação sem coerção
+        operacao = expressao.operacao or operador_binario(expressao.operador)
+        esquerda = self.compilar_expressao(expressao.esquerda)
+        if isinstance(expressao.direita, ExpressaoLiteral):
+            # Caso comum em laços (i < 10, i + 1): o operando direito é constante
+            constante = expressao.direita.valor
+            return lambda amb: operacao(esquerda(amb), constante)
+        direita = self.compilar_expressao(expressao.direita)
+        return lambda amb: operacao(esquerda(amb), direita(amb))
+
+    def compilar_expressao_ExpressaoLogica(self, expressao: ExpressaoLogica):
+        esquerda = self.compilar_expressao(expressao.esquerda)
+        direita = self.compilar_expressao(expressao.direita)
+        if expressao.operador == "e":
+            return lambda amb: esquerda(amb) and direita(amb)
+        if expressao.operador == "ou":
+            return lambda amb: esquerda(amb) or direita(amb)
+        raise ErroExecucao(f"Operador lógico desconhecido: {expressao.operador}")
+
+    def compilar_expressao_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        nome = chamada.nome
+        argumentos = tuple(self.compilar_expressao(arg) for arg in chamada.argumentos)
+        ler_funcao = self.compilar_expressao_ExpressaoIdentificador(ExpressaoIdentificador(nome))
+
+        def chamar(amb):
+            funcao_obj = ler_funcao(amb)
+            if not isinstance(funcao_obj, FuncaoCompilada):
+                raise ErroExecucao(f"'{nome}' não é uma função.")
+            parametros = funcao_obj.parametros
+            if len(argumentos) != len(parametros):
+                raise ErroExecucao(f"Número incorreto de argumentos para '{nome}'.")
+
+            # O novo ambiente é filho do ambiente onde a função foi DEFINIDA
+            ambiente_funcao = Ambiente(funcao_obj.ambiente_definicao)
+            valores = ambiente_funcao.valores
+            for param, arg in zip(parametros, argumentos):
+                valores[param] = arg(amb)
+            try:
+                funcao_obj.corpo(ambiente_funcao)
+                return None
+            except RetornoFuncao as r:
+                return r.valor
+
+        memoizacao = self.interpretador.memoizacao
+        if memoizacao is None:
+            return chamar
+        return chamada_memoizada(memoizacao, nome, ler_funcao, argumentos, FuncaoCompilada)
+
+
+def chamada_memoizada(memoizacao, nome: str, ler_funcao: Executavel, argumentos, classe_funcao) -> Executavel:
+    """Chamada compilada que consulta o cache quando a função chamada é pura.
+
+    A função só é conhecida na execução, então a pureza é verificada a cada
+    chamada; `classe_funcao` deve implementar `executar(valores)`.
+    """
+    def chamar(amb):
+        funcao_obj = ler_funcao(amb)
+        if not isinstance(funcao_obj, classe_funcao):
+            raise ErroExecucao(f"'{nome}' não é uma função.")
+        declaracao = funcao_obj.declaracao
+        if len(argumentos) != len(declaracao.parametros):
+            raise ErroExecucao(f"Número incorreto de argumentos para '{nome}'.")
+        valores = tuple(arg(amb) for arg in argumentos)
+        if memoizacao.pura(declaracao):
+            return memoizacao.chamar(declaracao, valores, lambda: funcao_obj.executar(valores))
+        return funcao_obj.executar(valores)
+    return chamar
+
+
+def _atribuidor(nome: str) -> Callable[[Ambiente, Any], None]:
+    def atribuir(amb, valor):
+        while amb is not None:
+            valores = amb.valores
+            if nome in valores:
+                valores[nome] = valor
+                return
+            amb = amb.pai
+        raise ErroExecucao(f"Variável '{nome}' não definida para atribuição.")
+    return atribuir
+
+
+class InterpretadorClosures(Interpretador):
+    """Interpretador que compila a AST em closures antes de executá-la."""
+
+    def interpretar(self, programa: Programa):
+        try:
+            if self.memoizacao is not None:
+                self.memoizacao.analisar(programa)
+            executar = CompiladorClosures(self).compilar(programa)
+            executar(self.ambiente_global)
+        except ErroExecucao as e:
+            self.es.escrever(f"Erro de execução: {e}\n")
+        finally:
+            self.es.descarregar()
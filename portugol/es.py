@@ -0,0 +1,148 @@
+"""
+Entrada e saída dos programas Portugol.
+
+`EntradaSaida` é o canal usado por `escreva` e `leia` em todos os backends.
+A saída é acumulada em um buffer e só é gravada quando passa de
+`limite_buffer` caracteres, antes de uma leitura que precise esperar por
+mais entrada e ao fim da execução. A entrada é lida em blocos grandes e
+dividida em linhas (ou, com `por_token=True`, em palavras separadas por
+espaços) sem uma chamada de sistema por `leia`.
+
+Os fluxos podem ser injetados, por exemplo `io.StringIO` nos testes; sem
+eles são usados `sys.stdin` e `sys.stdout` do momento da leitura/escrita.
+"""
+
+import codecs
+import sys
+from typing import List, Optional, TextIO
+
+# Caracteres acumulados antes de gravar a saída
+LIMITE_BUFFER_PADRAO = 1 << 16
+
+# Tamanho dos blocos lidos da entrada
+TAMANHO_BLOCO = 1 << 16
+
+
+class EntradaSaida:
+    def __init__(self, entrada: Optional[TextIO] = None, saida: Optional[TextIO] = None,
+                 limite_buffer: Optional[int] = None, por_token: bool = False,
+                 tamanho_bloco: int = TAMANHO_BLOCO):
+        self._entrada = entrada
+        self._saida = saida
+        self.tamanho_bloco = tamanho_bloco
+        # None: grava a cada escreva em um terminal e a cada LIMITE_BUFFER_PADRAO caracteres fora dele
+        self.limite_buffer = limite_buffer
+        self.por_token = por_token
+
+        self._partes: List[str] = []
+        self._tamanho = 0
+
+        # Itens (linhas ou palavras) já lidos e ainda não consumidos, e o trecho incompleto
+        self._itens: List[str] = []
+        self._indice = 0
+        self._resto = ""
+        self._fim = False
+        self._decodificador = None
+
+    @property
+    def entrada(self) -> TextIO:
+        return self._entrada if self._entrada is not None else sys.stdin
+
+    @property
+    def saida(self) -> TextIO:
+        return self._saida if self._saida is not None else sys.stdout
+
+    # Saída
+
+    def escrever(self, texto: str):
+        self._partes.append(texto)
+        self._tamanho += len(texto)
+        if self.limite_buffer is None:
+            self.limite_buffer = 0 if _terminal(self.saida) else LIMITE_BUFFER_PADRAO
+        if self._tamanho >= self.limite_buffer:
+            self.descarregar()
+
+    def descarregar(self):
+        if self._partes:
+            saida = self.saida
+            saida.write("".join(self._partes))
+            self._partes.clear()
+            self._tamanho = 0
+            saida.flush()
+
+    # Entrada
+
+    def ler(self) -> Optional[str]:
+        """Próxima linha (sem o fim de linha) ou palavra da entrada; None no fim da entrada."""
+        if self._indice < len(self._itens):
+            item = self._itens[self._indice]
+            self._indice += 1
+            return item
+        return self._ler_itens()
+
+    def _ler_itens(self) -> Optional[str]:
+        # A leitura pode bloquear: o que já foi escrito (ex.: uma pergunta) precisa aparecer antes
+        self.descarregar()
+        while not self._fim:
+            bloco = self._ler_bloco()
+            if not bloco:
+                self._fim = True
+                break
+            itens = self._dividir(self._resto + bloco)
+            if itens:
+                self._itens = itens
+                self._indice = 1
+                return itens[0]
+        self._itens, self._indice = [], 0
+        if self.por_token:
+            resto, self._resto = self._resto.split(), ""
+            if resto:
+                self._itens, self._indice = resto, 1
+                return resto[0]
+            return None
+        if self._resto:
+            linha, self._resto = self._resto, ""
+            return linha[:-1] if linha.endswith("\r") else linha
+        return None
+
+    def _dividir(self, texto: str) -> List[str]:
+        if self.por_token:
+            # Uma palavra no fim do bloco pode continuar no próximo
+            if texto and not texto[-1].isspace():
+                corte = max(texto.rfind(c) for c in " \t\r\n\f\v") + 1
+                self._resto = texto[corte:]
+                texto = texto[:corte]
+            else:
+                self._resto = ""
+            return texto.split()
+        linhas = texto.split("\n")
+        self._resto = linhas.pop()
+        if "\r" in texto:
+            linhas = [linha[:-1] if linha.endswith("\r") else linha for linha in linhas]
+        return linhas
+
+    def _ler_bloco(self) -> str:
+        entrada = self.entrada
+        binario = getattr(entrada, "buffer", None)
+        if binario is not None and hasattr(binario, "read1"):
+            # read1 devolve o que já está disponível, sem esperar o bloco inteiro (terminais, pipes)
+            if self._decodificador is None:
+                codificacao = getattr(entrada, "encoding", None) or "utf-8"
+                self._decodificador = codecs.getincrementaldecoder(codificacao)(
+                    getattr(entrada, "errors", None) or "strict")
+            while True:
+                dados = binario.read1(self.tamanho_bloco)
+                texto = self._decodificador.decode(dados, final=not dados)
+                # Um bloco pode terminar no meio de um caractere: o decodificador o guarda
+                if texto or not dados:
+                    return texto
+        if _terminal(entrada):
+            return entrada.readline()
+        return entrada.read(self.tamanho_bloco)
+
+
+def _terminal(fluxo) -> bool:
+    try:
+        return fluxo.isatty()
+    except (AttributeError, ValueError):
+        return False
@@ -0,0 +1,33 @@
+"""
+Registro dos backends de execução disponíveis.
+
+Os módulos de cada backend só são importados quando o backend é escolhido.
+"""
+
+import importlib
+from typing import Dict, Tuple
+
+BACKEND_PADRAO = "arvore"
+
+# nome do backend -> (módulo, classe do interpretador)
+BACKENDS: Dict[str, Tuple[str, str]] = {
+    "arvore": ("portugol.interpretador", "Interpretador"),
+    "closures": ("portugol.closures", "InterpretadorClosures"),
+    "vm": ("portugol.vm", "InterpretadorVM"),
+    "slots": ("portugol.slots", "InterpretadorSlots"),
+    "python": ("portugol.transpilador", "InterpretadorPython"),
+    "jit": ("portugol.jit", "InterpretadorJIT"),
+}
+
+
+def obter_backend(nome: str):
+    try:
+        modulo_nome, classe_nome = BACKENDS[nome]
+    except KeyError:
+        opcoes = ", ".join(sorted(BACKENDS))
+        raise ValueError(f"Backend desconhecido: '{nome}'. Opções: {opcoes}.") from None
+    return getattr(importlib.import_module(modulo_nome), classe_nome)
+
+
+def criar_interpretador(backend: str = BACKEND_PADRAO, **opcoes):
+    return obter_backend(backend)(**opcoes)
@@ -0,0 +1,202 @@
+"""
+Reanálise incremental do código-fonte, para integração com editores.
+
+Um `Documento` guarda o código, a AST e o trecho do código ocupado por cada
+item (declaração ou comando) do bloco principal do programa. A cada edição
+de texto, apenas os itens que a edição toca são analisados de novo: o trecho
+deles é envolvido em `programa{ ... }`, analisado pelo mesmo parser LALR e os
+novos nós substituem os antigos na lista do bloco principal. Uma função
+editada é reanalisada por inteiro; o resto do arquivo não passa pelo Lark.
+
+Se o trecho sozinho não for válido (por exemplo, ao abrir uma chave que só
+fecha em outro item), a região cresce para os itens vizinhos até que a
+análise funcione; edições fora do bloco principal analisam o arquivo todo.
+
+    documento = Documento(codigo)
+    resultado = documento.editar(Edicao(inicio, fim, "novo texto"))
+    resultado.programa, resultado.alterados
+
+Os índices dos itens seguintes à edição são deslocados de forma preguiçosa,
+só até onde foi a edição anterior: ao digitar em um mesmo lugar, o custo de
+cada edição não depende do tamanho do arquivo, exceto pela cópia do texto.
+Com `posicoes`, os nós reanalisados recebem as posições no arquivo inteiro;
+se a edição muda o número de linhas, as linhas dos itens seguintes são
+ajustadas (o que percorre esses itens).
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, NamedTuple, Optional
+
+from lark.exceptions import LarkError
+
+from .analise import percorrer
+from .ast import ASTNode, Programa
+from .parser import obter_parser
+from .transformer import PortugolTransformer
+
+# Envolve um trecho de itens do bloco principal para analisá-lo sozinho
+PREFIXO = "programa{"
+SUFIXO = "\n}"
+
+
+class Edicao(NamedTuple):
+    """Substitui `codigo[inicio:fim]` por `texto` (índices de caracteres)."""
+    inicio: int
+    fim: int
+    texto: str
+
+
+class Reanalise(NamedTuple):
+    programa: Programa
+    # Nós novos do bloco principal e os nós que eles substituíram
+    alterados: List[ASTNode]
+    removidos: List[ASTNode]
+    # Se o arquivo todo foi analisado de novo
+    completa: bool
+
+
+class Documento:
+    def __init__(self, codigo: str, posicoes: bool = False):
+        self.posicoes = posicoes
+        self.codigo = codigo
+        self.programa: Optional[Programa] = None
+        # Início e fim (exclusivo) de cada item do bloco principal no código; aos
+        # itens a partir de `_pendente` ainda falta somar `_deslocamento`
+        self._inicios: List[int] = []
+        self._fins: List[int] = []
+        self._pendente = 0
+        self._deslocamento = 0
+        # Índices logo após o '{' e do '}' do bloco principal
+        self._abre = self._fecha = 0
+        self._analisar_tudo(codigo)
+
+    def editar(self, edicao: Edicao) -> Reanalise:
+        """
+        Aplica a edição ao código e atualiza a AST.
+
+        Com um erro de sintaxe, a exceção do Lark é propagada; o código editado
+        é mantido e a próxima edição analisa o arquivo todo.
+        """
+        inicio, fim, texto = edicao
+        if not 0 <= inicio <= fim <= len(self.codigo):
+            raise ValueError(f"Edição fora do código: [{inicio}, {fim}) em {len(self.codigo)} caracteres.")
+        anterior = self.codigo
+        self.codigo = anterior[:inicio] + texto + anterior[fim:]
+
+        if self.programa is None or not self._abre <= inicio <= fim <= self._fecha:
+            removidos = [self.programa] if self.programa is not None else []
+            self._analisar_tudo(self.codigo)
+            return Reanalise(self.programa, [self.programa], removidos, True)
+
+        deslocamento = len(texto) - (fim - inicio)
+        # Itens tocados pela edição, inclusive os que apenas encostam nela
+        primeiro = self._buscar(self._fins, inicio, bisect_left)
+        ultimo = self._buscar(self._inicios, fim, bisect_right)
+        if self.posicoes:
+            # Itens na mesma linha do fim da edição mudam de coluna: entram na região
+            while ultimo < len(self._inicios) and "\n" not in anterior[fim:self._inicio(ultimo)]:
+                ultimo += 1
+
+        passo = 1
+        while True:
+            novos = self._analisar_regiao(primeiro, ultimo, deslocamento)
+            if novos is not None:
+                break
+            if primeiro == 0 and ultimo == len(self._inicios):
+                # Nem o bloco principal inteiro é válido: o erro vem da análise completa
+                self._analisar_tudo(self.codigo)
+                return Reanalise(self.programa, [self.programa], [], True)
+            primeiro, ultimo = max(0, primeiro - passo), min(len(self._inicios), ultimo + passo)
+            passo *= 2
+
+        itens, inicios, fins = novos
+        declaracoes = self.programa.declaracoes.declaracoes
+        removidos = declaracoes[primeiro:ultimo]
+        declaracoes[primeiro:ultimo] = itens
+        self._deslocar(ultimo, deslocamento)
+        self._inicios[primeiro:ultimo] = inicios
+        self._fins[primeiro:ultimo] = fins
+        self._pendente += len(itens) - (ultimo - primeiro)
+        self._fecha += deslocamento
+
+        if self.posicoes:
+            linhas = texto.count("\n") - anterior.count("\n", inicio, fim)
+            if linhas:
+                for item in declaracoes[primeiro + len(itens):]:
+                    for no in percorrer(item):
+                        if isinstance(no, ASTNode) and no.linha is not None:
+                            no.linha += linhas
+        return Reanalise(self.programa, itens, removidos, False)
+
+    def _analisar_tudo(self, codigo: str):
+        self.programa = None
+        arvore = obter_parser(posicoes=True).parse(codigo)
+        bloco = arvore.children[0]
+        self._abre, self._fecha = bloco.meta.start_pos + 1, bloco.meta.end_pos - 1
+        self._inicios = [item.meta.start_pos for item in bloco.children]
+        self._fins = [item.meta.end_pos for item in bloco.children]
+        self._pendente, self._deslocamento = len(self._inicios), 0
+        self.programa = PortugolTransformer(self.posicoes).transform(arvore)
+
+    # Deslocamento preguiçoso dos índices: uma edição soma o deslocamento aos
+    # itens seguintes só até a edição anterior, em vez de até o fim do arquivo
+
+    def _inicio(self, item: int) -> int:
+        return self._inicios[item] + (self._deslocamento if item >= self._pendente else 0)
+
+    def _fim(self, item: int) -> int:
+        return self._fins[item] + (self._deslocamento if item >= self._pendente else 0)
+
+    def _buscar(self, indices: List[int], posicao: int, busca) -> int:
+        item = busca(indices, posicao, 0, self._pendente)
+        if item < self._pendente:
+            return item
+        return busca(indices, posicao - self._deslocamento, self._pendente, len(indices))
+
+    def _deslocar(self, item: int, deslocamento: int):
+        """Soma `deslocamento` aos índices dos itens a partir de `item`; depois, `_pendente >= item`."""
+        pendente, acumulado, total = self._pendente, self._deslocamento, len(self._inicios)
+        if item > pendente:
+            self._somar(pendente, item, acumulado)
+            self._pendente, self._deslocamento = item, acumulado + deslocamento
+        elif pendente - item <= total - pendente:
+            self._somar(item, pendente, deslocamento)
+            self._deslocamento = acumulado + deslocamento
+        else:
+            # Mais curto materializar daí até o fim e recomeçar a pendência em `item`
+            self._somar(pendente, total, acumulado)
+            self._pendente, self._deslocamento = item, deslocamento
+
+    def _somar(self, inicio: int, fim: int, deslocamento: int):
+        if deslocamento and inicio < fim:
+            self._inicios[inicio:fim] = [i + deslocamento for i in self._inicios[inicio:fim]]
+            self._fins[inicio:fim] = [f + deslocamento for f in self._fins[inicio:fim]]
+
+    def _analisar_regiao(self, primeiro: int, ultimo: int, deslocamento: int):
+        """Analisa, no código já editado, o trecho entre os itens intactos vizinhos de [primeiro, ultimo)."""
+        inicio = self._fim(primeiro - 1) if primeiro > 0 else self._abre
+        fim = (self._inicio(ultimo) if ultimo < len(self._inicios) else self._fecha) + deslocamento
+        trecho = self.codigo[inicio:fim]
+        # Um comentário na última linha do trecho engoliria o item seguinte ou o '}' final
+        if "//" in trecho[trecho.rfind("\n") + 1:]:
+            return None
+        try:
+            arvore = obter_parser(posicoes=True).parse(PREFIXO + trecho + SUFIXO)
+        except LarkError:
+            return None
+
+        base = inicio - len(PREFIXO)
+        bloco = arvore.children[0]
+        inicios = [item.meta.start_pos + base for item in bloco.children]
+        fins = [item.meta.end_pos + base for item in bloco.children]
+        itens = PortugolTransformer(self.posicoes).transform(arvore).declaracoes.declaracoes
+        if self.posicoes:
+            linha = self.codigo.count("\n", 0, inicio)
+            coluna = inicio - (self.codigo.rfind("\n", 0, inicio) + 1) - len(PREFIXO)
+            for item in itens:
+                for no in percorrer(item):
+                    if isinstance(no, ASTNode) and no.linha is not None:
+                        if no.linha == 1:
+                            no.coluna += coluna
+                        no.linha += linha
+        return itens, inicios, fins
@@ -6,10 +6,13 @@ Interpretador para a linguagem Portugol.
 from typing import Any, Dict, Optional
 from .ast import (
     Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao,
-    ComandoAtribuicao, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
     ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
-    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoBinaria, ExpressaoUnaria
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
 )
+from .cadeias import Corda, concatenar
+from .es import EntradaSaida
 
 
 class ErroExecucao(Exception):
@@ -21,7 +24,14 @@ class RetornoFuncao(Exception):
         self.valor = valor
 
 
+# Importados como módulos e depois de ErroExecucao, da qual portugol.vetores e
+# portugol.analise (por meio de portugol.operadores) dependem
+from . import analise, vetores  # noqa: E402
+
+
 class Ambiente:
+    __slots__ = ("valores", "pai")
+
     def __init__(self, pai: Optional["Ambiente"] = None):
         self.valores: Dict[str, Any] = {}
         self.pai = pai
@@ -47,21 +57,40 @@ class Ambiente:
 
 # Classe para representar uma função em tempo de execução (closure)
 class Funcao:
+    __slots__ = ("declaracao", "ambiente_definicao")
+
     def __init__(self, declaracao: DeclaracaoFuncao, ambiente_definicao: Ambiente):
         self.declaracao = declaracao
         self.ambiente_definicao = ambiente_definicao
 
 
 class Interpretador:
-    def __init__(self):
+    # Executa os laços 'para' de contagem com um contador nativo (executar_laco_contado)
+    lacos_contados = True
+
+    def __init__(self, memoizacao=None, es: Optional[EntradaSaida] = None):
         self.ambiente_global = Ambiente()
         self.ambiente_atual = self.ambiente_global
+        # Memoizacao (portugol.memoizacao) das funções puras, ou None
+        self.memoizacao = memoizacao
+        # Canal usado por escreva, leia e pelas mensagens de erro
+        self.es = es if es is not None else EntradaSaida()
+        # Variáveis atribuídas dentro de funções, conhecidas depois de interpretar() analisar o programa
+        self.atribuidos_por_funcoes = None
+        # id do ComandoPara -> (comando, LacoContado ou None)
+        self._lacos: Dict[int, Any] = {}
 
     def interpretar(self, programa: Programa):
         try:
+            if self.memoizacao is not None:
+                self.memoizacao.analisar(programa)
+            if self.lacos_contados:
+                self.atribuidos_por_funcoes = analise.nomes_atribuidos_em_funcoes(programa)
             self.executar(programa)
         except ErroExecucao as e:
-            print(f"Erro de execução: {e}")
+            self.es.escrever(f"Erro de execução: {e}\n")
+        finally:
+            self.es.descarregar()
 
     def executar(self, no):
         metodo_nome = 'visitar_' + type(no).__name__
@@ -85,6 +114,12 @@ class Interpretador:
             self.ambiente_atual = ambiente_anterior
 
     def visitar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        if declaracao.dimensoes is not None:
+            dimensoes = [self.avaliar(tamanho) for tamanho in declaracao.dimensoes]
+            inicial = self.avaliar(declaracao.inicializador) if declaracao.inicializador else None
+            valor = vetores.criar_vetor(declaracao.identificador, declaracao.tipo.nome, dimensoes, inicial)
+            self.ambiente_atual.definir(declaracao.identificador, valor)
+            return
         valor = None
         if declaracao.inicializador:
             valor = self.avaliar(declaracao.inicializador)
@@ -97,8 +132,17 @@ class Interpretador:
 
     def visitar_ComandoAtribuicao(self, comando: ComandoAtribuicao):
         valor = self.avaliar(comando.expressao)
+        if valor.__class__ in vetores.COMPOSTOS:
+            # Um vetor atribuído a uma variável que já guarda um vetor é copiado para ele
+            atual = self.ambiente_atual.obter(comando.identificador)
+            valor = vetores.atribuir_composto(atual, valor, comando.identificador)
         self.ambiente_atual.atribuir(comando.identificador, valor)
 
+    def visitar_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        vetor = vetores.como_vetor(self.ambiente_atual.obter(comando.identificador), comando.identificador)
+        indices = [self.avaliar(indice) for indice in comando.indices]
+        vetor.atribuir(indices, self.avaliar(comando.expressao))
+
     def visitar_ComandoSe(self, comando: ComandoSe):
         if self.avaliar(comando.condicao):
             self.executar(comando.comando_entao)
@@ -115,29 +159,62 @@ class Interpretador:
         self.ambiente_atual = Ambiente(ambiente_anterior)
         try:
             self.executar(comando.inicializacao)
+            laco = self.laco_contado(comando)
+            if laco is not None:
+                self.executar_laco_contado(comando, laco)
+                return
             while self.avaliar(comando.condicao):
                 self.executar(comando.comando)
                 self.executar(comando.incremento)
         finally:
             self.ambiente_atual = ambiente_anterior
 
+    def laco_contado(self, comando: ComandoPara):
+        """A forma de contagem do laço (`analise.detectar_laco_contado`), reconhecida uma vez por laço."""
+        if self.atribuidos_por_funcoes is None:
+            return None
+        entrada = self._lacos.get(id(comando))
+        if entrada is None or entrada[0] is not comando:
+            entrada = (comando, analise.detectar_laco_contado(comando, self.atribuidos_por_funcoes))
+            self._lacos[id(comando)] = entrada
+        return entrada[1]
+
+    def executar_laco_contado(self, comando: ComandoPara, laco):
+        # O corpo não altera a variável nem o limite: os valores vêm de um range e
+        # a variável é atualizada direto no ambiente onde está, visível para o corpo
+        variavel = laco.variavel
+        ambiente = self.ambiente_atual
+        while variavel not in ambiente.valores:
+            ambiente = ambiente.pai
+        valores = ambiente.valores
+        contagem = analise.Contagem(valores[variavel], self.avaliar(laco.limite), laco.operador, laco.passo)
+        executar, corpo = self.executar, comando.comando
+        for valor in contagem.valores:
+            valores[variavel] = valor
+            executar(corpo)
+        valores[variavel] = contagem.final
+
     def visitar_ComandoEscreva(self, comando: ComandoEscreva):
         valores = [str(self.avaliar(expr)) for expr in comando.expressoes]
-        print("".join(valores), end='\n')
+        self.es.escrever("".join(valores) + "\n")
 
     def visitar_ComandoLeia(self, comando: ComandoLeia):
+        self.ambiente_atual.atribuir(comando.identificador, self.ler_entrada())
+
+    def ler_entrada(self):
+        return self.converter_entrada(self.es.ler())
+
+    def converter_entrada(self, valor_lido: Optional[str]):
+        """Valor de `leia` para uma linha ou palavra lida (None no fim da entrada)."""
+        if valor_lido is None:
+            raise ErroExecucao("Erro de leitura: entrada inesperada.")
         try:
-            valor_lido = input()
+            return int(valor_lido)
+        except ValueError:
             try:
-                valor_lido = int(valor_lido)
+                return float(valor_lido)
             except ValueError:
-                try:
-                    valor_lido = float(valor_lido)
-                except ValueError:
-                    pass
-            self.ambiente_atual.atribuir(comando.identificador, valor_lido)
-        except EOFError:
-            raise ErroExecucao("Erro de leitura: entrada inesperada.")
+                return valor_lido
 
     def visitar_ComandoRetorne(self, comando: ComandoRetorne):
         valor = self.avaliar(comando.expressao) if comando.expressao else None
@@ -160,8 +237,17 @@ class Interpretador:
     def avaliar_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador):
         return self.ambiente_atual.obter(expressao.nome)
 
+    def avaliar_ExpressaoIndice(self, expressao: ExpressaoIndice):
+        vetor = vetores.como_vetor(self.ambiente_atual.obter(expressao.nome), expressao.nome)
+        return vetor.obter([self.avaliar(indice) for indice in expressao.indices])
+
+    def avaliar_ExpressaoVetor(self, expressao: ExpressaoVetor):
+        return [self.avaliar(elemento) for elemento in expressao.elementos]
+
     def avaliar_ExpressaoUnaria(self, expressao: ExpressaoUnaria):
         valor = self.avaliar(expressao.expressao)
+        if expressao.operacao is not None:
+            return expressao.operacao(valor)
         if expressao.operador == "-": return -valor
         if expressao.operador == "+": return +valor
         if expressao.operador == "!": return not valor
@@ -170,9 +256,15 @@ class Interpretador:
     def avaliar_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
         esquerda = self.avaliar(expressao.esquerda)
         direita = self.avaliar(expressao.direita)
+        # Implementação especializada pela verificação de tipos: sem coerção nem despacho pelo operador
+        if expressao.operacao is not None:
+            return expressao.operacao(esquerda, direita)
         op = expressao.operador
 
-        if op in ('+', '-', '*', '/', '%') and isinstance(esquerda, str) and isinstance(direita, (int, float)):
+        if op == "+" and (esquerda.__class__ is str or esquerda.__class__ is Corda):
+            # Cadeias longas são montadas em uma Corda, sem copiar o texto a cada '+'
+            return concatenar(esquerda, direita)
+        if op in ('+', '-', '*', '/', '%') and isinstance(esquerda, (str, Corda)) and isinstance(direita, (int, float)):
             direita = str(direita)
         
         if op == "+": return esquerda + direita
@@ -194,6 +286,12 @@ class Interpretador:
         if op == "ou": return esquerda or direita
         raise ErroExecucao(f"Operador binário desconhecido: {op}")
 
+    def avaliar_ExpressaoLogica(self, expressao: ExpressaoLogica):
+        esquerda = self.avaliar(expressao.esquerda)
+        if expressao.operador == "e": return esquerda and self.avaliar(expressao.direita)
+        if expressao.operador == "ou": return esquerda or self.avaliar(expressao.direita)
+        raise ErroExecucao(f"Operador lógico desconhecido: {expressao.operador}")
+
     def avaliar_ChamadaFuncao(self, chamada: ChamadaFuncao):
         funcao_obj = self.ambiente_atual.obter(chamada.nome)
         if not isinstance(funcao_obj, Funcao):
@@ -203,10 +301,19 @@ class Interpretador:
         if len(chamada.argumentos) != len(declaracao.parametros):
             raise ErroExecucao(f"Número incorreto de argumentos para '{chamada.nome}'.")
 
+        memoizacao = self.memoizacao
+        if memoizacao is not None and memoizacao.pura(declaracao):
+            argumentos = tuple(self.avaliar(arg) for arg in chamada.argumentos)
+            return memoizacao.chamar(declaracao, argumentos,
+                                     lambda: self.executar_funcao(funcao_obj, argumentos))
+        return self.executar_funcao(funcao_obj, [self.avaliar(arg) for arg in chamada.argumentos])
+
+    def executar_funcao(self, funcao_obj: Funcao, argumentos):
+        declaracao = funcao_obj.declaracao
         # O novo ambiente é filho do ambiente onde a função foi DEFINIDA
         ambiente_funcao = Ambiente(funcao_obj.ambiente_definicao)
-        for param, arg in zip(declaracao.parametros, chamada.argumentos):
-            ambiente_funcao.definir(param.identificador, self.avaliar(arg))
+        for param, valor in zip(declaracao.parametros, argumentos):
+            ambiente_funcao.definir(param.identificador, valor)
 
         ambiente_anterior = self.ambiente_atual
         self.ambiente_atual = ambiente_funcao
@@ -0,0 +1,636 @@
+"""
+Execução em camadas: o interpretador de árvore compila para Python o que está quente.
+
+O `InterpretadorJIT` começa executando tudo pelo `Interpretador` de árvore e
+conta as chamadas de cada `DeclaracaoFuncao` e as voltas (arestas de
+retorno) de cada `ComandoEnquanto` e `ComandoPara`. Quando um contador chega
+ao limite (`limite_chamadas`, `limite_voltas`), o `CompiladorJIT` gera o
+código Python da função ou do laço, que é compilado com `compile()` e
+guardado por declaração: as chamadas e as execuções seguintes usam o código
+compilado. Um laço quente é compilado no meio da execução e continua, já
+compilado, da volta em que estava.
+
+O código é especializado pelos tipos vistos até a compilação: parâmetros e
+variáveis externas que sempre tiveram o mesmo tipo (inteiro, real, lógico
+ou cadeia) são verificados na entrada do código compilado, e as operações
+aritméticas entre números conhecidos viram os operadores do Python, sem a
+coerção de cadeia com número. Se a verificação falha, o código é descartado
+(desotimização), a chamada ou o laço continua no interpretador de árvore e
+as variáveis que mudaram de tipo deixam de ser especializadas na próxima
+compilação.
+
+As variáveis declaradas dentro da função ou do laço viram variáveis locais
+do Python; as externas são lidas e escritas nos dicionários dos `Ambiente`s
+onde estão (em variáveis locais, com escrita de volta na saída, quando o
+trecho compilado não chama funções). Funções que declaram outras funções
+não são compiladas. Cada compilação, desotimização e recusa fica em
+`eventos`, e `relatorio()` os resume.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from .analise import Contagem, percorrer
+from .ast import (
+    DeclaracaoVariavel, DeclaracaoFuncao, ComandoAtribuicao, ComandoAtribuicaoIndice,
+    ComandoEnquanto, ComandoPara, ComandoLeia, ChamadaFuncao, Programa,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .interpretador import Ambiente, ErroExecucao, Funcao, Interpretador, RetornoFuncao
+from .operadores import (
+    somar, subtrair, multiplicar, dividir, modulo, e_logico, ou_logico, dividir_sem_coercao, modulo_sem_coercao
+)
+from .resolvedor import ErroResolucao, Resolucao, resolver
+from .transpilador import TranspiladorPython, _constante_nao_nula
+from .vetores import COMPOSTOS, atribuir_composto, como_vetor, criar_vetor
+
+# Chamadas de uma função antes de compilá-la
+LIMITE_CHAMADAS = 1000
+# Voltas de um laço (somadas entre as execuções) antes de compilá-lo
+LIMITE_VOLTAS = 1000
+
+# Devolvido pelo código compilado quando a verificação de tipos da entrada falha
+DESOTIMIZAR = object()
+
+# Tipos pelos quais o código é especializado, e os nomes Portugol deles
+TIPOS_ESPECIALIZADOS = {int: "inteiro", float: "real", bool: "logico", str: "cadeia"}
+_NUMEROS = (int, float)
+_COMPARACOES = ('==', '!=', '<', '<=', '>', '>=')
+# Tipo de uma variável ainda sem atribuições durante a inferência
+_NADA = object()
+_DESCONHECIDO = object()
+# Nós que usam um nome
+_USOS = (ExpressaoIdentificador, ExpressaoIndice, ChamadaFuncao, ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoLeia)
+
+
+class Evento(NamedTuple):
+    # "compilacao", "desotimizacao" ou "recusa"
+    tipo: str
+    # A função ou o laço, como "função fib" ou "laço enquanto na linha 4"
+    alvo: str
+    detalhe: str
+    # Código gerado, nas compilações
+    fonte: Optional[str] = None
+
+    def __str__(self):
+        tipo = {"compilacao": "compilação", "desotimizacao": "desotimização"}.get(self.tipo, self.tipo)
+        return f"{tipo} de {self.alvo}: {self.detalhe}"
+
+
+class _Recusa(Exception):
+    pass
+
+
+def _nome_tipo(classe) -> str:
+    return TIPOS_ESPECIALIZADOS.get(classe, classe.__name__)
+
+
+class CompiladorJIT(TranspiladorPython):
+    """Gera o código de uma função ou de um laço, a partir da geração do `TranspiladorPython`.
+
+    O código é uma fábrica `_fabrica(_d0, _d1, ...)` que recebe os dicionários
+    dos ambientes onde estão as variáveis externas e devolve a função Python
+    compilada: a função Portugol com os mesmos parâmetros, ou um laço sem
+    parâmetros que continua a partir da condição.
+    """
+
+    def __init__(self, resolucao: Resolucao, atribuidos_por_funcoes: Set[str], genericos: Set[str]):
+        super().__init__(resolucao)
+        self.atribuidos_por_funcoes = atribuidos_por_funcoes
+        # Nomes que já falharam em uma verificação de tipo e não são mais especializados
+        self.genericos = genericos
+        self.unidade = None
+        self.parametros: List[Any] = []
+        # Nós percorridos pela unidade (para os laços 'para', sem a inicialização)
+        self.nos: List[Any] = []
+        self.locais: Set[int] = set()
+        # nome externo -> expressão Python que lê e escreve a variável
+        self.livres: Dict[str, str] = {}
+        self.atribuidos: Set[str] = set()
+        self.em_locais = False
+        # variável (id da declaração) -> tipo inferido
+        self.tipos: Dict[int, Any] = {}
+        # nome -> tipo verificado na entrada
+        self.guardas: Dict[str, type] = {}
+
+    # Preparação: nomes locais e externos
+
+    def preparar_funcao(self, declaracao: DeclaracaoFuncao) -> List[str]:
+        """Nomes externos usados pela função, cujos valores são procurados a partir do ambiente da definição."""
+        self.parametros = list(declaracao.parametros)
+        return self._preparar(declaracao, list(percorrer(declaracao.corpo)))
+
+    def preparar_laco(self, comando, laco) -> List[str]:
+        """Nomes externos usados pelo laço, cujos valores são procurados a partir do ambiente do laço."""
+        if isinstance(comando, ComandoPara):
+            # A inicialização já executou: o código começa na condição
+            nos = [comando.condicao, *percorrer(comando.condicao), comando.comando, *percorrer(comando.comando),
+                   comando.incremento, *percorrer(comando.incremento)]
+        else:
+            nos = list(percorrer(comando))
+        self.laco = laco
+        return self._preparar(comando, nos)
+
+    def _preparar(self, unidade, nos) -> List[str]:
+        if any(isinstance(no, DeclaracaoFuncao) for no in nos):
+            raise _Recusa("declara funções")
+        self.unidade = unidade
+        self.nos = nos
+        resolucao = self.resolucao
+        self.locais = {id(resolucao.variavel(parametro)) for parametro in self.parametros}
+        self.locais.update(id(resolucao.variavel(no)) for no in nos if isinstance(no, DeclaracaoVariavel))
+        # Sem chamadas, ninguém mais vê as variáveis externas enquanto o código executa
+        self.em_locais = not any(isinstance(no, ChamadaFuncao) for no in nos)
+        for no in nos:
+            if isinstance(no, _USOS):
+                variavel = resolucao.variavel(resolucao.declaracao(no))
+                if id(variavel) not in self.locais:
+                    nome = variavel.nome if isinstance(variavel, DeclaracaoFuncao) else variavel.identificador
+                    self._livre(nome)
+                    if isinstance(no, (ComandoAtribuicao, ComandoLeia)):
+                        self.atribuidos.add(nome)
+        return list(self.livres)
+
+    def _livre(self, nome: str) -> str:
+        expressao = self.livres.get(nome)
+        if expressao is None:
+            if self.em_locais:
+                self.contador += 1
+                expressao = f"{re.sub(r'[^A-Za-z0-9_]', '_', nome)}_{self.contador}"
+            else:
+                expressao = f"_d{len(self.livres)}[{nome!r}]"
+            self.livres[nome] = expressao
+        return expressao
+
+    # Tipos
+
+    def _inferir(self, observados: Dict[str, type]):
+        """Tipos das variáveis: as classes observadas na entrada e os das atribuições, até um ponto fixo."""
+        resolucao = self.resolucao
+        tipos = self.tipos
+        iniciais = {}
+        for parametro in self.parametros:
+            iniciais[id(resolucao.variavel(parametro))] = parametro.identificador
+        for no in self.nos:
+            if isinstance(no, _USOS):
+                variavel = resolucao.variavel(resolucao.declaracao(no))
+                if id(variavel) not in self.locais and not isinstance(variavel, DeclaracaoFuncao):
+                    iniciais[id(variavel)] = variavel.identificador
+        for chave, nome in iniciais.items():
+            classe = observados.get(nome)
+            especializavel = classe in TIPOS_ESPECIALIZADOS and nome not in self.genericos
+            if chave not in self.locais and not self.em_locais and nome in self.atribuidos_por_funcoes:
+                # Uma função chamada pelo código pode mudar o tipo
+                especializavel = False
+            tipos[chave] = classe if especializavel else None
+
+        atribuicoes = []
+        for no in self.nos:
+            if isinstance(no, DeclaracaoVariavel):
+                origem = no.inicializador if no.dimensoes is None and no.inicializador is not None else _DESCONHECIDO
+                atribuicoes.append((id(resolucao.variavel(no)), origem))
+                tipos.setdefault(id(resolucao.variavel(no)), _NADA)
+            elif isinstance(no, ComandoAtribuicao):
+                atribuicoes.append((id(resolucao.variavel(resolucao.declaracao(no))), no.expressao))
+            elif isinstance(no, ComandoLeia):
+                atribuicoes.append((id(resolucao.variavel(resolucao.declaracao(no))), _DESCONHECIDO))
+        alterou = True
+        while alterou:
+            alterou = False
+            for chave, origem in atribuicoes:
+                atual = tipos.get(chave)
+                if atual is None:
+                    continue
+                tipo = None if origem is _DESCONHECIDO else self.tipo(origem)
+                novo = tipo if atual is _NADA else atual if tipo is _NADA or tipo is atual else None
+                if novo is not atual:
+                    tipos[chave] = novo
+                    alterou = True
+        for chave, tipo in tipos.items():
+            if tipo is _NADA:
+                tipos[chave] = None
+        for chave, nome in iniciais.items():
+            if tipos[chave] is not None:
+                self.guardas[nome] = tipos[chave]
+
+    def tipo(self, no):
+        """Classe Python do valor da expressão, quando conhecida (_NADA enquanto a inferência não chegou nela)."""
+        if isinstance(no, ExpressaoLiteral):
+            classe = no.valor.__class__
+            return classe if classe in TIPOS_ESPECIALIZADOS else None
+        if isinstance(no, ExpressaoIdentificador):
+            return self.tipos.get(id(self.resolucao.variavel(self.resolucao.declaracao(no))))
+        if isinstance(no, ExpressaoUnaria):
+            if no.operador == "!":
+                return bool
+            tipo = self.tipo(no.expressao)
+            return tipo if tipo is _NADA or tipo in _NUMEROS else None
+        if isinstance(no, (ExpressaoBinaria, ExpressaoLogica)):
+            esquerda, direita = self.tipo(no.esquerda), self.tipo(no.direita)
+            if esquerda is None or direita is None:
+                return None
+            if esquerda is _NADA or direita is _NADA:
+                return _NADA
+            if no.operador in _COMPARACOES:
+                return bool
+            if no.operador in ("e", "ou"):
+                return bool if esquerda is bool and direita is bool else None
+            if esquerda not in _NUMEROS or direita not in _NUMEROS:
+                return None
+            if no.operador == "/":
+                return float
+            return int if esquerda is int and direita is int else float
+        return None
+
+    # Geração
+
+    def gerar(self, observados: Dict[str, type]) -> str:
+        self._inferir(observados)
+        funcao = isinstance(self.unidade, DeclaracaoFuncao)
+        protegido = self.em_locais and bool(self.atribuidos)
+        self.nivel = 3 if protegido else 2
+        if funcao:
+            for comando in self.unidade.corpo.declaracoes:
+                self.transpilar_comando(comando)
+        elif isinstance(self.unidade, ComandoPara):
+            self._continuar_para(self.unidade)
+        else:
+            self.transpilar_comando(self.unidade)
+        corpo = self.linhas or ["    " * self.nivel + "pass"]
+
+        dicionarios = [f"_d{indice}" for indice in range(len(self.livres))]
+        parametros = ", ".join(self.nome_python(parametro) for parametro in self.parametros)
+        self.linhas = []
+        self.nivel = 0
+        self.emitir(f"def _fabrica({', '.join(dicionarios)}):")
+        self.nivel = 1
+        self.emitir(f"def _compilada({parametros}):")
+        self.nivel = 2
+        if self.em_locais:
+            for (nome, local), dicionario in zip(self.livres.items(), dicionarios):
+                self.emitir(f"{local} = {dicionario}[{nome!r}]")
+        nomes_parametros = {parametro.identificador: parametro for parametro in self.parametros}
+        for nome, classe in self.guardas.items():
+            variavel = self.nome_python(nomes_parametros[nome]) if nome in nomes_parametros else self.livres[nome]
+            self.emitir(f"if {variavel}.__class__ is not {classe.__name__}: return _DESOTIMIZAR")
+        if protegido:
+            self.emitir("try:")
+            self.linhas.extend(corpo)
+            self.emitir("finally:")
+            for nome in sorted(self.atribuidos):
+                dicionario = dicionarios[list(self.livres).index(nome)]
+                self.emitir(f"    {dicionario}[{nome!r}] = {self.livres[nome]}")
+        else:
+            self.linhas.extend(corpo)
+        self.nivel = 1
+        self.emitir("return _compilada")
+        return "\n".join(self.linhas) + "\n"
+
+    def _continuar_para(self, comando: ComandoPara):
+        laco = self.laco
+        if laco is None:
+            self.emitir(f"while {self.expressao(comando.condicao)}:")
+            self.emitir_bloco([comando.comando, comando.incremento])
+            return
+        variavel = self.nome_atribuido(comando.inicializacao)
+        self.contador += 1
+        contagem = f"_contagem_{self.contador}"
+        self.emitir(f"{contagem} = _Contagem({variavel}, {self.expressao(laco.limite)}, {laco.operador!r}, {laco.passo})")
+        self.emitir(f"for {variavel} in {contagem}.valores:")
+        self.emitir_bloco([comando.comando])
+        self.emitir(f"{variavel} = {contagem}.final")
+
+    def descricao(self) -> str:
+        tipos = ", ".join(f"{nome}={_nome_tipo(classe)}" for nome, classe in self.guardas.items())
+        return f"tipos {tipos}" if tipos else "sem especialização de tipos"
+
+    # Nomes: locais do Python ou variáveis dos ambientes
+
+    def nome_python(self, declaracao) -> str:
+        variavel = self.resolucao.variavel(declaracao)
+        if id(variavel) in self.locais:
+            return super().nome_python(declaracao)
+        return self._livre(variavel.nome if isinstance(variavel, DeclaracaoFuncao) else variavel.identificador)
+
+    def nome_atribuido(self, uso) -> str:
+        declaracao = uso if isinstance(uso, DeclaracaoVariavel) else self.resolucao.declaracao(uso)
+        return self.nome_python(declaracao)
+
+    def nome_escrito(self, declaracao) -> str:
+        return self.nome_python(declaracao)
+
+    def transpilar_ComandoRetorne(self, comando):
+        valor = self.expressao(comando.expressao) if comando.expressao else "None"
+        if isinstance(self.unidade, DeclaracaoFuncao):
+            self.emitir(f"return {valor}")
+        else:
+            # Em um laço, o 'retorne' sai da função que o interpretador de árvore está executando
+            self.emitir(f"raise _RetornoFuncao({valor})")
+
+    def expressao_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        argumentos = ", ".join(self.expressao(argumento) for argumento in chamada.argumentos)
+        return f"_chamar({self.nome_lido(chamada)}, {chamada.nome!r}, [{argumentos}])"
+
+    def expressao_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        op = expressao.operador
+        if op in ('+', '-', '*', '/', '%'):
+            esquerda_tipo, direita_tipo = self.tipo(expressao.esquerda), self.tipo(expressao.direita)
+            if esquerda_tipo in _NUMEROS and direita_tipo in _NUMEROS:
+                esquerda, direita = self.expressao(expressao.esquerda), self.expressao(expressao.direita)
+                if op in ('+', '-', '*') or _constante_nao_nula(expressao.direita):
+                    return f"({esquerda} {op} {direita})"
+                return f"{'_dividir_sem_coercao' if op == '/' else '_modulo_sem_coercao'}({esquerda}, {direita})"
+        return super().expressao_ExpressaoBinaria(expressao)
+
+
+class _Unidade:
+    """Contador, tipos observados e código compilado de uma função ou de um laço."""
+
+    def __init__(self, no, alvo: str):
+        self.no = no
+        self.alvo = alvo
+        self.contador = 0
+        # Classes dos argumentos nas chamadas até a compilação (None onde variaram)
+        self.tipos: Optional[List[Any]] = None
+        self.genericos: Set[str] = set()
+        self.codigo: Optional["_Codigo"] = None
+        # Motivo pelo qual a unidade não é compilada
+        self.motivo: Optional[str] = None
+
+    def observar(self, argumentos):
+        tipos = [argumento.__class__ for argumento in argumentos]
+        if self.tipos is None:
+            self.tipos = tipos
+        else:
+            self.tipos = [anterior if anterior is atual else None for anterior, atual in zip(self.tipos, tipos)]
+
+
+class _Codigo:
+    def __init__(self, fabrica, livres: List[str], guardas: Dict[str, type], parametros: List[str]):
+        self.fabrica = fabrica
+        self.livres = livres
+        self.guardas = guardas
+        self.parametros = parametros
+        # id do objeto Funcao -> (Funcao, função compilada ligada aos ambientes dela)
+        self.ligadas: Dict[int, Any] = {}
+
+
+class InterpretadorJIT(Interpretador):
+    """Interpretador de árvore que compila para Python as funções e os laços quentes."""
+
+    def __init__(self, memoizacao=None, es=None, limite_chamadas: int = LIMITE_CHAMADAS,
+                 limite_voltas: int = LIMITE_VOLTAS):
+        super().__init__(memoizacao, es)
+        if limite_chamadas < 1 or limite_voltas < 1:
+            raise ValueError("Os limites de compilação devem ser pelo menos 1.")
+        self.limite_chamadas = limite_chamadas
+        self.limite_voltas = limite_voltas
+        self.eventos: List[Evento] = []
+        self.resolucao: Optional[Resolucao] = None
+        # id do nó (DeclaracaoFuncao, ComandoEnquanto ou ComandoPara) -> _Unidade
+        self._unidades: Dict[int, _Unidade] = {}
+        self._globais = {
+            "__name__": "__portugol_jit__",
+            "_somar": somar, "_subtrair": subtrair, "_multiplicar": multiplicar,
+            "_dividir": dividir, "_modulo": modulo, "_e": e_logico, "_ou": ou_logico,
+            "_dividir_sem_coercao": dividir_sem_coercao, "_modulo_sem_coercao": modulo_sem_coercao,
+            "_escrever": self.es.escrever, "_leia": self.ler_entrada, "_chamar": self.chamar,
+            "_Contagem": Contagem, "_RetornoFuncao": RetornoFuncao, "_DESOTIMIZAR": DESOTIMIZAR,
+            "_criar_vetor": criar_vetor, "_vetor": como_vetor, "_atribuir_composto": atribuir_composto,
+            "_COMPOSTOS": COMPOSTOS,
+        }
+
+    def interpretar(self, programa: Programa):
+        try:
+            self.resolucao = resolver(programa)
+        except ErroResolucao as e:
+            # Sem a resolução não se sabe que nomes são locais: tudo fica no interpretador de árvore
+            self.resolucao = None
+            self.registrar("recusa", "programa", f"nomes não resolvidos ({e})")
+        super().interpretar(programa)
+
+    def registrar(self, tipo: str, alvo: str, detalhe: str, fonte: Optional[str] = None):
+        self.eventos.append(Evento(tipo, alvo, detalhe, fonte))
+
+    def relatorio(self) -> str:
+        compiladas = sum(evento.tipo == "compilacao" for evento in self.eventos)
+        desotimizadas = sum(evento.tipo == "desotimizacao" for evento in self.eventos)
+        linhas = [f"jit: {compiladas} compilações, {desotimizadas} desotimizações "
+                  f"(limites: {self.limite_chamadas} chamadas, {self.limite_voltas} voltas)"]
+        linhas.extend(f"  {evento}" for evento in self.eventos)
+        return "\n".join(linhas)
+
+    # Funções
+
+    def chamar(self, funcao_obj, nome: str, argumentos):
+        """Chamada feita pelo código compilado, com as verificações de `avaliar_ChamadaFuncao`."""
+        if not isinstance(funcao_obj, Funcao):
+            raise ErroExecucao(f"'{nome}' não é uma função.")
+        declaracao = funcao_obj.declaracao
+        if len(argumentos) != len(declaracao.parametros):
+            raise ErroExecucao(f"Número incorreto de argumentos para '{nome}'.")
+        memoizacao = self.memoizacao
+        if memoizacao is not None and memoizacao.pura(declaracao):
+            argumentos = tuple(argumentos)
+            return memoizacao.chamar(declaracao, argumentos, lambda: self.executar_funcao(funcao_obj, argumentos))
+        return self.executar_funcao(funcao_obj, argumentos)
+
+    def executar_funcao(self, funcao_obj: Funcao, argumentos):
+        declaracao = funcao_obj.declaracao
+        unidade = self._unidade(declaracao)
+        if unidade is None:
+            return super().executar_funcao(funcao_obj, argumentos)
+        codigo = unidade.codigo
+        if codigo is not None:
+            compilada = self._ligar_funcao(codigo, funcao_obj)
+            if compilada is not None:
+                resultado = compilada(*argumentos)
+                if resultado is not DESOTIMIZAR:
+                    return resultado
+                valores = self._valores(codigo, funcao_obj.ambiente_definicao)
+                valores.update(zip(codigo.parametros, argumentos))
+                self._desotimizar(unidade, valores)
+        elif unidade.motivo is None:
+            unidade.observar(argumentos)
+            unidade.contador += 1
+            if unidade.contador >= self.limite_chamadas:
+                self._compilar(unidade, funcao_obj.ambiente_definicao)
+        return super().executar_funcao(funcao_obj, argumentos)
+
+    def _ligar_funcao(self, codigo: _Codigo, funcao_obj: Funcao):
+        ligada = codigo.ligadas.get(id(funcao_obj))
+        if ligada is not None and ligada[0] is funcao_obj:
+            return ligada[1]
+        ambiente = funcao_obj.ambiente_definicao
+        compilada = self._ligar(codigo, ambiente)
+        # Nomes que já estão no ambiente da definição sempre serão encontrados nele; os
+        # demais podem ser declarados depois em um ambiente mais próximo e são procurados a cada chamada
+        if compilada is not None and all(nome in ambiente.valores for nome in codigo.livres):
+            codigo.ligadas[id(funcao_obj)] = (funcao_obj, compilada)
+        return compilada
+
+    # Laços
+
+    def visitar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        unidade = self._unidade(comando)
+        if unidade is None:
+            return super().visitar_ComandoEnquanto(comando)
+        if unidade.codigo is not None and self._executar_laco(unidade):
+            return
+        avaliar, executar, limite = self.avaliar, self.executar, self.limite_voltas
+        while avaliar(comando.condicao):
+            executar(comando.comando)
+            unidade.contador += 1
+            if unidade.contador == limite and self._compilar_laco(unidade, None):
+                return
+
+    def visitar_ComandoPara(self, comando: ComandoPara):
+        unidade = self._unidade(comando)
+        if unidade is None:
+            return super().visitar_ComandoPara(comando)
+        ambiente_anterior = self.ambiente_atual
+        self.ambiente_atual = Ambiente(ambiente_anterior)
+        try:
+            self.executar(comando.inicializacao)
+            if unidade.codigo is not None and self._executar_laco(unidade):
+                return
+            laco = self.laco_contado(comando)
+            if laco is not None:
+                self.executar_laco_contado(comando, laco)
+                return
+            avaliar, executar, limite = self.avaliar, self.executar, self.limite_voltas
+            while avaliar(comando.condicao):
+                executar(comando.comando)
+                executar(comando.incremento)
+                unidade.contador += 1
+                if unidade.contador == limite and self._compilar_laco(unidade, None):
+                    return
+        finally:
+            self.ambiente_atual = ambiente_anterior
+
+    def executar_laco_contado(self, comando: ComandoPara, laco):
+        unidade = self._unidade(comando)
+        if unidade is None:
+            return super().executar_laco_contado(comando, laco)
+        variavel = laco.variavel
+        ambiente = self.ambiente_atual
+        while variavel not in ambiente.valores:
+            ambiente = ambiente.pai
+        valores = ambiente.valores
+        contagem = Contagem(valores[variavel], self.avaliar(laco.limite), laco.operador, laco.passo)
+        executar, corpo, limite = self.executar, comando.comando, self.limite_voltas
+        for valor in contagem.valores:
+            valores[variavel] = valor
+            executar(corpo)
+            unidade.contador += 1
+            if unidade.contador == limite and valor.__class__ in _NUMEROS:
+                # O código compilado continua a contagem a partir do próximo valor
+                valores[variavel] = valor + laco.passo
+                if self._compilar_laco(unidade, laco):
+                    return
+        valores[variavel] = contagem.final
+
+    def _compilar_laco(self, unidade: _Unidade, laco) -> bool:
+        """Compila o laço quente e o executa até o fim; falso se ele continua no interpretador de árvore."""
+        if unidade.motivo is not None:
+            return False
+        self._compilar(unidade, self.ambiente_atual, laco)
+        return unidade.codigo is not None and self._executar_laco(unidade)
+
+    def _executar_laco(self, unidade: _Unidade) -> bool:
+        codigo = unidade.codigo
+        compilada = self._ligar(codigo, self.ambiente_atual)
+        if compilada is None:
+            return False
+        if compilada() is not DESOTIMIZAR:
+            return True
+        self._desotimizar(unidade, self._valores(codigo, self.ambiente_atual))
+        return False
+
+    # Compilação e desotimização
+
+    def _unidade(self, no) -> Optional[_Unidade]:
+        if self.resolucao is None:
+            return None
+        unidade = self._unidades.get(id(no))
+        if unidade is None or unidade.no is not no:
+            if isinstance(no, DeclaracaoFuncao):
+                alvo = f"função {no.nome}"
+            else:
+                alvo = f"laço {'enquanto' if isinstance(no, ComandoEnquanto) else 'para'}"
+                if no.linha is not None:
+                    alvo += f" na linha {no.linha}"
+            unidade = self._unidades[id(no)] = _Unidade(no, alvo)
+        return unidade
+
+    def _compilar(self, unidade: _Unidade, ambiente: Ambiente, laco=None):
+        no = unidade.no
+        compilador = CompiladorJIT(self.resolucao, self.atribuidos_por_funcoes or set(), unidade.genericos)
+        try:
+            if isinstance(no, DeclaracaoFuncao):
+                livres = compilador.preparar_funcao(no)
+            else:
+                livres = compilador.preparar_laco(no, laco)
+        except _Recusa as e:
+            unidade.motivo = str(e)
+            self.registrar("recusa", unidade.alvo, unidade.motivo)
+            return
+        observados = {}
+        if isinstance(no, DeclaracaoFuncao):
+            for parametro, classe in zip(no.parametros, unidade.tipos or ()):
+                if classe is not None:
+                    observados[parametro.identificador] = classe
+        for nome in livres:
+            atual = ambiente
+            while atual is not None and nome not in atual.valores:
+                atual = atual.pai
+            if atual is not None:
+                observados[nome] = atual.valores[nome].__class__
+        espaco: Dict[str, Any] = {}
+        try:
+            fonte = compilador.gerar(observados)
+            exec(compile(fonte, f"<jit: {unidade.alvo}>", "exec"), self._globais, espaco)
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            # Limites do compilador do Python, como mais de 20 blocos aninhados: o código
+            # gerado não compila, mas o interpretador de árvore executa o mesmo trecho
+            erro = e.msg if isinstance(e, SyntaxError) else e.__class__.__name__
+            unidade.motivo = f"o Python não compila o código gerado ({erro})"
+            self.registrar("recusa", unidade.alvo, unidade.motivo)
+            return
+        parametros = [parametro.identificador for parametro in compilador.parametros]
+        unidade.codigo = _Codigo(espaco["_fabrica"], livres, dict(compilador.guardas), parametros)
+        self.registrar("compilacao", unidade.alvo, compilador.descricao(), fonte)
+
+    def _ligar(self, codigo: _Codigo, ambiente: Ambiente):
+        """A função compilada sobre os dicionários onde estão as variáveis externas (None se falta alguma)."""
+        dicionarios = []
+        for nome in codigo.livres:
+            atual = ambiente
+            while atual is not None and nome not in atual.valores:
+                atual = atual.pai
+            if atual is None:
+                return None
+            dicionarios.append(atual.valores)
+        return codigo.fabrica(*dicionarios)
+
+    def _valores(self, codigo: _Codigo, ambiente: Ambiente) -> Dict[str, Any]:
+        valores = {}
+        for nome in codigo.livres:
+            atual = ambiente
+            while atual is not None and nome not in atual.valores:
+                atual = atual.pai
+            if atual is not None:
+                valores[nome] = atual.valores[nome]
+        return valores
+
+    def _desotimizar(self, unidade: _Unidade, valores: Dict[str, Any]):
+        guardas = unidade.codigo.guardas
+        falhas = [nome for nome, classe in guardas.items() if nome in valores and valores[nome].__class__ is not classe]
+        unidade.genericos.update(falhas or guardas)
+        detalhe = ", ".join(f"{nome} era {_nome_tipo(guardas[nome])}, agora {_nome_tipo(valores[nome].__class__)}"
+                            for nome in falhas) or "verificação de tipos falhou"
+        self.registrar("desotimizacao", unidade.alvo, detalhe)
+        # Volta a contar: se continuar quente, é compilada de novo sem especializar o que mudou
+        unidade.codigo = None
+        unidade.contador = 0
+        unidade.tipos = None
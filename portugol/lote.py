@@ -0,0 +1,215 @@
+"""
+Execução em lote de muitos programas Portugol.
+
+Os programas vêm de um diretório (todos os `.ptg`, recursivamente, cada um
+com a entrada padrão lida de um arquivo `.in` de mesmo nome, se existir) ou
+de um manifesto JSON Lines, uma linha por programa:
+
+    {"programa": "aluno1/soma.ptg", "entrada": "casos/soma1.txt"}
+
+Caminhos relativos do manifesto partem do diretório dele. Os programas são
+distribuídos entre processos de um `ProcessPoolExecutor` (um por núcleo,
+por padrão); cada processo constrói o parser uma única vez e o reaproveita
+em todos os programas que executa. Cada programa tem um tempo limite de
+relógio, controlado por `SIGALRM` dentro do próprio processo (onde o sinal
+não existe, como no Windows, não há limite).
+
+A saída, o erro, o código de saída e a duração de cada programa são gravados,
+na ordem de entrada, em um arquivo JSON Lines. A saída e o código de saída
+são os mesmos que `main.py` produziria para o programa; o tempo esgotado
+usa o código 124, como o utilitário `timeout`.
+
+    python -m portugol.lote exemplos/ --resultados resultados.jsonl
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from .es import EntradaSaida
+from .execucao import BACKEND_PADRAO, BACKENDS, criar_interpretador
+
+EXTENSAO_ENTRADA = ".in"
+
+# Segundos de relógio que cada programa pode executar
+TEMPO_LIMITE_PADRAO = 10.0
+
+STATUS_TEMPO_ESGOTADO = 124
+
+
+class Tarefa(NamedTuple):
+    programa: str
+    entrada: Optional[str] = None
+
+
+class Resultado(NamedTuple):
+    programa: str
+    status: int
+    stdout: str
+    stderr: str
+    duracao: float
+
+
+class TempoEsgotado(BaseException):
+    """Interrompe o programa no tempo limite; não é capturada pelos `except Exception` dos backends."""
+
+
+def tarefas_do_diretorio(diretorio: str) -> List[Tarefa]:
+    tarefas = []
+    for raiz, subdiretorios, arquivos in os.walk(diretorio):
+        subdiretorios.sort()
+        for arquivo in sorted(arquivos):
+            if not arquivo.endswith(".ptg"):
+                continue
+            programa = os.path.join(raiz, arquivo)
+            entrada = os.path.splitext(programa)[0] + EXTENSAO_ENTRADA
+            tarefas.append(Tarefa(programa, entrada if os.path.isfile(entrada) else None))
+    return tarefas
+
+
+def tarefas_do_manifesto(caminho: str) -> List[Tarefa]:
+    base = os.path.dirname(os.path.abspath(caminho))
+    tarefas = []
+    with open(caminho, "r", encoding="utf-8") as f:
+        for numero, linha in enumerate(f, 1):
+            if not linha.strip():
+                continue
+            try:
+                item = json.loads(linha)
+                programa, entrada = item["programa"], item.get("entrada")
+            except (ValueError, KeyError, TypeError, AttributeError):
+                raise ValueError(f"{caminho}:{numero}: esperado um objeto com a chave 'programa'.") from None
+            tarefas.append(Tarefa(os.path.join(base, programa),
+                                  os.path.join(base, entrada) if entrada else None))
+    return tarefas
+
+
+def ler_tarefas(caminho: str) -> List[Tarefa]:
+    """Tarefas de um diretório de programas ou de um manifesto JSON Lines."""
+    if os.path.isdir(caminho):
+        return tarefas_do_diretorio(caminho)
+    return tarefas_do_manifesto(caminho)
+
+
+# Trabalhadores
+
+def _iniciar_trabalhador():
+    from .parser import obter_parser
+
+    # Um parser por processo, compartilhado por todos os programas executados nele
+    obter_parser(posicoes=False, passagem_unica=True)
+
+
+def _alarme(signum, frame):
+    raise TempoEsgotado()
+
+
+def executar_tarefa(tarefa: Tarefa, backend: str = BACKEND_PADRAO,
+                    tempo_limite: Optional[float] = TEMPO_LIMITE_PADRAO) -> Resultado:
+    from .parser import analisar, ler_codigo
+
+    saida, erro = io.StringIO(), io.StringIO()
+    status = 0
+    com_alarme = bool(tempo_limite) and hasattr(signal, "setitimer")
+    anterior = signal.signal(signal.SIGALRM, _alarme) if com_alarme else None
+    inicio = time.perf_counter()
+    try:
+        if com_alarme:
+            signal.setitimer(signal.ITIMER_REAL, tempo_limite)
+        codigo = ler_codigo(tarefa.programa)
+        entrada = ""
+        if tarefa.entrada is not None:
+            with open(tarefa.entrada, "r", encoding="utf-8") as f:
+                entrada = f.read()
+        interpretador = criar_interpretador(backend, es=EntradaSaida(entrada=io.StringIO(entrada), saida=saida))
+        interpretador.interpretar(analisar(codigo, posicoes=False))
+    except TempoEsgotado:
+        status = STATUS_TEMPO_ESGOTADO
+        erro.write(f"Erro: tempo limite de {tempo_limite:g} s excedido.\n")
+    except RecursionError:
+        status = 1
+        saida.write(f"Erro: recursão profunda demais para o backend '{backend}'. "
+                    "Use --backend=vm, que guarda as chamadas em uma pilha própria.\n")
+    except FileNotFoundError as e:
+        status = 1
+        saida.write(f"Erro: Arquivo '{e.filename}' não encontrado.\n")
+    except Exception as e:
+        status = 1
+        saida.write(f"Erro: {e}\n")
+    finally:
+        if com_alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, anterior)
+    duracao = time.perf_counter() - inicio
+    return Resultado(tarefa.programa, status, saida.getvalue(), erro.getvalue(), duracao)
+
+
+def _executar(argumentos) -> Resultado:
+    return executar_tarefa(*argumentos)
+
+
+# Coordenação
+
+def executar_lote(tarefas: Iterable[Tarefa], backend: str = BACKEND_PADRAO,
+                  tempo_limite: Optional[float] = TEMPO_LIMITE_PADRAO,
+                  trabalhadores: Optional[int] = None) -> Iterator[Resultado]:
+    """Executa as tarefas em paralelo, devolvendo os resultados na ordem das tarefas."""
+    tarefas = list(tarefas)
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    # Lotes de vários programas por envio diminuem a comunicação entre processos
+    lote = max(1, min(32, len(tarefas) // (trabalhadores * 4)))
+    with ProcessPoolExecutor(max_workers=trabalhadores, initializer=_iniciar_trabalhador) as executor:
+        argumentos = ((tarefa, backend, tempo_limite) for tarefa in tarefas)
+        yield from executor.map(_executar, argumentos, chunksize=lote)
+
+
+def gravar_resultados(resultados: Iterable[Resultado], caminho: str) -> List[Resultado]:
+    gravados = []
+    with open(caminho, "w", encoding="utf-8") as f:
+        for resultado in resultados:
+            f.write(json.dumps(resultado._asdict(), ensure_ascii=False) + "\n")
+            f.flush()
+            gravados.append(resultado)
+    return gravados
+
+
+def resumir(resultados: List[Resultado], duracao: float) -> str:
+    esgotados = sum(resultado.status == STATUS_TEMPO_ESGOTADO for resultado in resultados)
+    erros = sum(resultado.status != 0 for resultado in resultados) - esgotados
+    return (f"{len(resultados)} programas em {duracao:.2f} s: {len(resultados) - erros - esgotados} sem erro, "
+            f"{erros} com erro, {esgotados} excederam o tempo limite")
+
+
+def main(argv: Optional[List[str]] = None):
+    argumentos = argparse.ArgumentParser(description="Executa muitos programas Portugol em paralelo")
+    argumentos.add_argument("entrada", help="diretório com arquivos .ptg ou manifesto JSON Lines")
+    argumentos.add_argument("--resultados", default="resultados.jsonl", metavar="ARQUIVO",
+                            help="arquivo JSON Lines com o resultado de cada programa (padrão: %(default)s)")
+    argumentos.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO)
+    argumentos.add_argument("--trabalhadores", type=int, default=None, metavar="N",
+                            help="processos em paralelo (padrão: número de núcleos)")
+    argumentos.add_argument("--tempo-limite", type=float, default=TEMPO_LIMITE_PADRAO, metavar="S",
+                            help="segundos de relógio por programa; 0 desativa (padrão: %(default)s)")
+    args = argumentos.parse_args(argv)
+
+    try:
+        tarefas = ler_tarefas(args.entrada)
+    except (OSError, ValueError) as e:
+        argumentos.error(str(e))
+
+    inicio = time.perf_counter()
+    resultados = gravar_resultados(
+        executar_lote(tarefas, args.backend, args.tempo_limite, args.trabalhadores), args.resultados)
+    print(resumir(resultados, time.perf_counter() - inicio))
+    print(f"resultados gravados em {args.resultados}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
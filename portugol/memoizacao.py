@@ -0,0 +1,166 @@
+"""
+Memoização automática de funções Portugol puras.
+
+Uma função é pura quando o resultado depende apenas dos argumentos e a
+chamada não tem efeitos visíveis: o corpo não usa `escreva` nem `leia`, só
+lê e atribui variáveis locais (parâmetros e nomes declarados no próprio
+corpo), não usa vetores (cujo conteúdo muda sem que a variável mude) e
+só chama funções puras. Funções mutuamente recursivas são tratadas
+como um ponto fixo: todas começam puras e as que violam alguma regra são
+removidas até nada mudar.
+
+Os resultados das funções puras ficam em um `CacheLRU` compartilhado,
+indexado pela declaração e pelos argumentos. Chamadas que terminam com erro
+não são guardadas.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from .analise import percorrer
+from .ast import (
+    Programa, DeclaracaoVariavel, DeclaracaoFuncao, Parametro,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoEscreva, ComandoLeia, ChamadaFuncao,
+    ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor
+)
+from .resolvedor import ErroResolucao, Resolucao, resolver
+
+TAMANHO_CACHE_PADRAO = 100_000
+
+# Backends que consultam a memoização ao chamar funções
+BACKENDS_COM_MEMOIZACAO = ("arvore", "closures", "slots", "jit")
+
+_AUSENTE = object()
+
+
+def funcoes_puras(programa: Programa, resolucao: Optional[Resolucao] = None) -> Set[DeclaracaoFuncao]:
+    """Declarações de função do programa que podem ser memoizadas.
+
+    Usa a resolução estática para saber a que declaração cada nome se
+    refere; se o programa não puder ser resolvido, nenhuma função é pura.
+    """
+    if resolucao is None:
+        try:
+            resolucao = resolver(programa)
+        except ErroResolucao:
+            return set()
+
+    funcoes = [no for no in percorrer(programa) if isinstance(no, DeclaracaoFuncao)]
+    locais: Dict[int, Set[int]] = {}
+    for funcao in funcoes:
+        declaracoes = set(map(id, funcao.parametros))
+        declaracoes.update(id(no) for no in percorrer(funcao.corpo)
+                           if isinstance(no, (DeclaracaoVariavel, DeclaracaoFuncao, Parametro)))
+        locais[id(funcao)] = declaracoes
+
+    puras = {id(funcao) for funcao in funcoes}
+    alterou = True
+    while alterou:
+        alterou = False
+        for funcao in funcoes:
+            if id(funcao) in puras and not _pura(funcao, locais[id(funcao)], puras, resolucao):
+                puras.discard(id(funcao))
+                alterou = True
+    return {funcao for funcao in funcoes if id(funcao) in puras}
+
+
+def _pura(funcao: DeclaracaoFuncao, locais: Set[int], puras: Set[int], resolucao: Resolucao) -> bool:
+    for no in percorrer(funcao.corpo):
+        if isinstance(no, (ComandoEscreva, ComandoLeia, ComandoAtribuicaoIndice, ExpressaoIndice, ExpressaoVetor)):
+            return False
+        if isinstance(no, DeclaracaoVariavel) and no.dimensoes is not None:
+            # Cada chamada criaria um vetor novo; com o cache, todas devolveriam o mesmo
+            return False
+        if isinstance(no, ChamadaFuncao):
+            # Com alternativas, qualquer uma das funções pode ser a chamada
+            chamadas = [resolucao.declaracao(no)] + [alternativa for _, alternativa in resolucao.alternativas_de(no)]
+            if any(id(chamada) not in puras for chamada in chamadas):
+                return False
+        elif isinstance(no, (ExpressaoIdentificador, ComandoAtribuicao)):
+            if id(resolucao.declaracao(no)) not in locais:
+                return False
+    return True
+
+
+class CacheLRU:
+    """Dicionário de tamanho limitado que descarta o item usado há mais tempo."""
+
+    def __init__(self, tamanho: int = TAMANHO_CACHE_PADRAO):
+        if tamanho < 1:
+            raise ValueError("O tamanho do cache deve ser pelo menos 1.")
+        self.tamanho = tamanho
+        self.itens: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.descartes = 0
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        valor = self.itens.get(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            return padrao
+        self.itens.move_to_end(chave)
+        return valor
+
+    def guardar(self, chave: Hashable, valor: Any):
+        self.itens[chave] = valor
+        self.itens.move_to_end(chave)
+        if len(self.itens) > self.tamanho:
+            self.itens.popitem(last=False)
+            self.descartes += 1
+
+    def __len__(self):
+        return len(self.itens)
+
+
+class Memoizacao:
+    """Estado da memoização de uma execução: funções puras, cache e contadores."""
+
+    def __init__(self, tamanho_cache: int = TAMANHO_CACHE_PADRAO):
+        self.cache = CacheLRU(tamanho_cache)
+        self.puras: Set[int] = set()
+        # nome da função -> [acertos, faltas]
+        self.contadores: Dict[str, list] = {}
+
+    def analisar(self, programa: Programa, resolucao: Optional[Resolucao] = None):
+        puras = funcoes_puras(programa, resolucao)
+        self.puras = {id(funcao) for funcao in puras}
+        for funcao in puras:
+            self.contadores.setdefault(funcao.nome, [0, 0])
+
+    def pura(self, declaracao: DeclaracaoFuncao) -> bool:
+        return id(declaracao) in self.puras
+
+    def chamar(self, declaracao: DeclaracaoFuncao, argumentos: Tuple[Any, ...], executar: Callable[[], Any]) -> Any:
+        """Devolve o resultado guardado para os argumentos ou executa a função e o guarda."""
+        # O tipo faz parte da chave: f(1) e f(1.0) podem ter resultados diferentes
+        chave = (declaracao, tuple((type(arg), arg) for arg in argumentos))
+        try:
+            valor = self.cache.obter(chave, _AUSENTE)
+        except TypeError:
+            # Argumento que não pode ser chave de dicionário: executa sem cache
+            return executar()
+        contador = self.contadores[declaracao.nome]
+        if valor is not _AUSENTE:
+            contador[0] += 1
+            return valor
+        contador[1] += 1
+        valor = executar()
+        self.cache.guardar(chave, valor)
+        return valor
+
+    @property
+    def acertos(self) -> int:
+        return sum(acertos for acertos, _ in self.contadores.values())
+
+    @property
+    def faltas(self) -> int:
+        return sum(faltas for _, faltas in self.contadores.values())
+
+    def relatorio(self) -> str:
+        nomes = ", ".join(sorted(self.contadores)) or "nenhuma"
+        linhas = [
+            f"funções puras: {nomes}",
+            f"cache: {len(self.cache)}/{self.cache.tamanho} entradas, {self.cache.descartes} descartadas",
+        ]
+        for nome, (acertos, faltas) in sorted(self.contadores.items()):
+            linhas.append(f"  {nome}: {acertos} acertos, {faltas} faltas")
+        linhas.append(f"total: {self.acertos} acertos, {self.faltas} faltas")
+        return "\n".join(linhas)
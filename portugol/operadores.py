@@ -0,0 +1,126 @@
+"""
+Implementações dos operadores da linguagem Portugol.
+
+Cada operador é uma função Python comum, com a mesma semântica usada por
+`Interpretador.avaliar_ExpressaoBinaria` e `Interpretador.avaliar_ExpressaoUnaria`
+(incluindo a coerção de cadeia com número e os erros de divisão por zero).
+Os backends que resolvem o operador em tempo de compilação consultam as
+tabelas `OPERADORES_BINARIOS` e `OPERADORES_UNARIOS`.
+
+`OPERADORES_SEM_COERCAO` e `concatenar_numero` são versões especializadas,
+escolhidas pela verificação de tipos (`portugol.tipos`) quando os tipos dos
+operandos dispensam a verificação de coerção.
+
+A soma com uma cadeia à esquerda é a `concatenar` de `portugol.cadeias`, que
+monta cadeias longas em uma `Corda` em vez de copiá-las a cada '+'.
+"""
+
+import operator
+from typing import Any, Callable, Dict
+
+from .cadeias import Corda, concatenar
+from .interpretador import ErroExecucao
+
+
+def _coagir(esquerda: Any, direita: Any) -> Any:
+    # Cadeia combinada com número: o número é convertido para cadeia
+    if isinstance(esquerda, (str, Corda)) and isinstance(direita, (int, float)):
+        return str(direita)
+    return direita
+
+
+def somar(esquerda: Any, direita: Any) -> Any:
+    classe = esquerda.__class__
+    if classe is str or classe is Corda:
+        return concatenar(esquerda, direita)
+    return esquerda + direita
+
+
+def subtrair(esquerda: Any, direita: Any) -> Any:
+    return esquerda - _coagir(esquerda, direita)
+
+
+def multiplicar(esquerda: Any, direita: Any) -> Any:
+    return esquerda * _coagir(esquerda, direita)
+
+
+def dividir(esquerda: Any, direita: Any) -> Any:
+    direita = _coagir(esquerda, direita)
+    if direita == 0: raise ErroExecucao("Divisão por zero.")
+    return esquerda / direita
+
+
+def modulo(esquerda: Any, direita: Any) -> Any:
+    direita = _coagir(esquerda, direita)
+    if direita == 0: raise ErroExecucao("Módulo por zero.")
+    return esquerda % direita
+
+
+def e_logico(esquerda: Any, direita: Any) -> Any:
+    return esquerda and direita
+
+
+def ou_logico(esquerda: Any, direita: Any) -> Any:
+    return esquerda or direita
+
+
+# Especializações: o operando esquerdo nunca é cadeia ou o direito nunca é número
+
+def dividir_sem_coercao(esquerda: Any, direita: Any) -> Any:
+    if direita == 0: raise ErroExecucao("Divisão por zero.")
+    return esquerda / direita
+
+
+def modulo_sem_coercao(esquerda: Any, direita: Any) -> Any:
+    if direita == 0: raise ErroExecucao("Módulo por zero.")
+    return esquerda % direita
+
+
+def concatenar_numero(esquerda: str, direita: Any) -> str:
+    # Cadeia à esquerda e número à direita: sempre há coerção
+    return concatenar(esquerda, str(direita))
+
+
+OPERADORES_SEM_COERCAO: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": dividir_sem_coercao,
+    "%": modulo_sem_coercao,
+}
+
+OPERADORES_BINARIOS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": somar,
+    "-": subtrair,
+    "*": multiplicar,
+    "/": dividir,
+    "%": modulo,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "e": e_logico,
+    "ou": ou_logico,
+}
+
+OPERADORES_UNARIOS: Dict[str, Callable[[Any], Any]] = {
+    "-": operator.neg,
+    "+": operator.pos,
+    "!": operator.not_,
+}
+
+
+def operador_binario(op: str) -> Callable[[Any, Any], Any]:
+    try:
+        return OPERADORES_BINARIOS[op]
+    except KeyError:
+        raise ErroExecucao(f"Operador binário desconhecido: {op}") from None
+
+
+def operador_unario(op: str) -> Callable[[Any], Any]:
+    try:
+        return OPERADORES_UNARIOS[op]
+    except KeyError:
+        raise ErroExecucao(f"Operador unário desconhecido: {op}") from None
@@ -0,0 +1,683 @@
+"""
+Passes de otimização sobre a AST Portugol.
+
+Cada passo percorre o programa e devolve a AST transformada, contando o que
+alterou em `estatisticas`. O `GerenciadorPassos` aplica os passos em ordem e
+mede o tempo de cada um:
+
+- `CurtoCircuito`: troca `e`/`ou` por `ExpressaoLogica` quando o operando
+  direito não chama funções (e portanto não escreve nem lê nada);
+- `DobramentoConstantes`: avalia operações cujos operandos são literais;
+- `EliminacaoCodigoMorto`: remove desvios com condição constante, laços que
+  nunca executam e comandos que seguem um `retorne` no mesmo bloco;
+- `MovimentacaoInvariantes`: calcula uma única vez, antes do laço, as
+  subexpressões da condição de `enquanto`/`para` que o laço não altera;
+- `ExpansaoFuncoes`: copia o corpo de funções pequenas, não recursivas e
+  com uma única saída para o lugar das chamadas.
+
+Todos os passos preservam a saída dos programas; a única diferença
+observável é que o operando direito de um `e`/`ou` com curto-circuito pode
+deixar de ser avaliado e, com ele, um eventual erro de execução.
+"""
+
+import copy
+import math
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from .analise import (
+    campos, contem_chamada, nomes_atribuidos, nomes_atribuidos_em_funcoes, nomes_lidos, percorrer,
+    _expressao_simples
+)
+from .ast import (
+    ASTNode, Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao, Tipo,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .operadores import OPERADORES_BINARIOS, OPERADORES_UNARIOS
+from .resolvedor import ErroResolucao, resolver
+
+# Cadeias maiores que isto não são dobradas, para não inflar a AST (ex.: 100000 * "x")
+LIMITE_CADEIA_DOBRADA = 1024
+
+# Tipo das variáveis temporárias criadas pelos passos: o valor vem do inicializador
+TIPO_INFERIDO = "inferido"
+
+# Funções com mais nós da AST no corpo que isto não são expandidas
+TAMANHO_MAXIMO_EXPANSAO = 30
+
+
+class Passo:
+    """Base dos passos: transforma os filhos de cada nó e despacha por tipo.
+
+    `transformar_<Tipo>` devolve o nó que substitui o original, `None` para
+    removê-lo ou uma lista de nós para inseri-los no lugar dele (dentro de um
+    bloco; fora de um bloco a lista vira um `Bloco`).
+    """
+
+    nome = "passo"
+
+    def __init__(self):
+        self.estatisticas: Dict[str, int] = {}
+
+    def contar(self, chave: str, quantidade: int = 1):
+        self.estatisticas[chave] = self.estatisticas.get(chave, 0) + quantidade
+
+    def executar(self, programa: Programa) -> Programa:
+        return self.transformar(programa)
+
+    def transformar(self, no):
+        metodo = getattr(self, 'transformar_' + type(no).__name__, self.transformar_filhos)
+        return metodo(no)
+
+    def transformar_filhos(self, no):
+        for nome, valor in list(campos(no)):
+            if isinstance(valor, ASTNode):
+                novo = self.transformar(valor)
+                if novo is None:
+                    novo = Bloco([])
+                elif isinstance(novo, list):
+                    novo = Bloco(novo)
+                setattr(no, nome, novo)
+            elif isinstance(valor, list):
+                setattr(no, nome, self._transformar_lista(valor))
+        return no
+
+    def _transformar_lista(self, itens: List[Any]) -> List[Any]:
+        novos = []
+        for item in itens:
+            if not isinstance(item, ASTNode):
+                novos.append(item)
+                continue
+            novo = self.transformar(item)
+            if isinstance(novo, list):
+                novos.extend(novo)
+            elif novo is not None:
+                novos.append(novo)
+        return novos
+
+
+class CurtoCircuito(Passo):
+    nome = "curto-circuito"
+
+    def transformar_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        self.transformar_filhos(expressao)
+        if expressao.operador not in ('e', 'ou'):
+            return expressao
+        if contem_chamada(expressao.direita):
+            self.contar("mantidas (chamada no operando direito)")
+            return expressao
+        self.contar("operações lógicas com curto-circuito")
+        return ExpressaoLogica(expressao.esquerda, expressao.operador, expressao.direita)
+
+
+_NAO_DOBRAVEL = object()
+
+
+def _constante(calcular, *operandos) -> Any:
+    try:
+        valor = calcular(*operandos)
+    except Exception:
+        # O erro (divisão por zero, tipos incompatíveis) fica para a execução
+        return _NAO_DOBRAVEL
+    if type(valor) not in (int, float, str, bool):
+        return _NAO_DOBRAVEL
+    if type(valor) is float and not math.isfinite(valor):
+        return _NAO_DOBRAVEL
+    if type(valor) is str and len(valor) > LIMITE_CADEIA_DOBRADA:
+        return _NAO_DOBRAVEL
+    return valor
+
+
+class DobramentoConstantes(Passo):
+    nome = "dobramento-constantes"
+
+    def transformar_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        self.transformar_filhos(expressao)
+        esquerda, direita = expressao.esquerda, expressao.direita
+        if not (isinstance(esquerda, ExpressaoLiteral) and isinstance(direita, ExpressaoLiteral)):
+            return expressao
+        operacao = OPERADORES_BINARIOS.get(expressao.operador)
+        if operacao is None:
+            return expressao
+        valor = _constante(operacao, esquerda.valor, direita.valor)
+        if valor is _NAO_DOBRAVEL:
+            return expressao
+        self.contar("expressões binárias dobradas")
+        return ExpressaoLiteral(valor)
+
+    def transformar_ExpressaoUnaria(self, expressao: ExpressaoUnaria):
+        self.transformar_filhos(expressao)
+        operacao = OPERADORES_UNARIOS.get(expressao.operador)
+        if operacao is None or not isinstance(expressao.expressao, ExpressaoLiteral):
+            return expressao
+        valor = _constante(operacao, expressao.expressao.valor)
+        if valor is _NAO_DOBRAVEL:
+            return expressao
+        self.contar("expressões unárias dobradas")
+        return ExpressaoLiteral(valor)
+
+    def transformar_ExpressaoLogica(self, expressao: ExpressaoLogica):
+        self.transformar_filhos(expressao)
+        esquerda = expressao.esquerda
+        if not isinstance(esquerda, ExpressaoLiteral) or expressao.operador not in ('e', 'ou'):
+            return expressao
+        # `a e b` vale `b` se `a` for verdadeiro e `a` caso contrário; `ou` é o inverso
+        self.contar("operações lógicas resolvidas pelo operando esquerdo")
+        if bool(esquerda.valor) == (expressao.operador == 'e'):
+            return expressao.direita
+        return esquerda
+
+
+class EliminacaoCodigoMorto(Passo):
+    nome = "eliminacao-codigo-morto"
+
+    def transformar_Bloco(self, bloco: Bloco):
+        self.transformar_filhos(bloco)
+        for posicao, comando in enumerate(bloco.declaracoes):
+            if isinstance(comando, ComandoRetorne):
+                inalcancaveis = len(bloco.declaracoes) - posicao - 1
+                if inalcancaveis:
+                    self.contar("comandos após retorne removidos", inalcancaveis)
+                    del bloco.declaracoes[posicao + 1:]
+                break
+        return bloco
+
+    def transformar_ComandoSe(self, comando: ComandoSe):
+        self.transformar_filhos(comando)
+        if not isinstance(comando.condicao, ExpressaoLiteral):
+            return comando
+        self.contar("desvios com condição constante removidos")
+        if comando.condicao.valor:
+            return comando.comando_entao
+        return comando.comando_senao
+
+    def transformar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        self.transformar_filhos(comando)
+        if isinstance(comando.condicao, ExpressaoLiteral) and not comando.condicao.valor:
+            self.contar("laços que nunca executam removidos")
+            return None
+        return comando
+
+    def transformar_ComandoPara(self, comando: ComandoPara):
+        self.transformar_filhos(comando)
+        if isinstance(comando.condicao, ExpressaoLiteral) and not comando.condicao.valor:
+            self.contar("laços que nunca executam removidos")
+            # A inicialização ainda executa, no escopo próprio do laço
+            return Bloco([comando.inicializacao])
+        return comando
+
+
+class MovimentacaoInvariantes(Passo):
+    """Move para antes do laço as subexpressões invariantes da condição.
+
+    Uma subexpressão é invariante quando só usa literais, variáveis e
+    operadores, e nenhuma das variáveis é declarada, atribuída ou lida
+    (`leia`) pelo laço, nem alterada por funções que o laço possa chamar.
+    O valor é guardado em uma variável temporária `$invN`, que não pode
+    colidir com nomes do programa. Condições que chamam funções e o operando
+    direito de uma `ExpressaoLogica` são deixados como estão, para não mudar
+    a ordem de avaliação.
+    """
+
+    nome = "movimentacao-invariantes"
+
+    def executar(self, programa: Programa) -> Programa:
+        self.contador = 0
+        self.atribuidos_por_funcoes = nomes_atribuidos_em_funcoes(programa)
+        return super().executar(programa)
+
+    def transformar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        self.transformar_filhos(comando)
+        return self._mover(comando, nomes_atribuidos(comando.comando))
+
+    def transformar_ComandoPara(self, comando: ComandoPara):
+        self.transformar_filhos(comando)
+        if contem_chamada(comando.inicializacao):
+            return comando
+        alterados = (nomes_atribuidos(comando.inicializacao) | nomes_atribuidos(comando.incremento)
+                     | nomes_atribuidos(comando.comando))
+        return self._mover(comando, alterados)
+
+    def _mover(self, laco, alterados):
+        if contem_chamada(laco.condicao):
+            return laco
+        if contem_chamada(laco):
+            alterados = alterados | self.atribuidos_por_funcoes
+        declaracoes = []
+        laco.condicao = self._extrair(laco.condicao, alterados, declaracoes)
+        if not declaracoes:
+            return laco
+        self.contar("subexpressões invariantes movidas", len(declaracoes))
+        return declaracoes + [laco]
+
+    def _extrair(self, expressao, alterados, declaracoes: List[DeclaracaoVariavel]):
+        if isinstance(expressao, (ExpressaoLiteral, ExpressaoIdentificador, ChamadaFuncao)):
+            return expressao
+        lidos = nomes_lidos(expressao)
+        # Expressões sem variáveis ficam para o dobramento de constantes
+        if lidos and _expressao_simples(expressao) and not (lidos & alterados):
+            nome = f"$inv{self.contador}"
+            self.contador += 1
+            declaracoes.append(DeclaracaoVariavel(Tipo(TIPO_INFERIDO), nome, expressao))
+            return ExpressaoIdentificador(nome)
+        if isinstance(expressao, ExpressaoUnaria):
+            expressao.expressao = self._extrair(expressao.expressao, alterados, declaracoes)
+        elif isinstance(expressao, ExpressaoLogica):
+            expressao.esquerda = self._extrair(expressao.esquerda, alterados, declaracoes)
+        elif isinstance(expressao, ExpressaoBinaria):
+            expressao.esquerda = self._extrair(expressao.esquerda, alterados, declaracoes)
+            expressao.direita = self._extrair(expressao.direita, alterados, declaracoes)
+        return expressao
+
+
+# Nós que usam um nome declarado, e o campo onde o nome fica
+_CAMPO_NOME = {
+    ExpressaoIdentificador: "nome", ExpressaoIndice: "nome", ChamadaFuncao: "nome",
+    ComandoAtribuicao: "identificador", ComandoAtribuicaoIndice: "identificador", ComandoLeia: "identificador",
+}
+_ESCRITAS = (ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoLeia)
+
+
+class _Candidata:
+    """Uma função que pode ser expandida e o que a expansão precisa saber dela."""
+
+    def __init__(self, declaracao: DeclaracaoFuncao, indice: int):
+        self.declaracao = declaracao
+        # Posição da declaração no bloco principal: só chamadas em itens seguintes são expandidas
+        self.indice = indice
+        # Nomes globais usados pelo corpo, que não podem estar sombreados no lugar da chamada
+        self.livres: Set[str] = {declaracao.nome}
+        # Nomes globais alterados pelo corpo; None se o corpo chama outras funções
+        self.escritos: Optional[Set[str]] = set()
+        # (uso, declaração) dos nomes de parâmetros e variáveis locais, que são renomeados
+        self.locais: List[Any] = []
+        self.declaracoes: List[DeclaracaoVariavel] = []
+        corpo = declaracao.corpo.declaracoes
+        self.retorne = corpo[-1] if corpo and isinstance(corpo[-1], ComandoRetorne) else None
+
+
+class _Avaliacao:
+    """Estado de um comando percorrido na ordem de avaliação.
+
+    `antes` guarda as subexpressões já avaliadas que ficam no comando, e
+    `prefixo`, os comandos das chamadas expandidas, que executam antes dele.
+    """
+
+    __slots__ = ("antes", "prefixo")
+
+    def __init__(self):
+        self.antes: List[Any] = []
+        self.prefixo: List[Any] = []
+
+
+class ExpansaoFuncoes(Passo):
+    """Copia o corpo de funções pequenas para o lugar das chamadas.
+
+    O grafo de chamadas entre as funções do bloco principal decide quem pode
+    ser expandida: funções que não chegam a si mesmas pelo grafo, com no
+    máximo `tamanho_maximo` nós no corpo, sem vetores nos parâmetros, sem
+    funções aninhadas e com uma única saída (um `retorne` no fim do corpo,
+    ou nenhum). A expansão acontece das folhas do grafo para cima, uma rodada
+    por nível: uma função que chama outra só é considerada depois que as
+    chamadas dela foram expandidas.
+
+    No lugar de `x = f(a, b)`, os argumentos são guardados em variáveis
+    temporárias que substituem os parâmetros, seguidas do corpo e de uma
+    temporária com o valor do `retorne`. Os parâmetros e as variáveis locais
+    recebem nomes novos `$funcao.nome.N`, que não colidem com os do programa;
+    os nomes globais usados pelo corpo continuam os mesmos, e a chamada só é
+    expandida onde nenhum deles está sombreado.
+
+    Os comandos expandidos executam antes do comando da chamada, então só o
+    que seria avaliado antes da chamada precisa ser seguro para mudar de
+    lugar: literais e variáveis que a função não altera. Chamadas em
+    condições de laço, no incremento do `para` e no operando direito de uma
+    `ExpressaoLogica` não são expandidas, porque executam um número variável
+    de vezes.
+    """
+
+    nome = "expansao-funcoes"
+
+    def __init__(self, tamanho_maximo: int = TAMANHO_MAXIMO_EXPANSAO):
+        super().__init__()
+        self.tamanho_maximo = tamanho_maximo
+
+    def executar(self, programa: Programa) -> Programa:
+        self.contador = 0
+        motivos: Dict[str, str] = {}
+        expandidas: Set[str] = set()
+        while True:
+            try:
+                self.resolucao = resolver(programa)
+            except ErroResolucao:
+                self.contar("programas com nomes não definidos (nada expandido)")
+                return programa
+            self._candidatas, motivos_rodada = self._candidatas_da_rodada(programa)
+            motivos.update(motivos_rodada)
+            self.expandidas_rodada = 0
+            programa = self.transformar(programa)
+            expandidas |= {candidata.declaracao.nome for candidata in self._candidatas.values()
+                           if self.estatisticas.get(f"chamadas expandidas de {candidata.declaracao.nome}")}
+            if not self.expandidas_rodada:
+                break
+        for nome, motivo in motivos.items():
+            if nome not in expandidas:
+                self.contar(f"funções mantidas ({motivo})")
+        return programa
+
+    # Grafo de chamadas e escolha das funções
+
+    def _candidatas_da_rodada(self, programa: Programa):
+        itens = programa.declaracoes.declaracoes
+        resolucao = self.resolucao
+        globais = {id(item) for item in itens if isinstance(item, (DeclaracaoVariavel, DeclaracaoFuncao))}
+        nomes = [item.nome if isinstance(item, DeclaracaoFuncao) else item.identificador
+                 for item in itens if isinstance(item, (DeclaracaoVariavel, DeclaracaoFuncao))]
+        funcoes = {id(item): (indice, item) for indice, item in enumerate(itens) if isinstance(item, DeclaracaoFuncao)}
+
+        grafo = {}
+        for chave, (_, funcao) in funcoes.items():
+            chamadas = (resolucao.declaracoes.get(id(no)) for no in percorrer(funcao.corpo)
+                        if isinstance(no, ChamadaFuncao))
+            grafo[chave] = {id(chamada) for chamada in chamadas if chamada is not None}
+
+        candidatas, motivos = {}, {}
+        for chave, (indice, funcao) in funcoes.items():
+            if nomes.count(funcao.nome) > 1:
+                motivo = "nome declarado mais de uma vez"
+            elif _alcanca(grafo, chave, chave):
+                motivo = "recursiva"
+            else:
+                motivo = self._analisar_funcao(funcao, indice, globais)
+            if isinstance(motivo, _Candidata):
+                candidatas[chave] = motivo
+            else:
+                motivos[funcao.nome] = motivo
+        # Só as folhas entre as candidatas: as demais esperam a expansão das que elas chamam
+        folhas = {chave: candidata for chave, candidata in candidatas.items() if not grafo[chave] & candidatas.keys()}
+        for chave in candidatas.keys() - folhas.keys():
+            motivos[candidatas[chave].declaracao.nome] = "chama funções que não foram expandidas"
+        return folhas, motivos
+
+    def _analisar_funcao(self, funcao: DeclaracaoFuncao, indice: int, globais: Set[int]):
+        """A `_Candidata` da função, ou o motivo pelo qual ela não pode ser expandida."""
+        if any(parametro.dimensoes for parametro in funcao.parametros):
+            return "parâmetros vetores"
+        nos = list(percorrer(funcao.corpo))
+        if len(nos) > self.tamanho_maximo:
+            return "maiores que o limite"
+        if any(isinstance(no, DeclaracaoFuncao) for no in nos):
+            return "funções aninhadas"
+        candidata = _Candidata(funcao, indice)
+        retornes = [no for no in nos if isinstance(no, ComandoRetorne)]
+        if retornes and retornes != [candidata.retorne]:
+            return "mais de uma saída"
+
+        resolucao = self.resolucao
+        internas = {id(parametro) for parametro in funcao.parametros}
+        for no in nos:
+            if isinstance(no, DeclaracaoVariavel):
+                internas.add(id(no))
+                candidata.declaracoes.append(no)
+        for no in nos:
+            campo = _CAMPO_NOME.get(type(no))
+            if campo is None:
+                continue
+            declaracao = resolucao.declaracoes.get(id(no))
+            if declaracao is None:
+                return "nomes não resolvidos"
+            if id(declaracao) in internas:
+                candidata.locais.append((no, declaracao))
+                continue
+            if id(resolucao.variavel(declaracao)) not in globais:
+                return "usa nomes de fora do bloco principal"
+            nome = getattr(no, campo)
+            candidata.livres.add(nome)
+            if isinstance(no, ChamadaFuncao):
+                candidata.escritos = None
+            elif isinstance(no, _ESCRITAS) and candidata.escritos is not None:
+                candidata.escritos.add(nome)
+        return candidata
+
+    # Percurso: só comandos passam por transformar(); as expressões são
+    # percorridas por _expressao, na ordem em que são avaliadas
+
+    def transformar_Programa(self, programa: Programa):
+        self._escopos: List[Set[str]] = []
+        novos = []
+        # O bloco principal não sombreia nada: os nomes globais são os que as funções usam
+        for indice, item in enumerate(programa.declaracoes.declaracoes):
+            self._indice = indice
+            novo = self.transformar(item)
+            if isinstance(novo, list):
+                novos.extend(novo)
+            elif novo is not None:
+                novos.append(novo)
+        programa.declaracoes.declaracoes = novos
+        return programa
+
+    def transformar_Bloco(self, bloco: Bloco):
+        nomes = {item.nome if isinstance(item, DeclaracaoFuncao) else item.identificador
+                 for item in bloco.declaracoes if isinstance(item, (DeclaracaoVariavel, DeclaracaoFuncao))}
+        self._escopos.append(nomes)
+        try:
+            return self.transformar_filhos(bloco)
+        finally:
+            self._escopos.pop()
+
+    def transformar_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        self._escopos.append({parametro.identificador for parametro in declaracao.parametros})
+        try:
+            declaracao.corpo = self._comando(declaracao.corpo)
+        finally:
+            self._escopos.pop()
+        return declaracao
+
+    def transformar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        avaliacao = _Avaliacao()
+        if declaracao.dimensoes is not None:
+            declaracao.dimensoes = [self._expressao(tamanho, avaliacao) for tamanho in declaracao.dimensoes]
+        if declaracao.inicializador is not None:
+            declaracao.inicializador = self._expressao(declaracao.inicializador, avaliacao)
+        return avaliacao.prefixo + [declaracao] if avaliacao.prefixo else declaracao
+
+    def transformar_ComandoAtribuicao(self, comando: ComandoAtribuicao):
+        avaliacao = _Avaliacao()
+        comando.expressao = self._expressao(comando.expressao, avaliacao)
+        return avaliacao.prefixo + [comando] if avaliacao.prefixo else comando
+
+    def transformar_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        avaliacao = _Avaliacao()
+        # O vetor é buscado antes dos índices e do valor
+        avaliacao.antes.append(ExpressaoIdentificador(comando.identificador))
+        comando.indices = [self._expressao(indice, avaliacao) for indice in comando.indices]
+        comando.expressao = self._expressao(comando.expressao, avaliacao)
+        return avaliacao.prefixo + [comando] if avaliacao.prefixo else comando
+
+    def transformar_ComandoEscreva(self, comando: ComandoEscreva):
+        avaliacao = _Avaliacao()
+        comando.expressoes = [self._expressao(expressao, avaliacao) for expressao in comando.expressoes]
+        return avaliacao.prefixo + [comando] if avaliacao.prefixo else comando
+
+    def transformar_ComandoRetorne(self, comando: ComandoRetorne):
+        avaliacao = _Avaliacao()
+        if comando.expressao is not None:
+            comando.expressao = self._expressao(comando.expressao, avaliacao)
+        return avaliacao.prefixo + [comando] if avaliacao.prefixo else comando
+
+    def transformar_ComandoSe(self, comando: ComandoSe):
+        avaliacao = _Avaliacao()
+        comando.condicao = self._expressao(comando.condicao, avaliacao)
+        comando.comando_entao = self._comando(comando.comando_entao)
+        if comando.comando_senao is not None:
+            comando.comando_senao = self._comando(comando.comando_senao)
+        return avaliacao.prefixo + [comando] if avaliacao.prefixo else comando
+
+    def transformar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        comando.comando = self._comando(comando.comando)
+        return comando
+
+    def transformar_ComandoPara(self, comando: ComandoPara):
+        declarada = comando.inicializacao
+        self._escopos.append({declarada.identificador} if isinstance(declarada, DeclaracaoVariavel) else set())
+        try:
+            comando.comando = self._comando(comando.comando)
+        finally:
+            self._escopos.pop()
+        return comando
+
+    def transformar_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        # Uma chamada usada como comando: o valor devolvido é descartado
+        avaliacao = _Avaliacao()
+        chamada.argumentos = [self._expressao(argumento, avaliacao) for argumento in chamada.argumentos]
+        del avaliacao.antes[:]
+        if self._expandir(chamada, avaliacao, valor_usado=False) is not None:
+            return avaliacao.prefixo
+        return avaliacao.prefixo + [chamada] if avaliacao.prefixo else chamada
+
+    def _comando(self, no):
+        """Transforma um comando que ocupa um único lugar (corpo de laço, ramo de `se`)."""
+        novo = self.transformar(no)
+        if novo is None:
+            return Bloco([])
+        if isinstance(novo, list):
+            return Bloco(novo)
+        return novo
+
+    def _expressao(self, no, avaliacao: _Avaliacao):
+        """Expande as chamadas de `no`, na ordem de avaliação, e devolve o nó que fica no comando."""
+        marca = len(avaliacao.antes)
+        if isinstance(no, ChamadaFuncao):
+            no.argumentos = [self._expressao(argumento, avaliacao) for argumento in no.argumentos]
+            # Os argumentos vão junto com a chamada, se ela for expandida
+            del avaliacao.antes[marca:]
+            novo = self._expandir(no, avaliacao, valor_usado=True)
+            if novo is not None:
+                no = novo
+        elif isinstance(no, ExpressaoBinaria):
+            no.esquerda = self._expressao(no.esquerda, avaliacao)
+            no.direita = self._expressao(no.direita, avaliacao)
+        elif isinstance(no, ExpressaoLogica):
+            # O operando direito pode não ser avaliado: as chamadas dele ficam onde estão
+            no.esquerda = self._expressao(no.esquerda, avaliacao)
+        elif isinstance(no, ExpressaoUnaria):
+            no.expressao = self._expressao(no.expressao, avaliacao)
+        elif isinstance(no, ExpressaoIndice):
+            avaliacao.antes.append(ExpressaoIdentificador(no.nome))
+            no.indices = [self._expressao(indice, avaliacao) for indice in no.indices]
+        elif isinstance(no, ExpressaoVetor):
+            no.elementos = [self._expressao(elemento, avaliacao) for elemento in no.elementos]
+        del avaliacao.antes[marca:]
+        avaliacao.antes.append(no)
+        return no
+
+    # Expansão
+
+    def _expandir(self, chamada: ChamadaFuncao, avaliacao: _Avaliacao, valor_usado: bool):
+        """Acrescenta ao prefixo o corpo da função chamada e devolve o nó do valor (None se não expandiu)."""
+        declaracao = self.resolucao.declaracoes.get(id(chamada))
+        candidata = self._candidatas.get(id(declaracao)) if declaracao is not None else None
+        if candidata is None or len(chamada.argumentos) != len(declaracao.parametros):
+            return None
+        if self._indice <= candidata.indice:
+            return None
+        retorne = candidata.retorne
+        if valor_usado and (retorne is None or retorne.expressao is None):
+            return None
+        if any(nome in escopo for escopo in self._escopos for nome in candidata.livres):
+            return None
+        escritos = candidata.escritos
+        if any(contem_chamada(argumento) for argumento in chamada.argumentos):
+            escritos = None
+        for anterior in avaliacao.antes:
+            if isinstance(anterior, ExpressaoLiteral):
+                continue
+            if not isinstance(anterior, ExpressaoIdentificador):
+                return None
+            # Temporárias dos passos só são alteradas pelo próprio passo que as criou
+            if not anterior.nome.startswith("$") and (escritos is None or anterior.nome in escritos):
+                return None
+
+        copias: Dict[int, Any] = {}
+        corpo = copy.deepcopy(declaracao.corpo.declaracoes, copias)
+        novos_nomes: Dict[int, str] = {}
+
+        def renomear(original) -> str:
+            variavel = id(self.resolucao.variavel(original))
+            if variavel not in novos_nomes:
+                novos_nomes[variavel] = self._temporaria(declaracao.nome, original.identificador)
+            return novos_nomes[variavel]
+
+        for parametro, argumento in zip(declaracao.parametros, chamada.argumentos):
+            avaliacao.prefixo.append(DeclaracaoVariavel(Tipo(TIPO_INFERIDO), renomear(parametro), argumento))
+        for local in candidata.declaracoes:
+            copias[id(local)].identificador = renomear(local)
+        for uso, original in candidata.locais:
+            setattr(copias[id(uso)], _CAMPO_NOME[type(uso)], renomear(original))
+
+        valor = None
+        if retorne is not None:
+            expressao = corpo.pop().expressao
+            if valor_usado or not isinstance(expressao, (ExpressaoLiteral, ExpressaoIdentificador, type(None))):
+                # O valor é guardado mesmo quando descartado: a expressão pode falhar
+                nome = self._temporaria(declaracao.nome, "retorno")
+                corpo.append(DeclaracaoVariavel(Tipo(TIPO_INFERIDO), nome, expressao))
+                valor = ExpressaoIdentificador(nome)
+        avaliacao.prefixo.extend(corpo)
+        self.expandidas_rodada += 1
+        self.contar(f"chamadas expandidas de {declaracao.nome}")
+        return valor if valor is not None else []
+
+    def _temporaria(self, funcao: str, nome: str) -> str:
+        self.contador += 1
+        return f"${funcao}.{nome}.{self.contador}"
+
+
+def _alcanca(grafo: Dict[int, Set[int]], origem: int, destino: int) -> bool:
+    """Se há um caminho de uma ou mais chamadas de `origem` até `destino`."""
+    visitados, pendentes = set(), list(grafo.get(origem, ()))
+    while pendentes:
+        atual = pendentes.pop()
+        if atual == destino:
+            return True
+        if atual not in visitados:
+            visitados.add(atual)
+            pendentes.extend(grafo.get(atual, ()))
+    return False
+
+
+PASSOS_PADRAO = (ExpansaoFuncoes, CurtoCircuito, DobramentoConstantes, EliminacaoCodigoMorto, MovimentacaoInvariantes)
+
+
+class GerenciadorPassos:
+    """Aplica uma sequência de passos e guarda as estatísticas de cada um."""
+
+    def __init__(self, passos: Optional[List[Passo]] = None):
+        self.passos = list(passos) if passos is not None else [passo() for passo in PASSOS_PADRAO]
+        self.tempos: Dict[str, float] = {}
+
+    def otimizar(self, programa: Programa) -> Programa:
+        for passo in self.passos:
+            inicio = time.perf_counter()
+            programa = passo.executar(programa)
+            self.tempos[passo.nome] = time.perf_counter() - inicio
+        return programa
+
+    def relatorio(self) -> str:
+        linhas = []
+        for passo in self.passos:
+            tempo = self.tempos.get(passo.nome, 0.0) * 1000
+            linhas.append(f"{passo.nome} ({tempo:.2f} ms)")
+            if not passo.estatisticas:
+                linhas.append("  nenhuma alteração")
+            for chave, quantidade in passo.estatisticas.items():
+                linhas.append(f"  {chave}: {quantidade}")
+        return "\n".join(linhas)
+
+
+def otimizar(programa: Programa) -> Programa:
+    """Aplica os passos padrão ao programa."""
+    return GerenciadorPassos().otimizar(programa)
@@ -0,0 +1,135 @@
+"""
+Fábrica do parser LALR da linguagem Portugol.
+
+Construir as tabelas LALR a partir de `grammar.lark` domina o tempo de
+inicialização de programas curtos. `obter_parser` constrói o parser uma única
+vez por processo e guarda as tabelas serializadas em disco, em um arquivo cujo
+nome inclui a versão do Lark e o hash da gramática e das opções do parser:
+alterar a gramática ou atualizar o Lark gera um novo arquivo, e as execuções
+seguintes apenas o carregam.
+
+O diretório do cache é `$PORTUGOL_CACHE_DIR`, ou `portugol` dentro de
+`$XDG_CACHE_HOME` (padrão `~/.cache`).
+
+Sem posições, `analisar` usa a passagem única: o `ConstrutorAST` é o
+`transformer=` do parser LALR, e cada redução já devolve o nó da AST, sem
+montar antes a árvore do Lark e percorrê-la de novo. Com posições, a análise
+continua em duas passagens: o começo de comandos como `se` está em
+palavras-chave que o Lark só registra nos metadados da árvore.
+
+`ler_codigo` lê um arquivo-fonte mapeando-o na memória e o decodifica
+diretamente em uma `str`, sem a cópia intermediária de `f.read()`.
+"""
+
+import functools
+import hashlib
+import mmap
+import os
+from typing import Optional
+
+CAMINHO_GRAMATICA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar.lark")
+
+OPCOES_PARSER = {"start": "programa", "parser": "lalr"}
+
+
+def ler_gramatica() -> str:
+    with open(CAMINHO_GRAMATICA, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def diretorio_cache() -> str:
+    diretorio = os.environ.get("PORTUGOL_CACHE_DIR")
+    if diretorio:
+        return diretorio
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "portugol")
+
+
+def opcoes_parser(posicoes: bool = True) -> dict:
+    # propagate_positions leva a linha e a coluna de cada regra até a AST, mas
+    # quase dobra o tempo de análise: só é usado quando as posições são pedidas
+    return dict(OPCOES_PARSER, propagate_positions=posicoes)
+
+
+def caminho_cache(gramatica: str, posicoes: bool = True) -> str:
+    import lark
+
+    chave = gramatica + repr(sorted(opcoes_parser(posicoes).items()))
+    resumo = hashlib.sha256(chave.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(diretorio_cache(), f"parser-lark{lark.__version__}-{resumo}.pickle")
+
+
+def ler_codigo(caminho: str) -> str:
+    """Lê o código-fonte em UTF-8, com os fins de linha convertidos em '\\n' como no modo texto."""
+    with open(caminho, "rb") as f:
+        try:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Arquivos vazios e fluxos (ex.: pipes) não podem ser mapeados
+            codigo = f.read().decode("utf-8")
+        else:
+            with mapa:
+                codigo = str(mapa, "utf-8")
+    if "\r" in codigo:
+        codigo = codigo.replace("\r\n", "\n").replace("\r", "\n")
+    return codigo
+
+
+def construir_parser(usar_cache: bool = True, posicoes: bool = True, passagem_unica: bool = False):
+    # Lark só é importado quando um parser é de fato necessário
+    from lark import Lark
+
+    opcoes = opcoes_parser(posicoes)
+    if passagem_unica:
+        if posicoes:
+            raise ValueError("A análise em passagem única não guarda as posições dos nós.")
+        from .transformer import ConstrutorAST
+        # O transformer não entra no hash do cache do Lark: as tabelas são as mesmas
+        opcoes["transformer"] = ConstrutorAST()
+
+    gramatica = ler_gramatica()
+    cache: Optional[str] = None
+    if usar_cache:
+        cache = caminho_cache(gramatica, posicoes)
+        try:
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+        except OSError:
+            cache = None
+    # Com `cache`, o Lark grava as tabelas na primeira vez e as carrega nas
+    # seguintes; o próprio arquivo também guarda o hash da gramática e das opções
+    return Lark(gramatica, cache=cache or False, **opcoes)
+
+
+def obter_parser(usar_cache: bool = True, posicoes: bool = True, passagem_unica: bool = False):
+    """
+    Devolve o parser compartilhado do processo, construindo-o na primeira chamada.
+
+    Com `passagem_unica`, `parse` devolve diretamente a AST em vez da árvore do Lark.
+    """
+    # Argumentos normalizados: o lru_cache distingue argumentos posicionais de nomeados
+    return _parser_compartilhado(bool(usar_cache), bool(posicoes), bool(passagem_unica))
+
+
+@functools.lru_cache(maxsize=None)
+def _parser_compartilhado(usar_cache: bool, posicoes: bool, passagem_unica: bool):
+    return construir_parser(usar_cache, posicoes, passagem_unica)
+
+
+def analisar(codigo: str, usar_cache: bool = True, posicoes: bool = True,
+             passagem_unica: Optional[bool] = None):
+    """
+    Analisa o código-fonte e devolve a AST (`Programa`).
+
+    Com `posicoes`, cada nó guarda em `linha` e `coluna` onde começa no código.
+    `passagem_unica` (padrão: quando não há posições) constrói a AST durante a
+    análise sintática.
+    """
+    if passagem_unica is None:
+        passagem_unica = not posicoes
+    if passagem_unica:
+        return obter_parser(usar_cache, posicoes, True).parse(codigo)
+
+    from .transformer import PortugolTransformer
+
+    tree = obter_parser(usar_cache, posicoes).parse(codigo)
+    return PortugolTransformer(posicoes).transform(tree)
@@ -0,0 +1,134 @@
+"""
+Perfil de execução de programas Portugol.
+
+`InterpretadorPerfilado` é o interpretador de árvore com medições: conta
+quantas vezes cada linha do código-fonte executa um comando e, para cada
+função, quantas vezes ela foi chamada e o tempo gasto nela. O tempo
+inclusivo conta também as funções chamadas a partir dela; o exclusivo
+desconta essas chamadas. Em chamadas recursivas o tempo inclusivo só é
+somado na chamada mais externa, para não ser contado mais de uma vez.
+
+As medições ficam em um `Perfil`, que produz um relatório em texto e as
+pilhas colapsadas (`programa;f;g 1234`, em microssegundos de tempo
+exclusivo) lidas por ferramentas de flame graph como `flamegraph.pl` e
+speedscope. O interpretador comum não faz nenhuma dessas medições.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .ast import Bloco, Programa
+from .interpretador import Funcao, Interpretador
+
+# Nome do quadro mais externo, que corresponde ao corpo do programa
+QUADRO_PROGRAMA = "programa"
+
+# Linhas mostradas no relatório
+LIMITE_LINHAS_RELATORIO = 20
+
+
+class Perfil:
+    def __init__(self):
+        # linha -> comandos executados
+        self.linhas: Dict[int, int] = {}
+        # função -> [chamadas, tempo inclusivo, tempo exclusivo], em segundos
+        self.funcoes: Dict[str, List] = {}
+
+        # Cada caminho de chamadas é um índice; (índice do pai, nome) -> índice do filho
+        self._indices: Dict[Tuple[int, str], int] = {}
+        self._caminhos: List[Tuple[int, str]] = []
+        self._exclusivo: List[float] = []
+        # Quadros abertos: [nome, índice do caminho, início, tempo das chamadas internas]
+        self._pilha: List[List] = []
+        self._ativas: Dict[str, int] = {}
+
+    def entrar(self, nome: str):
+        pai = self._pilha[-1][1] if self._pilha else -1
+        indice = self._indices.get((pai, nome))
+        if indice is None:
+            indice = self._indices[(pai, nome)] = len(self._caminhos)
+            self._caminhos.append((pai, nome))
+            self._exclusivo.append(0.0)
+        estatistica = self.funcoes.get(nome)
+        if estatistica is None:
+            estatistica = self.funcoes[nome] = [0, 0.0, 0.0]
+        estatistica[0] += 1
+        self._ativas[nome] = self._ativas.get(nome, 0) + 1
+        self._pilha.append([nome, indice, time.perf_counter(), 0.0])
+
+    def sair(self):
+        fim = time.perf_counter()
+        nome, indice, inicio, internas = self._pilha.pop()
+        total = fim - inicio
+        exclusivo = total - internas
+        estatistica = self.funcoes[nome]
+        estatistica[2] += exclusivo
+        self._ativas[nome] -= 1
+        if not self._ativas[nome]:
+            estatistica[1] += total
+        self._exclusivo[indice] += exclusivo
+        if self._pilha:
+            self._pilha[-1][3] += total
+
+    def pilhas_colapsadas(self) -> str:
+        """Uma linha por caminho de chamadas: nomes separados por ';' e microssegundos exclusivos."""
+        linhas = []
+        for indice, exclusivo in enumerate(self._exclusivo):
+            microssegundos = round(exclusivo * 1_000_000)
+            if microssegundos <= 0:
+                continue
+            nomes = []
+            while indice >= 0:
+                indice, nome = self._caminhos[indice]
+                nomes.append(nome)
+            linhas.append(f"{';'.join(reversed(nomes))} {microssegundos}")
+        return "".join(linha + "\n" for linha in sorted(linhas))
+
+    def relatorio(self, codigo: Optional[str] = None, limite_linhas: int = LIMITE_LINHAS_RELATORIO) -> str:
+        fontes = codigo.splitlines() if codigo is not None else []
+        total = self.funcoes.get(QUADRO_PROGRAMA, [0, 0.0, 0.0])[1]
+        linhas = [f"tempo total: {total:.6f} s", "", "funções (por tempo exclusivo):",
+                  f"  {'função':<20} {'chamadas':>10} {'inclusivo (s)':>14} {'exclusivo (s)':>14}"]
+        funcoes = sorted(self.funcoes.items(), key=lambda item: (-item[1][2], item[0]))
+        for nome, (chamadas, inclusivo, exclusivo) in funcoes:
+            linhas.append(f"  {nome:<20} {chamadas:>10} {inclusivo:>14.6f} {exclusivo:>14.6f}")
+
+        linhas += ["", "linhas mais executadas:", f"  {'linha':>6} {'execuções':>10}  código"]
+        mais_executadas = sorted(self.linhas.items(), key=lambda item: (-item[1], item[0]))
+        for linha, execucoes in mais_executadas[:limite_linhas]:
+            fonte = fontes[linha - 1].strip() if linha <= len(fontes) else ""
+            linhas.append(f"  {linha:>6} {execucoes:>10}  {fonte}".rstrip())
+        if len(mais_executadas) > limite_linhas:
+            linhas.append(f"  ... ({len(mais_executadas) - limite_linhas} linhas omitidas)")
+        return "\n".join(linhas)
+
+
+class InterpretadorPerfilado(Interpretador):
+    # O perfil conta cada condição e incremento dos laços 'para' como comandos executados
+    lacos_contados = False
+
+    def __init__(self, perfil: Optional[Perfil] = None, **opcoes):
+        super().__init__(**opcoes)
+        self.perfil = perfil if perfil is not None else Perfil()
+
+    def interpretar(self, programa: Programa):
+        self.perfil.entrar(QUADRO_PROGRAMA)
+        try:
+            super().interpretar(programa)
+        finally:
+            self.perfil.sair()
+
+    def executar(self, no):
+        # Blocos não são comandos da linha: os comandos dentro deles é que são contados
+        linha = getattr(no, "linha", None)
+        if linha is not None and type(no) not in (Bloco, Programa):
+            linhas = self.perfil.linhas
+            linhas[linha] = linhas.get(linha, 0) + 1
+        return super().executar(no)
+
+    def executar_funcao(self, funcao_obj: Funcao, argumentos):
+        self.perfil.entrar(funcao_obj.declaracao.nome)
+        try:
+            return super().executar_funcao(funcao_obj, argumentos)
+        finally:
+            self.perfil.sair()
@@ -0,0 +1,313 @@
+"""
+Resolução estática de escopos para a linguagem Portugol.
+
+O `Resolvedor` percorre a AST uma vez antes da execução e calcula, para cada
+uso de nome (`ExpressaoIdentificador`, `ExpressaoIndice`, `ComandoAtribuicao`,
+`ComandoAtribuicaoIndice`, `ComandoLeia` e `ChamadaFuncao`), o endereço `(profundidade, slot)` da variável: quantos
+quadros acima do quadro atual ela está e em qual posição desse quadro.
+
+Quadros são listas de tamanho fixo cujo slot 0 guarda o quadro envolvente.
+Só o programa, cada chamada de função e os blocos que declaram funções
+alocam quadros; os demais blocos e laços `para` usam slots do quadro que os
+contém, de modo que blocos dentro de laços não alocam nada por iteração.
+
+Os corpos de função são resolvidos depois do restante do programa, então
+podem usar variáveis globais declaradas após a função, como no interpretador
+de árvore. Como lá, o nome é procurado no momento da chamada: se a variável
+encontrada foi declarada depois da função e ainda não existe, vale a de um
+escopo mais externo. Para esses usos a resolução guarda, além do endereço,
+as `alternativas` a tentar enquanto o slot não foi preenchido. Nomes não
+definidos são reportados antes de a execução começar.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .ast import (
+    ASTNode, Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .interpretador import ErroExecucao
+
+
+class ErroResolucao(ErroExecucao):
+    pass
+
+
+class Resolucao:
+    """Resultado da resolução, indexado pelo `id` dos nós da AST."""
+
+    def __init__(self):
+        # uso de nome -> (profundidade, slot)
+        self.enderecos: Dict[int, Tuple[int, int]] = {}
+        # uso de nome -> nó que declarou o nome (DeclaracaoVariavel, DeclaracaoFuncao ou Parametro)
+        self.declaracoes: Dict[int, Any] = {}
+        # declaração (DeclaracaoVariavel, DeclaracaoFuncao ou Parametro) -> slot
+        self.slots: Dict[int, int] = {}
+        # declaração -> primeira declaração do mesmo nome no mesmo escopo (mesma variável)
+        self.variaveis: Dict[int, Any] = {}
+        # nó que aloca quadro (Programa, DeclaracaoFuncao ou Bloco) -> tamanho do quadro
+        self.quadros: Dict[int, int] = {}
+        # uso de nome declarado depois da função que o usa -> (endereço, declaração) dos
+        # escopos mais externos, em ordem, usados enquanto a declaração não foi executada
+        self.alternativas: Dict[int, List[Tuple[Tuple[int, int], Any]]] = {}
+
+    def endereco(self, no: ASTNode) -> Tuple[int, int]:
+        return self.enderecos[id(no)]
+
+    def declaracao(self, no: ASTNode):
+        return self.declaracoes[id(no)]
+
+    def slot(self, declaracao) -> int:
+        return self.slots[id(declaracao)]
+
+    def variavel(self, declaracao):
+        return self.variaveis[id(declaracao)]
+
+    def tamanho_quadro(self, no: ASTNode) -> Optional[int]:
+        return self.quadros.get(id(no))
+
+    def alternativas_de(self, no: ASTNode) -> List[Tuple[Tuple[int, int], Any]]:
+        return self.alternativas.get(id(no), [])
+
+
+class _Quadro:
+    def __init__(self, no: ASTNode, pai: Optional["_Quadro"]):
+        self.no = no
+        self.pai = pai
+        self.tamanho = 1  # slot 0: quadro envolvente
+
+    def novo_slot(self) -> int:
+        slot = self.tamanho
+        self.tamanho += 1
+        return slot
+
+
+class _Escopo:
+    def __init__(self, pai: Optional["_Escopo"], quadro: _Quadro):
+        self.pai = pai
+        self.quadro = quadro
+        self.nomes: Dict[str, Tuple[int, Any]] = {}
+
+
+class Resolvedor:
+    def __init__(self):
+        self.resolucao = Resolucao()
+        self.escopo: Optional[_Escopo] = None
+        self.funcoes_pendentes: List[Tuple[DeclaracaoFuncao, _Escopo]] = []
+        # declaração -> ordem em que foi resolvida
+        self.ordens: Dict[int, int] = {}
+
+    def resolver_programa(self, programa: Programa) -> Resolucao:
+        quadro = _Quadro(programa, None)
+        self.escopo = _Escopo(None, quadro)
+        # O bloco do programa usa o quadro do próprio programa
+        self.resolver_comandos(programa.declaracoes.declaracoes)
+        while self.funcoes_pendentes:
+            declaracao, escopo = self.funcoes_pendentes.pop(0)
+            self.resolver_corpo_funcao(declaracao, escopo)
+        self.resolucao.quadros[id(programa)] = quadro.tamanho
+        return self.resolucao
+
+    # Escopos
+
+    def declarar(self, nome: str, declaracao) -> int:
+        existente = self.escopo.nomes.get(nome)
+        # Redeclarar no mesmo escopo reaproveita a variável, como Ambiente.definir
+        if existente:
+            slot = existente[0]
+            variavel = self.resolucao.variaveis[id(existente[1])]
+        else:
+            slot = self.escopo.quadro.novo_slot()
+            variavel = declaracao
+        self.escopo.nomes[nome] = (slot, declaracao)
+        self.ordens[id(declaracao)] = len(self.ordens)
+        self.resolucao.slots[id(declaracao)] = slot
+        self.resolucao.variaveis[id(declaracao)] = variavel
+        return slot
+
+    def localizar(self, no: ASTNode, nome: str, mensagem: str):
+        encontrados = []
+        # Fora da função que está sendo resolvida, só os nomes declarados até a
+        # definição dela certamente existem quando ela é chamada
+        limite = None
+        escopo = self.escopo
+        while escopo is not None:
+            if nome in escopo.nomes:
+                slot, declaracao = escopo.nomes[nome]
+                profundidade = 0
+                quadro = self.escopo.quadro
+                while quadro is not escopo.quadro:
+                    quadro = quadro.pai
+                    profundidade += 1
+                encontrados.append(((profundidade, slot), declaracao))
+                if limite is None or self.ordens[id(self.resolucao.variavel(declaracao))] <= limite:
+                    break
+            quadro = escopo.quadro
+            escopo = escopo.pai
+            if escopo is not None and escopo.quadro is not quadro and isinstance(quadro.no, DeclaracaoFuncao):
+                limite = self.ordens[id(quadro.no)]
+        if not encontrados:
+            raise ErroResolucao(mensagem)
+        (endereco, declaracao), *alternativas = encontrados
+        self.resolucao.enderecos[id(no)] = endereco
+        self.resolucao.declaracoes[id(no)] = declaracao
+        if alternativas:
+            self.resolucao.alternativas[id(no)] = alternativas
+        return declaracao
+
+    def entrar_escopo(self, novo_quadro: Optional[_Quadro] = None):
+        quadro = novo_quadro if novo_quadro is not None else self.escopo.quadro
+        self.escopo = _Escopo(self.escopo, quadro)
+
+    def sair_escopo(self):
+        self.escopo = self.escopo.pai
+
+    # Comandos
+
+    def resolver(self, no):
+        metodo_nome = 'resolver_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.resolver_no_desconhecido)
+        return metodo(no)
+
+    def resolver_no_desconhecido(self, no):
+        raise ErroResolucao(f"Tipo de nó AST desconhecido: {type(no).__name__}")
+
+    def resolver_comandos(self, comandos):
+        for no in comandos:
+            self.resolver(no)
+
+    def resolver_Bloco(self, bloco: Bloco):
+        # Um bloco que declara funções precisa de um quadro próprio a cada
+        # execução, pois as funções guardam o quadro onde foram definidas.
+        # Os demais usam slots do quadro envolvente.
+        if any(isinstance(no, DeclaracaoFuncao) for no in bloco.declaracoes):
+            quadro = _Quadro(bloco, self.escopo.quadro)
+            self.entrar_escopo(quadro)
+            self.resolver_comandos(bloco.declaracoes)
+            self.sair_escopo()
+            self.resolucao.quadros[id(bloco)] = quadro.tamanho
+        else:
+            self.entrar_escopo()
+            self.resolver_comandos(bloco.declaracoes)
+            self.sair_escopo()
+
+    def resolver_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        # Os tamanhos e o inicializador são resolvidos antes de o nome existir
+        for tamanho in declaracao.dimensoes or ():
+            self.resolver_expressao(tamanho)
+        if declaracao.inicializador:
+            self.resolver_expressao(declaracao.inicializador)
+        self.declarar(declaracao.identificador, declaracao)
+
+    def resolver_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        self.declarar(declaracao.nome, declaracao)
+        self.funcoes_pendentes.append((declaracao, self.escopo))
+
+    def resolver_corpo_funcao(self, declaracao: DeclaracaoFuncao, escopo: _Escopo):
+        escopo_anterior = self.escopo
+        quadro = _Quadro(declaracao, escopo.quadro)
+        self.escopo = _Escopo(escopo, quadro)
+        for parametro in declaracao.parametros:
+            self.declarar(parametro.identificador, parametro)
+        # O corpo é um escopo próprio (pode sombrear parâmetros), mas usa o quadro da chamada
+        self.entrar_escopo()
+        self.resolver_comandos(declaracao.corpo.declaracoes)
+        self.escopo = escopo_anterior
+        self.resolucao.quadros[id(declaracao)] = quadro.tamanho
+
+    def resolver_ComandoAtribuicao(self, comando: ComandoAtribuicao):
+        self.resolver_expressao(comando.expressao)
+        self.localizar(comando, comando.identificador,
+                       f"Variável '{comando.identificador}' não definida para atribuição.")
+
+    def resolver_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        # Como na execução: o vetor é buscado antes de os índices e o valor serem avaliados
+        self.localizar(comando, comando.identificador, f"Variável '{comando.identificador}' não definida.")
+        for indice in comando.indices:
+            self.resolver_expressao(indice)
+        self.resolver_expressao(comando.expressao)
+
+    def resolver_ComandoSe(self, comando: ComandoSe):
+        self.resolver_expressao(comando.condicao)
+        self.resolver(comando.comando_entao)
+        if comando.comando_senao:
+            self.resolver(comando.comando_senao)
+
+    def resolver_ComandoEnquanto(self, comando: ComandoEnquanto):
+        self.resolver_expressao(comando.condicao)
+        self.resolver(comando.comando)
+
+    def resolver_ComandoPara(self, comando: ComandoPara):
+        self.entrar_escopo()
+        self.resolver(comando.inicializacao)
+        self.resolver_expressao(comando.condicao)
+        self.resolver(comando.comando)
+        self.resolver(comando.incremento)
+        self.sair_escopo()
+
+    def resolver_ComandoEscreva(self, comando: ComandoEscreva):
+        for expressao in comando.expressoes:
+            self.resolver_expressao(expressao)
+
+    def resolver_ComandoLeia(self, comando: ComandoLeia):
+        self.localizar(comando, comando.identificador,
+                       f"Variável '{comando.identificador}' não definida para atribuição.")
+
+    def resolver_ComandoRetorne(self, comando: ComandoRetorne):
+        if comando.expressao:
+            self.resolver_expressao(comando.expressao)
+
+    def resolver_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        self.resolver_expressao(chamada)
+
+    # Expressões
+
+    def resolver_expressao(self, no):
+        metodo_nome = 'resolver_expressao_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.resolver_expressao_desconhecida)
+        return metodo(no)
+
+    def resolver_expressao_desconhecida(self, no):
+        raise ErroResolucao(f"Tipo de nó de expressão desconhecido: {type(no).__name__}")
+
+    def resolver_expressao_ExpressaoLiteral(self, expressao: ExpressaoLiteral):
+        pass
+
+    def resolver_expressao_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador):
+        self.localizar(expressao, expressao.nome, f"Variável '{expressao.nome}' não definida.")
+
+    def resolver_expressao_ExpressaoIndice(self, expressao: ExpressaoIndice):
+        self.localizar(expressao, expressao.nome, f"Variável '{expressao.nome}' não definida.")
+        for indice in expressao.indices:
+            self.resolver_expressao(indice)
+
+    def resolver_expressao_ExpressaoVetor(self, expressao: ExpressaoVetor):
+        for elemento in expressao.elementos:
+            self.resolver_expressao(elemento)
+
+    def resolver_expressao_ExpressaoUnaria(self, expressao: ExpressaoUnaria):
+        self.resolver_expressao(expressao.expressao)
+
+    def resolver_expressao_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        self.resolver_expressao(expressao.esquerda)
+        self.resolver_expressao(expressao.direita)
+
+    def resolver_expressao_ExpressaoLogica(self, expressao: ExpressaoLogica):
+        self.resolver_expressao(expressao.esquerda)
+        self.resolver_expressao(expressao.direita)
+
+    def resolver_expressao_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        declaracao = self.localizar(chamada, chamada.nome, f"Variável '{chamada.nome}' não definida.")
+        # Com alternativas, a função chamada só é conhecida na execução
+        if isinstance(declaracao, DeclaracaoFuncao) and not self.resolucao.alternativas_de(chamada):
+            if len(chamada.argumentos) != len(declaracao.parametros):
+                raise ErroResolucao(f"Número incorreto de argumentos para '{chamada.nome}'.")
+        for argumento in chamada.argumentos:
+            self.resolver_expressao(argumento)
+
+
+def resolver(programa: Programa) -> Resolucao:
+    return Resolvedor().resolver_programa(programa)
@@ -0,0 +1,327 @@
+"""
+Sessão interativa: executa trechos de Portugol sobre um estado que persiste.
+
+Uma `Sessao` guarda um `Interpretador` (o backend de árvore) cujo ambiente
+global dura entre as chamadas: variáveis declaradas e funções definidas em
+um trecho continuam disponíveis nos seguintes. Cada trecho passa sozinho pelo
+parser em passagem única (o mesmo objeto, já carregado, para todos os
+trechos) e só os nós novos são executados; nada do que já foi executado é
+analisado de novo.
+
+Um trecho pode ser uma sequência de declarações e comandos, como no corpo de
+`programa { ... }`, ou uma única expressão, cujo valor é devolvido:
+
+    sessao = Sessao()
+    sessao.executar("funcao inteiro dobro(inteiro x) { retorne x * 2; }")
+    sessao.executar("inteiro n = dobro(21);")
+    sessao.executar("n + 1").valor   # 43
+
+`executar` não escreve nada por conta própria: devolve um `Resultado` com o
+valor, o texto escrito por `escreva` (quando a sessão não tem `saida`) e um
+`ErroSessao` com o tipo, a mensagem e a posição no trecho, em vez da
+mensagem "Erro de execução" de `Interpretador.interpretar`. Os efeitos dos
+comandos anteriores ao erro permanecem, como no modo interativo do Python.
+
+`python -m portugol.sessao` abre um REPL sobre uma sessão; trechos com
+chaves ou parênteses abertos continuam nas linhas seguintes.
+"""
+
+import io
+import sys
+from typing import Any, Dict, NamedTuple, Optional, TextIO
+
+from lark.exceptions import UnexpectedCharacters, UnexpectedEOF, UnexpectedInput, UnexpectedToken
+
+from . import analise
+from .ast import ChamadaFuncao
+from .cadeias import texto
+from .es import EntradaSaida
+from .interpretador import ErroExecucao, Funcao, Interpretador, RetornoFuncao
+from .parser import obter_parser
+
+# Envolvem o trecho para analisá-lo sozinho, como em portugol.incremental; o
+# fim de linha antes do sufixo impede que um comentário no trecho o engula
+PREFIXO = "programa{"
+SUFIXO = "\n}"
+PREFIXO_EXPRESSAO = "programa{retorne "
+SUFIXO_EXPRESSAO = "\n;}"
+
+
+class ErroSessao(NamedTuple):
+    # "sintaxe" ou "execucao"
+    tipo: str
+    mensagem: str
+    # Posição no trecho (a partir de 1), quando conhecida
+    linha: Optional[int] = None
+    coluna: Optional[int] = None
+
+    def __str__(self):
+        onde = f" (linha {self.linha}, coluna {self.coluna})" if self.linha is not None else ""
+        return f"Erro de {'sintaxe' if self.tipo == 'sintaxe' else 'execução'}{onde}: {self.mensagem}"
+
+
+class Resultado(NamedTuple):
+    # Valor do trecho quando ele é uma expressão; None nos demais casos
+    valor: Any = None
+    saida: str = ""
+    erro: Optional[ErroSessao] = None
+    # O trecho é um começo válido que ainda não terminou (ex.: uma chave aberta)
+    incompleto: bool = False
+
+
+class _TrechoIncompleto(Exception):
+    pass
+
+
+class _ErroSintaxe(Exception):
+    def __init__(self, erro: ErroSessao):
+        self.erro = erro
+
+
+class Sessao:
+    def __init__(self, entrada: Optional[TextIO] = None, saida: Optional[TextIO] = None):
+        # Sem `saida`, o texto de escreva é devolvido em Resultado.saida
+        self._capturada = io.StringIO() if saida is None else None
+        es = EntradaSaida(entrada=entrada if entrada is not None else io.StringIO(),
+                          saida=saida if saida is not None else self._capturada)
+        self.interpretador = Interpretador(es=es)
+        self.interpretador.atribuidos_por_funcoes = set()
+        self._parser = obter_parser(posicoes=False, passagem_unica=True)
+
+    @property
+    def ambiente(self):
+        return self.interpretador.ambiente_global
+
+    def variaveis(self) -> Dict[str, Any]:
+        """Variáveis globais da sessão (sem as funções) e seus valores."""
+        return {nome: texto(valor) for nome, valor in self.ambiente.valores.items()
+                if not isinstance(valor, Funcao)}
+
+    def funcoes(self) -> Dict[str, Funcao]:
+        return {nome: valor for nome, valor in self.ambiente.valores.items() if isinstance(valor, Funcao)}
+
+    def reiniciar(self):
+        """Esquece todas as variáveis e funções, mantendo a entrada e a saída."""
+        es = self.interpretador.es
+        self.interpretador = Interpretador(es=es)
+        self.interpretador.atribuidos_por_funcoes = set()
+
+    def executar(self, trecho: str) -> Resultado:
+        try:
+            bloco, expressao = self._analisar(trecho)
+        except _TrechoIncompleto:
+            return Resultado(incompleto=True)
+        except _ErroSintaxe as e:
+            return Resultado(erro=e.erro)
+
+        interpretador = self.interpretador
+        interpretador.ambiente_atual = interpretador.ambiente_global
+        valor, erro = None, None
+        try:
+            if bloco is not None:
+                # Só um trecho com a palavra 'funcao' pode declarar funções
+                if "funcao" in trecho:
+                    self._registrar_funcoes(bloco)
+                # Os itens vão direto para o ambiente global, sem o escopo de visitar_Bloco
+                for item in bloco.declaracoes:
+                    interpretador.executar(item)
+            else:
+                valor = texto(interpretador.avaliar(expressao))
+        except ErroExecucao as e:
+            erro = ErroSessao("execucao", str(e))
+        except RetornoFuncao:
+            erro = ErroSessao("execucao", "'retorne' fora de uma função.")
+        except RecursionError:
+            erro = ErroSessao("execucao", "recursão profunda demais.")
+        except Exception as e:
+            erro = ErroSessao("execucao", str(e))
+        finally:
+            interpretador.ambiente_atual = interpretador.ambiente_global
+        return Resultado(valor, self._saida(), erro)
+
+    def _analisar(self, trecho: str):
+        """(bloco, None) para declarações e comandos, (None, expressão) para uma expressão."""
+        erros = []
+        final = trecho.rstrip()[-1:]
+        if final not in ("", ";", "}"):
+            # Sem o ';' final: um comando com o ';' implícito ou uma expressão
+            try:
+                bloco = self._parser.parse(PREFIXO + trecho + ";" + SUFIXO).declaracoes
+            except UnexpectedInput as e:
+                erros.append((e, len(PREFIXO)))
+            else:
+                itens = bloco.declaracoes
+                # Uma chamada sozinha mostra o valor devolvido
+                if len(itens) == 1 and isinstance(itens[0], ChamadaFuncao):
+                    return None, itens[0]
+                return bloco, None
+            try:
+                return None, self._como_expressao(trecho)
+            except UnexpectedInput as e:
+                erros.append((e, len(PREFIXO_EXPRESSAO)))
+        try:
+            return self._parser.parse(PREFIXO + trecho + SUFIXO).declaracoes, None
+        except UnexpectedInput as e:
+            simples = e
+        if final == "}":
+            # Um comando terminado em vetor literal, sem o ';' implícito
+            try:
+                return self._parser.parse(PREFIXO + trecho + ";" + SUFIXO).declaracoes, None
+            except UnexpectedInput as e:
+                erros.append((e, len(PREFIXO)))
+        if _incompleto(simples, len(PREFIXO) + len(trecho)):
+            raise _TrechoIncompleto()
+        erros.append((simples, len(PREFIXO)))
+        if final == "}":
+            # Um vetor literal
+            try:
+                return None, self._como_expressao(trecho)
+            except UnexpectedInput as e:
+                erros.append((e, len(PREFIXO_EXPRESSAO)))
+        # O erro mais adiante no trecho é o que mais provavelmente aponta o problema
+        erro, deslocamento = max(erros, key=lambda par: _posicao(*par))
+        raise _ErroSintaxe(_erro_sintaxe(erro, deslocamento, trecho))
+
+    def _como_expressao(self, trecho: str):
+        itens = self._parser.parse(PREFIXO_EXPRESSAO + trecho + SUFIXO_EXPRESSAO).declaracoes.declaracoes
+        # 'retorne 1; escreva(2)' também é válido com o sufixo, mas não é uma expressão
+        if len(itens) != 1 or itens[0].expressao is None:
+            raise UnexpectedEOF([])
+        return itens[0].expressao
+
+    def _registrar_funcoes(self, bloco):
+        # Os laços contados dependem das variáveis que as funções alteram: uma função nova
+        # com outras atribuições invalida o que já foi detectado nos laços executados antes
+        interpretador = self.interpretador
+        novos = analise.nomes_atribuidos_em_funcoes(bloco) - interpretador.atribuidos_por_funcoes
+        if novos:
+            interpretador.atribuidos_por_funcoes |= novos
+            interpretador._lacos.clear()
+
+    def _saida(self) -> str:
+        es = self.interpretador.es
+        es.descarregar()
+        if self._capturada is None:
+            return ""
+        escrito = self._capturada.getvalue()
+        self._capturada.seek(0)
+        self._capturada.truncate()
+        return escrito
+
+
+def _incompleto(erro: UnexpectedInput, fim: int) -> bool:
+    """O erro está no fim do texto envolvido, depois de todo o trecho."""
+    if isinstance(erro, UnexpectedEOF):
+        return True
+    return isinstance(erro, UnexpectedToken) and erro.pos_in_stream >= fim
+
+
+def _posicao(erro: UnexpectedInput, deslocamento: int) -> int:
+    posicao = getattr(erro, "pos_in_stream", None)
+    return -1 if posicao is None else posicao - deslocamento
+
+
+def _erro_sintaxe(erro: UnexpectedInput, deslocamento: int, trecho: str) -> ErroSessao:
+    if _posicao(erro, deslocamento) >= len(trecho) or isinstance(erro, UnexpectedEOF):
+        # O erro caiu no texto que envolve o trecho: falta algo no fim dele
+        linha = trecho.count("\n") + 1
+        return ErroSessao("sintaxe", "fim inesperado do trecho.", linha, len(trecho) - trecho.rfind("\n"))
+    linha, coluna = erro.line, erro.column
+    if linha == 1:
+        coluna -= deslocamento
+    if isinstance(erro, UnexpectedCharacters):
+        mensagem = f"caractere inesperado '{erro.char}'."
+    else:
+        mensagem = f"símbolo inesperado '{erro.token}'."
+    return ErroSessao("sintaxe", mensagem, linha, coluna)
+
+
+def descrever(valor: Any) -> str:
+    """Como o REPL mostra o valor de uma expressão: cadeias entre aspas, o resto como em escreva."""
+    if isinstance(valor, str):
+        return '"' + valor.replace('"', '\\"') + '"'
+    return str(valor)
+
+
+# REPL
+
+class _EntradaPorLinha:
+    """Entrada de leia no REPL: uma linha por vez, para não consumir as linhas dos trechos seguintes."""
+
+    def __init__(self, ler_linha):
+        self.ler_linha = ler_linha
+
+    def readline(self):
+        try:
+            return self.ler_linha("") + "\n"
+        except EOFError:
+            return ""
+
+    def isatty(self):
+        # Faz EntradaSaida ler com readline em vez de blocos
+        return True
+
+
+def repl(entrada: TextIO = sys.stdin, saida: TextIO = sys.stdout) -> int:
+    interativo = entrada.isatty()
+
+    def ler_linha(prompt):
+        if interativo:
+            return input(prompt)
+        linha = entrada.readline()
+        if not linha:
+            raise EOFError
+        return linha.rstrip("\n")
+
+    sessao = Sessao(entrada=_EntradaPorLinha(ler_linha), saida=saida)
+    if interativo:
+        saida.write("Portugol interativo. :sair termina, :variaveis lista as variáveis, "
+                    ":reiniciar esquece tudo.\n")
+    while True:
+        try:
+            linha = ler_linha(">>> ")
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            saida.write("\n")
+            continue
+        comando = linha.strip()
+        if not comando:
+            continue
+        if comando == ":sair":
+            break
+        if comando == ":variaveis":
+            for nome, valor in sessao.variaveis().items():
+                saida.write(f"{nome} = {descrever(valor)}\n")
+            continue
+        if comando == ":reiniciar":
+            sessao.reiniciar()
+            continue
+
+        trecho = linha
+        try:
+            resultado = sessao.executar(trecho)
+            while resultado.incompleto:
+                try:
+                    continuacao = ler_linha("... ")
+                except EOFError:
+                    continuacao = ""
+                # Uma linha vazia encerra o trecho incompleto, que então é um erro de sintaxe
+                if not continuacao.strip():
+                    resultado = Resultado(erro=ErroSessao("sintaxe", "fim inesperado do trecho."))
+                    break
+                trecho += "\n" + continuacao
+                resultado = sessao.executar(trecho)
+        except KeyboardInterrupt:
+            saida.write("\nInterrompido.\n")
+            continue
+        if resultado.erro is not None:
+            saida.write(f"{resultado.erro}\n")
+        elif resultado.valor is not None:
+            saida.write(descrever(resultado.valor) + "\n")
+        saida.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(repl())
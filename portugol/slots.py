@@ -0,0 +1,261 @@
+"""
+Backend de execução com quadros indexados por slot.
+
+Usa o `Resolvedor` para conhecer o endereço `(profundidade, slot)` de cada
+nome e compila a AST em closures, como `CompiladorClosures`, mas guardando
+as variáveis em listas de tamanho fixo em vez de dicionários `Ambiente`.
+Ler ou escrever uma variável é um acesso direto por índice, e blocos e laços
+`para` não alocam nada ao serem executados.
+"""
+
+from typing import Any, Callable, List, Tuple
+
+from .ast import (
+    Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao,
+    ComandoPara, ChamadaFuncao, ExpressaoIdentificador
+)
+from .closures import CompiladorClosures, chamada_memoizada
+from .interpretador import ErroExecucao, Funcao, Interpretador, RetornoFuncao
+from .resolvedor import ErroResolucao, Resolucao, resolver
+
+Quadro = List[Any]
+
+
+class _Indefinido:
+    def __repr__(self):
+        return "<indefinido>"
+
+
+# Valor dos slots cuja declaração ainda não foi executada
+INDEFINIDO = _Indefinido()
+
+
+class FuncaoSlots(Funcao):
+    __slots__ = ("corpo", "slots_parametros", "modelo_quadro")
+
+    def __init__(self, declaracao: DeclaracaoFuncao, quadro_definicao: Quadro,
+                 corpo: Callable[[Quadro], None], slots_parametros: List[int], tamanho_quadro: int):
+        super().__init__(declaracao, quadro_definicao)
+        self.corpo = corpo
+        self.slots_parametros = slots_parametros
+        self.modelo_quadro = [None] + [INDEFINIDO] * (tamanho_quadro - 1)
+
+    def executar(self, valores) -> Any:
+        quadro_funcao = self.modelo_quadro.copy()
+        quadro_funcao[0] = self.ambiente_definicao
+        for slot, valor in zip(self.slots_parametros, valores):
+            quadro_funcao[slot] = valor
+        try:
+            self.corpo(quadro_funcao)
+            return None
+        except RetornoFuncao as r:
+            return r.valor
+
+
+def novo_quadro(pai, tamanho: int) -> Quadro:
+    quadro = [INDEFINIDO] * tamanho
+    quadro[0] = pai
+    return quadro
+
+
+def leitor(profundidade: int, slot: int, nome: str) -> Callable[[Quadro], Any]:
+    # Variáveis do próprio quadro sempre já foram declaradas quando lidas; as
+    # de quadros externos podem ser usadas por uma função chamada antes da declaração
+    if profundidade == 0:
+        return lambda quadro: quadro[slot]
+
+    if profundidade == 1:
+        def ler_externo(quadro):
+            valor = quadro[0][slot]
+            if valor is INDEFINIDO:
+                raise ErroExecucao(f"Variável '{nome}' não definida.")
+            return valor
+        return ler_externo
+
+    def ler_distante(quadro):
+        for _ in range(profundidade):
+            quadro = quadro[0]
+        valor = quadro[slot]
+        if valor is INDEFINIDO:
+            raise ErroExecucao(f"Variável '{nome}' não definida.")
+        return valor
+    return ler_distante
+
+
+def escritor(profundidade: int, slot: int, nome: str) -> Callable[[Quadro, Any], None]:
+    if profundidade == 0:
+        def escrever_local(quadro, valor):
+            quadro[slot] = valor
+        return escrever_local
+
+    def escrever_externo(quadro, valor):
+        for _ in range(profundidade):
+            quadro = quadro[0]
+        if quadro[slot] is INDEFINIDO:
+            raise ErroExecucao(f"Variável '{nome}' não definida para atribuição.")
+        quadro[slot] = valor
+    return escrever_externo
+
+
+def leitor_alternativo(enderecos: List[Tuple[int, int]], nome: str) -> Callable[[Quadro], Any]:
+    """Lê a primeira variável já declarada entre os endereços, do mais interno ao mais externo."""
+    def ler_primeira_definida(quadro):
+        for profundidade, slot in enderecos:
+            atual = quadro
+            for _ in range(profundidade):
+                atual = atual[0]
+            valor = atual[slot]
+            if valor is not INDEFINIDO:
+                return valor
+        raise ErroExecucao(f"Variável '{nome}' não definida.")
+    return ler_primeira_definida
+
+
+def escritor_alternativo(enderecos: List[Tuple[int, int]], nome: str) -> Callable[[Quadro, Any], None]:
+    def escrever_primeira_definida(quadro, valor):
+        for profundidade, slot in enderecos:
+            atual = quadro
+            for _ in range(profundidade):
+                atual = atual[0]
+            if atual[slot] is not INDEFINIDO:
+                atual[slot] = valor
+                return
+        raise ErroExecucao(f"Variável '{nome}' não definida para atribuição.")
+    return escrever_primeira_definida
+
+
+class CompiladorSlots(CompiladorClosures):
+    """Especializa `CompiladorClosures` para quadros: só mudam escopos e acesso a nomes."""
+
+    def __init__(self, interpretador: Interpretador, resolucao: Resolucao):
+        super().__init__(interpretador)
+        self.resolucao = resolucao
+
+    def enderecos(self, no) -> List[Tuple[int, int]]:
+        return [self.resolucao.endereco(no)] + [endereco for endereco, _ in self.resolucao.alternativas_de(no)]
+
+    def leitor_nome(self, no, nome: str) -> Callable[[Quadro], Any]:
+        enderecos = self.enderecos(no)
+        if len(enderecos) > 1:
+            return leitor_alternativo(enderecos, nome)
+        return leitor(*enderecos[0], nome)
+
+    def escritor_nome(self, no, nome: str) -> Callable[[Quadro, Any], None]:
+        enderecos = self.enderecos(no)
+        if len(enderecos) > 1:
+            return escritor_alternativo(enderecos, nome)
+        return escritor(*enderecos[0], nome)
+
+    def compilar_comandos(self, comandos) -> Callable[[Quadro], None]:
+        compilados = tuple(self.compilar(no) for no in comandos)
+
+        def executar_comandos(quadro):
+            for comando in compilados:
+                comando(quadro)
+        return executar_comandos
+
+    def compilar_Programa(self, programa: Programa):
+        corpo = self.compilar_comandos(programa.declaracoes.declaracoes)
+        tamanho = self.resolucao.tamanho_quadro(programa)
+        return lambda quadro: corpo(novo_quadro(quadro, tamanho))
+
+    def compilar_Bloco(self, bloco: Bloco):
+        corpo = self.compilar_comandos(bloco.declaracoes)
+        tamanho = self.resolucao.tamanho_quadro(bloco)
+        if tamanho is None:
+            return corpo
+        return lambda quadro: corpo(novo_quadro(quadro, tamanho))
+
+    def compilar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        slot = self.resolucao.slot(declaracao)
+        if declaracao.dimensoes is not None:
+            criar = self.compilar_criacao_vetor(declaracao)
+
+            def declarar_vetor(quadro):
+                quadro[slot] = criar(quadro)
+            return declarar_vetor
+        if declaracao.inicializador:
+            inicializador = self.compilar_expressao(declaracao.inicializador)
+
+            def declarar(quadro):
+                quadro[slot] = inicializador(quadro)
+        else:
+            def declarar(quadro):
+                quadro[slot] = None
+        return declarar
+
+    def compilar_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        slot = self.resolucao.slot(declaracao)
+        corpo = self.compilar_comandos(declaracao.corpo.declaracoes)
+        slots_parametros = [self.resolucao.slot(param) for param in declaracao.parametros]
+        tamanho = self.resolucao.tamanho_quadro(declaracao)
+
+        def declarar_funcao(quadro):
+            quadro[slot] = FuncaoSlots(declaracao, quadro, corpo, slots_parametros, tamanho)
+        return declarar_funcao
+
+    def compilar_ComandoPara(self, comando: ComandoPara):
+        inicializacao = self.compilar(comando.inicializacao)
+        condicao = self.compilar_expressao(comando.condicao)
+        incremento = self.compilar(comando.incremento)
+        corpo = self.compilar(comando.comando)
+
+        def executar_para(quadro):
+            inicializacao(quadro)
+            while condicao(quadro):
+                corpo(quadro)
+                incremento(quadro)
+        return executar_para
+
+    def compilar_expressao_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador):
+        return self.leitor_nome(expressao, expressao.nome)
+
+    def compilar_expressao_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        nome = chamada.nome
+        ler_funcao = self.leitor_nome(chamada, nome)
+        argumentos = tuple(self.compilar_expressao(arg) for arg in chamada.argumentos)
+
+        def chamar(quadro):
+            funcao_obj = ler_funcao(quadro)
+            if not isinstance(funcao_obj, FuncaoSlots):
+                raise ErroExecucao(f"'{nome}' não é uma função.")
+            slots_parametros = funcao_obj.slots_parametros
+            if len(argumentos) != len(slots_parametros):
+                raise ErroExecucao(f"Número incorreto de argumentos para '{nome}'.")
+
+            # O novo quadro é filho do quadro onde a função foi DEFINIDA
+            quadro_funcao = funcao_obj.modelo_quadro.copy()
+            quadro_funcao[0] = funcao_obj.ambiente_definicao
+            for slot, arg in zip(slots_parametros, argumentos):
+                quadro_funcao[slot] = arg(quadro)
+            try:
+                funcao_obj.corpo(quadro_funcao)
+                return None
+            except RetornoFuncao as r:
+                return r.valor
+
+        memoizacao = self.interpretador.memoizacao
+        if memoizacao is None:
+            return chamar
+        return chamada_memoizada(memoizacao, nome, ler_funcao, argumentos, FuncaoSlots)
+
+
+class InterpretadorSlots(Interpretador):
+    """Interpretador que resolve os escopos estaticamente e executa com quadros de slots."""
+
+    def interpretar(self, programa: Programa):
+        try:
+            resolucao = resolver(programa)
+        except ErroResolucao as e:
+            self.es.escrever(f"Erro de execução: {e}\n")
+            self.es.descarregar()
+            return
+        if self.memoizacao is not None:
+            self.memoizacao.analisar(programa, resolucao)
+        try:
+            executar = CompiladorSlots(self, resolucao).compilar(programa)
+            executar(None)
+        except ErroExecucao as e:
+            self.es.escrever(f"Erro de execução: {e}\n")
+        finally:
+            self.es.descarregar()
@@ -0,0 +1,521 @@
+"""
+Verificação e inferência de tipos para a linguagem Portugol.
+
+Os tipos declarados não restringem os valores em tempo de execução (`leia`
+guarda um inteiro, um real ou uma cadeia conforme a entrada, e `a / b` é
+sempre real), então o tipo estático de uma expressão é inferido a partir dos
+valores que ela pode produzir: o conjunto dos tipos `inteiro`, `real`,
+`cadeia` e `logico` possíveis, ou `None` quando nada se sabe (por exemplo,
+depois de um `leia`).
+
+A inferência não depende da ordem de execução: o tipo de uma variável é a
+união dos tipos de tudo que é atribuído a ela em qualquer ponto do programa,
+o de um parâmetro é a união dos argumentos de todas as chamadas e o de uma
+função é a união dos seus `retorne`. Como esses tipos dependem uns dos
+outros (recursão, variáveis globais alteradas por funções), eles são
+calculados como um ponto fixo. Ler uma variável antes da primeira
+atribuição falha nos dois caminhos de execução, e por isso não é
+considerado.
+
+Depois do ponto fixo, cada expressão recebe `tipo_estatico` e as expressões
+aritméticas cujos operandos dispensam a coerção de cadeia com número
+recebem em `operacao` uma implementação especializada de
+`portugol.operadores`, usada pelos backends `arvore`, `closures` e `slots`
+no lugar do caminho genérico.
+
+Vetores e matrizes têm tipos próprios (`vetor de inteiro`, `vetor de real`,
+...) e, como guardam os elementos em armazenamento tipado
+(`portugol.vetores`), `v[i]` tem sempre o tipo de elemento do vetor. Um
+literal `{...}` tem o tipo `vetor` e cada elemento é conferido com o tipo
+do vetor que o recebe.
+
+São reportadas apenas operações que sempre falhariam (como `"a" - 1`),
+valores de tipo incompatível com o tipo declarado da variável, parâmetro ou
+função que os recebe, índices que não são inteiros ou em número diferente
+das dimensões declaradas, e chamadas de valores que não são funções.
+"""
+
+from typing import Dict, FrozenSet, List, Optional
+
+from .ast import (
+    Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao, Parametro,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .interpretador import ErroExecucao
+from .cadeias import concatenar
+from .operadores import OPERADORES_BINARIOS, OPERADORES_SEM_COERCAO, OPERADORES_UNARIOS, concatenar_numero, somar
+from .resolvedor import Resolucao, resolver
+from .vetores import plural
+
+INTEIRO = "inteiro"
+REAL = "real"
+CADEIA = "cadeia"
+LOGICO = "logico"
+
+# Conjunto de tipos possíveis; None significa "qualquer valor"
+Tipos = Optional[FrozenSet[str]]
+
+VAZIO: FrozenSet[str] = frozenset()
+NUMERICOS = frozenset({INTEIRO, REAL, LOGICO})
+
+# Tipos de valor aceitos por cada tipo declarado (logico é um inteiro em Python)
+COMPATIVEIS: Dict[str, FrozenSet[str]] = {
+    "inteiro": frozenset({INTEIRO, LOGICO}),
+    "real": NUMERICOS,
+    "cadeia": frozenset({CADEIA}),
+    "caractere": frozenset({CADEIA}),
+    "logico": frozenset({LOGICO}),
+}
+
+# Vetores: 'vetor de <tipo declarado>'; um literal {...} tem o tipo 'vetor'
+PREFIXO_VETOR = "vetor de "
+LITERAL_VETOR = "vetor"
+
+# Tipos dos elementos lidos de um vetor de cada tipo declarado
+ELEMENTOS: Dict[str, FrozenSet[str]] = {
+    "inteiro": frozenset({INTEIRO}),
+    "real": frozenset({REAL}),
+    "cadeia": frozenset({CADEIA}),
+    "caractere": frozenset({CADEIA}),
+    "logico": frozenset({LOGICO}),
+}
+
+ARITMETICOS = ("+", "-", "*", "/", "%")
+COMPARACOES_ORDEM = ("<", "<=", ">", ">=")
+
+
+class ErroTipo(ErroExecucao):
+    def __init__(self, mensagem: str, no=None):
+        self.linha = getattr(no, "linha", None)
+        self.coluna = getattr(no, "coluna", None)
+        if self.linha is not None:
+            mensagem = f"linha {self.linha}, coluna {self.coluna}: {mensagem}"
+        super().__init__(mensagem)
+
+
+def juntar(a: Tipos, b: Tipos) -> Tipos:
+    if a is None or b is None:
+        return None
+    return a | b
+
+
+def descrever(tipos: Tipos) -> str:
+    if tipos is None:
+        return "qualquer tipo"
+    return " ou ".join(sorted(tipos)) or "nenhum valor"
+
+
+def nome_tipo(tipos: Tipos) -> Optional[str]:
+    """Nome usado em `tipo_estatico`: o tipo, se for um só, ou 'numero' para inteiro e real."""
+    if tipos is None or not tipos:
+        return None
+    if len(tipos) == 1:
+        return next(iter(tipos))
+    if tipos <= NUMERICOS:
+        return "numero"
+    return None
+
+
+def _tipo_valor(valor) -> Tipos:
+    if isinstance(valor, bool):
+        return frozenset({LOGICO})
+    if isinstance(valor, int):
+        return frozenset({INTEIRO})
+    if isinstance(valor, float):
+        return frozenset({REAL})
+    if isinstance(valor, str):
+        return frozenset({CADEIA})
+    return None
+
+
+def tipo_vetor(declarado) -> str:
+    return PREFIXO_VETOR + str(declarado)
+
+
+def _tipo_elemento(tipo: str) -> Optional[str]:
+    """Tipo declarado dos elementos de um tipo de vetor ('vetor de real' -> 'real')."""
+    return tipo[len(PREFIXO_VETOR):] if tipo.startswith(PREFIXO_VETOR) else None
+
+
+def _dimensoes(declaracao) -> int:
+    """Número de dimensões de um vetor declarado ou parâmetro vetor; 0 para os demais."""
+    if isinstance(declaracao, DeclaracaoVariavel):
+        return len(declaracao.dimensoes) if declaracao.dimensoes is not None else 0
+    if isinstance(declaracao, Parametro):
+        return declaracao.dimensoes
+    return 0
+
+
+def _aritmetica(op: str, esquerda: str, direita: str) -> Optional[str]:
+    """Tipo de `esquerda op direita` para um par de tipos; None se a operação sempre falha."""
+    if esquerda in NUMERICOS and direita in NUMERICOS:
+        if op == "/" or REAL in (esquerda, direita):
+            return REAL
+        return INTEIRO
+    if esquerda == CADEIA:
+        # '+' concatena (convertendo números); '%' é a formatação de cadeias do Python
+        return CADEIA if op in ("+", "%") else None
+    # Número à esquerda de uma cadeia: só a repetição ('3 * "ab"') funciona
+    return CADEIA if op == "*" and esquerda in (INTEIRO, LOGICO) else None
+
+
+def _comparavel(esquerda: str, direita: str) -> bool:
+    return (esquerda in NUMERICOS) == (direita in NUMERICOS)
+
+
+def operacao_binaria(op: str, esquerda: Tipos, direita: Tipos):
+    """Implementação especializada de `op` para os tipos dos operandos, ou None."""
+    if op not in ARITMETICOS:
+        # Comparações e 'e'/'ou' não fazem coerção
+        return OPERADORES_BINARIOS.get(op)
+    if esquerda is None or direita is None:
+        return None
+    # A coerção só acontece com cadeia à esquerda e número à direita
+    if CADEIA not in esquerda or not direita & NUMERICOS:
+        if op == "+" and CADEIA in esquerda:
+            # Concatenação sem coerção: passa pelas cordas de portugol.cadeias
+            return concatenar if esquerda == {CADEIA} else somar
+        return OPERADORES_SEM_COERCAO[op]
+    if op == "+" and esquerda == {CADEIA} and direita <= NUMERICOS:
+        return concatenar_numero
+    return None
+
+
+class VerificadorTipos:
+    def __init__(self, resolucao: Resolucao):
+        self.resolucao = resolucao
+        # variável, parâmetro ou função (pelo id da declaração canônica) -> tipos
+        self.tipos: Dict[int, Tipos] = {}
+        self.erros: List[ErroTipo] = []
+        self.alterou = False
+        # Na última passada as expressões são anotadas e os erros registrados
+        self.final = False
+        self.funcao_atual: Optional[DeclaracaoFuncao] = None
+
+    def verificar(self, programa: Programa) -> List[ErroTipo]:
+        self.alterou = True
+        while self.alterou:
+            self.alterou = False
+            self.visitar(programa.declaracoes)
+        self.final = True
+        self.visitar(programa.declaracoes)
+        return self.erros
+
+    # Estado
+
+    def _chave(self, declaracao) -> int:
+        return id(self.resolucao.variavel(declaracao))
+
+    def obter(self, declaracao) -> Tipos:
+        return self.tipos.get(self._chave(declaracao), VAZIO)
+
+    def acrescentar(self, declaracao, tipos: Tipos):
+        chave = self._chave(declaracao)
+        atual = self.tipos.get(chave, VAZIO)
+        novo = juntar(atual, tipos)
+        if novo != atual:
+            self.tipos[chave] = novo
+            self.alterou = True
+
+    def erro(self, mensagem: str, no):
+        if self.final:
+            self.erros.append(ErroTipo(mensagem, no))
+
+    def conferir(self, declarado, tipos: Tipos, descricao: str, no):
+        compativeis = COMPATIVEIS.get(str(declarado))
+        if compativeis is not None and tipos and not tipos & compativeis:
+            self.erro(f"{descricao} recebe {descrever(tipos)}, mas é do tipo {declarado}.", no)
+
+    def vetores_compativeis(self, declarado) -> FrozenSet[str]:
+        """Tipos de vetor cujos elementos um vetor do tipo `declarado` aceita."""
+        compativeis = COMPATIVEIS.get(str(declarado), VAZIO)
+        return frozenset(tipo_vetor(tipo) for tipo, elementos in ELEMENTOS.items() if elementos & compativeis)
+
+    def conferir_vetor(self, declarado, expressao, nome: str, no) -> Tipos:
+        """Confere o valor atribuído (ou copiado) para o vetor `nome` do tipo `declarado`."""
+        if isinstance(expressao, ExpressaoVetor):
+            for folha in _folhas(expressao):
+                self.conferir(declarado, self.inferir(folha), f"O elemento de '{nome}'", folha)
+        tipos = self.inferir(expressao)
+        aceitos = self.vetores_compativeis(declarado) | {LITERAL_VETOR}
+        if tipos and not tipos & aceitos:
+            self.erro(f"O vetor '{nome}' recebe {descrever(tipos)}, mas é um {tipo_vetor(declarado)}.", no)
+        return tipos
+
+    def conferir_indices(self, nome: str, declaracao, indices, no):
+        for indice in indices:
+            tipos = self.inferir(indice)
+            if tipos and INTEIRO not in tipos:
+                self.erro(f"O índice de '{nome}' deve ser inteiro, mas é {descrever(tipos)}.", indice)
+        dimensoes = _dimensoes(declaracao)
+        if dimensoes and dimensoes != len(indices):
+            self.erro(f"'{nome}' tem {plural(dimensoes, 'dimensão', 'dimensões')}, "
+                      f"mas foi usado com {plural(len(indices), 'índice', 'índices')}.", no)
+
+    def tipos_vetor(self, declaracao, nome: str, no) -> Tipos:
+        """Tipos de vetor que a variável pode guardar (erro se ela nunca guarda um vetor)."""
+        if isinstance(declaracao, DeclaracaoFuncao):
+            self.erro(f"'{nome}' não é um vetor.", no)
+            return None
+        tipos = self.obter(declaracao)
+        if tipos is None:
+            return None
+        vetores = frozenset(tipo for tipo in tipos if _tipo_elemento(tipo) is not None)
+        if tipos and not vetores:
+            self.erro(f"'{nome}' não é um vetor.", no)
+        return vetores
+
+    # Comandos
+
+    def visitar(self, no):
+        metodo = getattr(self, 'visitar_' + type(no).__name__, self.visitar_no_desconhecido)
+        return metodo(no)
+
+    def visitar_no_desconhecido(self, no):
+        raise ErroTipo(f"Tipo de nó AST desconhecido: {type(no).__name__}", no)
+
+    def visitar_Bloco(self, bloco: Bloco):
+        for no in bloco.declaracoes:
+            self.visitar(no)
+
+    def visitar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        nome = declaracao.identificador
+        if declaracao.dimensoes is not None:
+            for tamanho in declaracao.dimensoes:
+                tipos = self.inferir(tamanho)
+                if tipos and INTEIRO not in tipos:
+                    self.erro(f"O tamanho de '{nome}' deve ser inteiro, mas é {descrever(tipos)}.", tamanho)
+            if declaracao.inicializador:
+                self.conferir_vetor(declaracao.tipo, declaracao.inicializador, nome, declaracao)
+            self.acrescentar(declaracao, frozenset({tipo_vetor(declaracao.tipo)}))
+            return
+        if declaracao.inicializador:
+            tipos = self.inferir(declaracao.inicializador)
+            self.conferir(declaracao.tipo, tipos, f"A variável '{declaracao.identificador}'", declaracao)
+            self.acrescentar(declaracao, tipos)
+
+    def visitar_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        funcao_anterior = self.funcao_atual
+        self.funcao_atual = declaracao
+        try:
+            self.visitar(declaracao.corpo)
+        finally:
+            self.funcao_atual = funcao_anterior
+        if not _sempre_retorna(declaracao.corpo):
+            # Terminar sem 'retorne' devolve None
+            self.acrescentar(declaracao, None)
+
+    def visitar_ComandoAtribuicao(self, comando: ComandoAtribuicao):
+        declaracao = self.resolucao.declaracao(comando)
+        if _dimensoes(declaracao):
+            # O vetor que a variável guarda recebe uma cópia dos elementos
+            self.conferir_vetor(declaracao.tipo, comando.expressao, comando.identificador, comando)
+            return
+        tipos = self.inferir(comando.expressao)
+        if isinstance(declaracao, (DeclaracaoVariavel, Parametro)):
+            self.conferir(declaracao.tipo, tipos, f"A variável '{comando.identificador}'", comando)
+        self.acrescentar(declaracao, tipos)
+        for _, alternativa in self.resolucao.alternativas_de(comando):
+            self.acrescentar(alternativa, tipos)
+
+    def visitar_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        nome = comando.identificador
+        declaracao = self.resolucao.declaracao(comando)
+        vetores = self.tipos_vetor(declaracao, nome, comando)
+        self.conferir_indices(nome, declaracao, comando.indices, comando)
+        tipos = self.inferir(comando.expressao)
+        for tipo in sorted(vetores or ()):
+            self.conferir(_tipo_elemento(tipo), tipos, f"O elemento de '{nome}'", comando)
+
+    def visitar_ComandoSe(self, comando: ComandoSe):
+        self.inferir(comando.condicao)
+        self.visitar(comando.comando_entao)
+        if comando.comando_senao:
+            self.visitar(comando.comando_senao)
+
+    def visitar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        self.inferir(comando.condicao)
+        self.visitar(comando.comando)
+
+    def visitar_ComandoPara(self, comando: ComandoPara):
+        self.visitar(comando.inicializacao)
+        self.inferir(comando.condicao)
+        self.visitar(comando.comando)
+        self.visitar(comando.incremento)
+
+    def visitar_ComandoEscreva(self, comando: ComandoEscreva):
+        for expressao in comando.expressoes:
+            self.inferir(expressao)
+
+    def visitar_ComandoLeia(self, comando: ComandoLeia):
+        # O valor lido pode ser inteiro, real ou cadeia, conforme a entrada
+        self.acrescentar(self.resolucao.declaracao(comando), None)
+        for _, alternativa in self.resolucao.alternativas_de(comando):
+            self.acrescentar(alternativa, None)
+
+    def visitar_ComandoRetorne(self, comando: ComandoRetorne):
+        tipos = self.inferir(comando.expressao) if comando.expressao else None
+        funcao = self.funcao_atual
+        if funcao is None:
+            return
+        if comando.expressao:
+            self.conferir(funcao.tipo, tipos, f"A função '{funcao.nome}'", comando)
+        self.acrescentar(funcao, tipos)
+
+    def visitar_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        self.inferir(chamada)
+
+    # Expressões
+
+    def inferir(self, expressao) -> Tipos:
+        metodo = getattr(self, 'inferir_' + type(expressao).__name__, self.inferir_desconhecida)
+        tipos = metodo(expressao)
+        if self.final:
+            expressao.tipo_estatico = nome_tipo(tipos)
+        return tipos
+
+    def inferir_desconhecida(self, expressao) -> Tipos:
+        raise ErroTipo(f"Tipo de nó de expressão desconhecido: {type(expressao).__name__}", expressao)
+
+    def inferir_ExpressaoLiteral(self, expressao: ExpressaoLiteral) -> Tipos:
+        return _tipo_valor(expressao.valor)
+
+    def inferir_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador) -> Tipos:
+        tipos = self.tipos_nome(self.resolucao.declaracao(expressao))
+        # Com alternativas, o valor pode vir de qualquer uma das variáveis
+        for _, alternativa in self.resolucao.alternativas_de(expressao):
+            tipos = juntar(tipos, self.tipos_nome(alternativa))
+        return tipos
+
+    def tipos_nome(self, declaracao) -> Tipos:
+        if isinstance(declaracao, DeclaracaoFuncao):
+            # A função usada como valor pode ser chamada por outro nome, com quaisquer argumentos
+            for parametro in declaracao.parametros:
+                self.acrescentar(parametro, None)
+            return None
+        return self.obter(declaracao)
+
+    def inferir_ExpressaoIndice(self, expressao: ExpressaoIndice) -> Tipos:
+        if self.resolucao.alternativas_de(expressao):
+            # O vetor só é conhecido na execução
+            for indice in expressao.indices:
+                self.inferir(indice)
+            return None
+        declaracao = self.resolucao.declaracao(expressao)
+        vetores = self.tipos_vetor(declaracao, expressao.nome, expressao)
+        self.conferir_indices(expressao.nome, declaracao, expressao.indices, expressao)
+        if vetores is None:
+            return None
+        return frozenset().union(*(ELEMENTOS.get(_tipo_elemento(tipo), VAZIO) for tipo in vetores))
+
+    def inferir_ExpressaoVetor(self, expressao: ExpressaoVetor) -> Tipos:
+        for elemento in expressao.elementos:
+            self.inferir(elemento)
+        return frozenset({LITERAL_VETOR})
+
+    def inferir_ExpressaoUnaria(self, expressao: ExpressaoUnaria) -> Tipos:
+        tipos = self.inferir(expressao.expressao)
+        op = expressao.operador
+        if self.final:
+            expressao.operacao = OPERADORES_UNARIOS.get(op)
+        if op == "!":
+            return frozenset({LOGICO})
+        if tipos is None:
+            return None
+        resultado = frozenset(REAL if tipo == REAL else INTEIRO for tipo in tipos if tipo in NUMERICOS)
+        if tipos and not resultado:
+            self.erro(f"O operador '{op}' não se aplica a {descrever(tipos)}.", expressao)
+        return resultado
+
+    def inferir_ExpressaoBinaria(self, expressao: ExpressaoBinaria) -> Tipos:
+        esquerda = self.inferir(expressao.esquerda)
+        direita = self.inferir(expressao.direita)
+        op = expressao.operador
+        if self.final:
+            expressao.operacao = operacao_binaria(op, esquerda, direita)
+        if op in ("==", "!="):
+            return frozenset({LOGICO})
+        if op in ("e", "ou"):
+            # 'e'/'ou' devolvem um dos operandos
+            return juntar(esquerda, direita)
+        if op in COMPARACOES_ORDEM:
+            if esquerda and direita and not any(_comparavel(e, d) for e in esquerda for d in direita):
+                self.erro(f"Não é possível comparar {descrever(esquerda)} com {descrever(direita)}.", expressao)
+            return frozenset({LOGICO})
+        if esquerda is None or direita is None:
+            return None
+        resultado = {_aritmetica(op, e, d) for e in esquerda for d in direita}
+        resultado.discard(None)
+        if esquerda and direita and not resultado:
+            self.erro(f"O operador '{op}' não se aplica a {descrever(esquerda)} e {descrever(direita)}.", expressao)
+        return frozenset(resultado)
+
+    def inferir_ExpressaoLogica(self, expressao: ExpressaoLogica) -> Tipos:
+        return juntar(self.inferir(expressao.esquerda), self.inferir(expressao.direita))
+
+    def inferir_ChamadaFuncao(self, chamada: ChamadaFuncao) -> Tipos:
+        argumentos = [self.inferir(argumento) for argumento in chamada.argumentos]
+        declaracao = self.resolucao.declaracao(chamada)
+        alternativas = self.resolucao.alternativas_de(chamada)
+        if alternativas:
+            # A função chamada só é conhecida na execução: os argumentos chegam a
+            # qualquer uma delas, e nada é conferido
+            resultado = VAZIO
+            for candidata in [declaracao] + [alternativa for _, alternativa in alternativas]:
+                if not isinstance(candidata, DeclaracaoFuncao):
+                    resultado = None
+                    continue
+                for parametro, tipos in zip(candidata.parametros, argumentos):
+                    self.acrescentar(parametro, tipos)
+                resultado = juntar(resultado, self.obter(candidata))
+            return resultado
+        if not isinstance(declaracao, DeclaracaoFuncao):
+            tipos = self.obter(declaracao)
+            if tipos:
+                self.erro(f"'{chamada.nome}' não é uma função.", chamada)
+            return None
+        for parametro, tipos in zip(declaracao.parametros, argumentos):
+            descricao = f"O parâmetro '{parametro.identificador}' de '{chamada.nome}'"
+            if parametro.dimensoes:
+                # O vetor é passado por referência, sem conversão dos elementos
+                if tipos and not tipos & self.vetores_compativeis(parametro.tipo):
+                    self.erro(f"{descricao} recebe {descrever(tipos)}, mas é um {tipo_vetor(parametro.tipo)}.",
+                              chamada)
+            else:
+                self.conferir(parametro.tipo, tipos, descricao, chamada)
+            self.acrescentar(parametro, tipos)
+        return self.obter(declaracao)
+
+
+def _folhas(expressao: ExpressaoVetor):
+    """Elementos de um literal {...}, descendo pelos literais aninhados das matrizes."""
+    for elemento in expressao.elementos:
+        if isinstance(elemento, ExpressaoVetor):
+            yield from _folhas(elemento)
+        else:
+            yield elemento
+
+
+def _sempre_retorna(no) -> bool:
+    """Verdadeiro se a execução do comando sempre termina em um 'retorne'."""
+    if isinstance(no, ComandoRetorne):
+        return True
+    if isinstance(no, Bloco):
+        return any(_sempre_retorna(comando) for comando in no.declaracoes)
+    if isinstance(no, ComandoSe):
+        return (no.comando_senao is not None and _sempre_retorna(no.comando_entao)
+                and _sempre_retorna(no.comando_senao))
+    return False
+
+
+def verificar_tipos(programa: Programa, resolucao: Optional[Resolucao] = None) -> List[ErroTipo]:
+    """Infere os tipos do programa, anota as expressões e devolve os erros de tipo encontrados.
+
+    Nomes não definidos levantam `ErroResolucao`, como na resolução de escopos.
+    """
+    if resolucao is None:
+        resolucao = resolver(programa)
+    return VerificadorTipos(resolucao).verificar(programa)
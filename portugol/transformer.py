@@ -1,17 +1,32 @@
 from lark import Transformer, Token
 from .ast import (
-    Programa, Tipo, ExpressaoLiteral, ExpressaoIdentificador,
-    ExpressaoBinaria, ExpressaoUnaria, ChamadaFuncao,
-    ComandoAtribuicao, ComandoSe, ComandoEnquanto, ComandoPara,
+    ASTNode, Programa, Tipo, ExpressaoLiteral, ExpressaoIdentificador,
+    ExpressaoBinaria, ExpressaoUnaria, ExpressaoIndice, ExpressaoVetor, ChamadaFuncao,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
     ComandoEscreva, ComandoLeia, ComandoRetorne, Bloco,
     DeclaracaoVariavel, Parametro, DeclaracaoFuncao
 )
 
 
-class PortugolTransformer(Transformer):
-    def __init__(self):
-        super().__init__()
-
+def literal(token: Token) -> ExpressaoLiteral:
+    """Converte um token de literal (NUMERO, STRING, BOOLEANO...) no nó da AST."""
+    valor = token.value
+    if token.type == "NUMERO":
+        return ExpressaoLiteral(int(valor))
+    if token.type == "NUMERO_REAL":
+        return ExpressaoLiteral(float(valor))
+    if token.type == "BOOLEANO":
+        return ExpressaoLiteral(valor == 'verdadeiro')
+    # STRING e CARACTERE: o texto sem as aspas
+    return ExpressaoLiteral(str(valor[1:-1]))
+
+
+# Métodos das regras da gramática. Também servem de `transformer=` do parser
+# LALR (ver `portugol.parser`), que os chama a cada redução e constrói a AST
+# sem a árvore intermediária do Lark. Nesse uso, o Lark só aceita métodos de
+# terminais que devolvam tokens: os literais chegam como tokens e são
+# convertidos em `expressao_primaria`.
+class ConstrutorAST(Transformer):
     def programa(self, args): return Programa(args[0])
     def bloco(self, args): return Bloco(args)
 
@@ -20,9 +35,10 @@ class PortugolTransformer(Transformer):
 
     def declaracao_variavel(self, args): return args[0]
     def declaracao_variavel_base(self, args):
-        tipo, identificador, *expressao = args
-        inicializador = expressao[0] if expressao else None
-        return DeclaracaoVariavel(tipo, str(identificador), inicializador)
+        tipo, identificador, *resto = args
+        dimensoes = resto.pop(0) if resto and isinstance(resto[0], list) else None
+        inicializador = resto[0] if resto else None
+        return DeclaracaoVariavel(tipo, str(identificador), inicializador, dimensoes)
 
     def declaracao_funcao(self, args):
         tipo, nome, *resto = args
@@ -31,7 +47,8 @@ class PortugolTransformer(Transformer):
         return DeclaracaoFuncao(tipo, str(nome), parametros, corpo)
 
     def parametros(self, args): return args
-    def parametro(self, args): return Parametro(args[0], str(args[1]))
+    def parametro(self, args): return Parametro(args[0], str(args[1]), len(args) - 2)
+    def dimensao_aberta(self, args): return None
 
     # Comandos
     def comando(self, args): return args[0]
@@ -41,6 +58,10 @@ class PortugolTransformer(Transformer):
         identificador, expressao = args
         return ComandoAtribuicao(str(identificador), expressao)
 
+    def atribuicao_indice(self, args):
+        identificador, indices, expressao = args
+        return ComandoAtribuicaoIndice(str(identificador), indices, expressao)
+
     def comando_se(self, args):
         condicao, comando_entao, *comando_senao = args
         return ComandoSe(condicao, comando_entao, comando_senao[0] if comando_senao else None)
@@ -57,13 +78,16 @@ class PortugolTransformer(Transformer):
 
     # Expressões
     def lista_expressoes(self, args): return args
+    def indices(self, args): return args
 
     def _criar_expressao_binaria(self, args):
         expr = args[0]
         for i in range(1, len(args), 2):
             op = str(args[i])
             direita = args[i+1]
+            # Cada operação da cadeia começa onde começa seu operando esquerdo
             expr = ExpressaoBinaria(expr, op, direita)
+            expr.linha, expr.coluna = expr.esquerda.linha, expr.esquerda.coluna
         return expr
 
     def expressao_logica(self, args): return self._criar_expressao_binaria(args)
@@ -76,27 +100,53 @@ class PortugolTransformer(Transformer):
             return args[0]
         return ExpressaoUnaria(str(args[0]), args[1])
 
-    def expressao_primaria(self, args): return args[0]
+    def expressao_primaria(self, args):
+        filho = args[0]
+        return literal(filho) if isinstance(filho, Token) else filho
     def expressao(self, args): return args[0]
 
     def identificador_expr(self, args): return ExpressaoIdentificador(str(args[0]))
+    def indice_expr(self, args): return ExpressaoIndice(str(args[0]), args[1])
+    def vetor_expr(self, args): return ExpressaoVetor(args[0] if args else [])
 
     def chamada_funcao(self, args):
         nome, *argumentos = args
         return ChamadaFuncao(str(nome), argumentos[0] if argumentos else [])
 
-    # Tipos e Tokens
+    # Tipos
     def tipo(self, args): return Tipo(str(args[0]))
 
+
+class PortugolTransformer(ConstrutorAST):
+    def __init__(self, posicoes: bool = False):
+        super().__init__()
+        self.posicoes = posicoes
+
+    # Posições: com o parser construído com propagate_positions, cada nó criado
+    # por uma regra ou token recebe a linha e a coluna onde ele começa. Regras que
+    # só repassam o filho (ex.: 'comando') não sobrescrevem a posição dele.
+    def _call_userfunc(self, tree, new_children=None):
+        no = super()._call_userfunc(tree, new_children)
+        if self.posicoes and isinstance(no, ASTNode) and no.linha is None and not tree.meta.empty:
+            no.linha, no.coluna = tree.meta.line, tree.meta.column
+        return no
+
+    def _call_userfunc_token(self, token):
+        no = super()._call_userfunc_token(token)
+        if self.posicoes and isinstance(no, ASTNode):
+            no.linha, no.coluna = token.line, token.column
+        return no
+
+    # Tokens
     def T_INTEIRO(self, token): return token.value
     def T_REAL(self, token): return token.value
     def T_CARACTERE(self, token): return token.value
     def T_LOGICO(self, token): return token.value
     def T_CADEIA(self, token): return token.value
 
-    def NUMERO(self, token): return ExpressaoLiteral(int(token.value))
-    def NUMERO_REAL(self, token): return ExpressaoLiteral(float(token.value))
-    def STRING(self, token): return ExpressaoLiteral(str(token.value[1:-1]))
-    def CARACTERE(self, token): return ExpressaoLiteral(str(token.value[1:-1]))
-    def BOOLEANO(self, token): return ExpressaoLiteral(token.value == 'verdadeiro')
+    def NUMERO(self, token): return literal(token)
+    def NUMERO_REAL(self, token): return literal(token)
+    def STRING(self, token): return literal(token)
+    def CARACTERE(self, token): return literal(token)
+    def BOOLEANO(self, token): return literal(token)
     def IDENTIFICADOR(self, token): return token.value
@@ -0,0 +1,438 @@
+"""
+Transpilador de Portugol para Python.
+
+O `TranspiladorPython` gera o código-fonte de um módulo Python equivalente ao
+programa: o programa vira a função `_programa`, cada função Portugol vira um
+`def` aninhado e cada variável recebe um nome Python único, obtido a partir da
+resolução estática de escopos. Laços `para` de contagem viram `for ... in`
+sobre um `range`, e `escreva` grava no buffer do `EntradaSaida` do interpretador.
+Vetores são os mesmos objetos `portugol.vetores.Vetor` dos outros backends.
+
+A semântica dos operadores é preservada: sempre que não se sabe estaticamente
+que o operando esquerdo não é cadeia, a operação passa pelas funções de
+`portugol.operadores`, que fazem a coerção de cadeia com número.
+"""
+
+import re
+from typing import Dict, List, Optional, Set
+
+from .analise import Contagem, detectar_laco_contado, filhos, nomes_atribuidos_em_funcoes, pode_ser_vetor
+from .ast import (
+    Programa, Bloco, DeclaracaoVariavel, DeclaracaoFuncao, Parametro,
+    ComandoAtribuicao, ComandoAtribuicaoIndice, ComandoSe, ComandoEnquanto, ComandoPara,
+    ComandoEscreva, ComandoLeia, ComandoRetorne, ChamadaFuncao,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoIndice, ExpressaoVetor,
+    ExpressaoBinaria, ExpressaoLogica, ExpressaoUnaria
+)
+from .interpretador import ErroExecucao, Interpretador, RetornoFuncao
+from .operadores import somar, subtrair, multiplicar, dividir, modulo, e_logico, ou_logico
+from .resolvedor import ErroResolucao, Resolucao, resolver
+from .vetores import COMPOSTOS, atribuir_composto, como_vetor, criar_vetor
+
+# Operadores que não envolvem coerção nem verificação de zero
+_COMPARACOES = {'==': '==', '!=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+_AUXILIARES_BINARIOS = {
+    '+': '_somar', '-': '_subtrair', '*': '_multiplicar', '/': '_dividir', '%': '_modulo',
+    'e': '_e', 'ou': '_ou',
+}
+_UNARIOS = {'-': '-', '+': '+', '!': 'not '}
+
+
+class _Funcao:
+    """Estado de geração de um `def` (uma função Portugol ou o programa)."""
+
+    def __init__(self, declaracao, pai: Optional["_Funcao"]):
+        self.declaracao = declaracao
+        self.pai = pai
+        self.nao_locais: Set[str] = set()
+
+
+class TranspiladorPython:
+    def __init__(self, resolucao: Resolucao):
+        self.resolucao = resolucao
+        self.linhas: List[str] = []
+        self.nivel = 0
+        self.funcao: Optional[_Funcao] = None
+        self.nomes: Dict[int, str] = {}
+        # nome Python -> nome Portugol da variável
+        self.originais: Dict[str, str] = {}
+        # declaração -> Programa ou DeclaracaoFuncao em cujo 'def' a variável vive
+        self.donos: Dict[int, object] = {}
+        self.contador = 0
+        self.atribuidos_por_funcoes: Set[str] = set()
+
+    def transpilar(self, programa: Programa) -> str:
+        self.atribuidos_por_funcoes = nomes_atribuidos_em_funcoes(programa)
+        self.registrar_donos(programa, programa)
+        self.emitir("# Gerado automaticamente a partir de um programa Portugol")
+        self.emitir_def("_programa", programa, [], programa.declaracoes.declaracoes)
+        self.emitir("")
+        self.emitir("_programa()")
+        return "\n".join(self.linhas) + "\n"
+
+    # Emissão
+
+    def emitir(self, linha: str):
+        self.linhas.append("    " * self.nivel + linha if linha else "")
+
+    def emitir_bloco(self, comandos):
+        inicio = len(self.linhas)
+        self.nivel += 1
+        for comando in comandos:
+            self.transpilar_comando(comando)
+        if len(self.linhas) == inicio:
+            self.emitir("pass")
+        self.nivel -= 1
+
+    def emitir_def(self, nome: str, declaracao, parametros: List[Parametro], comandos):
+        self.funcao = _Funcao(declaracao, self.funcao)
+        nomes_parametros = ", ".join(self.nome_python(param) for param in parametros)
+        self.emitir(f"def {nome}({nomes_parametros}):")
+        cabecalho = len(self.linhas)
+        self.emitir_bloco(comandos)
+        # As variáveis de funções externas alteradas aqui precisam de 'nonlocal'
+        if self.funcao.nao_locais:
+            nao_locais = ", ".join(sorted(self.funcao.nao_locais))
+            self.linhas.insert(cabecalho, "    " * (self.nivel + 1) + f"nonlocal {nao_locais}")
+        self.funcao = self.funcao.pai
+
+    # Nomes
+
+    def nome_python(self, declaracao) -> str:
+        variavel = self.resolucao.variavel(declaracao)
+        nome = self.nomes.get(id(variavel))
+        if nome is None:
+            self.contador += 1
+            original = variavel.nome if isinstance(variavel, DeclaracaoFuncao) else variavel.identificador
+            # Nomes sintéticos (criados por passes de otimização) podem ter caracteres inválidos
+            nome = f"{re.sub(r'[^A-Za-z0-9_]', '_', original)}_{self.contador}"
+            self.nomes[id(variavel)] = nome
+            self.originais[nome] = original
+        return nome
+
+    def registrar_donos(self, no, dono):
+        for filho in filhos(no):
+            if isinstance(filho, DeclaracaoFuncao):
+                self.donos[id(filho)] = dono
+                for parametro in filho.parametros:
+                    self.donos[id(parametro)] = filho
+                self.registrar_donos(filho.corpo, filho)
+            else:
+                if isinstance(filho, DeclaracaoVariavel):
+                    self.donos[id(filho)] = dono
+                self.registrar_donos(filho, dono)
+
+    def nome_atribuido(self, uso) -> str:
+        return self.nome_escrito(self.resolucao.declaracao(uso))
+
+    def nome_escrito(self, declaracao) -> str:
+        nome = self.nome_python(declaracao)
+        if self.donos[id(declaracao)] is not self.funcao.declaracao:
+            self.funcao.nao_locais.add(nome)
+        return nome
+
+    def nomes_atribuidos(self, uso) -> List[str]:
+        """O nome atribuído pelo uso seguido dos das alternativas da resolução, se houver."""
+        nomes = [self.nome_atribuido(uso)]
+        for _, declaracao in self.resolucao.alternativas_de(uso):
+            nome = self.nome_escrito(declaracao)
+            if nome not in nomes:
+                nomes.append(nome)
+        return nomes
+
+    def nome_lido(self, uso) -> str:
+        nomes = [self.nome_python(self.resolucao.declaracao(uso))]
+        for _, declaracao in self.resolucao.alternativas_de(uso):
+            nome = self.nome_python(declaracao)
+            if nome not in nomes:
+                nomes.append(nome)
+        if len(nomes) == 1:
+            return nomes[0]
+        # A variável pode ainda não ter sido declarada: vale a primeira que já existe
+        return f"_primeira_definida({', '.join(f'lambda: {nome}' for nome in nomes)})"
+
+    def emitir_na_primeira_definida(self, nomes: List[str], emitir_com):
+        """Emite `emitir_com(nome)` para a primeira variável que já existe entre os nomes."""
+        if len(nomes) == 1:
+            emitir_com(nomes[0])
+            return
+        self.emitir("try:")
+        self.emitir(f"    {nomes[0]}")
+        self.emitir("except NameError:")
+        self.nivel += 1
+        self.emitir_na_primeira_definida(nomes[1:], emitir_com)
+        self.nivel -= 1
+        self.emitir("else:")
+        self.nivel += 1
+        emitir_com(nomes[0])
+        self.nivel -= 1
+
+    # Comandos
+
+    def transpilar_comando(self, no):
+        metodo_nome = 'transpilar_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.transpilar_no_desconhecido)
+        return metodo(no)
+
+    def transpilar_no_desconhecido(self, no):
+        raise ErroExecucao(f"Tipo de nó AST desconhecido: {type(no).__name__}")
+
+    def transpilar_Bloco(self, bloco: Bloco):
+        for comando in bloco.declaracoes:
+            self.transpilar_comando(comando)
+
+    def transpilar_DeclaracaoVariavel(self, declaracao: DeclaracaoVariavel):
+        valor = self.expressao(declaracao.inicializador) if declaracao.inicializador else "None"
+        if declaracao.dimensoes is not None:
+            dimensoes = ", ".join(self.expressao(tamanho) for tamanho in declaracao.dimensoes)
+            valor = (f"_criar_vetor({declaracao.identificador!r}, {declaracao.tipo.nome!r}, "
+                     f"[{dimensoes}], {valor})")
+        self.emitir(f"{self.nome_python(declaracao)} = {valor}")
+
+    def transpilar_DeclaracaoFuncao(self, declaracao: DeclaracaoFuncao):
+        nome = self.nome_python(declaracao)
+        self.emitir_def(nome, declaracao, declaracao.parametros, declaracao.corpo.declaracoes)
+
+    def transpilar_ComandoAtribuicao(self, comando: ComandoAtribuicao):
+        valor = self.expressao(comando.expressao)
+        nomes = self.nomes_atribuidos(comando)
+        if pode_ser_vetor(comando.expressao):
+            # Um vetor atribuído a uma variável que já guarda um vetor é copiado para ele
+            self.emitir(f"_valor = {valor}")
+            self.emitir_na_primeira_definida(nomes, lambda nome: self.emitir(
+                f"{nome} = _atribuir_composto({nome}, _valor, {comando.identificador!r}) "
+                f"if _valor.__class__ in _COMPOSTOS else _valor"))
+            return
+        if len(nomes) > 1:
+            self.emitir(f"_valor = {valor}")
+            valor = "_valor"
+        self.emitir_na_primeira_definida(nomes, lambda nome: self.emitir(f"{nome} = {valor}"))
+
+    def transpilar_ComandoAtribuicaoIndice(self, comando: ComandoAtribuicaoIndice):
+        vetor = f"_vetor({self.nome_lido(comando)}, {comando.identificador!r})"
+        indices = [self.expressao(indice) for indice in comando.indices]
+        valor = self.expressao(comando.expressao)
+        if len(indices) == 1:
+            self.emitir(f"{vetor}.atribuir1({indices[0]}, {valor})")
+        elif len(indices) == 2:
+            self.emitir(f"{vetor}.atribuir2({indices[0]}, {indices[1]}, {valor})")
+        else:
+            self.emitir(f"{vetor}.atribuir([{', '.join(indices)}], {valor})")
+
+    def transpilar_ComandoSe(self, comando: ComandoSe):
+        self.emitir(f"if {self.expressao(comando.condicao)}:")
+        self.emitir_bloco([comando.comando_entao])
+        if comando.comando_senao:
+            self.emitir("else:")
+            self.emitir_bloco([comando.comando_senao])
+
+    def transpilar_ComandoEnquanto(self, comando: ComandoEnquanto):
+        self.emitir(f"while {self.expressao(comando.condicao)}:")
+        self.emitir_bloco([comando.comando])
+
+    def transpilar_ComandoPara(self, comando: ComandoPara):
+        laco = detectar_laco_contado(comando, self.atribuidos_por_funcoes)
+        if laco is None or (not laco.declarada and self.resolucao.alternativas_de(comando.inicializacao)):
+            self.transpilar_comando(comando.inicializacao)
+            self.emitir(f"while {self.expressao(comando.condicao)}:")
+            self.emitir_bloco([comando.comando, comando.incremento])
+            return
+
+        if laco.declarada:
+            variavel = self.nome_python(comando.inicializacao)
+        else:
+            variavel = self.nome_atribuido(comando.inicializacao)
+        inicio = self.expressao(laco.inicio)
+        # A variável recebe o valor inicial antes de o limite ser avaliado
+        self.emitir(f"{variavel} = {inicio}")
+        self.contador += 1
+        contagem = f"_contagem_{self.contador}"
+        limite = self.expressao(laco.limite)
+        self.emitir(f"{contagem} = _Contagem({variavel}, {limite}, {laco.operador!r}, {laco.passo})")
+        self.emitir(f"for {variavel} in {contagem}.valores:")
+        self.emitir_bloco([comando.comando])
+        if not laco.declarada:
+            # A variável continua visível depois do laço com o valor que falhou a condição
+            self.emitir(f"{variavel} = {contagem}.final")
+
+    def transpilar_ComandoEscreva(self, comando: ComandoEscreva):
+        # Cadeias literais entram direto no formato; os demais valores passam por '%s' (str)
+        partes, valores = [], []
+        for expressao in comando.expressoes:
+            if isinstance(expressao, ExpressaoLiteral) and isinstance(expressao.valor, str):
+                partes.append(expressao.valor)
+            else:
+                partes.append(None)
+                valores.append(self.expressao(expressao))
+        if not valores:
+            self.emitir(f"_escrever({''.join(partes) + chr(10)!r})")
+            return
+        formato = "".join("%s" if parte is None else parte.replace("%", "%%") for parte in partes) + "\n"
+        self.emitir(f"_escrever({formato!r} % ({', '.join(valores)},))")
+
+    def transpilar_ComandoLeia(self, comando: ComandoLeia):
+        nomes = self.nomes_atribuidos(comando)
+        self.emitir_na_primeira_definida(nomes, lambda nome: self.emitir(f"{nome} = _leia()"))
+
+    def transpilar_ComandoRetorne(self, comando: ComandoRetorne):
+        valor = self.expressao(comando.expressao) if comando.expressao else "None"
+        if isinstance(self.funcao.declaracao, Programa):
+            # 'retorne' fora de função se comporta como no interpretador de árvore
+            self.emitir(f"raise _RetornoFuncao({valor})")
+        else:
+            self.emitir(f"return {valor}")
+
+    def transpilar_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        self.emitir(self.expressao(chamada))
+
+    # Expressões
+
+    def expressao(self, no) -> str:
+        metodo_nome = 'expressao_' + type(no).__name__
+        metodo = getattr(self, metodo_nome, self.expressao_desconhecida)
+        return metodo(no)
+
+    def expressao_desconhecida(self, no):
+        raise ErroExecucao(f"Tipo de nó de expressão desconhecido: {type(no).__name__}")
+
+    def expressao_ExpressaoLiteral(self, expressao: ExpressaoLiteral):
+        return repr(expressao.valor)
+
+    def expressao_ExpressaoIdentificador(self, expressao: ExpressaoIdentificador):
+        return self.nome_lido(expressao)
+
+    def expressao_ExpressaoIndice(self, expressao: ExpressaoIndice):
+        vetor = f"_vetor({self.nome_lido(expressao)}, {expressao.nome!r})"
+        indices = [self.expressao(indice) for indice in expressao.indices]
+        if len(indices) == 1:
+            return f"{vetor}.obter1({indices[0]})"
+        if len(indices) == 2:
+            return f"{vetor}.obter2({indices[0]}, {indices[1]})"
+        return f"{vetor}.obter([{', '.join(indices)}])"
+
+    def expressao_ExpressaoVetor(self, expressao: ExpressaoVetor):
+        return f"[{', '.join(self.expressao(elemento) for elemento in expressao.elementos)}]"
+
+    def expressao_ExpressaoUnaria(self, expressao: ExpressaoUnaria):
+        if expressao.operador not in _UNARIOS:
+            raise ErroExecucao(f"Operador unário desconhecido: {expressao.operador}")
+        return f"({_UNARIOS[expressao.operador]}{self.expressao(expressao.expressao)})"
+
+    def expressao_ExpressaoBinaria(self, expressao: ExpressaoBinaria):
+        op = expressao.operador
+        esquerda = self.expressao(expressao.esquerda)
+        direita = self.expressao(expressao.direita)
+        if op in _COMPARACOES:
+            return f"({esquerda} {op} {direita})"
+        if op not in _AUXILIARES_BINARIOS:
+            raise ErroExecucao(f"Operador binário desconhecido: {op}")
+        if op in ('+', '-', '*') and _nunca_cadeia(expressao.esquerda) and _nunca_cadeia(expressao.direita):
+            # Sem cadeias envolvidas não há coerção: o operador Python é equivalente
+            return f"({esquerda} {op} {direita})"
+        if op in ('/', '%') and _nunca_cadeia(expressao.esquerda) and _constante_nao_nula(expressao.direita):
+            return f"({esquerda} {op} {direita})"
+        return f"{_AUXILIARES_BINARIOS[op]}({esquerda}, {direita})"
+
+    def expressao_ExpressaoLogica(self, expressao: ExpressaoLogica):
+        operadores = {'e': 'and', 'ou': 'or'}
+        if expressao.operador not in operadores:
+            raise ErroExecucao(f"Operador lógico desconhecido: {expressao.operador}")
+        esquerda = self.expressao(expressao.esquerda)
+        direita = self.expressao(expressao.direita)
+        return f"({esquerda} {operadores[expressao.operador]} {direita})"
+
+    def expressao_ChamadaFuncao(self, chamada: ChamadaFuncao):
+        argumentos = ", ".join(self.expressao(arg) for arg in chamada.argumentos)
+        declaracao = self.resolucao.declaracao(chamada)
+        funcao = self.nome_lido(chamada)
+        if isinstance(declaracao, DeclaracaoFuncao) and not self.resolucao.alternativas_de(chamada):
+            # Nome e aridade já foram verificados pelo resolvedor
+            return f"{funcao}({argumentos})"
+        return f"_funcao({funcao}, {chamada.nome!r}, {len(chamada.argumentos)})({argumentos})"
+
+
+def _nunca_cadeia(expressao) -> bool:
+    """Verdadeiro se a expressão nunca produz uma cadeia (ou falha antes disso)."""
+    if expressao.tipo_estatico in ("inteiro", "real", "logico", "numero"):
+        # Tipo inferido pela verificação de tipos
+        return True
+    if isinstance(expressao, ExpressaoLiteral):
+        return not isinstance(expressao.valor, str)
+    if isinstance(expressao, ExpressaoUnaria):
+        return True
+    if isinstance(expressao, ExpressaoBinaria):
+        if expressao.operador in _COMPARACOES or expressao.operador in ('-', '/'):
+            return True
+        if expressao.operador in ('+', '*'):
+            return _nunca_cadeia(expressao.esquerda) and _nunca_cadeia(expressao.direita)
+        if expressao.operador == '%':
+            return _nunca_cadeia(expressao.esquerda)
+    return False
+
+
+def _constante_nao_nula(expressao) -> bool:
+    return (isinstance(expressao, ExpressaoLiteral) and isinstance(expressao.valor, (int, float))
+            and expressao.valor != 0)
+
+
+def transpilar(programa: Programa) -> str:
+    """Resolve os escopos do programa e devolve o código-fonte Python equivalente."""
+    return TranspiladorPython(resolver(programa)).transpilar(programa)
+
+
+def _primeira_definida(*leitores):
+    for ler in leitores[:-1]:
+        try:
+            return ler()
+        except NameError:
+            pass
+    return leitores[-1]()
+
+
+def _verificar_funcao(valor, nome: str, aridade: int):
+    if not callable(valor) or not hasattr(valor, "__code__"):
+        raise ErroExecucao(f"'{nome}' não é uma função.")
+    if valor.__code__.co_argcount != aridade:
+        raise ErroExecucao(f"Número incorreto de argumentos para '{nome}'.")
+    return valor
+
+
+class InterpretadorPython(Interpretador):
+    """Interpretador que transpila o programa para Python e executa o código compilado."""
+
+    def interpretar(self, programa: Programa):
+        try:
+            transpilador = TranspiladorPython(resolver(programa))
+            fonte = transpilador.transpilar(programa)
+        except ErroResolucao as e:
+            self.es.escrever(f"Erro de execução: {e}\n")
+            self.es.descarregar()
+            return
+        try:
+            codigo = compile(fonte, "<portugol>", "exec")
+        except (SyntaxError, RecursionError, MemoryError):
+            # Limites do compilador do Python, como mais de 20 blocos aninhados:
+            # o programa é executado pelo interpretador de árvore
+            super().interpretar(programa)
+            return
+
+        globais = {
+            "__name__": "__portugol__",
+            "_somar": somar, "_subtrair": subtrair, "_multiplicar": multiplicar,
+            "_dividir": dividir, "_modulo": modulo, "_e": e_logico, "_ou": ou_logico,
+            "_escrever": self.es.escrever, "_leia": self.ler_entrada, "_funcao": _verificar_funcao,
+            "_primeira_definida": _primeira_definida,
+            "_Contagem": Contagem, "_RetornoFuncao": RetornoFuncao,
+            "_criar_vetor": criar_vetor, "_vetor": como_vetor, "_atribuir_composto": atribuir_composto,
+            "_COMPOSTOS": COMPOSTOS,
+        }
+        try:
+            exec(codigo, globais)
+        except ErroExecucao as e:
+            self.es.escrever(f"Erro de execução: {e}\n")
+        except NameError as e:
+            # Variável usada por uma função antes de sua declaração ser executada
+            nome = transpilador.originais.get(getattr(e, "name", None), "?")
+            self.es.escrever(f"Erro de execução: Variável '{nome}' não definida.\n")
+        finally:
+            self.es.descarregar()
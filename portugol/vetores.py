@@ -0,0 +1,303 @@
+"""
+Vetores e matrizes da linguagem Portugol.
+
+Os elementos de um `Vetor` ficam em um único `array.array` contíguo, em ordem
+de linhas no caso das matrizes, com o código de tipo do tipo declarado
+(inteiro: 'q', real: 'd', logico: 'b', caractere: 'w'); só os vetores de
+cadeia guardam uma lista. Um `inteiro v[1000]` ocupa 8 KiB em vez de mil
+objetos Python, e o `array` rejeita sozinho os valores de outro tipo.
+
+Criar, inicializar com um literal `{...}` e copiar um vetor inteiro (`v = w`)
+são operações em bloco: o preenchimento com zeros repete um único elemento,
+a conversão de um literal é uma só chamada a `array()` e a cópia entre
+vetores do mesmo tipo é uma atribuição de fatia (`memcpy`).
+
+Todos os backends usam as mesmas operações: `obter1`/`atribuir1` e
+`obter2`/`atribuir2` para um e dois índices, `obter`/`atribuir` para o caso
+geral e `atribuir_composto` para a atribuição de um vetor ou literal a uma
+variável. Índices fora dos limites ou valores do tipo errado geram `ErroExecucao`.
+"""
+
+from array import array, typecodes
+from typing import Any, List, Sequence
+
+from .cadeias import Corda
+from .interpretador import ErroExecucao
+
+# 'w' (str de um caractere) substitui o 'u', obsoleto, a partir do Python 3.13
+_CODIGO_CARACTERE = "w" if "w" in typecodes else "u"
+
+# tipo declarado -> código de tipo do array.array; cadeia usa uma lista
+CODIGOS = {"inteiro": "q", "real": "d", "logico": "b", "caractere": _CODIGO_CARACTERE}
+
+# Valor inicial dos elementos de um vetor declarado sem inicializador
+ZEROS = {"inteiro": 0, "real": 0.0, "logico": False, "caractere": " ", "cadeia": ""}
+
+
+def plural(quantidade: int, singular: str, forma_plural: str) -> str:
+    return f"{quantidade} {singular if quantidade == 1 else forma_plural}"
+
+
+class Vetor:
+    __slots__ = ("nome", "tipo", "dimensoes", "dados", "comprimento", "linhas", "colunas")
+
+    def __init__(self, nome: str, tipo: str, dimensoes: Sequence[int]):
+        self.nome = nome
+        self.tipo = tipo
+        self.dimensoes = tuple(dimensoes)
+        total = 1
+        for tamanho in self.dimensoes:
+            total *= tamanho
+        self.dados = self._novos_dados(total)
+        # Limites usados pelos acessos com um e dois índices; -1 nunca passa na verificação,
+        # e o acesso com o número errado de índices cai na mensagem de erro
+        self.comprimento = self.dimensoes[0] if len(self.dimensoes) == 1 else -1
+        self.linhas, self.colunas = self.dimensoes if len(self.dimensoes) == 2 else (-1, 0)
+
+    def _novos_dados(self, total: int):
+        return array(CODIGOS[self.tipo], [ZEROS[self.tipo]]) * total
+
+    def _converter(self, valores: List[Any]):
+        """Dados no formato de armazenamento a partir de uma lista de valores Python."""
+        try:
+            return array(CODIGOS[self.tipo], valores)
+        except (TypeError, OverflowError):
+            invalido = next(valor for valor in valores if not self._aceita(valor))
+            raise self._valor_invalido(invalido) from None
+
+    def _aceita(self, valor: Any) -> bool:
+        try:
+            array(CODIGOS[self.tipo], [valor])
+            return True
+        except (TypeError, OverflowError):
+            return False
+
+    @property
+    def descricao(self) -> str:
+        return "vetor" if len(self.dimensoes) == 1 else "matriz"
+
+    def forma(self) -> str:
+        return "".join(f"[{tamanho}]" for tamanho in self.dimensoes)
+
+    # Acesso aos elementos
+
+    def obter1(self, i: int) -> Any:
+        if i.__class__ is int and 0 <= i < self.comprimento:
+            return self.dados[i]
+        raise self._indices_invalidos((i,))
+
+    def atribuir1(self, i: int, valor: Any):
+        if i.__class__ is int and 0 <= i < self.comprimento:
+            try:
+                self.dados[i] = valor
+            except (TypeError, OverflowError):
+                raise self._valor_invalido(valor) from None
+            return
+        raise self._indices_invalidos((i,))
+
+    def obter2(self, i: int, j: int) -> Any:
+        if i.__class__ is int and j.__class__ is int and 0 <= i < self.linhas and 0 <= j < self.colunas:
+            return self.dados[i * self.colunas + j]
+        raise self._indices_invalidos((i, j))
+
+    def atribuir2(self, i: int, j: int, valor: Any):
+        if i.__class__ is int and j.__class__ is int and 0 <= i < self.linhas and 0 <= j < self.colunas:
+            try:
+                self.dados[i * self.colunas + j] = valor
+            except (TypeError, OverflowError):
+                raise self._valor_invalido(valor) from None
+            return
+        raise self._indices_invalidos((i, j))
+
+    def posicao(self, indices: Sequence[int]) -> int:
+        """Posição em `dados` do elemento com esses índices (em qualquer número de dimensões)."""
+        if len(indices) != len(self.dimensoes):
+            raise self._indices_invalidos(indices)
+        posicao = 0
+        for indice, tamanho in zip(indices, self.dimensoes):
+            if indice.__class__ is not int or not 0 <= indice < tamanho:
+                raise self._indices_invalidos(indices)
+            posicao = posicao * tamanho + indice
+        return posicao
+
+    def obter(self, indices: Sequence[int]) -> Any:
+        if len(indices) == 1:
+            return self.obter1(indices[0])
+        return self.dados[self.posicao(indices)]
+
+    def atribuir(self, indices: Sequence[int], valor: Any):
+        if len(indices) == 1:
+            self.atribuir1(indices[0], valor)
+            return
+        posicao = self.posicao(indices)
+        try:
+            self.dados[posicao] = valor
+        except (TypeError, OverflowError):
+            raise self._valor_invalido(valor) from None
+
+    def valores(self) -> List[Any]:
+        """Os elementos, em ordem de linhas, como valores Portugol."""
+        return list(self.dados)
+
+    # Operações em bloco
+
+    def copiar(self, origem: Any):
+        """Copia para este vetor os elementos de outro `Vetor` ou de um literal (listas aninhadas)."""
+        if isinstance(origem, Vetor):
+            if origem.dimensoes != self.dimensoes:
+                raise ErroExecucao(f"Não é possível copiar '{origem.nome}'{origem.forma()} para "
+                                   f"'{self.nome}'{self.forma()}: as dimensões são diferentes.")
+            if origem.tipo == self.tipo:
+                # Mesmo armazenamento: cópia direta do buffer
+                self.dados[:] = origem.dados
+                return
+            valores = origem.valores()
+        else:
+            valores = []
+            self._achatar(origem, 0, valores)
+        self.dados[:] = self._converter(valores)
+
+    def _achatar(self, literal: Any, nivel: int, saida: List[Any]):
+        tamanho = self.dimensoes[nivel]
+        if literal.__class__ is not list or len(literal) != tamanho:
+            raise ErroExecucao(f"O valor atribuído a '{self.nome}' não tem as dimensões {self.forma()}.")
+        if nivel + 1 == len(self.dimensoes):
+            if any(elemento.__class__ is list for elemento in literal):
+                raise ErroExecucao(f"O valor atribuído a '{self.nome}' não tem as dimensões {self.forma()}.")
+            saida.extend(literal)
+        else:
+            for linha in literal:
+                self._achatar(linha, nivel + 1, saida)
+
+    # Erros
+
+    def _indices_invalidos(self, indices: Sequence[Any]) -> ErroExecucao:
+        if len(indices) != len(self.dimensoes):
+            return ErroExecucao(f"'{self.nome}' tem {plural(len(self.dimensoes), 'dimensão', 'dimensões')}, "
+                                f"mas foi usado com {plural(len(indices), 'índice', 'índices')}.")
+        for dimensao, (indice, tamanho) in enumerate(zip(indices, self.dimensoes), 1):
+            if indice.__class__ is not int:
+                return ErroExecucao(f"Índice inválido para '{self.nome}': {indice!r} não é um inteiro.")
+            if not 0 <= indice < tamanho:
+                local = f"na dimensão {dimensao}, " if len(self.dimensoes) > 1 else ""
+                return ErroExecucao(f"Índice {indice} fora dos limites de '{self.nome}' ({local}tamanho {tamanho}).")
+        return ErroExecucao(f"Índices inválidos para '{self.nome}'.")
+
+    def _valor_invalido(self, valor: Any) -> ErroExecucao:
+        return ErroExecucao(f"Valor inválido para o {self.descricao} {self.tipo} '{self.nome}': {valor!r}.")
+
+    def __str__(self):
+        valores = [str(valor) for valor in self.valores()]
+        for tamanho in reversed(self.dimensoes):
+            valores = ["{" + ", ".join(valores[i:i + tamanho]) + "}" for i in range(0, len(valores), tamanho)]
+        return valores[0] if valores else "{}"
+
+    def __repr__(self):
+        return f"<{self.descricao} {self.tipo} {self.nome}{self.forma()}>"
+
+
+class VetorLogico(Vetor):
+    """Guarda 0 e 1 em um array de bytes; só aceita valores logico e os devolve como bool."""
+    __slots__ = ()
+
+    def _converter(self, valores: List[Any]):
+        for valor in valores:
+            if valor.__class__ is not bool:
+                raise self._valor_invalido(valor)
+        return array("b", valores)
+
+    def obter1(self, i: int) -> bool:
+        return Vetor.obter1(self, i) == 1
+
+    def atribuir1(self, i: int, valor: Any):
+        if valor.__class__ is not bool:
+            raise self._valor_invalido(valor)
+        Vetor.atribuir1(self, i, valor)
+
+    def obter2(self, i: int, j: int) -> bool:
+        return Vetor.obter2(self, i, j) == 1
+
+    def atribuir2(self, i: int, j: int, valor: Any):
+        if valor.__class__ is not bool:
+            raise self._valor_invalido(valor)
+        Vetor.atribuir2(self, i, j, valor)
+
+    def obter(self, indices: Sequence[int]) -> bool:
+        return Vetor.obter(self, indices) == 1
+
+    def atribuir(self, indices: Sequence[int], valor: Any):
+        if valor.__class__ is not bool:
+            raise self._valor_invalido(valor)
+        Vetor.atribuir(self, indices, valor)
+
+    def valores(self) -> List[bool]:
+        return [valor == 1 for valor in self.dados]
+
+
+class VetorCadeia(Vetor):
+    """Cadeias não têm tamanho fixo: os elementos ficam em uma lista, verificados na escrita."""
+    __slots__ = ()
+
+    def _novos_dados(self, total: int):
+        return [""] * total
+
+    def _cadeia(self, valor: Any) -> str:
+        # Cordas (portugol.cadeias) são guardadas já montadas
+        if valor.__class__ is not str:
+            if valor.__class__ is not Corda:
+                raise self._valor_invalido(valor)
+            return str(valor)
+        return valor
+
+    def _converter(self, valores: List[Any]):
+        return [self._cadeia(valor) for valor in valores]
+
+    def atribuir1(self, i: int, valor: Any):
+        Vetor.atribuir1(self, i, self._cadeia(valor))
+
+    def atribuir2(self, i: int, j: int, valor: Any):
+        Vetor.atribuir2(self, i, j, self._cadeia(valor))
+
+    def atribuir(self, indices: Sequence[int], valor: Any):
+        Vetor.atribuir(self, indices, self._cadeia(valor))
+
+
+CLASSES = {"logico": VetorLogico, "cadeia": VetorCadeia}
+
+CLASSES_VETOR = frozenset({Vetor, VetorLogico, VetorCadeia})
+
+# Classes dos valores cuja atribuição a uma variável passa por `atribuir_composto`
+COMPOSTOS = CLASSES_VETOR | {list}
+
+
+def criar_vetor(nome: str, tipo: str, dimensoes: Sequence[Any], inicial: Any = None) -> Vetor:
+    """Cria o vetor declarado como `tipo nome[d1][d2]...`, opcionalmente com os elementos de `inicial`."""
+    for tamanho in dimensoes:
+        if tamanho.__class__ is not int or tamanho < 0:
+            raise ErroExecucao(f"Tamanho inválido para '{nome}': {tamanho!r}.")
+    vetor = CLASSES.get(tipo, Vetor)(nome, tipo, dimensoes)
+    if inicial is not None:
+        vetor.copiar(inicial)
+    return vetor
+
+
+def como_vetor(valor: Any, nome: str) -> Vetor:
+    if not isinstance(valor, Vetor):
+        raise ErroExecucao(f"'{nome}' não é um vetor.")
+    return valor
+
+
+def atribuir_composto(atual: Any, valor: Any, nome: str) -> Any:
+    """
+    Atribuição de um vetor ou literal `{...}` à variável `nome`, cujo valor atual
+    é `atual`; devolve o novo valor da variável.
+
+    Se a variável já guarda um vetor, os elementos são copiados para ele (como
+    em `v = w` com `inteiro v[10]`); senão, ela passa a referenciar o vetor.
+    """
+    if isinstance(atual, Vetor):
+        atual.copiar(valor)
+        return atual
+    if isinstance(valor, Vetor):
+        return valor
+    raise ErroExecucao(f"'{nome}' não é um vetor.")
@@ -0,0 +1,314 @@
+"""
+Máquina virtual de pilha que executa o bytecode gerado por `CompiladorBytecode`.
+
+As chamadas de função empilham um quadro (código, posição de retorno e escopo
+do chamador) em uma lista, e `RETURN` o desempilha: não há recursão Python por
+chamada nem exceção por retorno. A profundidade de recursão fica limitada
+apenas por `limite_pilha` (milhões de chamadas), e passar dele gera um
+`ErroEstouroPilha` com a cadeia de chamadas.
+
+O laço de execução é um gerador (`MaquinaVirtual.execucao`) que devolve o
+controle a quem o conduz em cada `leia` e quando acaba a cota de passos
+(voltas de laço e chamadas de função). `executar` o conduz de forma
+síncrona; `portugol.assincrono` o conduz em um laço de eventos do asyncio.
+"""
+
+from typing import Any, List
+
+from .ast import Programa
+from .bytecode import (
+    LOAD_CONST, LOAD_NAME, STORE_NAME, DEFINE_NAME, POP, BINARY_OP, UNARY_OP,
+    JUMP, JUMP_IF_FALSE, ENTER_SCOPE, EXIT_SCOPE, PRINT, READ, MAKE_FUNCTION,
+    LOAD_FUNCTION, CALL, RETURN, HALT, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+    LOAD_INDEX, STORE_INDEX, NEW_ARRAY, BUILD_LIST, STORE_ARRAY_NAME, JUMP_BACK, NOMES_OPCODES, OPERACOES_BINARIAS, OPERACOES_UNARIAS, Codigo, CompiladorBytecode
+)
+from .interpretador import Ambiente, ErroExecucao, Funcao, Interpretador, RetornoFuncao
+from .vetores import CLASSES_VETOR, COMPOSTOS, atribuir_composto, como_vetor, criar_vetor
+
+
+class FuncaoBytecode(Funcao):
+    __slots__ = ("codigo",)
+
+    def __init__(self, codigo: Codigo, ambiente_definicao: Ambiente):
+        super().__init__(None, ambiente_definicao)
+        self.codigo = codigo
+
+
+# Número máximo de chamadas aninhadas; cada quadro ocupa algumas centenas de bytes
+LIMITE_PILHA_PADRAO = 2_000_000
+
+# Quantas funções distintas a cadeia de chamadas mostra em um estouro de pilha
+LIMITE_CADEIA_CHAMADAS = 20
+
+# Cota de passos da execução síncrona: na prática, nunca há pausa
+SEM_PAUSA = 1 << 62
+
+
+class ErroEstouroPilha(ErroExecucao):
+    """A profundidade de chamadas passou do limite da máquina virtual."""
+
+    def __init__(self, limite: int, cadeia: List[str]):
+        self.limite = limite
+        self.cadeia = cadeia
+        super().__init__(f"Estouro da pilha de chamadas: mais de {limite} chamadas aninhadas.\n"
+                         f"Cadeia de chamadas (a mais recente por último):\n{_descrever_cadeia(cadeia)}")
+
+
+def _descrever_cadeia(cadeia: List[str]) -> str:
+    # Chamadas consecutivas da mesma função (recursão) aparecem em uma só linha
+    grupos = []
+    for nome in cadeia:
+        if grupos and grupos[-1][0] == nome:
+            grupos[-1][1] += 1
+        else:
+            grupos.append([nome, 1])
+    linhas = [f"  {nome}" if vezes == 1 else f"  {nome} ({vezes} vezes)" for nome, vezes in grupos]
+    if len(linhas) > LIMITE_CADEIA_CHAMADAS:
+        metade = LIMITE_CADEIA_CHAMADAS // 2
+        omitidas = len(linhas) - 2 * metade
+        linhas = linhas[:metade] + [f"  ... ({omitidas} linhas omitidas)"] + linhas[-metade:]
+    return "\n".join(linhas)
+
+
+class MaquinaVirtual:
+    def __init__(self, interpretador: Interpretador, limite_pilha: int = LIMITE_PILHA_PADRAO):
+        self.interpretador = interpretador
+        self.limite_pilha = limite_pilha
+
+    def executar(self, codigo: Codigo, ambiente: Ambiente):
+        ler_entrada = self.interpretador.ler_entrada
+        execucao = self.execucao(codigo, ambiente, SEM_PAUSA)
+        try:
+            pedido = next(execucao)
+            while True:
+                pedido = execucao.send(ler_entrada() if pedido else SEM_PAUSA)
+        except StopIteration:
+            pass
+
+    def execucao(self, codigo: Codigo, ambiente: Ambiente, passos: int):
+        """
+        Gerador que executa o código, com uma cota inicial de `passos`.
+
+        Cada volta de laço (`JUMP_BACK`) e cada chamada de função gasta um
+        passo. Em um `leia`, o gerador produz a cota restante (sempre maior
+        que zero) e espera receber o valor lido; quando a cota acaba, produz
+        0 e espera receber a próxima cota. No fim do programa, devolve a cota
+        restante.
+        """
+        escrever = self.interpretador.es.escrever
+        instrucoes = codigo.instrucoes
+        constantes = codigo.constantes
+        nomes = codigo.nomes
+        pc = 0
+        pilha: List[Any] = []
+        push = pilha.append
+        pop = pilha.pop
+        # Quadros de chamada (código, posição de retorno, escopo) dos chamadores
+        quadros = []
+        limite_pilha = self.limite_pilha
+        amb = ambiente
+
+        while True:
+            op = instrucoes[pc]
+            arg = instrucoes[pc + 1]
+            pc += 2
+
+            if op == LOAD_NAME:
+                nome = nomes[arg]
+                atual = amb
+                while atual is not None:
+                    valores = atual.valores
+                    if nome in valores:
+                        push(valores[nome])
+                        break
+                    atual = atual.pai
+                else:
+                    raise ErroExecucao(f"Variável '{nome}' não definida.")
+            elif op == LOAD_CONST:
+                push(constantes[arg])
+            elif op == BINARY_OP:
+                direita = pop()
+                pilha[-1] = OPERACOES_BINARIAS[arg](pilha[-1], direita)
+            elif op == STORE_NAME:
+                nome = nomes[arg]
+                atual = amb
+                while atual is not None:
+                    valores = atual.valores
+                    if nome in valores:
+                        valores[nome] = pop()
+                        break
+                    atual = atual.pai
+                else:
+                    raise ErroExecucao(f"Variável '{nome}' não definida para atribuição.")
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+            elif op == JUMP_BACK:
+                pc = arg
+                passos -= 1
+                if not passos:
+                    passos = yield 0
+            elif op == LOAD_INDEX:
+                nome, quantidade = constantes[arg]
+                if quantidade == 1:
+                    indice = pop()
+                    vetor = pilha[-1]
+                    if vetor.__class__ not in CLASSES_VETOR:
+                        como_vetor(vetor, nome)
+                    pilha[-1] = vetor.obter1(indice)
+                else:
+                    indices = pilha[-quantidade:]
+                    del pilha[-quantidade:]
+                    pilha[-1] = como_vetor(pilha[-1], nome).obter(indices)
+            elif op == STORE_INDEX:
+                nome, quantidade = constantes[arg]
+                valor = pop()
+                if quantidade == 1:
+                    indice = pop()
+                    vetor = pop()
+                    if vetor.__class__ not in CLASSES_VETOR:
+                        como_vetor(vetor, nome)
+                    vetor.atribuir1(indice, valor)
+                else:
+                    indices = pilha[-quantidade:]
+                    del pilha[-quantidade:]
+                    como_vetor(pop(), nome).atribuir(indices, valor)
+            elif op == ENTER_SCOPE:
+                amb = Ambiente(amb)
+            elif op == EXIT_SCOPE:
+                amb = amb.pai
+            elif op == DEFINE_NAME:
+                amb.valores[nomes[arg]] = pop()
+            elif op == LOAD_FUNCTION:
+                nome, aridade = constantes[arg]
+                atual = amb
+                while atual is not None:
+                    valores = atual.valores
+                    if nome in valores:
+                        funcao = valores[nome]
+                        break
+                    atual = atual.pai
+                else:
+                    raise ErroExecucao(f"Variável '{nome}' não definida.")
+                if not isinstance(funcao, FuncaoBytecode):
+                    raise ErroExecucao(f"'{nome}' não é uma função.")
+                if aridade != len(funcao.codigo.parametros):
+                    raise ErroExecucao(f"Número incorreto de argumentos para '{nome}'.")
+                push(funcao)
+            elif op == CALL:
+                if arg:
+                    argumentos = pilha[-arg:]
+                    del pilha[-arg:]
+                else:
+                    argumentos = ()
+                funcao = pop()
+                if len(quadros) >= limite_pilha:
+                    cadeia = [quadro[0].nome for quadro in quadros] + [codigo.nome, funcao.codigo.nome]
+                    raise ErroEstouroPilha(limite_pilha, cadeia)
+                quadros.append((codigo, pc, amb))
+                # O novo ambiente é filho do ambiente onde a função foi DEFINIDA
+                amb = Ambiente(funcao.ambiente_definicao)
+                codigo = funcao.codigo
+                amb.valores.update(zip(codigo.parametros, argumentos))
+                instrucoes = codigo.instrucoes
+                constantes = codigo.constantes
+                nomes = codigo.nomes
+                pc = 0
+                passos -= 1
+                if not passos:
+                    passos = yield 0
+            elif op == RETURN:
+                if not quadros:
+                    raise RetornoFuncao(pop())
+                codigo, pc, amb = quadros.pop()
+                instrucoes = codigo.instrucoes
+                constantes = codigo.constantes
+                nomes = codigo.nomes
+            elif op == POP:
+                pop()
+            elif op == PRINT:
+                if arg:
+                    valores = pilha[-arg:]
+                    del pilha[-arg:]
+                else:
+                    valores = ()
+                escrever("".join([str(valor) for valor in valores]) + "\n")
+            elif op == READ:
+                nome = nomes[arg]
+                valor = yield passos
+                atual = amb
+                while atual is not None:
+                    valores = atual.valores
+                    if nome in valores:
+                        valores[nome] = valor
+                        break
+                    atual = atual.pai
+                else:
+                    raise ErroExecucao(f"Variável '{nome}' não definida para atribuição.")
+            elif op == UNARY_OP:
+                pilha[-1] = OPERACOES_UNARIAS[arg](pilha[-1])
+            elif op == MAKE_FUNCTION:
+                push(FuncaoBytecode(constantes[arg], amb))
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if pilha[-1]:
+                    pop()
+                else:
+                    pc = arg
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if pilha[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == STORE_ARRAY_NAME:
+                nome = nomes[arg]
+                valor = pop()
+                atual = amb
+                while atual is not None:
+                    valores = atual.valores
+                    if nome in valores:
+                        if valor.__class__ in COMPOSTOS:
+                            valor = atribuir_composto(valores[nome], valor, nome)
+                        valores[nome] = valor
+                        break
+                    atual = atual.pai
+                else:
+                    if valor.__class__ in COMPOSTOS:
+                        # Como nos outros backends, que leem a variável antes de copiar o vetor
+                        raise ErroExecucao(f"Variável '{nome}' não definida.")
+                    raise ErroExecucao(f"Variável '{nome}' não definida para atribuição.")
+            elif op == NEW_ARRAY:
+                nome, tipo, quantidade, inicializado = constantes[arg]
+                inicial = pop() if inicializado else None
+                dimensoes = pilha[-quantidade:]
+                del pilha[-quantidade:]
+                push(criar_vetor(nome, tipo, dimensoes, inicial))
+            elif op == BUILD_LIST:
+                if arg:
+                    elementos = pilha[-arg:]
+                    del pilha[-arg:]
+                else:
+                    elementos = []
+                push(elementos)
+            elif op == HALT:
+                return passos
+            else:
+                raise ErroExecucao(f"Opcode inválido: {NOMES_OPCODES[op] if op < len(NOMES_OPCODES) else op}")
+
+
+class InterpretadorVM(Interpretador):
+    """Interpretador que compila a AST para bytecode e a executa na máquina virtual."""
+
+    def __init__(self, limite_pilha: int = LIMITE_PILHA_PADRAO, **opcoes):
+        super().__init__(**opcoes)
+        self.limite_pilha = limite_pilha
+
+    def interpretar(self, programa: Programa):
+        try:
+            codigo = CompiladorBytecode().compilar_programa(programa)
+            MaquinaVirtual(self, self.limite_pilha).executar(codigo, self.ambiente_global)
+        except ErroExecucao as e:
+            self.es.escrever(f"Erro de execução: {e}\n")
+        finally:
+            self.es.descarregar()
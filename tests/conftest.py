@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# As tabelas do parser e o cache de programas gerados pelos testes ficam em um
+# diretório temporário, e não no cache do usuário (~/.cache/portugol)
+DIRETORIO_CACHE = tempfile.mkdtemp(prefix="portugol-testes-")
+os.environ["PORTUGOL_CACHE_DIR"] = DIRETORIO_CACHE
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(DIRETORIO_CACHE, ignore_errors=True)
@@ -0,0 +1,171 @@
+import unittest
+import asyncio
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.assincrono import EntradaAssincrona, ErroLimiteExecucao, FilaEntrada, InterpretadorAssincrono
+from portugol.es import EntradaSaida
+from portugol.parser import analisar
+from portugol.vm import InterpretadorVM
+
+PERGUNTA = """
+programa {
+    cadeia nome;
+    inteiro idade;
+    escreva("Nome?");
+    leia(nome);
+    escreva("Idade?");
+    leia(idade);
+    escreva(nome, " terá ", idade + 1, " anos.");
+}
+"""
+
+CALCULO = """
+programa {
+    funcao inteiro fibonacci(inteiro n) {
+        se (n <= 1) { retorne n; }
+        retorne fibonacci(n - 1) + fibonacci(n - 2);
+    }
+    inteiro soma = 0;
+    para (inteiro i = 0; i < 10; i = i + 1) {
+        soma = soma + fibonacci(i);
+    }
+    escreva(soma);
+}
+"""
+
+INFINITO = "programa { inteiro i = 0; enquanto (1 == 1) { i = i + 1; } }"
+
+
+def sessao(codigo, entrada=None, **opcoes):
+    saida = io.StringIO()
+    interpretador = InterpretadorAssincrono(entrada or FilaEntrada(), es=EntradaSaida(saida=saida), **opcoes)
+    return interpretador.interpretar_assincrono(analisar(codigo)), saida
+
+
+def executar(corrotina):
+    return asyncio.run(corrotina)
+
+
+class TestAssincrono(unittest.TestCase):
+
+    def test_leia_espera_a_entrada(self):
+        async def cenario():
+            entrada = FilaEntrada()
+            corrotina, saida = sessao(PERGUNTA, entrada)
+            tarefa = asyncio.create_task(corrotina)
+            await asyncio.sleep(0)
+            # A pergunta aparece antes de a sessão esperar pela resposta
+            self.assertEqual(saida.getvalue(), "Nome?\n")
+            entrada.enviar("Ana")
+            await asyncio.sleep(0)
+            self.assertFalse(tarefa.done())
+            entrada.enviar("\n4")
+            await asyncio.sleep(0)
+            self.assertEqual(saida.getvalue(), "Nome?\nIdade?\n")
+            entrada.fechar()
+            resumo = await tarefa
+            return resumo, saida.getvalue()
+
+        resumo, saida = executar(cenario())
+        self.assertIsNone(resumo.erro)
+        self.assertEqual(saida, "Nome?\nIdade?\nAna terá 5 anos.\n")
+
+    def test_mesma_saida_que_a_maquina_virtual(self):
+        esperado = io.StringIO()
+        InterpretadorVM(es=EntradaSaida(saida=esperado)).interpretar(analisar(CALCULO))
+        for passos_por_pausa in (1, 7, 10_000):
+            with self.subTest(passos_por_pausa=passos_por_pausa):
+                corrotina, saida = sessao(CALCULO, passos_por_pausa=passos_por_pausa)
+                resumo = executar(corrotina)
+                self.assertEqual(saida.getvalue(), esperado.getvalue())
+                # 10 voltas do 'para' e 276 chamadas de fibonacci
+                self.assertEqual(resumo.passos, 10 + 276)
+
+    def test_sessoes_intercaladas(self):
+        async def cenario():
+            terminadas = []
+
+            async def rodar(nome, codigo, **opcoes):
+                corrotina, _ = sessao(codigo, **opcoes)
+                resumo = await corrotina
+                terminadas.append(nome)
+                return resumo
+
+            resumos = await asyncio.gather(
+                rodar("infinito", INFINITO, passos_por_pausa=100, limite_passos=20_000),
+                *(rodar(f"calculo{i}", CALCULO, passos_por_pausa=100) for i in range(50)))
+            return terminadas, resumos
+
+        terminadas, resumos = executar(cenario())
+        # O laço infinito cede o laço de eventos: as outras sessões terminam antes dele
+        self.assertEqual(terminadas[-1], "infinito")
+        self.assertEqual(len(terminadas), 51)
+        self.assertTrue(all(resumo.erro is None for resumo in resumos[1:]))
+
+    def test_limite_de_passos(self):
+        corrotina, saida = sessao(INFINITO, limite_passos=5_000, passos_por_pausa=300)
+        resumo = executar(corrotina)
+        self.assertIsInstance(resumo.erro, ErroLimiteExecucao)
+        self.assertEqual(resumo.passos, 5_001)
+        self.assertEqual(saida.getvalue(), "Erro de execução: Limite de passos excedido: mais de 5000 passos.\n")
+
+    def test_limite_de_tempo(self):
+        corrotina, saida = sessao(INFINITO, limite_tempo=0.05, passos_por_pausa=100)
+        resumo = executar(corrotina)
+        self.assertIsInstance(resumo.erro, ErroLimiteExecucao)
+        self.assertGreater(resumo.tempo, 0.05)
+        self.assertIn("Limite de tempo excedido", saida.getvalue())
+
+    def test_espera_pela_entrada_nao_conta_tempo(self):
+        async def cenario():
+            entrada = FilaEntrada()
+            corrotina, saida = sessao(PERGUNTA, entrada, limite_tempo=0.05)
+            tarefa = asyncio.create_task(corrotina)
+            await asyncio.sleep(0.1)
+            entrada.enviar("Bia\n20\n")
+            return await tarefa, saida.getvalue()
+
+        resumo, saida = executar(cenario())
+        self.assertIsNone(resumo.erro)
+        self.assertTrue(saida.endswith("Bia terá 21 anos.\n"))
+
+    def test_fim_da_entrada(self):
+        async def cenario():
+            entrada = FilaEntrada("Caio")
+            corrotina, saida = sessao(PERGUNTA, entrada)
+            tarefa = asyncio.create_task(corrotina)
+            await asyncio.sleep(0)
+            entrada.fechar()
+            return await tarefa, saida.getvalue()
+
+        resumo, saida = executar(cenario())
+        self.assertEqual(str(resumo.erro), "Erro de leitura: entrada inesperada.")
+        self.assertEqual(saida, "Nome?\nIdade?\nErro de execução: Erro de leitura: entrada inesperada.\n")
+
+    def test_fila_por_token(self):
+        async def cenario():
+            entrada = FilaEntrada("3 4", por_token=True)
+            entrada.enviar("5 6\n7")
+            entrada.fechar()
+            return [await entrada.ler() for _ in range(5)]
+
+        self.assertEqual(executar(cenario()), ["3", "45", "6", "7", None])
+
+    def test_entrada_sem_ler_nao_pode_ser_criada(self):
+        class SemLer(EntradaAssincrona):
+            pass
+
+        with self.assertRaises(TypeError):
+            SemLer()
+
+    def test_interpretar_sincrono_nao_e_suportado(self):
+        with self.assertRaises(TypeError):
+            InterpretadorAssincrono(FilaEntrada()).interpretar(analisar(INFINITO))
+
+
+if __name__ == '__main__':
+    unittest.main()
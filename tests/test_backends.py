@@ -0,0 +1,181 @@
+import unittest
+import glob
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import obter_parser
+from portugol.transformer import PortugolTransformer
+from portugol.execucao import BACKENDS, criar_interpretador
+from portugol.es import EntradaSaida
+
+ENTRADA_EXEMPLOS = "7\n3\n"
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exemplos')
+
+# Backends que resolvem os nomes antes de executar: erros de nome e de
+# aridade aparecem antes de qualquer saída
+BACKENDS_COM_RESOLUCAO = {"slots", "python"}
+
+PROGRAMAS = {
+    "coercao": """
+    programa {
+        cadeia s = "n=";
+        escreva(s + 1, s + 2.5, 1 + 2 * 3, 7 / 2, 7 % 3, -4, !(1 > 2));
+        escreva(1 < 2 e 2 < 1, 0 ou 3, 1 == 1.0, "a" < "b");
+    }
+    """,
+    "escopos": """
+    programa {
+        inteiro x = 1;
+        funcao inteiro le_x() {
+            retorne x;
+        }
+        {
+            inteiro x = 2;
+            escreva(x, le_x());
+        }
+        x = 3;
+        escreva(le_x());
+        para (inteiro i = 0; i < 2; i = i + 1) {
+            inteiro y;
+            escreva(y);
+            y = i;
+        }
+    }
+    """,
+    "erro_divisao": """
+    programa {
+        escreva("antes");
+        escreva(1 / 0);
+        escreva("depois");
+    }
+    """,
+    "global_posterior": """
+    programa {
+        funcao inteiro f() { escreva(x); x = x + 1; }
+        inteiro x = 1;
+        f();
+        f();
+    }
+    """,
+    "chamada_antes_da_declaracao": """
+    programa {
+        funcao inteiro f() { escreva(x); }
+        f();
+        inteiro x = 1;
+    }
+    """,
+    "declaracao_posterior_no_bloco": """
+    programa {
+        inteiro x = 1;
+        {
+            funcao inteiro f() { retorne x; }
+            escreva(f());
+            inteiro x = 2;
+            escreva(f());
+        }
+    }
+    """,
+    "atribuicao_e_chamada_antes_da_declaracao": """
+    programa {
+        inteiro x = 1;
+        funcao inteiro g() { retorne 100; }
+        {
+            funcao inteiro f() {
+                x = x + 1;
+                para (x = x; x < 5; x = x + 1) { }
+                funcao inteiro h() { retorne x * 10 + g(); }
+                retorne h();
+            }
+            escreva(f(), " ", x);
+            inteiro x = 2;
+            escreva(f(), " ", x);
+            funcao inteiro g() { retorne 200; }
+            escreva(f(), " ", x);
+        }
+        escreva(x);
+    }
+    """,
+    "funcoes_aninhadas": """
+    programa {
+        funcao inteiro externa(inteiro n) {
+            inteiro total = 0;
+            funcao inteiro soma(inteiro k) { total = total + k; }
+            para (inteiro i = 1; i <= n; i = i + 1) {
+                soma(i);
+            }
+            retorne total;
+        }
+        escreva(externa(4), " ", externa(10));
+    }
+    """,
+    "funcao_sem_retorno": """
+    programa {
+        funcao inteiro f() { escreva("f"); }
+        escreva(f());
+        f();
+    }
+    """,
+}
+
+
+ERRO_VARIAVEL = """
+programa {
+    escreva("antes");
+    escreva(desconhecida);
+}
+"""
+
+ERRO_ARGUMENTOS = """
+programa {
+    funcao inteiro f(inteiro a) { retorne a; }
+    escreva(f(1, 2));
+}
+"""
+
+
+class TestBackends(unittest.TestCase):
+    """Todos os backends devem produzir exatamente a mesma saída do interpretador de árvore."""
+
+    def setUp(self):
+        self.parser = obter_parser()
+
+    def _executar(self, codigo, backend, entrada=""):
+        ast = PortugolTransformer().transform(self.parser.parse(codigo))
+        stdout_capture = io.StringIO()
+        es = EntradaSaida(entrada=io.StringIO(entrada), saida=stdout_capture)
+        criar_interpretador(backend, es=es).interpretar(ast)
+        return stdout_capture.getvalue()
+
+    def _comparar(self, codigo, entrada="", erro_estatico=None):
+        esperado = self._executar(codigo, "arvore", entrada)
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                saida = self._executar(codigo, backend, entrada)
+                if erro_estatico and backend in BACKENDS_COM_RESOLUCAO:
+                    self.assertEqual(saida, f"Erro de execução: {erro_estatico}\n")
+                else:
+                    self.assertEqual(saida, esperado)
+
+    def test_exemplos(self):
+        caminhos = sorted(glob.glob(os.path.join(EXEMPLOS, "*.ptg")))
+        self.assertTrue(caminhos)
+        for caminho in caminhos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                codigo = f.read()
+            with self.subTest(exemplo=caminho):
+                self._comparar(codigo, ENTRADA_EXEMPLOS)
+
+    def test_programas(self):
+        for nome, codigo in PROGRAMAS.items():
+            with self.subTest(programa=nome):
+                self._comparar(codigo)
+
+    def test_erros_de_nome(self):
+        self._comparar(ERRO_VARIAVEL, erro_estatico="Variável 'desconhecida' não definida.")
+        self._comparar(ERRO_ARGUMENTOS, erro_estatico="Número incorreto de argumentos para 'f'.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import copy
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.cargas import gerar_cargas
+from benchmarks.regressao import ETAPAS, comparar, medir
+from portugol.es import EntradaSaida
+from portugol.execucao import criar_interpretador
+from portugol.parser import analisar
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_cargas_executam(self):
+        for carga in gerar_cargas(escala=0.01):
+            with self.subTest(carga=carga.nome):
+                saida = io.StringIO()
+                es = EntradaSaida(entrada=io.StringIO(carga.entrada), saida=saida)
+                criar_interpretador(es=es).interpretar(analisar(carga.codigo))
+                self.assertNotIn("Erro", saida.getvalue())
+
+    def test_medicoes_e_comparacao(self):
+        resultados = medir(gerar_cargas(["fibonacci", "fonte_grande"], escala=0.05), repeticoes=1)
+        self.assertEqual(set(resultados["cargas"]), {"fibonacci", "fonte_grande"})
+        for medicoes in resultados["cargas"].values():
+            self.assertEqual(set(medicoes["tempo"]), set(ETAPAS))
+            self.assertEqual(set(medicoes["memoria_pico"]), set(ETAPAS))
+        self.assertEqual(comparar(resultados, resultados), [])
+
+        piorado = copy.deepcopy(resultados)
+        piorado["cargas"]["fonte_grande"]["tempo"]["parse"] = resultados["cargas"]["fonte_grande"]["tempo"]["parse"] * 2 + 1
+        regressoes = comparar(piorado, resultados, limite=0.5)
+        self.assertEqual(len(regressoes), 1)
+        self.assertTrue(regressoes[0].startswith("fonte_grande/parse (tempo)"))
+
+if __name__ == '__main__':
+    unittest.main()
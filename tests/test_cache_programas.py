@@ -0,0 +1,127 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from portugol.cache_programas import EXTENSAO, CacheProgramas, interpretar_tamanho
+from portugol.es import EntradaSaida
+from portugol.execucao import criar_interpretador
+from portugol.otimizador import GerenciadorPassos
+from portugol.parser import analisar
+
+CODIGO = """
+programa {
+    funcao inteiro dobro(inteiro x) { retorne x * 2; }
+    inteiro soma = 0;
+    para (inteiro i = 0; i < 4; i = i + 1) {
+        soma = soma + dobro(i) + 2 * 3;
+    }
+    escreva("soma: ", soma);
+}
+"""
+
+
+def executar(programa):
+    saida = io.StringIO()
+    criar_interpretador(es=EntradaSaida(saida=saida)).interpretar(programa)
+    return saida.getvalue()
+
+
+class TestCacheProgramas(unittest.TestCase):
+
+    def setUp(self):
+        temporario = tempfile.TemporaryDirectory()
+        self.addCleanup(temporario.cleanup)
+        self.diretorio = temporario.name
+        self.cache = CacheProgramas(self.diretorio)
+
+    def test_guarda_e_carrega(self):
+        for posicoes in (False, True):
+            for otimizar in (False, True):
+                with self.subTest(posicoes=posicoes, otimizar=otimizar):
+                    programa = analisar(CODIGO, posicoes=posicoes)
+                    if otimizar:
+                        programa = GerenciadorPassos().otimizar(programa)
+                    chave = self.cache.chave(CODIGO, posicoes, otimizar)
+                    self.assertIsNone(self.cache.carregar(chave))
+                    self.assertTrue(self.cache.guardar(chave, programa))
+                    carregado = self.cache.carregar(chave)
+                    self.assertIsNot(carregado, programa)
+                    self.assertEqual(executar(carregado), "soma: 36\n")
+                    dobro = carregado.declaracoes.declaracoes[0]
+                    self.assertEqual(dobro.linha, 3 if posicoes else None)
+        self.assertEqual(len(os.listdir(self.diretorio)), 4)
+
+    def test_chave_depende_do_codigo_e_das_opcoes(self):
+        chaves = {self.cache.chave(CODIGO), self.cache.chave(CODIGO + " "),
+                  self.cache.chave(CODIGO, posicoes=False), self.cache.chave(CODIGO, otimizar=True)}
+        self.assertEqual(len(chaves), 4)
+        self.assertEqual(self.cache.chave(CODIGO), CacheProgramas("outro").chave(CODIGO))
+
+    def test_arquivo_invalido_e_descartado(self):
+        chave = self.cache.chave(CODIGO)
+        self.cache.guardar(chave, analisar(CODIGO))
+        with open(self.cache.caminho(chave), "r+b") as f:
+            f.truncate(20)
+        self.assertIsNone(self.cache.carregar(chave))
+        self.assertFalse(os.path.exists(self.cache.caminho(chave)))
+
+    def test_poda_remove_os_usados_ha_mais_tempo(self):
+        chaves = []
+        for i in range(4):
+            codigo = f'programa {{ escreva("{i}"); }}'
+            chaves.append(self.cache.chave(codigo))
+            self.cache.guardar(chaves[-1], analisar(codigo))
+            os.utime(self.cache.caminho(chaves[-1]), (1000 + i, 1000 + i))
+        # Um acerto torna o programa o mais recente
+        self.cache.carregar(chaves[0])
+        tamanho = os.path.getsize(self.cache.caminho(chaves[0]))
+
+        resultado = self.cache.podar(2 * tamanho)
+        self.assertEqual((resultado.removidos, resultado.restantes), (2, 2))
+        self.assertEqual(self.cache.tamanho(), resultado.bytes_restantes)
+        restantes = {nome[:-len(EXTENSAO)] for nome in os.listdir(self.diretorio)}
+        self.assertEqual(restantes, {chaves[0], chaves[3]})
+        self.assertEqual(self.cache.podar(0).removidos, 2)
+        self.assertEqual(os.listdir(self.diretorio), [])
+
+    def test_interpretar_tamanho(self):
+        self.assertEqual(interpretar_tamanho("1500"), 1500)
+        self.assertEqual(interpretar_tamanho("200K"), 200 * 1024)
+        self.assertEqual(interpretar_tamanho("1.5mb"), 3 * 512 * 1024)
+        self.assertEqual(interpretar_tamanho("2G"), 2 * 1024 ** 3)
+        for invalido in ("", "M", "-1", "dez"):
+            with self.subTest(tamanho=invalido):
+                with self.assertRaises(ValueError):
+                    interpretar_tamanho(invalido)
+
+    def test_main_nao_analisa_de_novo(self):
+        arquivo = os.path.join(self.diretorio, "programa.ptg")
+        with open(arquivo, "w", encoding="utf-8") as f:
+            f.write(CODIGO)
+
+        def rodar(*opcoes):
+            saida = io.StringIO()
+            argv = ["main.py", "--cache-dir", self.diretorio, *opcoes, arquivo]
+            with patch.object(sys, "argv", argv), contextlib.redirect_stdout(saida):
+                main.main()
+            return saida.getvalue()
+
+        self.assertEqual(rodar("--otimizar"), "soma: 36\n")
+        with patch.object(main, "analisar", side_effect=AssertionError("analisou de novo")):
+            self.assertEqual(rodar("--otimizar"), "soma: 36\n")
+        with patch.object(main, "analisar", wraps=analisar) as analise:
+            self.assertEqual(rodar("--no-cache", "--otimizar"), "soma: 36\n")
+            self.assertEqual(rodar(), "soma: 36\n")
+            self.assertEqual(analise.call_count, 2)
+        self.assertEqual(len(CacheProgramas(self.diretorio).arquivos()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
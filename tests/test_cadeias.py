@@ -0,0 +1,136 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.cadeias import LIMITE_CAUDA, LIMITE_CORDA, Corda, concatenar
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKENDS, criar_interpretador
+from portugol.operadores import multiplicar, somar, subtrair
+from portugol.parser import analisar
+from portugol.tipos import verificar_tipos
+from portugol.vetores import criar_vetor
+
+CODIGO = """
+programa {
+    cadeia texto = "";
+    inteiro i = 0;
+    enquanto (i < 3000) {
+        texto = texto + "ab" + i;
+        i = i + 1;
+    }
+    cadeia outro = texto;
+    outro = outro + "!";
+    escreva(texto == outro, " ", texto < outro, " ", outro > texto, " ", outro == texto + "!");
+    escreva(("x" + texto) == "x" + texto, " ", texto != "");
+    cadeia v[2];
+    v[0] = outro;
+    escreva(v[0] == outro);
+    funcao cadeia eco(cadeia s) { retorne s; }
+    escreva(eco(outro) == outro, " ", eco(texto) != outro);
+    cadeia fim = texto;
+    i = 0;
+    enquanto (i < 10) { fim = fim + i; i = i + 1; }
+    escreva(fim == texto + "0123456789");
+    escreva(fim);
+}
+"""
+
+
+def executar(codigo, backend="arvore", tipos=False):
+    saida = io.StringIO()
+    programa = analisar(codigo)
+    if tipos:
+        assert verificar_tipos(programa) == []
+    criar_interpretador(backend, es=EntradaSaida(saida=saida)).interpretar(programa)
+    return saida.getvalue()
+
+
+def texto_longo(tamanho=LIMITE_CORDA):
+    return "abcdefghij" * (tamanho // 10 + 1)
+
+
+def profundidade(corda):
+    nos = 0
+    while corda.__class__ is Corda:
+        nos += 1
+        corda = corda.anterior
+    return nos
+
+
+class TestCadeias(unittest.TestCase):
+
+    def test_cadeias_curtas_continuam_str(self):
+        self.assertEqual(concatenar("ab", "cd"), "abcd")
+        self.assertIs(concatenar("ab", 1).__class__, str)
+        self.assertIs(somar("a", 2.5).__class__, str)
+
+    def test_acrescentar_e_amortizado(self):
+        texto = ""
+        esperado = []
+        for i in range(20_000):
+            texto = somar(texto, "parte %d;" % i)
+            esperado.append("parte %d;" % i)
+        self.assertIsInstance(texto, Corda)
+        # Um nó a cada LIMITE_CAUDA caracteres, não um por concatenação
+        self.assertLessEqual(profundidade(texto), 2 * len(texto) // LIMITE_CAUDA + 1)
+        self.assertEqual(str(texto), "".join(esperado))
+        self.assertEqual(len(texto), len("".join(esperado)))
+        # Depois de montada, a corda não guarda mais os nós anteriores
+        self.assertEqual(profundidade(texto), 1)
+
+    def test_cordas_sao_imutaveis(self):
+        base = concatenar(texto_longo(), "!")
+        um, dois = base + "1", base + "2"
+        self.assertEqual((str(base)[-1], str(um)[-2:], str(dois)[-2:]), ("!", "!1", "!2"))
+        self.assertEqual(str(um + "x"), str(base) + "1x")
+
+    def test_igual_a_str(self):
+        texto = texto_longo()
+        corda = concatenar(texto, "z")
+        self.assertIsInstance(corda, Corda)
+        self.assertEqual(corda, texto + "z")
+        self.assertEqual(texto + "z", corda)
+        self.assertEqual(hash(corda), hash(texto + "z"))
+        self.assertEqual({corda: 1}[texto + "z"], 1)
+        self.assertTrue(corda > texto and texto < corda and corda != 5)
+        self.assertEqual(f"{corda}", texto + "z")
+        self.assertEqual(repr(corda), repr(texto + "z"))
+        self.assertEqual(somar("<", corda), "<" + texto + "z")
+        self.assertTrue(corda)
+
+    def test_erros_iguais_aos_da_str(self):
+        texto = texto_longo()
+        corda = concatenar(texto, "z")
+        for operacao, direita in ((subtrair, 1), (multiplicar, 2), (somar, [1])):
+            with self.subTest(operacao=operacao.__name__):
+                with self.assertRaises(TypeError) as esperado:
+                    operacao(texto + "z", direita)
+                with self.assertRaises(TypeError) as obtido:
+                    operacao(corda, direita)
+                self.assertEqual(str(obtido.exception), str(esperado.exception))
+
+    def test_vetor_de_cadeia_guarda_str(self):
+        vetor = criar_vetor("v", "cadeia", [2])
+        vetor.atribuir1(0, concatenar(texto_longo(), "z"))
+        self.assertIs(vetor.obter1(0).__class__, str)
+
+    def test_verificacao_de_tipos_escolhe_a_concatenacao(self):
+        programa = analisar('programa { cadeia a = "x"; a = a + "y"; escreva(a + 1); }')
+        self.assertEqual(verificar_tipos(programa), [])
+        atribuicao = programa.declaracoes.declaracoes[1]
+        self.assertIs(atribuicao.expressao.operacao, concatenar)
+
+    def test_backends_iguais_ao_interpretador_de_arvore(self):
+        esperado = executar(CODIGO)
+        self.assertTrue(esperado.startswith("False True True True\nTrue True\nTrue\nTrue True\nTrue\nab0ab1ab2"))
+        for backend in BACKENDS:
+            for tipos in (False, True):
+                with self.subTest(backend=backend, tipos=tipos):
+                    self.assertEqual(executar(CODIGO, backend, tipos), esperado)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import analisar
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKENDS, criar_interpretador
+
+
+class EntradaObservada(io.StringIO):
+    """Entrada que registra o que já tinha sido gravado na saída a cada leitura."""
+
+    def __init__(self, texto, saida):
+        super().__init__(texto)
+        self.saida = saida
+        self.saida_nas_leituras = []
+
+    def read(self, tamanho=-1):
+        self.saida_nas_leituras.append(self.saida.getvalue())
+        return super().read(tamanho)
+
+
+class TestEntradaSaida(unittest.TestCase):
+
+    def _itens(self, es):
+        itens = []
+        while (item := es.ler()) is not None:
+            itens.append(item)
+        return itens
+
+    def test_linhas_em_blocos_pequenos(self):
+        texto = "primeira linha\r\nsegunda\n\nterceira sem fim de linha"
+        for tamanho_bloco in (1, 3, 7, 1 << 16):
+            with self.subTest(tamanho_bloco=tamanho_bloco):
+                es = EntradaSaida(entrada=io.StringIO(texto), tamanho_bloco=tamanho_bloco)
+                self.assertEqual(self._itens(es), ["primeira linha", "segunda", "", "terceira sem fim de linha"])
+                self.assertIsNone(es.ler())
+
+    def test_leitura_por_token(self):
+        texto = "  12 345\t6\n\n  palavra   final"
+        for tamanho_bloco in (1, 2, 5, 1 << 16):
+            with self.subTest(tamanho_bloco=tamanho_bloco):
+                es = EntradaSaida(entrada=io.StringIO(texto), por_token=True, tamanho_bloco=tamanho_bloco)
+                self.assertEqual(self._itens(es), ["12", "345", "6", "palavra", "final"])
+
+    def test_fluxo_binario_com_caracteres_multibyte(self):
+        entrada = io.TextIOWrapper(io.BytesIO("ação\nçé\n".encode("utf-8")), encoding="utf-8")
+        es = EntradaSaida(entrada=entrada, tamanho_bloco=1)
+        self.assertEqual(self._itens(es), ["ação", "çé"])
+
+    def test_buffer_de_saida(self):
+        saida = io.StringIO()
+        es = EntradaSaida(saida=saida, limite_buffer=10)
+        es.escrever("abc\n")
+        self.assertEqual(saida.getvalue(), "")
+        es.escrever("defghij\n")
+        self.assertEqual(saida.getvalue(), "abc\ndefghij\n")
+        es.escrever("k\n")
+        es.descarregar()
+        self.assertEqual(saida.getvalue(), "abc\ndefghij\nk\n")
+
+    def test_saida_descarregada_antes_de_ler(self):
+        codigo = """
+        programa {
+            inteiro a;
+            inteiro b;
+            escreva("Primeiro:");
+            leia(a);
+            escreva("Segundo:");
+            leia(b);
+            escreva(a + b);
+        }
+        """
+        saida = io.StringIO()
+        entrada = EntradaObservada("1\n2\n", saida)
+        criar_interpretador(es=EntradaSaida(entrada=entrada, saida=saida)).interpretar(analisar(codigo))
+        self.assertEqual(saida.getvalue(), "Primeiro:\nSegundo:\n3\n")
+        # As duas linhas vieram no mesmo bloco: só a primeira leitura precisou esperar a entrada
+        self.assertEqual(entrada.saida_nas_leituras[0], "Primeiro:\n")
+
+    def test_leia_por_token_em_todos_os_backends(self):
+        codigo = """
+        programa {
+            inteiro a;
+            real b;
+            cadeia c;
+            leia(a);
+            leia(b);
+            leia(c);
+            escreva(a * 2, " ", b, " ", c);
+        }
+        """
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                saida = io.StringIO()
+                es = EntradaSaida(entrada=io.StringIO("21 2.5\nfim"), saida=saida, por_token=True)
+                criar_interpretador(backend, es=es).interpretar(analisar(codigo))
+                self.assertEqual(saida.getvalue(), "42 2.5 fim\n")
+
+    def test_erro_de_execucao_sai_depois_da_saida_do_programa(self):
+        codigo = 'programa { escreva("antes"); escreva(1 / 0); }'
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                saida = io.StringIO()
+                criar_interpretador(backend, es=EntradaSaida(saida=saida)).interpretar(analisar(codigo))
+                self.assertEqual(saida.getvalue(), "antes\nErro de execução: Divisão por zero.\n")
+
+if __name__ == '__main__':
+    unittest.main()
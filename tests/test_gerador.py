@@ -0,0 +1,97 @@
+import unittest
+import io
+import sys
+import os
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.escalabilidade import expoente, formatar, grafico_svg, medir
+from benchmarks.gerador import FORMATOS, gerar
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKENDS, criar_interpretador
+from portugol.parser import analisar, obter_parser
+from portugol.tipos import verificar_tipos
+
+
+def executar(carga, backend="arvore"):
+    saida = io.StringIO()
+    es = EntradaSaida(entrada=io.StringIO(carga.entrada), saida=saida)
+    criar_interpretador(backend, es=es).interpretar(analisar(carga.codigo))
+    return saida.getvalue()
+
+
+class TestGerador(unittest.TestCase):
+
+    def test_mesma_semente_mesmo_programa(self):
+        for formato in FORMATOS:
+            with self.subTest(formato=formato):
+                self.assertEqual(gerar(formato, 20, semente=3), gerar(formato, 20, semente=3))
+                self.assertNotEqual(gerar(formato, 20, semente=3).codigo, gerar(formato, 20, semente=4).codigo)
+
+    def test_tamanho_cresce(self):
+        for formato in FORMATOS:
+            if formato == "lacos_longos":
+                continue
+            with self.subTest(formato=formato):
+                self.assertLess(len(gerar(formato, 10).codigo), len(gerar(formato, 40).codigo))
+
+    def test_programas_validos_em_todos_os_backends(self):
+        for formato in FORMATOS:
+            for semente in range(3):
+                with self.subTest(formato=formato, semente=semente):
+                    carga = gerar(formato, 100 if formato == "lacos_longos" else 15, semente)
+                    self.assertEqual(verificar_tipos(analisar(carga.codigo)), [])
+                    esperado = executar(carga)
+                    self.assertNotIn("Erro", esperado)
+                    for backend in BACKENDS:
+                        self.assertEqual(executar(carga, backend), esperado, backend)
+
+    def test_laco_longo_executa_as_voltas_pedidas(self):
+        carga = gerar("lacos_longos", 400)
+        self.assertIn("< 20)", carga.codigo)
+        self.assertEqual(carga.codigo.count("para ("), 1)
+        self.assertEqual(carga.codigo.count("enquanto ("), 1)
+
+    def test_misto_cobre_todas_as_regras_da_gramatica(self):
+        parser = obter_parser(posicoes=False)
+        # Regras que começam com '_' são criadas pelo Lark para as repetições e somem da árvore
+        regras = {str(regra.alias or regra.origin.name) for regra in parser.rules}
+        regras = {regra for regra in regras if not regra.startswith("_")}
+        arvore = parser.parse(gerar("misto", 100).codigo)
+        self.assertEqual(regras - {str(subarvore.data) for subarvore in arvore.iter_subtrees()}, set())
+
+
+class TestEscalabilidade(unittest.TestCase):
+
+    def test_expoente(self):
+        pontos = [{"tamanho": n, "tempo": {"parse": 3 * n, "execucao": n ** 2 / 10}} for n in (10, 20, 40, 80)]
+        self.assertAlmostEqual(expoente(pontos, "tempo", "parse"), 1.0)
+        self.assertAlmostEqual(expoente(pontos, "tempo", "execucao"), 2.0)
+        # Medições abaixo do mínimo ficam fora do ajuste
+        self.assertIsNone(expoente(pontos, "tempo", "execucao", minimo=500))
+        pontos[-1] = {"tamanho": 80, "erro": {"etapa": "parse", "tipo": "RecursionError"}}
+        self.assertAlmostEqual(expoente(pontos, "tempo", "parse"), 1.0)
+
+    def test_medir_e_mostrar(self):
+        resultados = medir(["linear", "expressoes_profundas"], pontos=2, escala=0.1, repeticoes=1)
+        self.assertEqual([ponto["tamanho"] for ponto in resultados["formatos"]["linear"]], [25, 50])
+        for ponto in resultados["formatos"]["linear"]:
+            self.assertEqual(set(ponto["tempo"]), {"parse", "transformacao", "execucao"})
+        self.assertIsNotNone(resultados["expoentes"]["linear"]["tempo"]["parse"])
+        self.assertIn("linear", formatar(resultados))
+        raiz = ET.fromstring(grafico_svg(resultados))
+        self.assertEqual(raiz.tag, "{http://www.w3.org/2000/svg}svg")
+        self.assertTrue(raiz.findall("{http://www.w3.org/2000/svg}polyline"))
+
+    def test_erro_interrompe_o_formato(self):
+        resultados = medir(["expressoes_profundas"], pontos=3, escala=64, repeticoes=1)
+        pontos = resultados["formatos"]["expressoes_profundas"]
+        self.assertEqual(len(pontos), 1)
+        self.assertEqual(pontos[0]["erro"]["tipo"], "RecursionError")
+        self.assertIn("RecursionError em", formatar(resultados))
+        self.assertIn("RecursionError em", grafico_svg(resultados))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lark.exceptions import LarkError
+
+from portugol.analise import campos
+from portugol.ast import ASTNode, ComandoEscreva, DeclaracaoFuncao, Parametro, Tipo
+from portugol.incremental import Documento, Edicao
+from portugol.parser import analisar
+
+CODIGO = """programa {
+  inteiro x = 1; // comentário
+  f(2);
+  funcao inteiro g(inteiro a) { retorne a + 1; }
+  se (x > 1) escreva(1); senao { x = 2; }
+  para (inteiro i = 0; i < 3; i = i + 1) { escreva(i); }
+  cadeia s = "a // b";
+}
+"""
+
+
+def forma(no):
+    """Estrutura comparável de um nó, com as posições."""
+    if isinstance(no, Tipo):
+        return ("Tipo", no.nome)
+    if isinstance(no, (ASTNode, Parametro)):
+        return (type(no).__name__,) + tuple((nome, forma(valor)) for nome, valor in campos(no))
+    if isinstance(no, list):
+        return [forma(item) for item in no]
+    return no
+
+
+class TestIncremental(unittest.TestCase):
+
+    def editar(self, documento, antigo, novo):
+        inicio = documento.codigo.index(antigo)
+        return documento.editar(Edicao(inicio, inicio + len(antigo), novo))
+
+    def assertIgualAnaliseCompleta(self, documento):
+        esperado = analisar(documento.codigo, posicoes=documento.posicoes)
+        self.assertEqual(forma(documento.programa), forma(esperado))
+
+    def test_reanalisa_so_o_item_editado(self):
+        documento = Documento(CODIGO)
+        itens = list(documento.programa.declaracoes.declaracoes)
+        resultado = self.editar(documento, "retorne a + 1", "retorne a * 2")
+
+        self.assertFalse(resultado.completa)
+        self.assertEqual(len(resultado.alterados), 1)
+        self.assertIsInstance(resultado.alterados[0], DeclaracaoFuncao)
+        self.assertEqual(resultado.removidos, [itens[2]])
+        # Os outros itens são os mesmos objetos
+        novos = documento.programa.declaracoes.declaracoes
+        self.assertEqual([novo is antigo for novo, antigo in zip(novos, itens)],
+                         [True, True, False, True, True, True])
+        self.assertIgualAnaliseCompleta(documento)
+
+    def test_insere_e_remove_itens(self):
+        documento = Documento(CODIGO)
+        resultado = self.editar(documento, "f(2);", "f(2); escreva(3); escreva(4);")
+        self.assertEqual([type(no) for no in resultado.alterados][-2:], [ComandoEscreva, ComandoEscreva])
+        self.assertEqual(len(documento.programa.declaracoes.declaracoes), 8)
+        self.assertIgualAnaliseCompleta(documento)
+
+        self.editar(documento, "escreva(3); escreva(4);", "")
+        self.assertEqual(len(documento.programa.declaracoes.declaracoes), 6)
+        self.assertIgualAnaliseCompleta(documento)
+
+    def test_item_que_so_vale_com_o_vizinho(self):
+        documento = Documento(CODIGO)
+        # 'se (x > 0)' sozinho não é válido: a região cresce e o 'f(2);' vira o corpo do 'se'
+        resultado = self.editar(documento, "inteiro x = 1;", "se (x > 0)")
+        self.assertFalse(resultado.completa)
+        self.assertEqual(len(documento.programa.declaracoes.declaracoes), 5)
+        self.assertIgualAnaliseCompleta(documento)
+
+    def test_erro_de_sintaxe(self):
+        documento = Documento(CODIGO)
+        with self.assertRaises(LarkError):
+            self.editar(documento, "f(2);", "f(2")
+        self.assertIsNone(documento.programa)
+        # O texto editado é mantido; a próxima edição válida analisa tudo
+        resultado = self.editar(documento, "f(2", "f(2);")
+        self.assertTrue(resultado.completa)
+        self.assertIgualAnaliseCompleta(documento)
+
+    def test_comentario_que_engole_o_item_seguinte(self):
+        documento = Documento(CODIGO.replace("f(2);\n  funcao", "f(2); funcao"))
+        self.editar(documento, "f(2); ", "f(2); // ")
+        self.assertIgualAnaliseCompleta(documento)
+        self.assertEqual(len(documento.programa.declaracoes.declaracoes), 5)
+
+    def test_edicao_fora_do_bloco_principal(self):
+        documento = Documento(CODIGO)
+        resultado = self.editar(documento, "programa {", "programa  {")
+        self.assertTrue(resultado.completa)
+        self.assertIgualAnaliseCompleta(documento)
+        with self.assertRaises(ValueError):
+            documento.editar(Edicao(0, len(documento.codigo) + 1, ""))
+
+    def test_posicoes(self):
+        documento = Documento(CODIGO, posicoes=True)
+        self.editar(documento, "f(2);", "\n  f(2); f(3);")
+        self.assertIgualAnaliseCompleta(documento)
+        self.editar(documento, "x = 1;", "xis = 10;")
+        self.assertIgualAnaliseCompleta(documento)
+        self.editar(documento, "escreva(i);", "escreva(i,\n i);")
+        self.assertIgualAnaliseCompleta(documento)
+
+    def test_edicoes_aleatorias_iguais_a_analise_completa(self):
+        pedacos = ["x", "1", ";", "{", "}", " ", "\n", "// ", "escreva(3);", "inteiro y = 2;", "+ 2", "\"",
+                   "senao", "funcao inteiro h() { retorne 0; }", "(", ")", ""]
+        aleatorio = random.Random(15)
+        for posicoes in (False, True):
+            documento = Documento(CODIGO, posicoes)
+            for _ in range(300):
+                codigo = documento.codigo
+                inicio = aleatorio.randint(0, len(codigo))
+                fim = min(len(codigo), inicio + aleatorio.choice([0, 0, 1, 2, 5]))
+                texto = aleatorio.choice(pedacos)
+                try:
+                    esperado = analisar(codigo[:inicio] + texto + codigo[fim:], posicoes=posicoes)
+                except LarkError:
+                    esperado = None
+                with self.subTest(posicoes=posicoes, codigo=codigo, edicao=(inicio, fim, texto)):
+                    if esperado is None:
+                        with self.assertRaises(LarkError):
+                            documento.editar(Edicao(inicio, fim, texto))
+                        # Desfaz a edição inválida
+                        documento.editar(Edicao(inicio, inicio + len(texto), codigo[inicio:fim]))
+                    else:
+                        programa = documento.editar(Edicao(inicio, fim, texto)).programa
+                        self.assertEqual(forma(programa), forma(esperado))
+
+
+if __name__ == '__main__':
+    unittest.main()
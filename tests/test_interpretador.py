@@ -1,35 +1,32 @@
 import unittest
-from unittest.mock import patch
 import io
 import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from lark import Lark
+from portugol.parser import obter_parser
 from portugol.transformer import PortugolTransformer
-from portugol.interpretador import Interpretador
+from portugol.execucao import criar_interpretador
+from portugol.es import EntradaSaida
 
 class TestInterpretador(unittest.TestCase):
+    backend = "arvore"
 
     def setUp(self):
         """Configura o parser e o interpretador para cada teste."""
-        with open("portugol/grammar.lark", "r", encoding="utf-8") as f:
-            grammar = f.read()
-        self.parser = Lark(grammar, start="programa", parser="lalr")
+        self.parser = obter_parser()
         self.transformer = PortugolTransformer()
 
     def _executar_codigo(self, codigo, entrada_mock=""):
         """Função auxiliar para executar um trecho de código e capturar a saída."""
         tree = self.parser.parse(codigo)
         ast = self.transformer.transform(tree)
-        interpretador = Interpretador()
-
         stdout_capture = io.StringIO()
-        with patch('sys.stdout', stdout_capture):
-            with patch('builtins.input', side_effect=entrada_mock.splitlines()):
-                interpretador.interpretar(ast)
-        
+        es = EntradaSaida(entrada=io.StringIO(entrada_mock), saida=stdout_capture)
+        interpretador = criar_interpretador(self.backend, es=es)
+        interpretador.interpretar(ast)
+
         return stdout_capture.getvalue()
 
     def test_declaracao_e_atribuicao(self):
@@ -143,5 +140,17 @@ class TestInterpretador(unittest.TestCase):
         saida = self._executar_codigo(codigo)
         self.assertEqual(saida, "120\n")
 
+
+class TestInterpretadorClosures(TestInterpretador):
+    backend = "closures"
+
+
+class TestInterpretadorVM(TestInterpretador):
+    backend = "vm"
+
+
+class TestInterpretadorSlots(TestInterpretador):
+    backend = "slots"
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import unittest
+import glob
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.gerador import FORMATOS, gerar
+from portugol.es import EntradaSaida
+from portugol.interpretador import Interpretador
+from portugol.jit import InterpretadorJIT
+from portugol.parser import analisar
+
+ENTRADA_EXEMPLOS = "7\n3\n"
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exemplos')
+
+
+def executar(codigo, classe=InterpretadorJIT, entrada="", **opcoes):
+    saida = io.StringIO()
+    interpretador = classe(es=EntradaSaida(entrada=io.StringIO(entrada), saida=saida), **opcoes)
+    interpretador.interpretar(analisar(codigo))
+    return saida.getvalue(), interpretador
+
+
+def eventos(interpretador):
+    return [(evento.tipo, evento.alvo, evento.detalhe) for evento in interpretador.eventos]
+
+
+class TestJIT(unittest.TestCase):
+
+    def test_mesma_saida_que_o_interpretador_de_arvore(self):
+        """Com limites baixos, quase tudo é compilado, e a saída não muda."""
+        programas = []
+        caminhos = sorted(glob.glob(os.path.join(EXEMPLOS, "*.ptg")))
+        self.assertTrue(caminhos)
+        for caminho in caminhos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                programas.append((caminho, f.read(), ENTRADA_EXEMPLOS))
+        for formato in FORMATOS:
+            for semente in range(3):
+                carga = gerar(formato, 100 if formato == "lacos_longos" else 15, semente)
+                programas.append((f"{formato}/{semente}", carga.codigo, carga.entrada))
+        for nome, codigo, entrada in programas:
+            esperado, _ = executar(codigo, Interpretador, entrada)
+            for limite in (1, 3):
+                with self.subTest(programa=nome, limite=limite):
+                    saida, _ = executar(codigo, entrada=entrada, limite_chamadas=limite, limite_voltas=limite)
+                    self.assertEqual(saida, esperado)
+
+    def test_funcao_compilada_ao_chegar_ao_limite(self):
+        codigo = """
+        programa {
+            funcao inteiro dobro(inteiro x) { retorne x * 2; }
+            para (inteiro i = 0; i < %d; i = i + 1) { escreva(dobro(i)); }
+        }
+        """
+        saida, interpretador = executar(codigo % 4, limite_chamadas=5, limite_voltas=100)
+        self.assertEqual(saida, "0\n2\n4\n6\n")
+        self.assertEqual(interpretador.eventos, [])
+        saida, interpretador = executar(codigo % 8, limite_chamadas=5, limite_voltas=100)
+        self.assertEqual(saida, "".join(f"{2 * i}\n" for i in range(8)))
+        self.assertEqual(eventos(interpretador), [("compilacao", "função dobro", "tipos x=inteiro")])
+        fonte = interpretador.eventos[0].fonte
+        self.assertIn("return _DESOTIMIZAR", fonte)
+        # Com o tipo conhecido, a multiplicação não passa pela coerção de cadeia
+        self.assertIn("(x_1 * 2)", fonte)
+
+    def test_desotimizacao_quando_o_tipo_muda(self):
+        codigo = """
+        programa {
+            funcao real metade(real x) { retorne x / 2; }
+            para (inteiro i = 0; i < 3; i = i + 1) { escreva(metade(i)); }
+            para (inteiro i = 0; i < 3; i = i + 1) { escreva(metade(i + 0.5)); }
+            escreva(metade(8));
+        }
+        """
+        esperado, _ = executar(codigo, Interpretador)
+        saida, interpretador = executar(codigo, limite_chamadas=2, limite_voltas=100)
+        self.assertEqual(saida, esperado)
+        self.assertEqual(eventos(interpretador), [
+            ("compilacao", "função metade", "tipos x=inteiro"),
+            ("desotimizacao", "função metade", "x era inteiro, agora real"),
+            # Compilada de novo sem especializar o que mudou de tipo
+            ("compilacao", "função metade", "sem especialização de tipos"),
+        ])
+
+    def test_laco_compilado_no_meio_da_execucao(self):
+        codigo = """
+        programa {
+            inteiro n = 0;
+            inteiro soma = 0;
+            enquanto (n < 50) {
+                inteiro quadrado = n * n;
+                soma = soma + quadrado;
+                n = n + 1;
+            }
+            escreva(n, " ", soma);
+            para (n = 0; n < 10; n = n + 3) { soma = soma - n; }
+            escreva(n, " ", soma);
+        }
+        """
+        saida, interpretador = executar(codigo, limite_voltas=2)
+        self.assertEqual(saida, "50 40425\n12 40407\n")
+        self.assertEqual(eventos(interpretador), [
+            ("compilacao", "laço enquanto na linha 5", "tipos n=inteiro, soma=inteiro"),
+            ("compilacao", "laço para na linha 11", "tipos n=inteiro, soma=inteiro"),
+        ])
+
+    def test_retorne_e_erros_no_codigo_compilado(self):
+        codigo = """
+        programa {
+            inteiro v[5] = {4, 8, 15, 16, 23};
+            inteiro passos = 0;
+            funcao inteiro posicao(inteiro alvo) {
+                para (inteiro i = 0; i < 5; i = i + 1) {
+                    passos = passos + 1;
+                    se (v[i] == alvo) { retorne i; }
+                }
+                retorne -1;
+            }
+            escreva(posicao(15), posicao(42), posicao(4), " ", passos);
+            inteiro d = 3;
+            enquanto (d > -3) { escreva(12 / d); d = d - 1; }
+        }
+        """
+        esperado, _ = executar(codigo, Interpretador)
+        self.assertIn("Erro de execução: Divisão por zero.", esperado)
+        for limite in (1, 2):
+            with self.subTest(limite=limite):
+                saida, _ = executar(codigo, limite_chamadas=limite, limite_voltas=limite)
+                self.assertEqual(saida, esperado)
+
+    def test_recusas(self):
+        codigo = """
+        programa {
+            funcao inteiro externa(inteiro x) {
+                funcao inteiro interna() { retorne x; }
+                retorne interna() + 1;
+            }
+            escreva(externa(1), externa(2));
+        }
+        """
+        saida, interpretador = executar(codigo, limite_chamadas=1)
+        self.assertEqual(saida, "23\n")
+        self.assertIn(("recusa", "função externa", "declara funções"), eventos(interpretador))
+        # Sem a resolução dos nomes, tudo fica no interpretador de árvore
+        saida, interpretador = executar("programa { escreva(1); escreva(x); }", limite_chamadas=1)
+        self.assertEqual(saida, "1\nErro de execução: Variável 'x' não definida.\n")
+        self.assertEqual([evento.tipo for evento in interpretador.eventos], ["recusa"])
+        self.assertIn("recusa de programa", interpretador.relatorio())
+
+    def test_codigo_que_o_python_nao_compila(self):
+        """Mais de 20 blocos aninhados não compilam em Python: o laço fica no interpretador de árvore."""
+        corpo = "c = c + 1;"
+        for i in range(21):
+            corpo = f"para (inteiro i{i} = 0; i{i} < 1; i{i} = i{i} + 1) {{ {corpo} }}"
+        codigo = "programa { inteiro c = 0; inteiro k = 0; enquanto (k < 30) { %s k = k + 1; } escreva(c); }" % corpo
+        saida, interpretador = executar(codigo, limite_chamadas=10, limite_voltas=10)
+        self.assertEqual(saida, "30\n")
+        self.assertIn(("recusa", "laço enquanto na linha 1", "o Python não compila o código gerado "
+                       "(too many statically nested blocks)"), eventos(interpretador))
+        for semente in (2, 3, 4, 8):
+            carga = gerar("blocos_aninhados", 40, semente)
+            with self.subTest(semente=semente):
+                esperado, _ = executar(carga.codigo, Interpretador, carga.entrada)
+                saida, _ = executar(carga.codigo, entrada=carga.entrada, limite_chamadas=1, limite_voltas=1)
+                self.assertEqual(saida, esperado)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.ast import ComandoPara
+from portugol.analise import percorrer
+from portugol.es import EntradaSaida
+from portugol.interpretador import Interpretador
+from portugol.parser import analisar
+
+
+class InterpretadorGenerico(Interpretador):
+    lacos_contados = False
+
+
+# nome -> (código, se o primeiro 'para' do programa usa o contador nativo)
+PROGRAMAS = {
+    "tabuada": ("""
+    programa {
+        inteiro soma = 0;
+        para (inteiro numero = 1; numero <= 5; numero = numero + 1) {
+            para (inteiro contador = 1; contador <= 10; contador = contador + 1) {
+                soma = soma + numero * contador;
+            }
+        }
+        escreva(soma);
+    }
+    """, True),
+    "variavel_externa_e_valor_final": ("""
+    programa {
+        inteiro i;
+        para (i = 10; i > 0; i = i - 3) {
+            escreva(i);
+        }
+        escreva("fim ", i);
+    }
+    """, True),
+    "limite_real_e_leitura_no_corpo": ("""
+    programa {
+        real limite = 3.5;
+        funcao inteiro quadrado(inteiro x) { retorne x * x; }
+        para (inteiro i = 0; i <= limite; i = i + 2) {
+            escreva(quadrado(i));
+        }
+    }
+    """, True),
+    "inicio_real": ("""
+    programa {
+        real x;
+        para (x = 0.5; x < 3; x = x + 1) { escreva(x); }
+        escreva(x);
+    }
+    """, True),
+    "laco_vazio": ("""
+    programa {
+        inteiro j = 7;
+        para (j = 5; j < 5; j = j + 1) { escreva(j); }
+        escreva(j);
+    }
+    """, True),
+    "corpo_altera_o_limite": ("""
+    programa {
+        inteiro n = 3;
+        para (inteiro i = 0; i < n; i = i + 1) {
+            se (i == 0) { n = 5; }
+            escreva(i);
+        }
+    }
+    """, False),
+    "funcao_altera_o_limite": ("""
+    programa {
+        inteiro n = 4;
+        funcao inteiro encolhe() { n = n - 1; retorne n; }
+        para (inteiro i = 0; i < n; i = i + 1) {
+            escreva(i, " ", encolhe());
+        }
+    }
+    """, False),
+    "corpo_le_a_variavel": ("""
+    programa {
+        para (inteiro i = 0; i < 10; i = i + 1) {
+            escreva(i);
+            leia(i);
+        }
+    }
+    """, False),
+    "retorno_dentro_do_laco": ("""
+    programa {
+        funcao inteiro primeiro_multiplo(inteiro k) {
+            para (inteiro i = 1; i < 100; i = i + 1) {
+                se (i % k == 0) { retorne i; }
+            }
+            retorne 0;
+        }
+        escreva(primeiro_multiplo(7));
+        para (inteiro i = 0; i < 2; i = i + 1) { escreva(primeiro_multiplo(i + 3)); }
+    }
+    """, True),
+    "erro_no_limite": ("""
+    programa {
+        para (inteiro i = 0; i < n; i = i + 1) { escreva(i); }
+    }
+    """, True),
+}
+
+
+def executar(classe, programa, entrada=""):
+    saida = io.StringIO()
+    interpretador = classe(es=EntradaSaida(entrada=io.StringIO(entrada), saida=saida))
+    interpretador.interpretar(programa)
+    return interpretador, saida.getvalue()
+
+
+class TestLacosContados(unittest.TestCase):
+
+    def test_mesma_saida_que_o_caminho_generico(self):
+        for nome, (codigo, contado) in PROGRAMAS.items():
+            with self.subTest(programa=nome):
+                programa = analisar(codigo)
+                interpretador, saida = executar(Interpretador, programa, "20\n")
+                _, esperado = executar(InterpretadorGenerico, programa, "20\n")
+                self.assertEqual(saida, esperado)
+                primeiro = next(no for no in percorrer(programa) if isinstance(no, ComandoPara))
+                self.assertEqual(interpretador.laco_contado(primeiro) is not None, contado)
+
+    def test_saidas(self):
+        self.assertEqual(executar(Interpretador, analisar(PROGRAMAS["tabuada"][0]))[1], "825\n")
+        self.assertEqual(executar(Interpretador, analisar(PROGRAMAS["variavel_externa_e_valor_final"][0]))[1],
+                         "10\n7\n4\n1\nfim -2\n")
+        self.assertEqual(executar(Interpretador, analisar(PROGRAMAS["inicio_real"][0]))[1],
+                         "0.5\n1.5\n2.5\n3.5\n")
+        self.assertEqual(executar(Interpretador, analisar(PROGRAMAS["erro_no_limite"][0]))[1],
+                         "Erro de execução: Variável 'n' não definida.\n")
+
+    def test_incremento_nao_e_executado(self):
+        class Contador(Interpretador):
+            incrementos = 0
+
+            def visitar_ComandoAtribuicao(self, comando):
+                if comando.identificador == "contador":
+                    Contador.incrementos += 1
+                super().visitar_ComandoAtribuicao(comando)
+
+        executar(Contador, analisar(PROGRAMAS["tabuada"][0]))
+        self.assertEqual(Contador.incrementos, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.lote import (
+    STATUS_TEMPO_ESGOTADO, Tarefa, executar_lote, executar_tarefa, gravar_resultados, ler_tarefas, main
+)
+
+PROGRAMAS = {
+    "soma.ptg": "programa { inteiro a; inteiro b; leia(a); leia(b); escreva(a + b); }",
+    "soma.in": "2\n40\n",
+    "sub/ola.ptg": 'programa { escreva("olá"); }',
+    "sub/divisao.ptg": "programa { escreva(1 / 0); }",
+    "sub/sintaxe.ptg": "programa { escreva( }",
+    "sub/infinito.ptg": "programa { inteiro i = 0; enquanto (i == 0) { } }",
+}
+
+
+class TestLote(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+        for nome, conteudo in PROGRAMAS.items():
+            caminho = os.path.join(self.diretorio.name, nome)
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(conteudo)
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio.name, nome)
+
+    def test_tarefas_do_diretorio(self):
+        tarefas = ler_tarefas(self.diretorio.name)
+        self.assertEqual([os.path.relpath(tarefa.programa, self.diretorio.name) for tarefa in tarefas],
+                         ["soma.ptg", os.path.join("sub", "divisao.ptg"), os.path.join("sub", "infinito.ptg"),
+                          os.path.join("sub", "ola.ptg"), os.path.join("sub", "sintaxe.ptg")])
+        self.assertEqual(tarefas[0].entrada, self._caminho("soma.in"))
+        self.assertIsNone(tarefas[1].entrada)
+
+    def test_manifesto(self):
+        manifesto = self._caminho("manifesto.jsonl")
+        with open(manifesto, "w", encoding="utf-8") as f:
+            f.write('{"programa": "soma.ptg", "entrada": "soma.in"}\n\n{"programa": "sub/ola.ptg"}\n')
+        self.assertEqual(ler_tarefas(manifesto), [Tarefa(self._caminho("soma.ptg"), self._caminho("soma.in")),
+                                                  Tarefa(self._caminho("sub/ola.ptg"))])
+        with open(manifesto, "a", encoding="utf-8") as f:
+            f.write('["sem chave"]\n')
+        with self.assertRaisesRegex(ValueError, "manifesto.jsonl:4"):
+            ler_tarefas(manifesto)
+
+    def test_resultados_de_cada_tarefa(self):
+        resultado = executar_tarefa(Tarefa(self._caminho("soma.ptg"), self._caminho("soma.in")))
+        self.assertEqual((resultado.status, resultado.stdout, resultado.stderr), (0, "42\n", ""))
+        # Erros de execução e de sintaxe saem como em main.py
+        resultado = executar_tarefa(Tarefa(self._caminho("sub/divisao.ptg")))
+        self.assertEqual((resultado.status, resultado.stdout), (0, "Erro de execução: Divisão por zero.\n"))
+        resultado = executar_tarefa(Tarefa(self._caminho("sub/sintaxe.ptg")))
+        self.assertEqual(resultado.status, 1)
+        self.assertTrue(resultado.stdout.startswith("Erro: "))
+        resultado = executar_tarefa(Tarefa(self._caminho("nao_existe.ptg")))
+        self.assertEqual(resultado.status, 1)
+        self.assertIn("não encontrado", resultado.stdout)
+
+    @unittest.skipUnless(hasattr(__import__("signal"), "setitimer"), "requer SIGALRM")
+    def test_tempo_limite(self):
+        resultado = executar_tarefa(Tarefa(self._caminho("sub/infinito.ptg")), tempo_limite=0.2)
+        self.assertEqual(resultado.status, STATUS_TEMPO_ESGOTADO)
+        self.assertEqual(resultado.stderr, "Erro: tempo limite de 0.2 s excedido.\n")
+        self.assertLess(resultado.duracao, 5)
+
+    def test_lote_em_paralelo(self):
+        tarefas = ler_tarefas(self.diretorio.name)
+        caminho = self._caminho("resultados.jsonl")
+        resultados = gravar_resultados(executar_lote(tarefas, tempo_limite=0.5, trabalhadores=2), caminho)
+        self.assertEqual([resultado.programa for resultado in resultados], [tarefa.programa for tarefa in tarefas])
+        with open(caminho, "r", encoding="utf-8") as f:
+            gravados = [json.loads(linha) for linha in f]
+        self.assertEqual([gravado["status"] for gravado in gravados], [0, 0, STATUS_TEMPO_ESGOTADO, 0, 1])
+        self.assertEqual(gravados[3]["stdout"], "olá\n")
+        self.assertEqual(set(gravados[0]), {"programa", "status", "stdout", "stderr", "duracao"})
+
+    def test_linha_de_comando(self):
+        caminho = self._caminho("saida.jsonl")
+        os.remove(self._caminho("sub/infinito.ptg"))
+        self.assertEqual(main([self.diretorio.name, "--resultados", caminho, "--trabalhadores", "1",
+                               "--backend", "vm"]), 0)
+        with open(caminho, "r", encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["stdout"], "42\n")
+
+if __name__ == '__main__':
+    unittest.main()
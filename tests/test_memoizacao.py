@@ -0,0 +1,131 @@
+import unittest
+import glob
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import analisar
+from portugol.execucao import criar_interpretador
+from portugol.es import EntradaSaida
+from portugol.memoizacao import BACKENDS_COM_MEMOIZACAO, CacheLRU, Memoizacao, funcoes_puras
+
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exemplos')
+
+FIBONACCI = """
+programa {
+    funcao inteiro fibonacci(inteiro n) {
+        se (n <= 1) {
+            retorne n;
+        }
+        retorne fibonacci(n - 1) + fibonacci(n - 2);
+    }
+    escreva(fibonacci(20));
+    escreva(fibonacci(20.0));
+}
+"""
+
+
+class TestMemoizacao(unittest.TestCase):
+
+    def _puras(self, codigo):
+        return sorted(funcao.nome for funcao in funcoes_puras(analisar(codigo)))
+
+    def _executar(self, codigo, backend, memoizacao=None, entrada=""):
+        stdout_capture = io.StringIO()
+        es = EntradaSaida(entrada=io.StringIO(entrada), saida=stdout_capture)
+        criar_interpretador(backend, memoizacao=memoizacao, es=es).interpretar(analisar(codigo))
+        return stdout_capture.getvalue()
+
+    def test_analise_de_pureza(self):
+        codigo = """
+        programa {
+            inteiro global = 1;
+            funcao inteiro quadrado(inteiro x) { inteiro r = x * x; retorne r; }
+            funcao inteiro usa_quadrado(inteiro x) { retorne quadrado(x) + 1; }
+            funcao inteiro escreve(inteiro x) { escreva(x); retorne x; }
+            funcao inteiro le() { inteiro x; leia(x); retorne x; }
+            funcao inteiro altera(inteiro x) { global = x; retorne x; }
+            funcao inteiro le_global(inteiro x) { retorne x + global; }
+            funcao inteiro chama_impura(inteiro x) { retorne escreve(x); }
+            funcao inteiro par(inteiro n) { se (n == 0) { retorne 1; } retorne impar(n - 1); }
+            funcao inteiro impar(inteiro n) { se (n == 0) { retorne 0; } retorne par(n - 1); }
+            funcao inteiro externa(inteiro n) {
+                inteiro total = 0;
+                funcao inteiro soma(inteiro k) { total = total + k; }
+                soma(n);
+                retorne total;
+            }
+        }
+        """
+        self.assertEqual(self._puras(codigo), ["impar", "par", "quadrado", "usa_quadrado"])
+
+    def test_programa_nao_resolvido_nao_tem_funcoes_puras(self):
+        codigo = """
+        programa {
+            funcao inteiro f(inteiro x) { retorne x; }
+            escreva(desconhecida);
+        }
+        """
+        self.assertEqual(self._puras(codigo), [])
+
+    def test_cache_lru(self):
+        cache = CacheLRU(2)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        self.assertEqual(cache.obter("a"), 1)
+        cache.guardar("c", 3)
+        # "b" era o item usado há mais tempo
+        self.assertIsNone(cache.obter("b"))
+        self.assertEqual((cache.obter("a"), cache.obter("c")), (1, 3))
+        self.assertEqual((len(cache), cache.descartes), (2, 1))
+        with self.assertRaises(ValueError):
+            CacheLRU(0)
+
+    def test_fibonacci_memoizado(self):
+        esperado = self._executar(FIBONACCI, "closures")
+        self.assertEqual(esperado, "6765\n6765.0\n")
+        for backend in BACKENDS_COM_MEMOIZACAO:
+            with self.subTest(backend=backend):
+                memoizacao = Memoizacao()
+                self.assertEqual(self._executar(FIBONACCI, backend, memoizacao), esperado)
+                # Cada argumento (inteiro ou real) é calculado uma única vez
+                self.assertEqual(memoizacao.contadores, {"fibonacci": [36, 42]})
+                self.assertIn("fibonacci: 36 acertos, 42 faltas", memoizacao.relatorio())
+
+    def test_cache_pequeno_descarta_resultados(self):
+        memoizacao = Memoizacao(tamanho_cache=3)
+        self.assertEqual(self._executar(FIBONACCI, "slots", memoizacao), "6765\n6765.0\n")
+        self.assertEqual(len(memoizacao.cache), 3)
+        self.assertGreater(memoizacao.cache.descartes, 0)
+
+    def test_erros_nao_sao_guardados(self):
+        codigo = """
+        programa {
+            funcao inteiro inverso(inteiro x) { retorne 1 / x; }
+            escreva(inverso(2));
+            escreva(inverso(0));
+        }
+        """
+        for backend in BACKENDS_COM_MEMOIZACAO:
+            with self.subTest(backend=backend):
+                memoizacao = Memoizacao()
+                self.assertEqual(self._executar(codigo, backend, memoizacao),
+                                 "0.5\nErro de execução: Divisão por zero.\n")
+                self.assertEqual(len(memoizacao.cache), 1)
+
+    def test_exemplos_memoizados(self):
+        caminhos = sorted(glob.glob(os.path.join(EXEMPLOS, "*.ptg")))
+        self.assertTrue(caminhos)
+        for caminho in caminhos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                codigo = f.read()
+            esperado = self._executar(codigo, "arvore", entrada="7\n3\n")
+            for backend in BACKENDS_COM_MEMOIZACAO:
+                with self.subTest(exemplo=caminho, backend=backend):
+                    saida = self._executar(codigo, backend, Memoizacao(), entrada="7\n3\n")
+                    self.assertEqual(saida, esperado)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,227 @@
+import unittest
+import glob
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.analise import percorrer
+from portugol.parser import analisar
+from portugol.ast import (
+    Bloco, ChamadaFuncao, ComandoEscreva, ComandoEnquanto, DeclaracaoVariavel,
+    ExpressaoLiteral, ExpressaoIdentificador, ExpressaoBinaria, ExpressaoLogica
+)
+from portugol.execucao import BACKENDS, criar_interpretador
+from portugol.es import EntradaSaida
+from portugol.otimizador import (
+    CurtoCircuito, DobramentoConstantes, EliminacaoCodigoMorto, ExpansaoFuncoes, MovimentacaoInvariantes,
+    GerenciadorPassos, otimizar
+)
+
+ENTRADA_EXEMPLOS = "7\n3\n"
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exemplos')
+
+
+class TestOtimizador(unittest.TestCase):
+
+    def _executar(self, programa, backend="arvore", entrada=""):
+        stdout_capture = io.StringIO()
+        es = EntradaSaida(entrada=io.StringIO(entrada), saida=stdout_capture)
+        criar_interpretador(backend, es=es).interpretar(programa)
+        return stdout_capture.getvalue()
+
+    def _comandos(self, programa):
+        return programa.declaracoes.declaracoes
+
+    def test_dobramento_de_constantes(self):
+        programa = DobramentoConstantes().executar(analisar('programa { escreva(2 * 3 + 1, -(4), "n=" + 1, 1 < 2); }'))
+        expressoes = self._comandos(programa)[0].expressoes
+        self.assertTrue(all(isinstance(e, ExpressaoLiteral) for e in expressoes))
+        self.assertEqual([e.valor for e in expressoes], [7, -4, "n=1", True])
+
+    def test_dobramento_preserva_erros_de_execucao(self):
+        passo = DobramentoConstantes()
+        programa = passo.executar(analisar('programa { escreva("antes"); escreva(1 / 0); }'))
+        self.assertIsInstance(self._comandos(programa)[1].expressoes[0], ExpressaoBinaria)
+        self.assertEqual(passo.estatisticas, {})
+        self.assertEqual(self._executar(programa), "antes\nErro de execução: Divisão por zero.\n")
+
+    def test_curto_circuito(self):
+        codigo = """
+        programa {
+            funcao inteiro f() { escreva("f"); retorne 1; }
+            inteiro x = 0;
+            escreva(x > 0 e 1 / x > 0);
+            escreva(x > 0 e f() > 0);
+        }
+        """
+        passo = CurtoCircuito()
+        programa = passo.executar(analisar(codigo))
+        comandos = self._comandos(programa)
+        self.assertIsInstance(comandos[2].expressoes[0], ExpressaoLogica)
+        # Com chamada no operando direito, a avaliação continua completa
+        self.assertIsInstance(comandos[3].expressoes[0], ExpressaoBinaria)
+        self.assertEqual(passo.estatisticas, {"operações lógicas com curto-circuito": 1,
+                                              "mantidas (chamada no operando direito)": 1})
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(self._executar(otimizar(analisar(codigo)), backend), "False\nf\nFalse\n")
+
+    def test_eliminacao_de_codigo_morto(self):
+        codigo = """
+        programa {
+            se (1 > 2) { escreva("nunca"); } senao { escreva("sempre"); }
+            se (2 > 1) escreva("sim");
+            enquanto (1 == 2) { escreva("laço"); }
+            funcao inteiro f() {
+                retorne 1;
+                escreva("inalcançável");
+            }
+            escreva(f());
+        }
+        """
+        gerenciador = GerenciadorPassos([DobramentoConstantes(), EliminacaoCodigoMorto()])
+        programa = gerenciador.otimizar(analisar(codigo))
+        comandos = self._comandos(programa)
+        self.assertIsInstance(comandos[0], Bloco)
+        self.assertIsInstance(comandos[1], ComandoEscreva)
+        self.assertEqual(len(comandos), 4)
+        self.assertEqual(len(comandos[2].corpo.declaracoes), 1)
+        self.assertEqual(gerenciador.passos[1].estatisticas, {
+            "desvios com condição constante removidos": 2,
+            "laços que nunca executam removidos": 1,
+            "comandos após retorne removidos": 1,
+        })
+        self.assertEqual(self._executar(programa), "sempre\nsim\n1\n")
+
+    def test_movimentacao_de_invariantes(self):
+        codigo = """
+        programa {
+            inteiro n = 3;
+            inteiro i = 0;
+            enquanto (i < n * 2 e i > -1) {
+                i = i + 1;
+            }
+            escreva(i);
+            enquanto (i < n * 4) {
+                n = n - 1;
+            }
+            escreva(n);
+        }
+        """
+        passo = MovimentacaoInvariantes()
+        programa = passo.executar(analisar(codigo))
+        comandos = self._comandos(programa)
+        self.assertIsInstance(comandos[2], DeclaracaoVariavel)
+        self.assertEqual(comandos[2].identificador, "$inv0")
+        self.assertIsInstance(comandos[3], ComandoEnquanto)
+        self.assertIsInstance(comandos[3].condicao.esquerda.direita, ExpressaoIdentificador)
+        # `n` muda dentro do segundo laço: nada é movido
+        self.assertIsInstance(comandos[5].condicao.direita, ExpressaoBinaria)
+        self.assertEqual(passo.estatisticas, {"subexpressões invariantes movidas": 1})
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(self._executar(otimizar(analisar(codigo)), backend), "6\n1\n")
+
+    def test_invariantes_respeitam_funcoes_chamadas_no_laco(self):
+        codigo = """
+        programa {
+            inteiro limite = 3;
+            funcao inteiro encolhe() { limite = limite - 1; }
+            para (inteiro i = 0; i < limite + 0; i = i + 1) {
+                encolhe();
+                escreva(i);
+            }
+        }
+        """
+        passo = MovimentacaoInvariantes()
+        programa = passo.executar(analisar(codigo))
+        self.assertEqual(passo.estatisticas, {})
+        self.assertEqual(self._executar(programa), "0\n1\n")
+
+    def test_expansao_de_funcoes(self):
+        codigo = """
+        programa {
+            inteiro total = 0;
+            funcao inteiro quadrado(inteiro x) { inteiro y = x * x; retorne y; }
+            funcao inteiro soma(inteiro x, inteiro y) { retorne quadrado(x) + y; }
+            funcao inteiro acumula(inteiro v) { total = total + v; }
+            inteiro y = 5;
+            escreva(soma(y, 1), " ", quadrado(soma(2, 0)));
+            para (inteiro i = 0; i < 3; i = i + 1) { acumula(quadrado(i)); }
+            escreva(total, " ", y);
+        }
+        """
+        passo = ExpansaoFuncoes()
+        programa = passo.executar(analisar(codigo))
+        self.assertEqual(passo.estatisticas, {
+            "chamadas expandidas de quadrado": 3, "chamadas expandidas de acumula": 1,
+            "chamadas expandidas de soma": 2,
+        })
+        # As funções continuam declaradas, mas nenhuma chamada sobra fora delas
+        chamadas = [no for item in self._comandos(programa)[4:] for no in percorrer(item)
+                    if isinstance(no, ChamadaFuncao)]
+        self.assertEqual(chamadas, [])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(self._executar(otimizar(analisar(codigo)), backend), "26 16\n5 5\n")
+
+    def test_expansao_preserva_escopos_e_ordem(self):
+        codigo = """
+        programa {
+            inteiro g = 1;
+            funcao inteiro le() { retorne g; }
+            funcao inteiro muda() { g = g + 10; retorne g; }
+            funcao inteiro fat(inteiro n) { se (n <= 1) { retorne 1; } retorne n * fat(n - 1); }
+            funcao inteiro par(inteiro n) { retorne impar(n); }
+            funcao inteiro impar(inteiro n) { retorne par(n); }
+            escreva(le() + muda());
+            escreva(g + muda());
+            se (g > 0) { inteiro g = 100; escreva(le()); }
+            escreva(fat(4));
+        }
+        """
+        passo = ExpansaoFuncoes()
+        programa = passo.executar(analisar(codigo))
+        # 'g + muda()' lê g antes da chamada, e o 'g' local sombreia o global que 'le' usa
+        self.assertEqual(passo.estatisticas, {
+            "chamadas expandidas de le": 1, "chamadas expandidas de muda": 1,
+            "funções mantidas (recursiva)": 3,
+        })
+        self.assertEqual(self._executar(programa), "12\n32\n21\n24\n")
+
+    def test_expansao_limite_de_tamanho(self):
+        codigo = "programa { funcao inteiro f(inteiro a) { retorne a * 2 + 1; } escreva(f(3)); }"
+        passo = ExpansaoFuncoes(tamanho_maximo=3)
+        passo.executar(analisar(codigo))
+        self.assertEqual(passo.estatisticas, {"funções mantidas (maiores que o limite)": 1})
+        passo = ExpansaoFuncoes()
+        self.assertEqual(self._executar(passo.executar(analisar(codigo))), "7\n")
+        self.assertEqual(passo.estatisticas, {"chamadas expandidas de f": 1})
+
+    def test_relatorio(self):
+        gerenciador = GerenciadorPassos()
+        gerenciador.otimizar(analisar('programa { escreva(1 + 1); }'))
+        relatorio = gerenciador.relatorio()
+        self.assertIn("dobramento-constantes", relatorio)
+        self.assertIn("  expressões binárias dobradas: 1", relatorio)
+        self.assertIn("movimentacao-invariantes", relatorio)
+        self.assertIn("expansao-funcoes", relatorio)
+        self.assertIn("  nenhuma alteração", relatorio)
+
+    def test_exemplos_otimizados(self):
+        """Os exemplos otimizados produzem a mesma saída em todos os backends."""
+        caminhos = sorted(glob.glob(os.path.join(EXEMPLOS, "*.ptg")))
+        self.assertTrue(caminhos)
+        for caminho in caminhos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                codigo = f.read()
+            esperado = self._executar(analisar(codigo), entrada=ENTRADA_EXEMPLOS)
+            for backend in BACKENDS:
+                with self.subTest(exemplo=caminho, backend=backend):
+                    saida = self._executar(otimizar(analisar(codigo)), backend, ENTRADA_EXEMPLOS)
+                    self.assertEqual(saida, esperado)
+
+if __name__ == '__main__':
+    unittest.main()
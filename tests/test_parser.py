@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol import parser as fabrica
+from portugol.analise import campos, percorrer
+from portugol.ast import Programa
+from portugol.otimizador import GerenciadorPassos
+
+class TestParser(unittest.TestCase):
+
+    def test_parser_compartilhado_no_processo(self):
+        self.assertIs(fabrica.obter_parser(), fabrica.obter_parser())
+        self.assertIs(fabrica.obter_parser(posicoes=False), fabrica.obter_parser(True, False))
+
+    def test_cache_em_disco(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            with patch.dict(os.environ, {"PORTUGOL_CACHE_DIR": diretorio}):
+                caminho = fabrica.caminho_cache(fabrica.ler_gramatica())
+                self.assertFalse(os.path.exists(caminho))
+
+                fabrica.construir_parser()
+                self.assertTrue(os.path.exists(caminho))
+                modificado = os.path.getmtime(caminho)
+
+                # A segunda construção só carrega as tabelas
+                parser = fabrica.construir_parser()
+                self.assertEqual(os.path.getmtime(caminho), modificado)
+                self.assertEqual(parser.parse("programa { }").data, "programa")
+
+    def test_cache_depende_da_gramatica(self):
+        gramatica = fabrica.ler_gramatica()
+        self.assertNotEqual(fabrica.caminho_cache(gramatica),
+                            fabrica.caminho_cache(gramatica + "\n// alterada\n"))
+
+    def test_analisar(self):
+        self.assertIsInstance(fabrica.analisar("programa { escreva(1); }"), Programa)
+
+    def test_posicoes_dos_nos(self):
+        codigo = "programa {\n  inteiro x = 1;\n  se (x == 1) { escreva(x + 2 * 3, -x); }\n}"
+        posicoes = [(type(no).__name__, no.linha, no.coluna) for no in percorrer(fabrica.analisar(codigo))]
+        self.assertEqual(posicoes, [
+            ("Programa", 1, 1), ("Bloco", 1, 10),
+            ("DeclaracaoVariavel", 2, 3), ("ExpressaoLiteral", 2, 15),
+            ("ComandoSe", 3, 3), ("ExpressaoBinaria", 3, 7), ("ExpressaoIdentificador", 3, 7),
+            ("ExpressaoLiteral", 3, 12), ("Bloco", 3, 15), ("ComandoEscreva", 3, 17),
+            # Em 'x + 2 * 3' a soma começa no operando esquerdo
+            ("ExpressaoBinaria", 3, 25), ("ExpressaoIdentificador", 3, 25),
+            ("ExpressaoBinaria", 3, 29), ("ExpressaoLiteral", 3, 29), ("ExpressaoLiteral", 3, 33),
+            ("ExpressaoUnaria", 3, 36), ("ExpressaoIdentificador", 3, 37),
+        ])
+
+    def test_analise_sem_posicoes(self):
+        programa = fabrica.analisar("programa { escreva(1); }", posicoes=False)
+        self.assertTrue(all(no.linha is None for no in percorrer(programa)))
+
+    def test_nos_sem_dicionario(self):
+        programa = fabrica.analisar("programa { inteiro x = 1 + 2; }")
+        for no in percorrer(programa):
+            self.assertFalse(hasattr(no, "__dict__"), type(no).__name__)
+        soma = programa.declaracoes.declaracoes[0].inicializador
+        self.assertEqual([nome for nome, _ in campos(soma)],
+                         ["linha", "coluna", "tipo_estatico", "esquerda", "operador", "direita", "operacao"])
+
+    def test_passagem_unica_constroi_a_mesma_ast(self):
+        codigo = """
+        programa {
+            funcao real media(inteiro v[], inteiro n) {
+                inteiro soma = 0;
+                para (inteiro i = 0; i < n; i = i + 1) { soma = soma + v[i]; }
+                retorne soma / n;
+            }
+            inteiro v[3] = {1, 2, 3};
+            cadeia s = "olá";
+            caractere c = 'x';
+            se (!(media(v, 3) >= 2.5) ou v[0] != -1 e verdadeiro) { escreva(s, c); } senao { leia(s); }
+            enquanto (falso) { }
+        }
+        """
+        unica = fabrica.analisar(codigo, posicoes=False, passagem_unica=True)
+        duas = fabrica.analisar(codigo, posicoes=False, passagem_unica=False)
+        nos_unica, nos_duas = list(percorrer(unica)), list(percorrer(duas))
+        self.assertEqual(len(nos_unica), len(nos_duas))
+        for no_unica, no_duas in zip(nos_unica, nos_duas):
+            self.assertIs(type(no_unica), type(no_duas))
+            for (nome, valor), (_, esperado) in zip(campos(no_unica), campos(no_duas)):
+                if esperado is None or isinstance(esperado, (str, int, float)):
+                    self.assertEqual((nome, valor, type(valor)), (nome, esperado, type(esperado)))
+        # O otimizador trata as duas ASTs da mesma forma
+        GerenciadorPassos().otimizar(unica)
+
+    def test_passagem_unica_por_padrao_sem_posicoes(self):
+        parser = fabrica.obter_parser(posicoes=False, passagem_unica=True)
+        with patch.object(parser, "parse", wraps=parser.parse) as parse:
+            self.assertIsInstance(fabrica.analisar("programa { }", posicoes=False), Programa)
+            parse.assert_called_once()
+        with self.assertRaises(ValueError):
+            fabrica.analisar("programa { }", posicoes=True, passagem_unica=True)
+
+    def test_ler_codigo(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "programa.ptg")
+            for conteudo, esperado in ((b"", ""),
+                                       ("programa {\r\n  escreva(\"ç\");\r}\n".encode("utf-8"),
+                                        "programa {\n  escreva(\"ç\");\n}\n")):
+                with self.subTest(conteudo=conteudo):
+                    with open(caminho, "wb") as f:
+                        f.write(conteudo)
+                    self.assertEqual(fabrica.ler_codigo(caminho), esperado)
+            with self.assertRaises(FileNotFoundError):
+                fabrica.ler_codigo(os.path.join(diretorio, "ausente.ptg"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import analisar
+from portugol.es import EntradaSaida
+from portugol.perfil import InterpretadorPerfilado, Perfil
+
+FIBONACCI = """programa {
+    funcao inteiro fibonacci(inteiro n) {
+        se (n <= 1) {
+            retorne n;
+        }
+        retorne fibonacci(n - 1) + fibonacci(n - 2);
+    }
+    funcao inteiro dobro(inteiro n) {
+        retorne fibonacci(n) * 2;
+    }
+    para (inteiro i = 0; i < 3; i = i + 1) {
+        escreva(dobro(5));
+    }
+}
+"""
+
+
+class TestPerfil(unittest.TestCase):
+
+    def _perfilar(self, codigo):
+        saida = io.StringIO()
+        interpretador = InterpretadorPerfilado(es=EntradaSaida(saida=saida))
+        interpretador.interpretar(analisar(codigo))
+        return interpretador.perfil, saida.getvalue()
+
+    def test_contagem_por_linha(self):
+        perfil, saida = self._perfilar(FIBONACCI)
+        self.assertEqual(saida, "10\n10\n10\n")
+        # fibonacci(5) faz 15 chamadas: 8 casos base e 7 recursivas
+        self.assertEqual(perfil.linhas[3], 45)
+        self.assertEqual(perfil.linhas[4], 24)
+        self.assertEqual(perfil.linhas[6], 21)
+        self.assertEqual(perfil.linhas[9], 3)
+        # O próprio 'para', sua inicialização e os três incrementos
+        self.assertEqual(perfil.linhas[11], 5)
+        self.assertEqual(perfil.linhas[12], 3)
+        self.assertNotIn(1, perfil.linhas)
+
+    def test_tempos_por_funcao(self):
+        perfil, _ = self._perfilar(FIBONACCI)
+        self.assertEqual({nome: estatistica[0] for nome, estatistica in perfil.funcoes.items()},
+                         {"programa": 1, "dobro": 3, "fibonacci": 45})
+        programa, dobro, fibonacci = (perfil.funcoes[nome] for nome in ("programa", "dobro", "fibonacci"))
+        # Na recursão, o tempo inclusivo só é somado nas chamadas mais externas
+        self.assertLessEqual(fibonacci[1], dobro[1])
+        self.assertLessEqual(dobro[1], programa[1])
+        self.assertAlmostEqual(programa[2] + dobro[2] + fibonacci[2], programa[1], places=6)
+
+    def test_pilhas_colapsadas(self):
+        perfil, _ = self._perfilar(FIBONACCI)
+        pilhas = {}
+        for linha in perfil.pilhas_colapsadas().splitlines():
+            caminho, microssegundos = linha.rsplit(" ", 1)
+            pilhas[caminho] = int(microssegundos)
+        self.assertIn("programa;dobro;fibonacci", pilhas)
+        self.assertTrue(all(caminho.startswith("programa") for caminho in pilhas))
+        self.assertLessEqual(max(caminho.count(";") for caminho in pilhas), 6)
+
+    def test_relatorio(self):
+        perfil, _ = self._perfilar(FIBONACCI)
+        relatorio = perfil.relatorio(FIBONACCI, limite_linhas=2)
+        self.assertIn("funções (por tempo exclusivo):", relatorio)
+        linhas = relatorio.splitlines()
+        inicio = linhas.index("linhas mais executadas:")
+        self.assertEqual(linhas[inicio + 2].split(), ["3", "45", "se", "(n", "<=", "1)", "{"])
+        self.assertEqual(linhas[inicio + 3].split()[:2], ["4", "24"])
+        self.assertTrue(linhas[-1].endswith("linhas omitidas)"))
+
+    def test_erro_fecha_os_quadros(self):
+        codigo = "programa {\n funcao inteiro f(inteiro x) { retorne 1 / x; }\n escreva(f(0));\n}"
+        perfil, saida = self._perfilar(codigo)
+        self.assertEqual(saida, "Erro de execução: Divisão por zero.\n")
+        self.assertEqual(perfil.funcoes["f"][0], 1)
+        self.assertEqual(perfil._pilha, [])
+
+    def test_perfil_vazio(self):
+        self.assertIn("tempo total: 0.000000 s", Perfil().relatorio())
+        self.assertEqual(Perfil().pilhas_colapsadas(), "")
+
+if __name__ == '__main__':
+    unittest.main()
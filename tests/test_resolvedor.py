@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import obter_parser
+from portugol.transformer import PortugolTransformer
+from portugol.resolvedor import ErroResolucao, resolver
+
+class TestResolvedor(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = obter_parser()
+
+    def _ast(self, codigo):
+        return PortugolTransformer().transform(self.parser.parse(codigo))
+
+    def test_enderecos_locais_e_globais(self):
+        ast = self._ast("""
+        programa {
+            inteiro x = 1;
+            funcao inteiro f(inteiro a) {
+                inteiro b = a + x;
+                retorne b;
+            }
+        }
+        """)
+        resolucao = resolver(ast)
+        declaracao_x, funcao = ast.declaracoes.declaracoes
+        declaracao_b, retorno = funcao.corpo.declaracoes
+        uso_a, uso_x = declaracao_b.inicializador.esquerda, declaracao_b.inicializador.direita
+
+        self.assertEqual(resolucao.endereco(uso_a), (0, 1))
+        self.assertEqual(resolucao.endereco(uso_x), (1, resolucao.slot(declaracao_x)))
+        self.assertEqual(resolucao.endereco(retorno.expressao), (0, resolucao.slot(declaracao_b)))
+        self.assertIs(resolucao.declaracao(uso_x), declaracao_x)
+        self.assertEqual(resolucao.tamanho_quadro(funcao), 3)
+
+    def test_blocos_sem_funcoes_nao_alocam_quadro(self):
+        ast = self._ast("""
+        programa {
+            inteiro i = 0;
+            enquanto (i < 3) {
+                inteiro dobro = i * 2;
+                i = i + 1;
+            }
+            {
+                inteiro i = 5;
+                escreva(i);
+            }
+        }
+        """)
+        resolucao = resolver(ast)
+        _, enquanto, bloco = ast.declaracoes.declaracoes
+        self.assertIsNone(resolucao.tamanho_quadro(enquanto.comando))
+        self.assertIsNone(resolucao.tamanho_quadro(bloco))
+        # O 'i' interno sombreia o externo em outro slot do mesmo quadro
+        self.assertEqual(resolucao.endereco(bloco.declaracoes[1].expressoes[0]), (0, 3))
+        self.assertEqual(resolucao.tamanho_quadro(ast), 4)
+
+    def test_variavel_nao_definida(self):
+        ast = self._ast("""
+        programa {
+            escreva("nunca executado");
+            se (1 > 2) {
+                y = 3;
+            }
+        }
+        """)
+        with self.assertRaises(ErroResolucao) as contexto:
+            resolver(ast)
+        self.assertEqual(str(contexto.exception), "Variável 'y' não definida para atribuição.")
+
+    def test_uso_antes_da_declaracao_no_mesmo_bloco(self):
+        ast = self._ast("""
+        programa {
+            escreva(x);
+            inteiro x = 1;
+        }
+        """)
+        with self.assertRaises(ErroResolucao):
+            resolver(ast)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.sessao import ErroSessao, Sessao, repl
+
+
+class TestSessao(unittest.TestCase):
+
+    def setUp(self):
+        self.sessao = Sessao()
+
+    def executar(self, trecho):
+        resultado = self.sessao.executar(trecho)
+        self.assertIsNone(resultado.erro, trecho)
+        return resultado
+
+    def test_estado_persiste_entre_trechos(self):
+        self.executar("funcao inteiro dobro(inteiro x) { retorne x * 2; }")
+        self.executar("inteiro n = dobro(21);")
+        self.assertEqual(self.executar("n + 1").valor, 43)
+        self.executar("n = n - 2")
+        self.assertEqual(self.executar("dobro(n)").valor, 80)
+        self.assertEqual(self.sessao.variaveis(), {"n": 40})
+        self.assertEqual(list(self.sessao.funcoes()), ["dobro"])
+
+    def test_expressoes_e_comandos(self):
+        self.executar('cadeia nome = "Ana";')
+        self.assertEqual(self.executar('"Olá, " + nome').valor, "Olá, Ana")
+        self.assertEqual(self.executar("{1, 2, 3}").valor, [1, 2, 3])
+        # O ';' do último comando é opcional
+        resultado = self.executar('escreva("oi ", nome)')
+        self.assertEqual((resultado.valor, resultado.saida), (None, "oi Ana\n"))
+        resultado = self.executar("para (inteiro i = 0; i < 3; i = i + 1) { escreva(i); }")
+        self.assertEqual(resultado.saida, "0\n1\n2\n")
+        self.assertEqual(self.executar("").saida, "")
+
+    def test_erros_estruturados(self):
+        self.executar("inteiro x = 1;")
+        erro = self.sessao.executar("x + y").erro
+        self.assertEqual(erro, ErroSessao("execucao", "Variável 'y' não definida."))
+        erro = self.sessao.executar("x = 1 @ 2;").erro
+        self.assertEqual((erro.tipo, erro.linha, erro.coluna), ("sintaxe", 1, 7))
+        self.assertIn("'@'", erro.mensagem)
+        erro = self.sessao.executar("x = 2;\nx = x +;").erro
+        self.assertEqual((erro.tipo, erro.linha), ("sintaxe", 2))
+        self.assertEqual(self.sessao.executar("retorne 1;").erro.tipo, "execucao")
+        # Os comandos anteriores ao erro têm efeito
+        self.assertIsNotNone(self.sessao.executar("x = 5; x = z;").erro)
+        self.assertEqual(self.executar("x").valor, 5)
+
+    def test_trecho_incompleto(self):
+        for trecho in ("se (1 == 1) {", "funcao inteiro f(inteiro a) {\n retorne a;", "escreva(1,"):
+            with self.subTest(trecho=trecho):
+                resultado = self.sessao.executar(trecho)
+                self.assertTrue(resultado.incompleto)
+                self.assertIsNone(resultado.erro)
+        self.assertFalse(self.sessao.executar("x +").incompleto)
+
+    def test_vetor_literal_sem_ponto_e_virgula(self):
+        resultado = self.sessao.executar("inteiro v[3] = {1, 2, 3}")
+        self.assertFalse(resultado.incompleto)
+        self.assertIsNone(resultado.erro)
+        self.assertEqual(self.executar("v[2]").valor, 3)
+        resultado = self.sessao.executar("v = {4, 5, 6}")
+        self.assertFalse(resultado.incompleto)
+        self.assertIsNone(resultado.erro)
+        self.assertEqual(self.executar("v[0] + v[2]").valor, 10)
+        entrada = io.StringIO("inteiro w[2] = {7, 8}\nw[1]\nw = {1, 2}\nw[0] + w[1]\n")
+        saida = io.StringIO()
+        repl(entrada, saida)
+        self.assertEqual(saida.getvalue().splitlines(), ["8", "3"])
+
+    def test_funcao_nova_invalida_lacos_contados(self):
+        self.executar("inteiro n = 3;")
+        self.executar("funcao inteiro muda() { retorne 0; }")
+        self.executar("funcao inteiro conta() {\n"
+                      "    para (inteiro i = 0; i < n; i = i + 1) { escreva(i); muda(); }\n"
+                      "    retorne 0;\n"
+                      "}")
+        self.assertEqual(self.executar("conta()").saida, "0\n1\n2\n")
+        # Redefinida, 'muda' altera o limite do laço já analisado em 'conta'
+        self.executar("funcao inteiro muda() { n = 0; retorne 0; }")
+        self.executar("n = 3")
+        self.assertEqual(self.executar("conta()").saida, "0\n")
+
+    def test_reiniciar(self):
+        self.executar("inteiro x = 1;")
+        self.sessao.reiniciar()
+        self.assertEqual(self.sessao.variaveis(), {})
+        self.assertIsNotNone(self.sessao.executar("x").erro)
+
+    def test_leitura(self):
+        sessao = Sessao(entrada=io.StringIO("7\n"))
+        sessao.executar("inteiro x; leia(x);")
+        self.assertEqual(sessao.executar("x * 6").valor, 42)
+
+    def test_repl(self):
+        entrada = io.StringIO('inteiro x\nleia(x)\n41\nx + 1\n"a" + x\n'
+                              'se (x > 1) {\n  escreva("grande");\n}\n'
+                              'funcao inteiro f() {\n\nx = 1 @ 2\n:variaveis\n:reiniciar\n:variaveis\n')
+        saida = io.StringIO()
+        repl(entrada, saida)
+        self.assertEqual(saida.getvalue().splitlines(), [
+            "42",
+            '"a41"',
+            "grande",
+            "Erro de sintaxe: fim inesperado do trecho.",
+            "Erro de sintaxe (linha 1, coluna 7): caractere inesperado '@'.",
+            "x = 41",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
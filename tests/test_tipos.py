@@ -0,0 +1,178 @@
+import unittest
+import glob
+import io
+import operator
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import analisar
+from portugol.analise import percorrer
+from portugol.ast import ExpressaoBinaria
+from portugol.es import EntradaSaida
+from portugol.execucao import criar_interpretador
+from portugol.operadores import concatenar_numero, dividir_sem_coercao
+from portugol.resolvedor import ErroResolucao
+from portugol.tipos import verificar_tipos
+
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exemplos')
+
+# Backends que usam as operações escolhidas pela verificação de tipos
+BACKENDS_ESPECIALIZADOS = ("arvore", "closures", "slots", "python")
+
+PROGRAMAS = {
+    "coercao": """
+    programa {
+        cadeia s = "n=";
+        inteiro i = 3;
+        real r = 2.5;
+        escreva(s + i, s + r, i + r, i / 2, i % 2, -i, !(i > 2), s + (i < r));
+        escreva(s + s, 2 * "ab", i == s, 1 < 2 e 2 < 1, 0 ou 3);
+    }
+    """,
+    "leia": """
+    programa {
+        inteiro a;
+        inteiro b;
+        leia(a);
+        leia(b);
+        escreva(b + a, a * 2, a - 1);
+    }
+    """,
+    "parametros_mistos": """
+    programa {
+        funcao inteiro dobro(inteiro x) { retorne x + x; }
+        escreva(dobro(2), dobro(1.5), dobro("ab"));
+        funcao inteiro fib(inteiro n) {
+            se (n <= 1) { retorne n; }
+            retorne fib(n - 1) + fib(n - 2);
+        }
+        escreva(fib(15), " ", fib(10.0));
+    }
+    """,
+    "funcao_como_valor": """
+    programa {
+        funcao inteiro soma1(inteiro x) { retorne x + 1; }
+        inteiro f = 0;
+        f = soma1;
+        escreva(f("a"), soma1(1));
+    }
+    """,
+    "globais_alteradas": """
+    programa {
+        inteiro total = 0;
+        funcao inteiro troca() { total = "t"; }
+        escreva(total + 1);
+        troca();
+        escreva(total + 1);
+        cadeia nao_iniciada;
+        escreva(nao_iniciada);
+    }
+    """,
+    "divisao_por_zero": """
+    programa {
+        inteiro zero = 0;
+        escreva(10 % 3);
+        escreva(1 / zero);
+    }
+    """,
+}
+
+
+class TestTipos(unittest.TestCase):
+
+    def _executar(self, programa, backend, entrada=""):
+        stdout_capture = io.StringIO()
+        es = EntradaSaida(entrada=io.StringIO(entrada), saida=stdout_capture)
+        try:
+            criar_interpretador(backend, es=es).interpretar(programa)
+        except TypeError as e:
+            # Operações entre tipos incompatíveis devem falhar igualmente nos dois caminhos
+            return stdout_capture.getvalue() + f"TypeError: {e}"
+        return stdout_capture.getvalue()
+
+    def _binarias(self, programa):
+        return [no for no in percorrer(programa) if isinstance(no, ExpressaoBinaria)]
+
+    def test_anotacoes(self):
+        programa = analisar("""
+        programa {
+            inteiro i = 1;
+            real r = 2.0;
+            cadeia s = "x";
+            inteiro lido;
+            leia(lido);
+            escreva(i + 1, i / 2, i + r, s + i, lido + 1, i < r);
+        }
+        """)
+        self.assertEqual(verificar_tipos(programa), [])
+        soma, divisao, mista, concatenacao, com_lido, comparacao = self._binarias(programa)
+        self.assertEqual([no.tipo_estatico for no in self._binarias(programa)],
+                         ["inteiro", "real", "real", "cadeia", None, "logico"])
+        self.assertIs(soma.operacao, operator.add)
+        self.assertIs(divisao.operacao, dividir_sem_coercao)
+        self.assertIs(concatenacao.operacao, concatenar_numero)
+        # O valor lido pode ser uma cadeia: mantém o caminho genérico
+        self.assertIsNone(com_lido.operacao)
+        self.assertIs(comparacao.operacao, operator.lt)
+
+    def test_inferencia_entre_funcoes(self):
+        programa = analisar("""
+        programa {
+            funcao real metade(real x) { retorne x / 2; }
+            funcao inteiro usa(inteiro n) { retorne n * 3; }
+            escreva(usa(4) + metade(3));
+        }
+        """)
+        self.assertEqual(verificar_tipos(programa), [])
+        metade, usa, soma = self._binarias(programa)
+        self.assertEqual((metade.tipo_estatico, usa.tipo_estatico, soma.tipo_estatico), ("real", "inteiro", "real"))
+
+    def test_erros_de_tipo(self):
+        codigo = """programa {
+            inteiro x = "abc";
+            cadeia c = "a";
+            escreva(c - 1);
+            escreva(1 < "b");
+            funcao inteiro f(inteiro a) { retorne "r"; }
+            escreva(f("x"));
+            inteiro y = 3;
+            escreva(y(2));
+            escreva(-c);
+            x = 1.5;
+        }"""
+        erros = [str(erro) for erro in verificar_tipos(analisar(codigo))]
+        self.assertEqual(erros, [
+            "linha 2, coluna 13: A variável 'x' recebe cadeia, mas é do tipo inteiro.",
+            "linha 4, coluna 21: O operador '-' não se aplica a cadeia e inteiro.",
+            "linha 5, coluna 21: Não é possível comparar inteiro com cadeia.",
+            "linha 6, coluna 43: A função 'f' recebe cadeia, mas é do tipo inteiro.",
+            "linha 7, coluna 21: O parâmetro 'a' de 'f' recebe cadeia, mas é do tipo inteiro.",
+            "linha 9, coluna 21: 'y' não é uma função.",
+            "linha 10, coluna 21: O operador '-' não se aplica a cadeia.",
+            "linha 11, coluna 13: A variável 'x' recebe real, mas é do tipo inteiro.",
+        ])
+
+    def test_nome_nao_definido(self):
+        with self.assertRaises(ErroResolucao):
+            verificar_tipos(analisar("programa { escreva(x); }"))
+
+    def test_mesma_saida_com_operacoes_especializadas(self):
+        exemplos = {}
+        caminhos = sorted(glob.glob(os.path.join(EXEMPLOS, "*.ptg")))
+        self.assertTrue(caminhos)
+        for caminho in caminhos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                exemplos[caminho] = f.read()
+        for nome, codigo in {**PROGRAMAS, **exemplos}.items():
+            for entrada in ("7\n3\n", "7\nabc\n"):
+                esperado = self._executar(analisar(codigo), "arvore", entrada)
+                for backend in BACKENDS_ESPECIALIZADOS:
+                    with self.subTest(programa=nome, entrada=entrada, backend=backend):
+                        programa = analisar(codigo)
+                        verificar_tipos(programa)
+                        self.assertEqual(self._executar(programa, backend, entrada), esperado)
+
+if __name__ == '__main__':
+    unittest.main()
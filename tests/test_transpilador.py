@@ -0,0 +1,131 @@
+import unittest
+import glob
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import analisar
+from portugol.interpretador import Interpretador
+from portugol.es import EntradaSaida
+from portugol.transpilador import InterpretadorPython, transpilar
+
+ENTRADAS = ["5\n2\n", "2.5\n0.5\n", "Maria\n"]
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exemplos')
+
+class TestTranspilador(unittest.TestCase):
+
+    def _executar(self, interpretador, codigo, entrada=""):
+        stdout_capture = io.StringIO()
+        interpretador.es = EntradaSaida(entrada=io.StringIO(entrada), saida=stdout_capture)
+        interpretador.interpretar(analisar(codigo))
+        return stdout_capture.getvalue()
+
+    def _resultado(self, interpretador, codigo, entrada):
+        """Saída do programa e, se houver, o tipo e a mensagem do erro Python que escapou."""
+        try:
+            return self._executar(interpretador, codigo, entrada), None
+        except RecursionError:
+            return None, "RecursionError"
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    def _comparar(self, codigo, entrada=""):
+        esperado = self._resultado(Interpretador(), codigo, entrada)
+        self.assertEqual(self._resultado(InterpretadorPython(), codigo, entrada), esperado)
+        return esperado[0]
+
+    def test_diferencial_exemplos(self):
+        """Compara a saída do código transpilado com a do Interpretador em todos os exemplos."""
+        caminhos = sorted(glob.glob(os.path.join(EXEMPLOS, "*.ptg")))
+        self.assertTrue(caminhos)
+        for caminho in caminhos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                codigo = f.read()
+            for entrada in ENTRADAS:
+                with self.subTest(exemplo=caminho, entrada=entrada):
+                    self._comparar(codigo, entrada)
+
+    def test_para_de_contagem_vira_range(self):
+        codigo = """
+        programa {
+            inteiro i;
+            para (i = 10; i > 0; i = i - 3) {
+                escreva(i);
+            }
+            escreva("fim: ", i);
+            para (inteiro j = 0; j <= 2.5; j = j + 1) {
+                escreva(j);
+            }
+        }
+        """
+        self.assertIn(" in _contagem_", transpilar(analisar(codigo)))
+        self.assertEqual(self._comparar(codigo), "10\n7\n4\n1\nfim: -2\n0\n1\n2\n")
+
+    def test_para_que_altera_o_contador_nao_vira_range(self):
+        codigo = """
+        programa {
+            para (inteiro i = 0; i < 10; i = i + 1) {
+                escreva(i);
+                i = i * 2;
+            }
+        }
+        """
+        self.assertNotIn(" in _contagem_", transpilar(analisar(codigo)))
+        self.assertEqual(self._comparar(codigo), "0\n1\n3\n7\n")
+
+    def test_coercao_de_cadeia(self):
+        codigo = """
+        programa {
+            cadeia s = "x";
+            inteiro n = 3;
+            escreva(s + n, s + 1.5, n + n, "100%");
+            escreva(s * n);
+        }
+        """
+        fonte = transpilar(analisar(codigo))
+        self.assertIn("_somar(s_1, n_2)", fonte)
+        self.assertIn("'%s%s%s100%%\\n'", fonte)
+        with self.assertRaises(TypeError):
+            self._executar(InterpretadorPython(), codigo)
+
+    def test_funcoes_viram_defs_aninhados(self):
+        codigo = """
+        programa {
+            inteiro total = 0;
+            funcao inteiro acumula(inteiro k) {
+                total = total + k;
+                retorne total;
+            }
+            acumula(2);
+            escreva(acumula(3));
+        }
+        """
+        fonte = transpilar(analisar(codigo))
+        self.assertIn("def acumula_2(k_3):", fonte)
+        self.assertIn("nonlocal total_1", fonte)
+        self.assertEqual(self._comparar(codigo), "5\n")
+
+    def test_codigo_que_o_python_nao_compila(self):
+        """Mais de 20 blocos aninhados não compilam em Python: o programa vai para o interpretador de árvore."""
+        corpo = "c = c + 1;"
+        for i in range(21):
+            corpo = f"para (inteiro i{i} = 0; i{i} < 1; i{i} = i{i} + 1) {{ {corpo} }}"
+        codigo = "programa { inteiro c = 0; escreva(\"antes\"); %s escreva(c); }" % corpo
+        with self.assertRaises(SyntaxError):
+            compile(transpilar(analisar(codigo)), "<portugol>", "exec")
+        self.assertEqual(self._comparar(codigo), "antes\n1\n")
+
+    def test_nome_da_variavel_nao_definida(self):
+        codigo = """
+        programa {
+            funcao inteiro f() { retorne total_2 + 1; }
+            escreva(f());
+            inteiro total_2 = 1;
+        }
+        """
+        self.assertEqual(self._comparar(codigo), "Erro de execução: Variável 'total_2' não definida.\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from array import array
+
+from portugol.es import EntradaSaida
+from portugol.execucao import BACKENDS, criar_interpretador
+from portugol.interpretador import ErroExecucao
+from portugol.memoizacao import Memoizacao, funcoes_puras
+from portugol.parser import analisar
+from portugol.tipos import verificar_tipos
+from portugol.vetores import VetorCadeia, VetorLogico, criar_vetor
+
+PROGRAMAS = {
+    "declaracao_e_indices": """
+    programa {
+        inteiro v[5];
+        real m[2][3] = {{1, 2, 3}, {4.5, 5, 6}};
+        para (inteiro i = 0; i < 5; i = i + 1) {
+            v[i] = i * i;
+        }
+        m[0][1] = v[4] / 2;
+        escreva(v, " ", m, " ", v[2] + m[1][0]);
+        cadeia nomes[2] = {"ana", "bia"};
+        caractere letras[3] = {'x', 'y', 'z'};
+        logico marcado[3];
+        marcado[1] = 1 < 2;
+        escreva(nomes[1] + "!", letras, marcado, marcado[1]);
+    }
+    """,
+    "copia_e_referencia": """
+    programa {
+        inteiro a[3] = {1, 2, 3};
+        inteiro b[3] = a;
+        real r[3];
+        b[0] = 10;
+        r = a;
+        escreva(a, b, r);
+        a = b;
+        b[1] = 20;
+        escreva(a, b);
+        funcao inteiro zera(inteiro v[]) {
+            v[0] = 0;
+            retorne v[1];
+        }
+        escreva(zera(a), a);
+        inteiro ref = a;
+        ref[2] = 7;
+        escreva(a);
+        a = {4, 5, 6};
+        escreva(a, ref);
+    }
+    """,
+    "tres_dimensoes": """
+    programa {
+        inteiro n = 2;
+        inteiro c[n][n + 1][2];
+        para (inteiro i = 0; i < n; i = i + 1) {
+            c[i][i + 1][1] = i + 1;
+        }
+        escreva(c, c[1][2][1]);
+    }
+    """,
+    "indice_fora": """
+    programa {
+        inteiro v[3];
+        escreva("antes");
+        v[3] = 1;
+    }
+    """,
+    "indice_negativo_em_matriz": """
+    programa {
+        real m[2][2];
+        escreva(m[1][-1]);
+    }
+    """,
+    "valor_de_outro_tipo": """
+    programa {
+        inteiro v[2];
+        v[0] = 2.5;
+    }
+    """,
+    "dimensoes_diferentes": """
+    programa {
+        inteiro a[2];
+        inteiro b[3];
+        a = b;
+    }
+    """,
+    "literal_com_tamanho_errado": """
+    programa {
+        inteiro m[2][2] = {{1, 2}, {3}};
+    }
+    """,
+    "indices_demais": """
+    programa {
+        inteiro v[2];
+        escreva(v[0][1]);
+    }
+    """,
+    "nao_e_vetor": """
+    programa {
+        inteiro x = 1;
+        escreva(x[0]);
+    }
+    """,
+}
+
+
+def executar(codigo, backend="arvore", **opcoes):
+    saida = io.StringIO()
+    es = EntradaSaida(entrada=io.StringIO(""), saida=saida)
+    criar_interpretador(backend, es=es, **opcoes).interpretar(analisar(codigo))
+    return saida.getvalue()
+
+
+class TestVetores(unittest.TestCase):
+
+    def test_backends_iguais_ao_interpretador_de_arvore(self):
+        for nome, codigo in PROGRAMAS.items():
+            esperado = executar(codigo)
+            for backend in BACKENDS:
+                with self.subTest(programa=nome, backend=backend):
+                    self.assertEqual(executar(codigo, backend), esperado)
+
+    def test_saidas(self):
+        self.assertEqual(executar(PROGRAMAS["declaracao_e_indices"]),
+                         "{0, 1, 4, 9, 16} {{1.0, 8.0, 3.0}, {4.5, 5.0, 6.0}} 8.5\n"
+                         "bia!{x, y, z}{False, True, False}True\n")
+        self.assertEqual(executar(PROGRAMAS["copia_e_referencia"]),
+                         "{1, 2, 3}{10, 2, 3}{1.0, 2.0, 3.0}\n{10, 2, 3}{10, 20, 3}\n"
+                         "2{0, 2, 3}\n{0, 2, 7}\n{4, 5, 6}{4, 5, 6}\n")
+        self.assertEqual(executar(PROGRAMAS["indice_fora"]),
+                         "antes\nErro de execução: Índice 3 fora dos limites de 'v' (tamanho 3).\n")
+        self.assertIn("na dimensão 2", executar(PROGRAMAS["indice_negativo_em_matriz"]))
+        self.assertIn("Valor inválido para o vetor inteiro 'v': 2.5.", executar(PROGRAMAS["valor_de_outro_tipo"]))
+        self.assertIn("'v' tem 1 dimensão, mas foi usado com 2 índices.", executar(PROGRAMAS["indices_demais"]))
+        self.assertIn("'x' não é um vetor.", executar(PROGRAMAS["nao_e_vetor"]))
+
+    def test_armazenamento_contiguo_por_tipo(self):
+        inteiros = criar_vetor("v", "inteiro", [1000])
+        self.assertIsInstance(inteiros.dados, array)
+        self.assertEqual((inteiros.dados.typecode, len(inteiros.dados)), ("q", 1000))
+        matriz = criar_vetor("m", "real", [3, 4], [[float(i * 4 + j) for j in range(4)] for i in range(3)])
+        self.assertEqual(matriz.dados.typecode, "d")
+        self.assertEqual(matriz.obter2(2, 1), 9.0)
+        self.assertEqual(matriz.obter([2, 1]), 9.0)
+
+        logicos = criar_vetor("l", "logico", [2])
+        self.assertIsInstance(logicos, VetorLogico)
+        logicos.atribuir1(0, True)
+        self.assertIs(logicos.obter1(0), True)
+        with self.assertRaises(ErroExecucao):
+            logicos.atribuir1(1, 1)
+        self.assertIsInstance(criar_vetor("c", "cadeia", [2]), VetorCadeia)
+
+    def test_copia_em_bloco(self):
+        origem = criar_vetor("a", "inteiro", [4], [1, 2, 3, 4])
+        destino = criar_vetor("b", "inteiro", [4])
+        dados = destino.dados
+        destino.copiar(origem)
+        # O buffer do destino é reaproveitado e não compartilhado com a origem
+        self.assertIs(destino.dados, dados)
+        self.assertIsNot(destino.dados, origem.dados)
+        self.assertEqual(list(destino.dados), [1, 2, 3, 4])
+        reais = criar_vetor("r", "real", [4], origem)
+        self.assertEqual(reais.valores(), [1.0, 2.0, 3.0, 4.0])
+        with self.assertRaises(ErroExecucao):
+            origem.copiar(reais)
+        with self.assertRaises(ErroExecucao):
+            criar_vetor("v", "inteiro", [-1])
+
+    def test_funcoes_com_vetores_nao_sao_memoizadas(self):
+        codigo = """
+        programa {
+            inteiro v[2];
+            funcao inteiro primeiro(inteiro a[]) { retorne a[0]; }
+            funcao inteiro dobro(inteiro x) { retorne x * 2; }
+            escreva(primeiro(v));
+            v[0] = 5;
+            escreva(primeiro(v), dobro(3));
+        }
+        """
+        self.assertEqual({funcao.nome for funcao in funcoes_puras(analisar(codigo))}, {"dobro"})
+        for backend in ("arvore", "closures", "slots"):
+            with self.subTest(backend=backend):
+                self.assertEqual(executar(codigo, backend, memoizacao=Memoizacao()), "0\n56\n")
+
+    def test_verificacao_de_tipos(self):
+        codigo = """programa {
+            inteiro v[3] = {1, 2.5, 3};
+            real m[2][2];
+            cadeia c[2];
+            funcao inteiro f(inteiro a[]) { retorne a[0] + 1; }
+            escreva(v[1.5], m[1], f(c), f(v));
+            v = 3;
+            v[0] = "x";
+            inteiro x = 1;
+            escreva(x[0]);
+        }"""
+        erros = [str(erro) for erro in verificar_tipos(analisar(codigo, posicoes=True))]
+        self.assertEqual(erros, [
+            "linha 2, coluna 32: O elemento de 'v' recebe real, mas é do tipo inteiro.",
+            "linha 6, coluna 23: O índice de 'v' deve ser inteiro, mas é real.",
+            "linha 6, coluna 29: 'm' tem 2 dimensões, mas foi usado com 1 índice.",
+            "linha 6, coluna 35: O parâmetro 'a' de 'f' recebe vetor de cadeia, mas é um vetor de inteiro.",
+            "linha 7, coluna 13: O vetor 'v' recebe inteiro, mas é um vetor de inteiro.",
+            "linha 8, coluna 13: O elemento de 'v' recebe cadeia, mas é do tipo inteiro.",
+            "linha 10, coluna 21: 'x' não é um vetor.",
+        ])
+
+    def test_tipo_dos_elementos(self):
+        programa = analisar("programa { real m[2][2]; inteiro v[2]; escreva(m[0][0] + v[1]); }")
+        self.assertEqual(verificar_tipos(programa), [])
+        soma = programa.declaracoes.declaracoes[2].expressoes[0]
+        self.assertEqual((soma.esquerda.tipo_estatico, soma.direita.tipo_estatico, soma.tipo_estatico),
+                         ("real", "inteiro", "real"))
+        self.assertIsNotNone(soma.operacao)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from portugol.parser import analisar
+from portugol.bytecode import Codigo, CompiladorBytecode, desmontar
+from portugol.es import EntradaSaida
+from portugol.vm import ErroEstouroPilha, InterpretadorVM, MaquinaVirtual
+
+SOMA = """
+programa {
+    funcao inteiro soma(inteiro n) {
+        se (n == 0) { retorne 0; }
+        retorne n + soma(n - 1);
+    }
+    escreva(soma(%d));
+}
+"""
+
+PAR_IMPAR = """
+programa {
+    funcao inteiro par(inteiro n) { se (n == 0) { retorne 1; } retorne impar(n - 1); }
+    funcao inteiro impar(inteiro n) { se (n == 0) { retorne 0; } retorne par(n - 1); }
+    funcao inteiro inicio(inteiro n) { retorne par(n); }
+    escreva(inicio(100));
+}
+"""
+
+
+class TestVM(unittest.TestCase):
+
+    def _executar(self, codigo, **opcoes):
+        stdout_capture = io.StringIO()
+        InterpretadorVM(es=EntradaSaida(saida=stdout_capture), **opcoes).interpretar(analisar(codigo))
+        return stdout_capture.getvalue()
+
+    def test_recursao_profunda(self):
+        # Bem além do limite de recursão do Python
+        self.assertEqual(self._executar(SOMA % 100000), f"{100000 * 100001 // 2}\n")
+
+    def test_estouro_de_pilha(self):
+        saida = self._executar(SOMA % 100, limite_pilha=50)
+        self.assertEqual(saida, "Erro de execução: Estouro da pilha de chamadas: mais de 50 chamadas aninhadas.\n"
+                                "Cadeia de chamadas (a mais recente por último):\n"
+                                "  programa\n"
+                                "  soma (51 vezes)\n")
+        self.assertEqual(self._executar(SOMA % 49, limite_pilha=50), "1225\n")
+
+    def test_cadeia_de_chamadas_longa_e_resumida(self):
+        codigo = CompiladorBytecode().compilar_programa(analisar(PAR_IMPAR))
+        with self.assertRaises(ErroEstouroPilha) as contexto:
+            MaquinaVirtual(InterpretadorVM(), limite_pilha=30).executar(codigo, None)
+        erro = contexto.exception
+        self.assertEqual(erro.cadeia[:4], ["programa", "inicio", "par", "impar"])
+        self.assertEqual(len(erro.cadeia), 32)
+        linhas = str(erro).splitlines()
+        self.assertIn("  ... (12 linhas omitidas)", linhas)
+        self.assertEqual(linhas[-1], "  impar")
+
+    def test_blocos_sem_declaracoes_nao_criam_escopo(self):
+        codigo = """
+        programa {
+            funcao inteiro f(inteiro n) {
+                se (n > 0) { retorne n; }
+                retorne 0;
+            }
+            para (inteiro i = 0; i < 2; i = i + 1) { escreva(f(i)); }
+        }
+        """
+        listagem = desmontar(CompiladorBytecode().compilar_programa(analisar(codigo)))
+        programa, funcao = listagem.split("\n\n")[:2]
+        # Escopo do programa e escopo do 'para', que declara i
+        self.assertEqual(programa.count("ENTER_SCOPE"), 2)
+        self.assertNotIn("ENTER_SCOPE", funcao)
+        self.assertEqual(self._executar(codigo), "0\n1\n")
+
+    def test_constantes_repetidas_usam_a_mesma_posicao(self):
+        compilador = CompiladorBytecode()
+        compilador.codigo = Codigo("teste", [])
+        valores = [1, 1.0, True, "1", ("v", 1), 1, 1.0, True, "1", ("v", 1)]
+        # 1, 1.0 e verdadeiro são iguais em Python, mas cada um tem a sua constante
+        self.assertEqual([compilador.constante(valor) for valor in valores], [0, 1, 2, 3, 4] * 2)
+        self.assertEqual([type(c) for c in compilador.codigo.constantes], [int, float, bool, str, tuple])
+
+if __name__ == '__main__':
+    unittest.main()